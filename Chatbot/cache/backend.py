@@ -0,0 +1,169 @@
+# Chatbot/cache/backend.py
+
+"""
+backend.py
+==========
+
+Shared (cross-node) cache tier for ColorLLMCache.
+
+- `CacheBackend`: the interface — batched get / set of JSON values under
+  string keys, with an optional TTL
+- `RemoteCacheBackend`: implementation over any Redis-protocol server
+  (see resp_client.py); a whole message's phrases are fetched with one
+  pipelined round trip
+- Failures degrade gracefully: errors and timeouts read as misses and
+  skipped writes, and after a few consecutive failures a circuit breaker
+  stops calling the remote until it has had time to recover
+
+The local SQLite file stays the default persistent tier; the remote tier
+is only used when configured ($COLOR_LLM_CACHE_URL or
+`ColorLLMCache.set_backend`). ColorLLMCache's in-memory LRU is the
+near-cache in front of it.
+
+Used By:
+--------
+- llm_cache.ColorLLMCache
+"""
+
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from Chatbot.cache.resp_client import RESP_TIMEOUT, RESPClient, RESPError
+from Chatbot.extractors.color.llm.circuit_breaker import CircuitBreaker, get_circuit_breaker
+
+REMOTE_BREAKER_NAME = "color_cache_remote"
+REMOTE_FAILURE_THRESHOLD = 3
+REMOTE_RESET_TIMEOUT = 10.0
+REMOTE_KEY_PREFIX = "color_llm"
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """
+    Interface of a shared cache tier. Keys are strings; values are
+    JSON-serializable. Implementations must not raise on I/O failures.
+    """
+
+    @abstractmethod
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Returns {key: value} for the keys found (missing keys are left out).
+        """
+
+    @abstractmethod
+    def set_many(self, items: Mapping[str, Any], ttl: Optional[float] = None) -> bool:
+        """
+        Stores `items`, expiring after `ttl` seconds (None = never).
+
+        Returns:
+            bool: False if the write was skipped or failed.
+        """
+
+    def available(self) -> bool:
+        return True
+
+    def stats(self) -> Dict[str, object]:
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+class RemoteCacheBackend(CacheBackend):
+    """
+    Redis-protocol cache tier with pipelined multi-get and a circuit breaker.
+    """
+
+    def __init__(
+        self,
+        client: RESPClient,
+        prefix: str = REMOTE_KEY_PREFIX,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.breaker = breaker or get_circuit_breaker(
+            REMOTE_BREAKER_NAME, failure_threshold=REMOTE_FAILURE_THRESHOLD, reset_timeout=REMOTE_RESET_TIMEOUT
+        )
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(("hits", "misses", "writes", "errors", "skipped"), 0)
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = RESP_TIMEOUT, **kwargs) -> "RemoteCacheBackend":
+        return cls(RESPClient.from_url(url, timeout=timeout), **kwargs)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def _count(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                self._counts[name] += value
+
+    def _call(self, commands) -> Optional[list]:
+        """
+        Runs a pipeline through the breaker; None when skipped or failed.
+        """
+        if not self.breaker.allow():
+            self._count(skipped=1)
+            return None
+        try:
+            replies = self.client.pipeline(commands)
+        except (OSError, ValueError, RESPError) as e:
+            self.breaker.record_failure()
+            self._count(errors=1)
+            logger.warning(f"[🌐 CACHE REMOTE DOWN] {self.client.host}:{self.client.port} → {e}")
+            return None
+        errors = [reply for reply in replies if isinstance(reply, RESPError)]
+        if errors:
+            self.breaker.record_failure()
+            self._count(errors=1)
+            logger.warning(f"[🌐 CACHE REMOTE ERROR] {errors[0]}")
+            return None
+        self.breaker.record_success()
+        return replies
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        replies = self._call([("GET", self._key(key)) for key in keys])
+        if replies is None:
+            return {}
+
+        found = {}
+        for key, raw in zip(keys, replies):
+            if raw is None:
+                continue
+            try:
+                found[key] = json.loads(raw)
+            except ValueError:
+                continue  # foreign or torn value: treat as a miss
+        self._count(hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def set_many(self, items: Mapping[str, Any], ttl: Optional[float] = None) -> bool:
+        if not items:
+            return True
+        expiry = ("PX", max(1, int(ttl * 1000))) if ttl else ()
+        replies = self._call([("SET", self._key(key), json.dumps(value), *expiry) for key, value in items.items()])
+        if replies is None:
+            return False
+        self._count(writes=len(items))
+        return True
+
+    def available(self) -> bool:
+        return not self.breaker.is_open()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            counts = dict(self._counts)
+        counts["breaker"] = self.breaker.state
+        return counts
+
+    def close(self) -> None:
+        self.client.close()
@@ -1,11 +1,83 @@
 # Chatbot/cache/color_llm_cache.py
 
 import json
+import numbers
 import os
-from typing import Optional, Tuple, List
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple, List
 
+from Chatbot.cache.backend import CacheBackend, RemoteCacheBackend
+from Chatbot.cache.lru_ttl import BoundedTTLCache
+from Chatbot.cache.mmap_store import MmapRGBStore, write_rgb_store
+from Chatbot.cache.sqlite_store import SQLiteColorStore
 from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
 
+RGB_STORE_PATH_ENV = "COLOR_RGB_STORE_PATH"
+CACHE_PATH_ENV = "COLOR_LLM_CACHE_PATH"
+REMOTE_URL_ENV = "COLOR_LLM_CACHE_URL"
+CACHE_TAG_ENV = "COLOR_LLM_CACHE_TAG"
+CACHE_TTL_ENV = "COLOR_LLM_CACHE_TTL"
+MEMORY_SIZE_ENV = "COLOR_LLM_CACHE_MEMORY_SIZE"
+NEGATIVE_TTL_ENV = "COLOR_LLM_NEGATIVE_TTL"
+LEGACY_JSON_NAME = "color_llm_cache.json"
+FLUSH_EVERY = 32
+
+# Bump (or set $COLOR_LLM_CACHE_TAG) when the model or the prompts change:
+# entries written under another tag are then treated as misses
+DEFAULT_CACHE_TAG = "v1"
+DEFAULT_TTL = 30 * 24 * 3600.0
+MEMORY_MAX_ENTRIES = 10_000
+
+# Negative entries: the TTL doubles with each failed attempt, up to 16x
+DEFAULT_NEGATIVE_TTL = 3600.0
+NEGATIVE_TTL_MAX_FACTOR = 16
+FAILURE_RGB = "rgb"
+FAILURE_SIMPLIFY = "simplify"
+
+TIERS = ("memory", "mmap", "remote", "sqlite")
+_COUNTERS = TIERS + ("negative",)
+
+
+def admit_rgb(rgb) -> bool:
+    """
+    Admission rule for RGB entries: three integers in 0..255.
+    """
+    return (
+        isinstance(rgb, (list, tuple)) and len(rgb) == 3
+        and all(isinstance(v, numbers.Integral) and not isinstance(v, bool) and 0 <= v <= 255 for v in rgb)
+    )
+
+
+def admit_simplified(simplified) -> bool:
+    """
+    Admission rule for simplified phrases: a non-empty string or a
+    non-empty list of non-empty strings.
+    """
+    if isinstance(simplified, str):
+        return bool(simplified.strip())
+    return (
+        isinstance(simplified, list) and bool(simplified)
+        and all(isinstance(v, str) and v.strip() for v in simplified)
+    )
+
+
+def known_failure(cache, kind: str, phrase: str) -> Optional[dict]:
+    """
+    Returns the live negative entry of `phrase` in `cache`, if the cache
+    supports negative entries and has one.
+    """
+    get_failure = getattr(cache, "get_failure", None)
+    return get_failure(kind, phrase) if get_failure is not None else None
+
+
+def record_failure(cache, kind: str, phrase: str, reason: str) -> Optional[dict]:
+    """
+    Stores a negative entry for `phrase` if `cache` supports them.
+    """
+    store_failure = getattr(cache, "store_failure", None)
+    return store_failure(kind, phrase, reason) if store_failure is not None else None
+
 
 class ColorLLMCache:
     """
@@ -13,6 +85,31 @@ class ColorLLMCache:
 
     - RGB values are stored as: { "peachy beige": [243, 207, 183] }
     - Simplified phrases are stored as: { "peachy": ["light peach"] }
+    - Two tiers: a bounded LRU in memory ($COLOR_LLM_CACHE_MEMORY_SIZE
+      entries per kind, see lru_ttl.py) in front of an SQLite file (WAL,
+      see sqlite_store.py) at `_path` ($COLOR_LLM_CACHE_PATH, default
+      Data/color_llm_cache.sqlite3); persistent hits are promoted to memory
+    - With $COLOR_LLM_CACHE_URL (redis://host:port/db) or `set_backend`, a
+      shared remote tier (see backend.py) sits between memory and SQLite:
+      flushes are written through to it, local hits are copied up, and
+      `get_rgb_many` fetches a whole message in one round trip; when the
+      remote is down, lookups fall through to the local tiers
+    - Every entry carries an expiry ($COLOR_LLM_CACHE_TTL seconds, 0 = never)
+      and the model / prompt version tag ($COLOR_LLM_CACHE_TAG); expired or
+      other-tag entries read as misses
+    - Only parsed, in-range RGBs and non-empty simplifications are admitted
+    - Phrases the LLM could not resolve get negative entries (reason,
+      attempt count) with a short TTL ($COLOR_LLM_NEGATIVE_TTL seconds,
+      doubled per attempt); callers consult them before querying again,
+      and `failure_report()` lists the most retried ones
+    - New entries are flushed every FLUSH_EVERY writes, or on `save()`; a
+      flush upserts only those entries, so concurrent workers add to the
+      same file instead of overwriting it
+    - With $COLOR_RGB_STORE_PATH set, RGB values are also read from a shared
+      memory-mapped snapshot (see mmap_store.py); the snapshot records the
+      tag it was written under and is not mapped under another tag
+    - A legacy Data/color_llm_cache.json is imported once on first load
+    - `stats()` reports hits / misses / hit ratio per tier
     """
 
     _instance = None
@@ -26,52 +123,474 @@ class ColorLLMCache:
     def __init__(self):
         if ColorLLMCache._instance is not None:
             raise Exception("Use get_instance() instead of direct instantiation.")
-        self._rgb_cache = {}
-        self._simplify_cache = {}
-        self._path = self._default_path()
+        self.tag = os.environ.get(CACHE_TAG_ENV) or DEFAULT_CACHE_TAG
+        ttl = float(os.environ.get(CACHE_TTL_ENV, DEFAULT_TTL))
+        self.ttl: Optional[float] = ttl if ttl > 0 else None
+        max_entries = int(os.environ.get(MEMORY_SIZE_ENV, MEMORY_MAX_ENTRIES))
+        self._rgb_cache = BoundedTTLCache(max_entries, self.ttl, self.tag)
+        self._simplify_cache = BoundedTTLCache(max_entries, self.ttl, self.tag)
+        self.negative_ttl = float(os.environ.get(NEGATIVE_TTL_ENV, DEFAULT_NEGATIVE_TTL))
+        self._failure_cache = BoundedTTLCache(max_entries, self.negative_ttl, self.tag)
+        self._pending_failures: Dict[Tuple[str, str], dict] = {}
+        self._resolved_failures: set = set()
+        self._pending_rgb: Dict[str, Tuple[list, Optional[float]]] = {}
+        self._pending_simplified: Dict[str, Tuple[List[str], Optional[float]]] = {}
+        self._flush_lock = threading.RLock()
+        self._rgb_store: Optional[MmapRGBStore] = None
+        self._rgb_store_path = os.environ.get(RGB_STORE_PATH_ENV)
+        self._db: Optional[SQLiteColorStore] = None
+        self._path = os.environ.get(CACHE_PATH_ENV) or self._default_path()
+        remote_url = os.environ.get(REMOTE_URL_ENV)
+        self._backend: Optional[CacheBackend] = RemoteCacheBackend.from_url(remote_url) if remote_url else None
+        self.reset_stats()
         self.load()
 
     def _default_path(self) -> str:
+        return os.path.join(self._data_dir(), "color_llm_cache.sqlite3")
+
+    @staticmethod
+    def _data_dir() -> str:
         base_dir = os.path.dirname(os.path.abspath(__file__))
         project_root = os.path.abspath(os.path.join(base_dir, "..", ".."))
-        return os.path.join(project_root, "Data", "color_llm_cache.json")
+        return os.path.join(project_root, "Data")
+
+    def _store(self, create: bool = False) -> Optional[SQLiteColorStore]:
+        """
+        Returns the SQLite store at `_path`; reads never create the file.
+        """
+        if self._db is not None and self._db.path != self._path:
+            self._db.close()
+            self._db = None
+        if self._db is None:
+            if not create and not os.path.exists(self._path):
+                return None
+            os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+            self._db = SQLiteColorStore(self._path)
+        return self._db
+
+    def set_tag(self, tag: str):
+        """
+        Switches the current model / prompt version tag; entries written
+        under the previous tag become misses.
+        """
+        with self._flush_lock:
+            self.flush()
+            self.tag = self._rgb_cache.tag = self._simplify_cache.tag = self._failure_cache.tag = tag
+            self._rgb_store = None  # the snapshot was written under the old tag
+
+    def _expiry(self, ttl: Optional[float]) -> Optional[float]:
+        ttl = self.ttl if ttl is None else ttl
+        return time.time() + ttl if ttl and ttl > 0 else None
+
+    def _count(self, tier: str, hit: bool):
+        self._stats[tier]["hits" if hit else "misses"] += 1
+
+    def set_backend(self, backend: Optional[CacheBackend]):
+        """
+        Plugs in (or, with None, removes) the shared remote tier.
+        """
+        with self._flush_lock:
+            self.flush()
+            self._backend = backend
+
+    def _remote_key(self, kind: str, key: str) -> str:
+        return f"{self.tag}:{kind}:{key}"
+
+    def _push_remote(self, kind: str, entries: Dict[str, tuple]):
+        """
+        Writes {key: (value, expires)} to the remote tier, grouped by TTL.
+        """
+        backend = self._backend
+        if backend is None or not entries:
+            return
+        now = time.time()
+        groups: Dict[Optional[int], dict] = {}
+        for key, (value, expires) in entries.items():
+            ttl = None if expires is None else max(1, int(expires - now))
+            groups.setdefault(ttl, {})[self._remote_key(kind, key)] = value
+        for ttl, items in groups.items():
+            backend.set_many(items, ttl=ttl)
 
     def get_rgb(self, phrase: str) -> Optional[Tuple[int, int, int]]:
-        val = self._rgb_cache.get(normalize_token(phrase))
-        return tuple(val) if isinstance(val, list) else val
+        return self.get_rgb_many([phrase])[phrase]
+
+    def get_rgb_many(self, phrases: Iterable[str]) -> Dict[str, Optional[Tuple[int, int, int]]]:
+        """
+        Looks up many phrases at once, tier by tier (memory → mmap → remote
+        → SQLite); the remote tier is queried with one pipelined round trip.
+
+        Args:
+            phrases (Iterable[str]): Color phrases (e.g., all of one message).
+
+        Returns:
+            Dict[str, Optional[Tuple[int, int, int]]]: Phrase → RGB or None.
+        """
+        keys = {phrase: normalize_token(phrase) for phrase in phrases}
+        found: Dict[str, Tuple[int, int, int]] = {}
+        missing = []
 
-    def store_rgb(self, phrase: str, rgb: Tuple[int, int, int]):
-        self._rgb_cache[normalize_token(phrase)] = list(rgb)
+        with self._flush_lock:
+            for key in dict.fromkeys(keys.values()):
+                val = self._rgb_cache.get(key)
+                self._count("memory", val is not None)
+                if val is None and self._rgb_store is not None:
+                    val = self._rgb_store.get(key)
+                    self._count("mmap", val is not None)
+                    if val is not None:
+                        self._rgb_cache.set(key, list(val), expires_at=self._rgb_store.expires_at(key))
+                if val is None:
+                    missing.append(key)
+                else:
+                    found[key] = tuple(val)
+
+        backend = self._backend
+        if missing and backend is not None:
+            remote = backend.get_many([self._remote_key("rgb", key) for key in missing])
+            still_missing = []
+            with self._flush_lock:
+                for key in missing:
+                    val = remote.get(self._remote_key("rgb", key))
+                    hit = admit_rgb(val)
+                    self._count("remote", hit)
+                    if hit:
+                        self._rgb_cache[key] = list(val)
+                        found[key] = tuple(val)
+                    else:
+                        still_missing.append(key)
+            missing = still_missing
+
+        copy_up = {}
+        if missing:
+            with self._flush_lock:
+                db = self._store()
+                for key in missing:
+                    entry = db.lookup_rgb(key, self.tag) if db is not None else None
+                    self._count("sqlite", entry is not None)
+                    if entry is not None:
+                        rgb, expires = entry
+                        self._rgb_cache.set(key, list(rgb), expires_at=expires)
+                        found[key] = rgb
+                        copy_up[key] = (list(rgb), expires)
+        self._push_remote("rgb", copy_up)  # share entries this node has and the remote lacks
+
+        return {phrase: found.get(key) for phrase, key in keys.items()}
+
+    def store_rgb(self, phrase: str, rgb: Tuple[int, int, int], ttl: Optional[float] = None):
+        """
+        Caches an RGB for `phrase` if it passes admission.
+
+        Args:
+            phrase (str): Color phrase.
+            rgb (Tuple[int, int, int]): Parsed RGB.
+            ttl (float, optional): Seconds to keep it (<= 0 = never); defaults to the cache TTL.
+        """
+        if not admit_rgb(rgb):
+            self._stats["rejected"] += 1
+            return
+        key = normalize_token(phrase)
+        expires = self._expiry(ttl)
+        with self._flush_lock:
+            self._rgb_cache.set(key, list(rgb), expires_at=expires)
+            self._pending_rgb[key] = (list(rgb), expires)
+            self._resolve_failure(FAILURE_RGB, key)
+            self._maybe_flush()
 
     def get_simplified(self, phrase: str) -> List[str]:
-        return self._simplify_cache.get(normalize_token(phrase), [])
+        key = normalize_token(phrase)
+        with self._flush_lock:
+            val = self._simplify_cache.get(key)
+            self._count("memory", val is not None)
+            if val is not None:
+                return val
+
+        backend = self._backend
+        if backend is not None:
+            val = backend.get_many([self._remote_key("simplified", key)]).get(self._remote_key("simplified", key))
+            hit = admit_simplified(val)
+            with self._flush_lock:
+                self._count("remote", hit)
+                if hit:
+                    self._simplify_cache[key] = val
+                    return val
+
+        with self._flush_lock:
+            db = self._store()
+            entry = db.lookup_simplified(key, self.tag) if db is not None else None
+            self._count("sqlite", entry is not None)
+            if entry is None:
+                return []
+            value, expires = entry
+            self._simplify_cache.set(key, value, expires_at=expires)
+        self._push_remote("simplified", {key: (value, expires)})
+        return value
+
+    def store_simplified(self, phrase: str, simplified: List[str], ttl: Optional[float] = None):
+        if not admit_simplified(simplified):
+            self._stats["rejected"] += 1
+            return
+        key = normalize_token(phrase)
+        expires = self._expiry(ttl)
+        with self._flush_lock:
+            self._simplify_cache.set(key, simplified, expires_at=expires)
+            self._pending_simplified[key] = (simplified, expires)
+            self._resolve_failure(FAILURE_SIMPLIFY, key)
+            self._maybe_flush()
+
+    # ------------------ NEGATIVE ENTRIES ------------------ #
+
+    def _failure_record(self, kind: str, key: str) -> Optional[dict]:
+        """
+        Latest negative entry for (kind, key), expired or not.
+        """
+        record = self._pending_failures.get((kind, key))
+        if record is None:
+            db = self._store()
+            record = db.lookup_failure(kind, key, self.tag) if db is not None else None
+        return record
+
+    def get_failure(self, kind: str, phrase: str) -> Optional[dict]:
+        """
+        Returns the live negative entry of `phrase`, or None.
+
+        Args:
+            kind (str): FAILURE_RGB or FAILURE_SIMPLIFY.
+            phrase (str): Color phrase.
+
+        Returns:
+            Optional[dict]: kind / key / reason / attempts / first_seen /
+            last_seen / expires.
+        """
+        key = normalize_token(phrase)
+        with self._flush_lock:
+            record = self._failure_cache.get((kind, key))
+            if record is None and (kind, key) not in self._resolved_failures:
+                record = self._failure_record(kind, key)
+                if record is not None and (record["expires"] is None or record["expires"] > time.time()):
+                    self._failure_cache.set((kind, key), record, expires_at=record["expires"])
+                else:
+                    record = None
+            self._count("negative", record is not None)
+            return record
+
+    def store_failure(self, kind: str, phrase: str, reason: str) -> dict:
+        """
+        Records a failed resolution of `phrase`; each repeat increments
+        the attempt count and doubles the entry's TTL (capped).
 
-    def store_simplified(self, phrase: str, simplified: List[str]):
-        self._simplify_cache[normalize_token(phrase)] = simplified
+        Args:
+            kind (str): FAILURE_RGB or FAILURE_SIMPLIFY.
+            phrase (str): Color phrase.
+            reason (str): Why it failed (e.g., 'unparsable', 'empty_reply').
 
-    def clear(self):
+        Returns:
+            dict: The stored negative entry.
+        """
+        key = normalize_token(phrase)
+        now = time.time()
+        with self._flush_lock:
+            previous = None if (kind, key) in self._resolved_failures else self._failure_record(kind, key)
+            attempts = (previous["attempts"] if previous else 0) + 1
+            ttl = self.negative_ttl * min(2 ** (attempts - 1), NEGATIVE_TTL_MAX_FACTOR)
+            record = {
+                "kind": kind,
+                "key": key,
+                "reason": reason,
+                "attempts": attempts,
+                "first_seen": previous["first_seen"] if previous else now,
+                "last_seen": now,
+                "expires": now + ttl if ttl > 0 else None,
+            }
+            self._failure_cache.set((kind, key), record, expires_at=record["expires"])
+            self._pending_failures[(kind, key)] = record
+            self._resolved_failures.discard((kind, key))
+            self._maybe_flush()
+            return record
+
+    def _resolve_failure(self, kind: str, key: str):
+        if (kind, key) in self._failure_cache:
+            del self._failure_cache[(kind, key)]
+        self._pending_failures.pop((kind, key), None)
+        if self._store() is not None:
+            self._resolved_failures.add((kind, key))
+
+    def failure_report(self, limit: int = 20) -> List[dict]:
+        """
+        Returns the most retried negative entries (expired ones included),
+        most attempts first.
+        """
+        with self._flush_lock:
+            db = self._store()
+            records = {
+                (record["kind"], record["key"]): record
+                for record in (db.iter_failures(self.tag) if db is not None else ())
+                if (record["kind"], record["key"]) not in self._resolved_failures
+            }
+            records.update(self._pending_failures)
+        return sorted(records.values(), key=lambda r: (-r["attempts"], -r["last_seen"]))[:limit]
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Returns per-tier hits / misses / hit_ratio (plus negative-entry
+        lookups), memory tier occupancy and evictions, and the number of
+        entries refused by admission.
+        """
+        with self._flush_lock:
+            report: Dict[str, object] = {}
+            for tier in _COUNTERS:
+                counts = dict(self._stats[tier])
+                lookups = counts["hits"] + counts["misses"]
+                counts["hit_ratio"] = counts["hits"] / lookups if lookups else 0.0
+                report[tier] = counts
+            report["memory"].update(
+                size=len(self._rgb_cache) + len(self._simplify_cache),
+                max_entries=self._rgb_cache.maxsize,
+                evictions=self._rgb_cache.evictions + self._simplify_cache.evictions,
+                expired=self._rgb_cache.expirations + self._simplify_cache.expirations,
+            )
+            report["rejected"] = self._stats["rejected"]
+        if self._backend is not None:
+            report["remote"]["backend"] = self._backend.stats()
+        return report
+
+    def reset_stats(self):
+        self._stats = {tier: {"hits": 0, "misses": 0} for tier in _COUNTERS}
+        self._stats["rejected"] = 0
+
+    def clear(self, persistent: bool = False):
+        """
+        Drops in-memory entries (unflushed ones included) and detaches the
+        RGB snapshot. With `persistent=True`, also empties the SQLite file.
+        """
+        with self._flush_lock:
+            self._rgb_cache.clear()
+            self._simplify_cache.clear()
+            self._failure_cache.clear()
+            self._pending_rgb.clear()
+            self._pending_simplified.clear()
+            self._pending_failures.clear()
+            self._resolved_failures.clear()
+            self._rgb_store = None
+            if persistent and self._store() is not None:
+                self._store().clear()
+
+    def _maybe_flush(self):
+        pending = len(self._pending_rgb) + len(self._pending_simplified) + len(self._pending_failures)
+        if pending >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Upserts entries added since the last flush into the SQLite file.
+
+        Returns:
+            int: Number of entries written.
+        """
+        with self._flush_lock:
+            rgb_items = [(key, rgb, expires) for key, (rgb, expires) in self._pending_rgb.items()]
+            simplified_items = [(key, value, expires) for key, (value, expires) in self._pending_simplified.items()]
+            failures = list(self._pending_failures.values())
+            if rgb_items or simplified_items or failures or self._resolved_failures:
+                self._store(create=True).put_many(
+                    rgb_items, simplified_items, tag=self.tag, failures=failures, resolved=self._resolved_failures
+                )
+            pushed = (dict(self._pending_rgb), dict(self._pending_simplified))
+            self._pending_rgb.clear()
+            self._pending_simplified.clear()
+            self._pending_failures.clear()
+            self._resolved_failures.clear()
+            self._push_remote("rgb", pushed[0])
+            self._push_remote("simplified", pushed[1])
+            return len(rgb_items) + len(simplified_items) + len(failures)
+
+    def _all_rgb(self) -> Dict[str, Tuple[list, Optional[float]]]:
+        """
+        Returns every live RGB entry as {key: (rgb, expires)}.
+        """
+        db = self._store()
+        merged = {}
+        if db is not None:
+            merged.update((key, (list(rgb), expires)) for key, rgb, expires in db.iter_rgb(self.tag))
+        if self._rgb_store is not None:
+            merged.update((key, (list(rgb), expires)) for key, rgb, expires in self._rgb_store.expiring_items())
+        merged.update(self._pending_rgb)
+        for key in list(self._rgb_cache):
+            rgb = self._rgb_cache.get(key)
+            if rgb is not None:
+                merged[key] = (rgb, self._rgb_cache.expires_at(key))
+        now = time.time()
+        return {key: entry for key, entry in merged.items() if entry[1] is None or entry[1] > now}
+
+    def snapshot_rgb(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Writes all RGB entries, with their expiry, to a memory-mapped store
+        file and serves lookups from it. Call in the parent before forking
+        workers.
+
+        Args:
+            path (str, optional): Store path. Defaults to $COLOR_RGB_STORE_PATH.
+
+        Returns:
+            Optional[str]: Written path, or None if no path is configured.
+        """
+        path = path or self._rgb_store_path
+        if not path:
+            return None
+        entries = self._all_rgb()
+        write_rgb_store(
+            path,
+            {key: rgb for key, (rgb, _) in entries.items()},
+            tag=self.tag,
+            expires={key: expires for key, (_, expires) in entries.items()},
+        )
+        self._rgb_store = MmapRGBStore(path)
+        self._rgb_store_path = path
         self._rgb_cache.clear()
-        self._simplify_cache.clear()
+        return path
 
     def save(self):
         try:
-            with open(self._path, "w", encoding="utf-8") as f:
-                json.dump({
-                    "rgb": self._rgb_cache,
-                    "simplified": self._simplify_cache
-                }, f, indent=2)
-            print(f"[💾 CACHE SAVED] → {self._path}")
+            written = self.flush()
+            print(f"[💾 CACHE SAVED] {written} new entries → {self._path}")
+            if self._rgb_store_path:
+                self.snapshot_rgb()
         except Exception as e:
             print(f"[❌ ERROR] Saving cache → {e}")
 
     def load(self):
-        if not os.path.exists(self._path):
-            return
+        if self._rgb_store_path and os.path.exists(self._rgb_store_path):
+            try:
+                store = MmapRGBStore(self._rgb_store_path)
+                if store.tag == self.tag:
+                    self._rgb_store = store
+                    print(f"[📂 RGB STORE MAPPED] ← {self._rgb_store_path}")
+                else:
+                    store.close()
+                    print(f"[⚠️ RGB STORE SKIPPED] tag '{store.tag}' ≠ '{self.tag}' ← {self._rgb_store_path}")
+            except Exception as e:
+                print(f"[❌ ERROR] Mapping RGB store → {e}")
+
+        legacy = os.path.join(os.path.dirname(os.path.abspath(self._path)), LEGACY_JSON_NAME)
+        if not os.path.exists(self._path) and os.path.exists(legacy):
+            self.import_json(legacy)
+
+    def import_json(self, path: str) -> int:
+        """
+        Imports a whole-file JSON cache ({"rgb": ..., "simplified": ...}).
+
+        Returns:
+            int: Number of entries imported.
+        """
         try:
-            with open(self._path, "r", encoding="utf-8") as f:
+            with open(path, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                self._rgb_cache.update(data.get("rgb", {}))
-                self._simplify_cache.update(data.get("simplified", {}))
-            print(f"[📂 CACHE LOADED] ← {self._path}")
+            expires = self._expiry(None)
+            rgb_items = [(normalize_token(k), v, expires) for k, v in data.get("rgb", {}).items() if admit_rgb(v)]
+            simplified_items = [
+                (normalize_token(k), v, expires) for k, v in data.get("simplified", {}).items() if admit_simplified(v)
+            ]
+            self._store(create=True).put_many(rgb_items, simplified_items, tag=self.tag)
+            print(f"[📂 CACHE IMPORTED] {len(rgb_items) + len(simplified_items)} entries ← {path}")
+            return len(rgb_items) + len(simplified_items)
         except Exception as e:
-            print(f"[❌ ERROR] Loading cache → {e}")
+            print(f"[❌ ERROR] Importing cache → {e}")
+            return 0
@@ -0,0 +1,109 @@
+# Chatbot/cache/lru_ttl.py
+
+"""
+lru_ttl.py
+==========
+
+Size-bounded LRU mapping with per-entry expiry and version tags — the
+in-memory tier of ColorLLMCache.
+
+- At most `maxsize` entries; inserting past it evicts the least recently
+  used one
+- Each entry has an absolute expiry (None = never) and a tag; entries
+  that expired or carry another tag than the mapping's current `tag`
+  (e.g., after a model / prompt change) read as missing and are dropped
+- Behaves like a dict otherwise (`cache[key] = value`, `get`, `in`,
+  `clear`, equality), so existing callers keep working
+
+Used By:
+--------
+- llm_cache.ColorLLMCache
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_USE_TTL = object()
+
+
+class BoundedTTLCache(OrderedDict):
+    """
+    LRU + TTL mapping (not thread-safe; callers hold their own lock).
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: Optional[float] = None,
+        tag: str = "",
+        clock: Callable[[], float] = time.time
+    ):
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.tag = tag
+        self._clock = clock
+        self._meta: Dict[Hashable, Tuple[Optional[float], str]] = {}
+        self.evictions = 0
+        self.expirations = 0
+
+    def set(self, key: Hashable, value: Any, expires_at=_USE_TTL, tag: Optional[str] = None) -> None:
+        """
+        Inserts or refreshes `key` as most recently used.
+
+        Args:
+            key (Hashable): Entry key.
+            value (Any): Entry value.
+            expires_at (float, optional): Absolute expiry (epoch seconds);
+                defaults to now + `ttl` (never if `ttl` is None).
+            tag (str, optional): Version tag; defaults to the current `tag`.
+        """
+        if expires_at is _USE_TTL:
+            expires_at = None if self.ttl is None else self._clock() + self.ttl
+        OrderedDict.__setitem__(self, key, value)
+        self.move_to_end(key)
+        self._meta[key] = (expires_at, self.tag if tag is None else tag)
+        while len(self) > self.maxsize:
+            oldest, _ = self.popitem(last=False)
+            self._meta.pop(oldest, None)
+            self.evictions += 1
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+
+    def _live(self, key: Hashable) -> bool:
+        expires_at, tag = self._meta.get(key, (None, self.tag))
+        if tag == self.tag and (expires_at is None or expires_at > self._clock()):
+            return True
+        OrderedDict.__delitem__(self, key)
+        self._meta.pop(key, None)
+        self.expirations += 1
+        return False
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = OrderedDict.__getitem__(self, key)
+        if not self._live(key):
+            raise KeyError(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        return OrderedDict.__contains__(self, key) and self._live(key)
+
+    def __delitem__(self, key: Hashable) -> None:
+        OrderedDict.__delitem__(self, key)
+        self._meta.pop(key, None)
+
+    def expires_at(self, key: Hashable) -> Optional[float]:
+        return self._meta.get(key, (None, ""))[0]
+
+    def clear(self) -> None:
+        OrderedDict.clear(self)
+        self._meta.clear()
@@ -0,0 +1,252 @@
+# Chatbot/cache/mmap_store.py
+
+"""
+mmap_store.py
+=============
+
+Read-only, memory-mapped name → RGB store shared by pre-forked workers.
+
+Python dicts of tuples are not fork-friendly: every lookup touches the
+refcounts of the key and value objects, which dirties the pages and
+breaks copy-on-write sharing. This store keeps everything in one file
+that each worker `mmap`s; lookups read bytes straight from the mapping,
+so the pages stay in the shared page cache.
+
+File layout (little-endian, sections aligned to 8 bytes):
+---------------------------------------------------------
+- Header: magic, version, entry count, hash slot count, tag length, blob length
+- Tag: UTF-8 writer tag (e.g. the LLM cache's model / prompt version)
+- RGB table: entry count × 3 uint8
+- Expiries (version 3 only): entry count uint32 epoch seconds, 0 = never;
+  expired entries read as missing
+- Name offsets: (entry count + 1) uint32 into the name blob
+- Hash slots: slot count uint32 (0 = empty, else entry index + 1),
+  open addressing on CRC32 with linear probing
+- Name blob: UTF-8 names, sorted, concatenated
+
+Used By:
+--------
+- Palette map for the extraction pipeline ($COLOR_PALETTE_STORE_PATH)
+- ColorLLMCache RGB snapshots ($COLOR_RGB_STORE_PATH)
+"""
+
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Callable, Iterator, Mapping, Optional, Tuple
+
+_MAGIC = b"RGBSTOR1"
+_VERSION = 2  # 2: tag after the header (1: untagged, still readable)
+_VERSION_EXPIRING = 3  # 2 + per-entry expiries (written only when some entry expires)
+_HEADER = struct.Struct("<8sIIIIQ")  # magic, version, count, slots, tag_len, blob_len
+_U32 = struct.Struct("<I")
+_U32_PAIR = struct.Struct("<II")
+_ALIGN = 8
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _slot_count(count: int) -> int:
+    slots = 8
+    while slots < 2 * count:
+        slots <<= 1
+    return slots
+
+
+def write_rgb_store(
+    path: str,
+    rgb_map: Mapping[str, Tuple[int, int, int]],
+    tag: str = "",
+    expires: Optional[Mapping[str, Optional[float]]] = None
+) -> None:
+    """
+    Writes a name → RGB mapping to a store file (atomically, via rename).
+
+    Args:
+        path (str): Output file path.
+        rgb_map (Mapping[str, Tuple[int, int, int]]): Names → RGB (0–255).
+        tag (str): Stored as-is, read back as `MmapRGBStore.tag`.
+        expires (Mapping[str, Optional[float]], optional): Names → absolute
+            expiry (epoch seconds, None = never); names left out never expire.
+    """
+    raw_tag = tag.encode("utf-8")
+    items = sorted((name, tuple(rgb)) for name, rgb in rgb_map.items())
+    count = len(items)
+    slots = _slot_count(count)
+
+    encoded = [name.encode("utf-8") for name, _ in items]
+    offsets = [0]
+    for raw in encoded:
+        offsets.append(offsets[-1] + len(raw))
+
+    table = [0] * slots
+    mask = slots - 1
+    for idx, raw in enumerate(encoded):
+        slot = zlib.crc32(raw) & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = idx + 1
+
+    rgb_bytes = bytes(component for _, rgb in items for component in rgb)
+    sections = [rgb_bytes]
+    expiries = [(expires or {}).get(name) for name, _ in items]
+    version = _VERSION_EXPIRING if any(at is not None for at in expiries) else _VERSION
+    if version == _VERSION_EXPIRING:
+        # floored to the second: an entry may expire up to 1s early, never late
+        sections.append(struct.pack(f"<{count}I", *(0 if at is None else max(1, int(at)) for at in expiries)))
+    sections += [
+        struct.pack(f"<{count + 1}I", *offsets),
+        struct.pack(f"<{slots}I", *table),
+        b"".join(encoded),
+    ]
+
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, version, count, slots, len(raw_tag), offsets[-1]))
+        f.write(raw_tag)
+        for section in sections:
+            f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+            f.write(section)
+    os.replace(tmp_path, path)
+
+
+class MmapRGBStore(Mapping):
+    """
+    Read-only Mapping[str, Tuple[int, int, int]] over a store file.
+
+    - `store[name]` / `get()` / `in`: one CRC32 + usually one byte compare
+    - Iteration yields names in sorted order
+    - `tag` is the writer's tag ('' for untagged files)
+    - Entries past their expiry (version 3 files) read as missing
+    - Nothing is decoded up front; `close()` releases the mapping
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self._path = path
+        self._clock = clock
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) else None
+
+        if self._mm is None or len(self._mm) < _HEADER.size:
+            raise ValueError(f"Not an RGB store file: {path}")
+        magic, version, count, slots, tag_len, blob_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version not in (1, _VERSION, _VERSION_EXPIRING):
+            raise ValueError(f"Not an RGB store file: {path}")
+        if version == 1:
+            tag_len = 0  # reserved field, always written as 0
+        if _HEADER.size + tag_len > len(self._mm):
+            raise ValueError(f"Truncated RGB store file: {path}")
+
+        self._tag = self._mm[_HEADER.size:_HEADER.size + tag_len].decode("utf-8")
+        self._count = count
+        self._mask = slots - 1
+        self._rgb_at = _aligned(_HEADER.size + tag_len)
+        self._expires_at = _aligned(self._rgb_at + 3 * count) if version == _VERSION_EXPIRING else None
+        self._offsets_at = _aligned(
+            self._rgb_at + 3 * count if self._expires_at is None else self._expires_at + 4 * count
+        )
+        self._slots_at = _aligned(self._offsets_at + 4 * (count + 1))
+        self._blob_at = _aligned(self._slots_at + 4 * slots)
+
+        if self._blob_at + blob_len > len(self._mm):
+            raise ValueError(f"Truncated RGB store file: {path}")
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def tag(self) -> str:
+        return self._tag
+
+    def _name_bytes(self, idx: int) -> bytes:
+        start, end = _U32_PAIR.unpack_from(self._mm, self._offsets_at + 4 * idx)
+        return self._mm[self._blob_at + start:self._blob_at + end]
+
+    def _find(self, key: str) -> int:
+        if not isinstance(key, str) or not self._count:
+            return -1
+        mm, mask, slots_at, offsets_at, blob_at = self._mm, self._mask, self._slots_at, self._offsets_at, self._blob_at
+        raw = key.encode("utf-8")
+        slot = zlib.crc32(raw) & mask
+        while True:
+            (entry,) = _U32.unpack_from(mm, slots_at + 4 * slot)
+            if not entry:
+                return -1
+            start, end = _U32_PAIR.unpack_from(mm, offsets_at + 4 * (entry - 1))
+            if end - start == len(raw) and mm[blob_at + start:blob_at + end] == raw:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def _rgb(self, idx: int) -> Tuple[int, int, int]:
+        start = self._rgb_at + 3 * idx
+        return tuple(self._mm[start:start + 3])
+
+    def _expiry(self, idx: int) -> Optional[float]:
+        if self._expires_at is None:
+            return None
+        (at,) = _U32.unpack_from(self._mm, self._expires_at + 4 * idx)
+        return float(at) if at else None
+
+    def _find_live(self, key: str) -> int:
+        idx = self._find(key)
+        if idx >= 0 and self._expires_at is not None:
+            at = self._expiry(idx)
+            if at is not None and at <= self._clock():
+                return -1
+        return idx
+
+    def _live_indexes(self) -> Iterator[int]:
+        now = self._clock()
+        for idx in range(self._count):
+            at = self._expiry(idx)
+            if at is None or at > now:
+                yield idx
+
+    def __getitem__(self, key: str) -> Tuple[int, int, int]:
+        idx = self._find_live(key)
+        if idx < 0:
+            raise KeyError(key)
+        return self._rgb(idx)
+
+    def get(self, key: str, default: Optional[Tuple[int, int, int]] = None) -> Optional[Tuple[int, int, int]]:
+        idx = self._find_live(key)
+        return self._rgb(idx) if idx >= 0 else default
+
+    def expires_at(self, key: str) -> Optional[float]:
+        """
+        Returns the stored expiry of `key` (epoch seconds), None if it never
+        expires or is not stored.
+        """
+        idx = self._find(key)
+        return self._expiry(idx) if idx >= 0 else None
+
+    def __contains__(self, key: object) -> bool:
+        return self._find_live(key) >= 0
+
+    def __len__(self) -> int:
+        return self._count if self._expires_at is None else sum(1 for _ in self._live_indexes())
+
+    def __iter__(self) -> Iterator[str]:
+        for idx in self._live_indexes():
+            yield self._name_bytes(idx).decode("utf-8")
+
+    def items(self) -> Iterator[Tuple[str, Tuple[int, int, int]]]:
+        for idx in self._live_indexes():
+            yield self._name_bytes(idx).decode("utf-8"), self._rgb(idx)
+
+    def expiring_items(self) -> Iterator[Tuple[str, Tuple[int, int, int], Optional[float]]]:
+        """
+        Yields (name, RGB, expiry) for every live entry.
+        """
+        for idx in self._live_indexes():
+            yield self._name_bytes(idx).decode("utf-8"), self._rgb(idx), self._expiry(idx)
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
@@ -0,0 +1,195 @@
+# Chatbot/cache/resp_client.py
+
+"""
+resp_client.py
+==============
+
+Minimal client for the Redis serialization protocol (RESP2), enough for
+a shared key-value cache: any Redis-compatible server (Redis, Valkey,
+KeyDB, ...) works, and so does the local stand-in used by the tests.
+
+- One TCP connection per thread and per process (re-opened after fork
+  or after an error), with a short socket timeout
+- A rejected AUTH / SELECT is a connection failure (ConnectionError), like
+  an unreachable server
+- `pipeline(commands)` writes every command in one send and then reads
+  the replies, so a multi-key lookup costs a single round trip
+
+Used By:
+--------
+- backend.RemoteCacheBackend
+"""
+
+import os
+import socket
+import threading
+from typing import Any, List, Optional, Sequence
+from urllib.parse import urlparse
+
+RESP_TIMEOUT = 0.1
+RESP_DEFAULT_PORT = 6379
+
+
+class RESPError(Exception):
+    """
+    Error reply from the server ('-ERR ...').
+    """
+
+
+def encode_command(*args) -> bytes:
+    """
+    Encodes one command as a RESP array of bulk strings.
+    """
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+def read_reply(stream) -> Any:
+    """
+    Reads one RESP reply from a buffered binary stream.
+
+    Returns:
+        Any: str (simple string), int, bytes or None (bulk), list (array),
+        or a RESPError instance for error replies.
+    """
+    line = stream.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("connection closed by server")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode("utf-8")
+    if kind == b"-":
+        return RESPError(payload.decode("utf-8"))
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = stream.read(length + 2)
+        if len(data) != length + 2:
+            raise ConnectionError("connection closed by server")
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        return None if length < 0 else [read_reply(stream) for _ in range(length)]
+    raise ConnectionError(f"unexpected RESP reply: {line!r}")
+
+
+class RESPClient:
+    """
+    Thread-safe RESP client (one connection per thread).
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = RESP_DEFAULT_PORT,
+        db: int = 0,
+        password: Optional[str] = None,
+        timeout: float = RESP_TIMEOUT
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sockets: List[socket.socket] = []
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = RESP_TIMEOUT) -> "RESPClient":
+        """
+        Builds a client from 'redis://[:password@]host[:port][/db]'.
+        """
+        parsed = urlparse(url)
+        db = parsed.path.strip("/")
+        return cls(
+            host=parsed.hostname or "127.0.0.1",
+            port=parsed.port or RESP_DEFAULT_PORT,
+            db=int(db) if db else 0,
+            password=parsed.password,
+            timeout=timeout,
+        )
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = self._local.conn = (sock, sock.makefile("rb"))
+        self._local.pid = os.getpid()
+        with self._lock:
+            self._sockets.append(sock)
+
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            for command, reply in zip(setup, self._roundtrip(conn, setup)):
+                if isinstance(reply, RESPError):
+                    self._drop()
+                    raise ConnectionError(f"{command[0]} rejected: {reply}")
+        return conn
+
+    def _roundtrip(self, conn, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        sock, stream = conn
+        sock.sendall(b"".join(encode_command(*command) for command in commands))
+        return [read_reply(stream) for _ in commands]
+
+    def _drop(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            with self._lock:
+                if conn[0] in self._sockets:
+                    self._sockets.remove(conn[0])
+            try:
+                conn[1].close()
+                conn[0].close()
+            except OSError:
+                pass
+
+    def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """
+        Sends `commands` in one write and returns their replies in order
+        (error replies are returned as RESPError instances, not raised).
+
+        Raises:
+            OSError: Connection failures, rejected AUTH / SELECT and timeouts
+                (the connection is dropped).
+        """
+        if not commands:
+            return []
+        try:
+            return self._roundtrip(self._connection(), commands)
+        except (OSError, ValueError):
+            self._drop()  # the stream may hold half a reply: never reuse it
+            raise
+
+    def execute(self, *args) -> Any:
+        """
+        Runs one command; error replies are raised as RESPError.
+        """
+        reply = self.pipeline([args])[0]
+        if isinstance(reply, RESPError):
+            raise reply
+        return reply
+
+    def close(self) -> None:
+        with self._lock:
+            sockets, self._sockets = self._sockets, []
+        for sock in sockets:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local = threading.local()
@@ -0,0 +1,287 @@
+# Chatbot/cache/sqlite_store.py
+
+"""
+sqlite_store.py
+===============
+
+Embedded, indexed persistence for ColorLLMCache (SQLite in WAL mode).
+
+- One row per phrase in `rgb(key, r, g, b, expires, tag)` and
+  `simplified(key, value, expires, tag)`, both keyed by the normalized
+  phrase (WITHOUT ROWID primary-key index), so lookups are point queries
+  and nothing is loaded up front
+- `failures(kind, key, reason, attempts, ...)` holds negative entries for
+  phrases the LLM could not resolve
+- Reads may filter on a version tag and the current time: rows written
+  under another model / prompt version, or past their expiry, read as
+  missing (and are removed by `purge`)
+- Writes are incremental upserts in one short transaction per flush;
+  WAL lets readers in other processes proceed while a worker writes, and
+  concurrent writers serialize on the database lock instead of
+  overwriting each other's files
+- One connection per thread and per process (re-opened after fork)
+
+Used By:
+--------
+- llm_cache.ColorLLMCache
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+SQLITE_TIMEOUT = 10.0
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS rgb ("
+    " key TEXT PRIMARY KEY, r INTEGER NOT NULL, g INTEGER NOT NULL, b INTEGER NOT NULL,"
+    " expires REAL, tag TEXT NOT NULL DEFAULT ''"
+    ") WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS simplified ("
+    " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL, tag TEXT NOT NULL DEFAULT ''"
+    ") WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS failures ("
+    " kind TEXT NOT NULL, key TEXT NOT NULL, reason TEXT NOT NULL, attempts INTEGER NOT NULL,"
+    " first_seen REAL NOT NULL, last_seen REAL NOT NULL, expires REAL, tag TEXT NOT NULL DEFAULT '',"
+    " PRIMARY KEY (kind, key)"
+    ") WITHOUT ROWID",
+)
+
+_FAILURE_COLUMNS = ("kind", "key", "reason", "attempts", "first_seen", "last_seen", "expires", "tag")
+
+# Columns added after the first release of the schema (migrated in place)
+_ADDED_COLUMNS = (("expires", "REAL"), ("tag", "TEXT NOT NULL DEFAULT ''"))
+
+RGB = Tuple[int, int, int]
+
+
+def _validity(tag: Optional[str], now: Optional[float]) -> Tuple[str, list]:
+    """
+    Returns the SQL condition (and parameters) selecting live rows.
+    """
+    clauses, params = ["(expires IS NULL OR expires > ?)"], [time.time() if now is None else now]
+    if tag is not None:
+        clauses.append("tag = ?")
+        params.append(tag)
+    return " AND ".join(clauses), params
+
+
+def _with_expiry(item: Sequence[Any]) -> Tuple[str, Any, Optional[float]]:
+    return (item[0], item[1], item[2] if len(item) > 2 else None)
+
+
+class SQLiteColorStore:
+    """
+    Phrase → RGB / simplified-phrase store backed by one SQLite file.
+    """
+
+    def __init__(self, path: str, timeout: float = SQLITE_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: List[Tuple[sqlite3.Connection, int]] = []
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        # check_same_thread=False only so close() can run from any thread;
+        # each thread still uses its own connection
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        for table in ("rgb", "simplified"):
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for column, declaration in _ADDED_COLUMNS:
+                if column not in existing:
+                    try:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+                    except sqlite3.OperationalError:
+                        pass  # another process migrated it first
+        self._local.conn, self._local.pid = conn, os.getpid()
+        with self._lock:
+            self._connections.append((conn, os.getpid()))
+        return conn
+
+    # ------------------ READS ------------------ #
+
+    def lookup_rgb(
+        self, key: str, tag: Optional[str] = None, now: Optional[float] = None
+    ) -> Optional[Tuple[RGB, Optional[float]]]:
+        """
+        Returns (rgb, expires) for a live row, or None.
+
+        Args:
+            key (str): Normalized phrase.
+            tag (str, optional): Required version tag (None = any).
+            now (float, optional): Current epoch time, for expiry.
+        """
+        condition, params = _validity(tag, now)
+        row = self._conn().execute(
+            f"SELECT r, g, b, expires FROM rgb WHERE key = ? AND {condition}", (key, *params)
+        ).fetchone()
+        return (tuple(row[:3]), row[3]) if row else None
+
+    def lookup_simplified(
+        self, key: str, tag: Optional[str] = None, now: Optional[float] = None
+    ) -> Optional[Tuple[List[str], Optional[float]]]:
+        """
+        Returns (value, expires) for a live row, or None.
+        """
+        condition, params = _validity(tag, now)
+        row = self._conn().execute(
+            f"SELECT value, expires FROM simplified WHERE key = ? AND {condition}", (key, *params)
+        ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def get_rgb(self, key: str, tag: Optional[str] = None, now: Optional[float] = None) -> Optional[RGB]:
+        entry = self.lookup_rgb(key, tag, now)
+        return entry[0] if entry else None
+
+    def get_simplified(self, key: str, tag: Optional[str] = None, now: Optional[float] = None) -> Optional[List[str]]:
+        entry = self.lookup_simplified(key, tag, now)
+        return entry[0] if entry else None
+
+    def iter_rgb(
+        self, tag: Optional[str] = None, now: Optional[float] = None
+    ) -> Iterator[Tuple[str, RGB, Optional[float]]]:
+        condition, params = _validity(tag, now)
+        for key, r, g, b, expires in self._conn().execute(
+            f"SELECT key, r, g, b, expires FROM rgb WHERE {condition} ORDER BY key", params
+        ):
+            yield key, (r, g, b), expires
+
+    def iter_simplified(
+        self, tag: Optional[str] = None, now: Optional[float] = None
+    ) -> Iterator[Tuple[str, List[str]]]:
+        condition, params = _validity(tag, now)
+        for key, value in self._conn().execute(
+            f"SELECT key, value FROM simplified WHERE {condition} ORDER BY key", params
+        ):
+            yield key, json.loads(value)
+
+    def lookup_failure(self, kind: str, key: str, tag: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Returns the negative entry for (kind, key), expired or not, or None.
+        """
+        sql = f"SELECT {', '.join(_FAILURE_COLUMNS)} FROM failures WHERE kind = ? AND key = ?"
+        params: list = [kind, key]
+        if tag is not None:
+            sql += " AND tag = ?"
+            params.append(tag)
+        row = self._conn().execute(sql, params).fetchone()
+        return dict(zip(_FAILURE_COLUMNS, row)) if row else None
+
+    def iter_failures(self, tag: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yields negative entries, most attempted first.
+        """
+        sql = f"SELECT {', '.join(_FAILURE_COLUMNS)} FROM failures"
+        params: list = []
+        if tag is not None:
+            sql += " WHERE tag = ?"
+            params.append(tag)
+        sql += " ORDER BY attempts DESC, last_seen DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for row in self._conn().execute(sql, params):
+            yield dict(zip(_FAILURE_COLUMNS, row))
+
+    def count(self) -> Tuple[int, int]:
+        """
+        Returns (rgb rows, simplified rows), stale ones included.
+        """
+        conn = self._conn()
+        return (
+            conn.execute("SELECT COUNT(*) FROM rgb").fetchone()[0],
+            conn.execute("SELECT COUNT(*) FROM simplified").fetchone()[0],
+        )
+
+    # ------------------ WRITES ------------------ #
+
+    def put_many(
+        self,
+        rgb_items: Iterable[Sequence[Any]] = (),
+        simplified_items: Iterable[Sequence[Any]] = (),
+        tag: str = "",
+        failures: Iterable[Dict[str, Any]] = (),
+        resolved: Iterable[Tuple[str, str]] = ()
+    ) -> None:
+        """
+        Upserts RGB, simplified and negative entries in one transaction.
+
+        Args:
+            rgb_items: (key, rgb) or (key, rgb, expires) tuples.
+            simplified_items: (key, value) or (key, value, expires) tuples.
+            tag (str): Version tag stored with every row.
+            failures: Negative entries (kind, key, reason, attempts,
+                first_seen, last_seen, expires).
+            resolved: (kind, key) pairs whose negative entries are deleted.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO rgb (key, r, g, b, expires, tag) VALUES (?, ?, ?, ?, ?, ?)",
+                ((key, *map(int, rgb), expires, tag) for key, rgb, expires in map(_with_expiry, rgb_items))
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO simplified (key, value, expires, tag) VALUES (?, ?, ?, ?)",
+                ((key, json.dumps(value), expires, tag)
+                 for key, value, expires in map(_with_expiry, simplified_items))
+            )
+            conn.executemany("DELETE FROM failures WHERE kind = ? AND key = ?", resolved)
+            conn.executemany(
+                f"INSERT OR REPLACE INTO failures ({', '.join(_FAILURE_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (tuple({**record, "tag": tag}[column] for column in _FAILURE_COLUMNS) for record in failures)
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def put_rgb(self, key: str, rgb: RGB, expires: Optional[float] = None, tag: str = "") -> None:
+        self.put_many(rgb_items=[(key, rgb, expires)], tag=tag)
+
+    def put_simplified(self, key: str, value: List[str], expires: Optional[float] = None, tag: str = "") -> None:
+        self.put_many(simplified_items=[(key, value, expires)], tag=tag)
+
+    def purge(self, tag: Optional[str] = None, now: Optional[float] = None) -> int:
+        """
+        Deletes expired rows and, with `tag`, rows written under another tag.
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        condition, params = _validity(tag, now)
+        conn = self._conn()
+        deleted = 0
+        for table in ("rgb", "simplified", "failures"):
+            deleted += conn.execute(f"DELETE FROM {table} WHERE NOT ({condition})", params).rowcount
+        return deleted
+
+    def clear(self) -> None:
+        conn = self._conn()
+        conn.execute("DELETE FROM rgb")
+        conn.execute("DELETE FROM simplified")
+        conn.execute("DELETE FROM failures")
+
+    def close(self) -> None:
+        """
+        Closes every connection this process opened (inherited ones are
+        left alone: closing them after fork could disturb the parent).
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn, pid in connections:
+            if pid == os.getpid():
+                conn.close()
+        self._local = threading.local()
@@ -0,0 +1,230 @@
+# Chatbot/cache/warmup.py
+
+"""
+warmup.py
+=========
+
+Cache warm-up: bulk preload of ColorLLMCache from the product catalog, so
+new workers do not start with an empty phrase cache.
+
+- Reads color phrases from catalogs in the Data/ schema: product lists
+  (`[{"color": ...}, ...]`, as Data/products.json), metadata files
+  (`{"colors": [...]}`, as Data/product_metadata.json) and, for large
+  catalogs, JSON lines with one product per line
+- Resolves every phrase offline (exact palette index hits only) on a
+  thread pool and, with `--llm`, sends the rest to the LLM in parallel
+  batches. Fuzzy name matches are guesses ('olivine' → 'olive'),
+  so they are never cached as if authoritative
+- Idempotent and resumable: phrases already cached, or with a live
+  negative entry, are skipped, and results are flushed chunk by chunk,
+  so an interrupted run picks up where it stopped
+- Prints a coverage report
+
+Usage:
+------
+    python -m Chatbot.cache.warmup                           # Data/ catalog, offline only
+    python -m Chatbot.cache.warmup --llm --workers 4 big_catalog.jsonl
+
+Used By:
+--------
+- Deployment (run before starting or scaling out workers)
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from Chatbot.cache.llm_cache import FAILURE_RGB, ColorLLMCache, known_failure
+from Chatbot.extractors.color.llm.llm_api_client import LLM_BATCH_SIZE, query_llm_for_rgb_batch
+from Chatbot.extractors.color.utils.palette_index import lookup_palette_rgb
+from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "Data"
+DEFAULT_CATALOGS = (DATA_DIR / "products.json", DATA_DIR / "product_metadata.json")
+
+WARMUP_WORKERS = 4
+WARMUP_CHUNK = 256
+
+# 'pink / nude', 'rose, coral' → one phrase each
+_COLOR_SEPARATORS = re.compile(r"\s*[,/;|]\s*")
+
+RGB = Tuple[int, int, int]
+
+
+# ------------------ CATALOG ------------------ #
+
+def split_color_field(value) -> List[str]:
+    """
+    Splits a product's color field (string or list) into phrases.
+    """
+    values = value if isinstance(value, list) else [value]
+    phrases = []
+    for item in values:
+        if isinstance(item, str):
+            phrases.extend(part for part in _COLOR_SEPARATORS.split(item) if part.strip())
+    return phrases
+
+
+def iter_catalog_phrases(path) -> Iterator[str]:
+    """
+    Yields the normalized color phrases of one catalog file.
+
+    Args:
+        path: .json (product list or {"colors": [...]}) or .jsonl (one product per line).
+    """
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    for phrase in split_color_field(json.loads(line).get("color")):
+                        yield normalize_token(phrase)
+        return
+
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        for phrase in split_color_field(data.get("colors", [])):
+            yield normalize_token(phrase)
+        data = data.get("products", [])
+    for product in data:
+        if isinstance(product, dict):
+            for phrase in split_color_field(product.get("color")):
+                yield normalize_token(phrase)
+
+
+def collect_phrases(paths: Iterable) -> List[str]:
+    """
+    Returns the distinct color phrases of all catalogs, in first-seen order.
+    """
+    phrases: Dict[str, None] = {}
+    for path in paths:
+        for phrase in iter_catalog_phrases(path):
+            if phrase:
+                phrases[phrase] = None
+    return list(phrases)
+
+
+# ------------------ RESOLUTION ------------------ #
+
+def resolve_offline(phrase: str) -> Optional[RGB]:
+    """
+    Offline resolution: exact XKCD / CSS4 palette hits only. Near misses
+    are left to the LLM (or reported unresolved) rather than cached as a
+    fuzzy guess.
+    """
+    return lookup_palette_rgb(phrase)
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for offset in range(0, len(items), size):
+        yield items[offset:offset + size]
+
+
+def warm_cache(
+    phrases: Iterable[str],
+    cache: Optional[ColorLLMCache] = None,
+    use_llm: bool = False,
+    workers: int = WARMUP_WORKERS,
+    batch_size: int = LLM_BATCH_SIZE,
+    chunk_size: int = WARMUP_CHUNK,
+    transport=None
+) -> Dict[str, object]:
+    """
+    Resolves `phrases` into the cache.
+
+    Args:
+        phrases (Iterable[str]): Color phrases (normalized or not).
+        cache (ColorLLMCache, optional): Defaults to the shared instance.
+        use_llm (bool): Send offline misses to the LLM.
+        workers (int): Threads for offline resolution and concurrent LLM batches.
+        batch_size (int): Phrases per LLM completion.
+        chunk_size (int): Offline phrases per flush.
+        transport (LLMTransport, optional): Defaults to the shared pooled transport.
+
+    Returns:
+        Dict[str, object]: phrases / cached / known_failures / offline / llm
+        counts, unresolved phrases, coverage and elapsed seconds.
+    """
+    cache = cache or ColorLLMCache.get_instance()
+    start = time.perf_counter()
+    phrases = list(dict.fromkeys(normalize_token(phrase) for phrase in phrases))
+    report = {"phrases": len(phrases), "cached": 0, "known_failures": 0, "offline": 0, "llm": 0}
+
+    todo = []
+    for phrase in phrases:
+        if cache.get_rgb(phrase):
+            report["cached"] += 1
+        elif known_failure(cache, FAILURE_RGB, phrase):
+            report["known_failures"] += 1
+        else:
+            todo.append(phrase)
+
+    missed = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cache-warmup") as pool:
+        for chunk in _chunks(todo, chunk_size):
+            for phrase, rgb in zip(chunk, pool.map(resolve_offline, chunk)):
+                if rgb:
+                    cache.store_rgb(phrase, rgb)
+                    report["offline"] += 1
+                else:
+                    missed.append(phrase)
+            cache.flush()
+
+        if use_llm and missed:
+            futures = [
+                pool.submit(query_llm_for_rgb_batch, batch, cache=cache, batch_size=batch_size, transport=transport)
+                for batch in _chunks(missed, batch_size)
+            ]
+            resolved = set()
+            for future in as_completed(futures):
+                resolved.update(phrase for phrase, rgb in future.result().items() if rgb)
+                cache.flush()
+            report["llm"] = len(resolved)
+            missed = [phrase for phrase in missed if phrase not in resolved]
+
+    cache.flush()
+    covered = report["cached"] + report["offline"] + report["llm"]
+    report["unresolved"] = missed
+    report["coverage"] = covered / len(phrases) if phrases else 1.0
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def print_report(report: Dict[str, object], show_unresolved: int = 20) -> None:
+    print(f"[📊 CACHE WARM-UP] {report['phrases']} phrases in {report['seconds']:.2f}s")
+    for key in ("cached", "offline", "llm", "known_failures"):
+        print(f"  {key:<16}{report[key]:>8}")
+    print(f"  {'unresolved':<16}{len(report['unresolved']):>8}")
+    print(f"  {'coverage':<16}{report['coverage']:>8.1%}")
+    for phrase in report["unresolved"][:show_unresolved]:
+        print(f"    - {phrase}")
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, object]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("catalogs", nargs="*", help="catalog files (default: Data/products.json, product_metadata.json)")
+    parser.add_argument("--llm", action="store_true", help="resolve offline misses with the LLM")
+    parser.add_argument("--workers", type=int, default=WARMUP_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=LLM_BATCH_SIZE)
+    parser.add_argument("--show-unresolved", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.llm and not os.getenv("OPENROUTER_API_KEY"):
+        parser.error("--llm needs OPENROUTER_API_KEY")
+
+    cache = ColorLLMCache.get_instance()
+    phrases = collect_phrases(args.catalogs or DEFAULT_CATALOGS)
+    report = warm_cache(phrases, cache, use_llm=args.llm, workers=args.workers, batch_size=args.batch_size)
+    cache.save()  # also refreshes the mmap snapshot when $COLOR_RGB_STORE_PATH is set
+    print_report(report, args.show_unresolved)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,7 @@ from Chatbot.extractors.color.logic.compound_rule import is_blocked_modifier_ton
 from Chatbot.extractors.color.utils.modifier_resolution import resolve_modifier_token, should_suppress_compound, match_suffix_fallback
 from Chatbot.extractors.color.utils.token_utils import split_glued_tokens, singularize
 from Chatbot.extractors.color.utils.token_utils import normalize_token
+from Chatbot.extractors.color.utils.trace import debug_trace
 
 import spacy
 nlp = spacy.load("en_core_web_sm")
@@ -46,6 +47,7 @@ def extract_compound_phrases(
 
     If none of these resolve a valid compound, a fallback fuzzy match is attempted.
     """
+    trace = debug_trace(debug, "compound.extract_compound_phrases")
     # ✅ Normalize hyphenated input before tokenization
     raw_text = raw_text.replace("-", " ") if raw_text else ""
     if raw_text:
@@ -77,8 +79,8 @@ def extract_compound_phrases(
         if mod and f"{mod} {right}" not in compounds:
             compounds.add(f"{mod} {right}")
             raw_compounds.append((mod, right))
-            if debug:
-                print(f"[🩹 FALLBACK PATCH] {left}+{right} → {mod} {right}")
+            if trace:
+                trace.event("[🩹 FALLBACK PATCH] {}+{} → {} {}", left, right, mod, right)
 
     # ⛔ Filter out blocked tone-modifier pairs
     blocked = {
@@ -94,8 +96,8 @@ def extract_compound_phrases(
         if compound in compounds:
             compounds.discard(compound)
         raw_compounds.remove((mod, tone))
-        if debug:
-            print(f"[⛔ BLOCKED PAIR REMOVED] '{compound}'")
+        if trace:
+            trace.event("[⛔ BLOCKED PAIR REMOVED] '{}'", compound)
 
 
 def extract_from_adjacent(
@@ -104,18 +106,19 @@ def extract_from_adjacent(
     raw_compounds,
     known_modifiers,
     known_tones,
-    debug=True
+    debug=False
 ):
     """
     Extracts compound color phrases from adjacent token pairs (e.g., "muted rose").
     Accepts a modifier followed by a tone.
     """
+    trace = debug_trace(debug, "compound.extract_from_adjacent")
     for i in range(len(tokens) - 1):
         raw_mod = tokens[i].text.lower()
         raw_tone = singularize(tokens[i + 1].text.lower())
 
-        if debug:
-            print(f"\n[🔍 ADJACENT PAIR] '{raw_mod}' + '{raw_tone}'")
+        if trace:
+            trace.event("\n[🔍 ADJACENT PAIR] '{}' + '{}'", raw_mod, raw_tone)
 
         mod = resolve_modifier_token(raw_mod, known_modifiers, known_tones, is_tone=False, debug=debug)
         tone = raw_tone if raw_tone in known_tones else None
@@ -123,8 +126,8 @@ def extract_from_adjacent(
         if mod and tone:
             phrase = f"{mod} {tone}"
             if phrase not in compounds:
-                if debug:
-                    print(f"[✅ ADJACENT COMPOUND ADDED] → '{phrase}'")
+                if trace:
+                    trace.event("[✅ ADJACENT COMPOUND ADDED] → '{}'", phrase)
                 compounds.add(phrase)
                 raw_compounds.append(phrase)
 
@@ -150,15 +153,16 @@ def split_tokens_to_parts(
     Returns:
         list[str] | None: A [modifier, tone] split or None if invalid.
     """
-    if debug:
-        print(f"\n[🔍 SPLIT START] Input: '{text}'")
+    trace = debug_trace(debug, "compound.split_tokens_to_parts")
+    if trace:
+        trace.event("\n[🔍 SPLIT START] Input: '{}'", text)
 
     # First check for dash-based splits
     if "-" in text:
         parts = text.split("-", 1)
         if all(part in known_color_tokens for part in parts):
-            if debug:
-                print(f"[✅ DASH SPLIT] '{text}' → {parts}")
+            if trace:
+                trace.event("[✅ DASH SPLIT] '{}' → {}", text, parts)
             return parts
 
     # Try recursive character-level splits
@@ -168,18 +172,18 @@ def split_tokens_to_parts(
         resolved_left = match_suffix_fallback(left, known_color_tokens) or left
         resolved_right = match_suffix_fallback(right, known_color_tokens) or right
 
-        if debug:
-            print(f"[🔍 TRY] '{left}' + '{right}' → resolved: '{resolved_left}', '{resolved_right}'")
+        if trace:
+            trace.event("[🔍 TRY] '{}' + '{}' → resolved: '{}', '{}'", left, right, resolved_left, resolved_right)
 
         if resolved_left in known_color_tokens and resolved_right in known_color_tokens:
             left_norm = normalize_token(left)
             right_norm = normalize_token(right)
-            if debug:
-                print(f"[✅ SPLIT SUCCESS] '{text}' → ['{left_norm}', '{right_norm}']")
+            if trace:
+                trace.event("[✅ SPLIT SUCCESS] '{}' → ['{}', '{}']", text, left_norm, right_norm)
             return [left_norm, right_norm]
 
-    if debug:
-        print(f"[⛔ NO SPLIT FOUND] '{text}'")
+    if trace:
+        trace.event("[⛔ NO SPLIT FOUND] '{}'", text)
     return None
 
 def extract_from_glued(
@@ -190,7 +194,7 @@ def extract_from_glued(
     known_modifiers,
     known_tones,
     all_webcolor_names,
-    debug=True
+    debug=False
 ):
     """
     Extracts compounds from single glued tokens (e.g., 'dustyrose', 'subtlealmond', 'purepearl').
@@ -201,12 +205,13 @@ def extract_from_glued(
     - known_modifier + tone (fallback)
     - modifier + modifier (e.g., 'purepearl')
     """
+    trace = debug_trace(debug, "compound.extract_from_glued")
     for token in tokens:
         raw = token.text.lower()
 
         if not raw.isalpha() or raw in known_color_tokens:
-            if debug:
-                print(f"[⛔ SKIP] Token '{raw}' is known or non-alpha")
+            if trace:
+                trace.event("[⛔ SKIP] Token '{}' is known or non-alpha", raw)
             continue
 
         parts = split_glued_tokens(raw, known_color_tokens, known_modifiers)
@@ -234,8 +239,8 @@ def extract_from_glued(
         # 1. modifier resolved + valid tone
         if mod and is_valid_tone:
             compound = f"{mod} {tone_candidate}"
-            if debug:
-                print(f"[✅ GLUED MOD+TONE] '{raw}' → '{compound}'")
+            if trace:
+                trace.event("[✅ GLUED MOD+TONE] '{}' → '{}'", raw, compound)
             compounds.add(compound)
             raw_compounds.append(compound)
             continue
@@ -243,8 +248,8 @@ def extract_from_glued(
         # 2. known modifier + known tone (fallback)
         elif mod_fallback:
             compound = f"{mod_candidate} {tone_candidate}"
-            if debug:
-                print(f"[✅ GLUED MOD+TONE (fallback)] '{raw}' → '{compound}'")
+            if trace:
+                trace.event("[✅ GLUED MOD+TONE (fallback)] '{}' → '{}'", raw, compound)
             compounds.add(compound)
             raw_compounds.append(compound)
             continue
@@ -252,8 +257,8 @@ def extract_from_glued(
         # 3. tone + tone
         elif tone_pair:
             compound = f"{mod_candidate} {tone_candidate}"
-            if debug:
-                print(f"[✅ GLUED TONE+TONE] '{raw}' → '{compound}'")
+            if trace:
+                trace.event("[✅ GLUED TONE+TONE] '{}' → '{}'", raw, compound)
             compounds.add(compound)
             raw_compounds.append(compound)
             continue
@@ -261,8 +266,8 @@ def extract_from_glued(
         # 4. modifier + modifier
         elif mod_mod_pair:
             compound = f"{mod_candidate} {tone_candidate}"
-            if debug:
-                print(f"[✅ GLUED MOD+MOD] '{raw}' → '{compound}'")
+            if trace:
+                trace.event("[✅ GLUED MOD+MOD] '{}' → '{}'", raw, compound)
             compounds.add(compound)
             raw_compounds.append(compound)
             continue
@@ -282,18 +287,19 @@ def extract_from_split(
     Attempts to recover compound phrases from mis-tokenized or corrupted inputs.
     Works on tokens like 'dustyrose', 'taupeybeige', etc.
     """
+    trace = debug_trace(debug, "compound.extract_from_split")
     for token in tokens:
         text = token.text.lower()
         if text in known_color_tokens or any(text in c.replace(" ", "") for c in compounds):
             continue
 
-        if debug:
-            print(f"\n[🔍 SPLIT CANDIDATE] '{text}'")
+        if trace:
+            trace.event("\n[🔍 SPLIT CANDIDATE] '{}'", text)
 
         parts = split_tokens_to_parts(text, known_color_tokens)
         if not parts or len(parts) != 2:
-            if debug:
-                print(f"[⛔ INVALID SPLIT] {parts}")
+            if trace:
+                trace.event("[⛔ INVALID SPLIT] {}", parts)
             continue
 
         mod_candidate, tone_candidate = parts
@@ -303,8 +309,8 @@ def extract_from_split(
 
         if mod and is_valid_tone:
             compound = f"{mod} {tone_candidate}"
-            if debug:
-                print(f"[✅ SPLIT COMPOUND] '{text}' → '{compound}'")
+            if trace:
+                trace.event("[✅ SPLIT COMPOUND] '{}' → '{}'", text, compound)
             compounds.add(compound)
             raw_compounds.append(compound)
 
@@ -319,9 +325,10 @@ def attempt_mod_tone_pair(
     all_webcolor_names: set,
     debug: bool
 ):
-    if debug:
-        print(f"[🔍 MOD CHECK] mod_candidate='{mod_candidate}'")
-        print(f"[🔍 TONE CHECK] tone_candidate='{tone_candidate}'")
+    trace = debug_trace(debug, "compound.attempt_mod_tone_pair")
+    if trace:
+        trace.event("[🔍 MOD CHECK] mod_candidate='{}'", mod_candidate)
+        trace.event("[🔍 TONE CHECK] tone_candidate='{}'", tone_candidate)
 
     # ─── Try resolving modifier
     mod = resolve_modifier_token(
@@ -338,14 +345,14 @@ def attempt_mod_tone_pair(
         if simplified:
             mod = simplified[0].split()[0]
             if mod not in known_modifiers and mod not in known_tones:
-                if debug:
-                    print(f"⛔ Rejected: simplified modifier '{mod}' not in known sets")
+                if trace:
+                    trace.event("⛔ Rejected: simplified modifier '{}' not in known sets", mod)
                 return
-            if debug:
-                print(f"[✅ SIMPLIFIED MODIFIER] '{mod_candidate}' → '{mod}'")
+            if trace:
+                trace.event("[✅ SIMPLIFIED MODIFIER] '{}' → '{}'", mod_candidate, mod)
         else:
-            if debug:
-                print(f"⛔ Rejected: modifier '{mod_candidate}' is not valid")
+            if trace:
+                trace.event("⛔ Rejected: modifier '{}' is not valid", mod_candidate)
             return
 
     # ─── Try resolving tone
@@ -360,40 +367,40 @@ def attempt_mod_tone_pair(
     if not tone:
         if tone_candidate in known_tones or tone_candidate in all_webcolor_names:
             tone = tone_candidate
-            if debug:
-                print(f"[⚠️ FALLBACK] accepted tone='{tone}' via direct match")
+            if trace:
+                trace.event("[⚠️ FALLBACK] accepted tone='{}' via direct match", tone)
         else:
             # Try fallback simplification for tone
             simplified = simplify_phrase_if_needed(tone_candidate, known_modifiers, known_tones)
-            if debug:
-                print(f"[🧪 RAW SIMPLIFIED] {simplified}")
+            if trace:
+                trace.event("[🧪 RAW SIMPLIFIED] {}", simplified)
             if simplified:
                 tone = simplified[0].split()[-1]
                 if tone not in known_tones and tone not in all_webcolor_names:
-                    if debug:
-                        print(f"⛔ Rejected: simplified tone '{tone}' not valid")
+                    if trace:
+                        trace.event("⛔ Rejected: simplified tone '{}' not valid", tone)
                     return
-                if debug:
-                    print(f"[✅ SIMPLIFIED TONE] '{tone_candidate}' → '{tone}'")
+                if trace:
+                    trace.event("[✅ SIMPLIFIED TONE] '{}' → '{}'", tone_candidate, tone)
             else:
-                if debug:
-                    print(f"⛔ Rejected: '{tone_candidate}' is not a strict tone")
+                if trace:
+                    trace.event("⛔ Rejected: '{}' is not a strict tone", tone_candidate)
                 return
 
     # ─── Filter suffixy fake tones unless they're real
     if (tone.endswith("y") or tone.endswith("ish")) and tone not in known_tones and tone not in all_webcolor_names:
-        if debug:
-            print(f"⛔ Rejected: tone='{tone}' looks suffixy and is not a real tone")
+        if trace:
+            trace.event("⛔ Rejected: tone='{}' looks suffixy and is not a real tone", tone)
         return
 
     # ─── Final suppression rule
     if should_suppress_compound(mod, tone):
-        if debug:
-            print(f"[⛔ SUPPRESSED] {mod} {tone}")
+        if trace:
+            trace.event("[⛔ SUPPRESSED] {} {}", mod, tone)
         return
 
     compound = f"{mod} {tone}"
     compounds.add(compound)
     raw_compounds.append(compound)
-    if debug:
-        print(f"[✅ COMPOUND DETECTED] → '{compound}'")
+    if trace:
+        trace.event("[✅ COMPOUND DETECTED] → '{}'", compound)
@@ -14,6 +14,7 @@ from Chatbot.extractors.color.extraction.compound import extract_compound_phrase
 from Chatbot.extractors.color.extraction.standalone import extract_standalone_phrases, extract_lone_tones
 from Chatbot.extractors.color.llm.simplifier import extract_suffix_fallbacks
 from Chatbot.extractors.color.logic.color_pipeline import process_segment_colors
+from Chatbot.extractors.color.utils.telemetry import span
 
 def extract_all_descriptive_color_phrases(
     text: str,
@@ -33,16 +34,20 @@ def extract_all_descriptive_color_phrases(
     phrases = set()
 
     # Compound
-    extract_compound_phrases(tokens, phrases, [], known_tones | known_modifiers | all_webcolor_names, known_modifiers, known_tones, all_webcolor_names, debug)
+    with span("compound"):
+        extract_compound_phrases(tokens, phrases, [], known_tones | known_modifiers | all_webcolor_names, known_modifiers, known_tones, all_webcolor_names, debug)
 
     # Standalone
-    phrases.update(extract_standalone_phrases(tokens, known_modifiers, known_tones, debug))
+    with span("standalone"):
+        phrases.update(extract_standalone_phrases(tokens, known_modifiers, known_tones, debug))
 
     # Lone tones
-    phrases.update(extract_lone_tones(tokens, known_tones, debug))
+    with span("lone_tones"):
+        phrases.update(extract_lone_tones(tokens, known_tones, debug))
 
     # Suffix fallback
-    phrases.update(extract_suffix_fallbacks(tokens, known_modifiers, known_tones, debug))
+    with span("suffix_fallback"):
+        phrases.update(extract_suffix_fallbacks(tokens, known_modifiers, known_tones, debug))
 
     return list(set(map(str.lower, phrases)))
 
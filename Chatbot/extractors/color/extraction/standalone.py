@@ -9,6 +9,7 @@ including simplified and injected expressions.
 from Chatbot.extractors.color.llm.simplifier import simplify_phrase_if_needed
 from Chatbot.extractors.color.shared.constants import COSMETIC_NOUNS
 from Chatbot.extractors.general.utils.fuzzy_match import normalize_token, match_expression_aliases
+from Chatbot.extractors.color.utils.trace import debug_trace
 
 
 def extract_standalone_phrases(tokens, known_modifiers, known_tones, debug=False):
@@ -23,12 +24,13 @@ def levenshtein_distance(a, b):
     return sum(1 for x, y in zip(a, b) if x != y) + abs(len(a) - len(b))
 
 def is_suffix_variant(word: str, base: str, debug=False) -> bool:
-    if debug:
-        print(f"[🧪 SUFFIX CHECK] word='{word}', base='{base}'")
+    trace = debug_trace(debug, "standalone.is_suffix_variant")
+    if trace:
+        trace.event("[🧪 SUFFIX CHECK] word='{}', base='{}'", word, base)
 
     if word == base:
-        if debug:
-            print(f"[❌ NOT SUFFIX] word == base → no suffix")
+        if trace:
+            trace.event("[❌ NOT SUFFIX] word == base → no suffix")
         return False
 
     allowed_suffixes = {"y", "ish"}
@@ -36,21 +38,23 @@ def is_suffix_variant(word: str, base: str, debug=False) -> bool:
 
     if word.startswith(base):
         suffix = word[len(base):]
-        if debug:
-            print(f"[🧪 SUFFIX EXTRACTED] word starts with base → suffix='{suffix}'")
+        if trace:
+            trace.event("[🧪 SUFFIX EXTRACTED] word starts with base → suffix='{}'", suffix)
         if suffix in allowed_suffixes:
-            print(f"[✅ VALID SUFFIX] '{word}' = '{base}' + '{suffix}'")
+            if trace:
+                trace.event("[✅ VALID SUFFIX] '{}' = '{}' + '{}'", word, base, suffix)
             return True
     elif base.endswith("e") and word.startswith(base[:-1]):
         suffix = word[len(base) - 1:]
-        if debug:
-            print(f"[🧪 ALT-SUFFIX CHECK] Trying base minus 'e' → suffix='{suffix}'")
+        if trace:
+            trace.event("[🧪 ALT-SUFFIX CHECK] Trying base minus 'e' → suffix='{}'", suffix)
         if suffix in allowed_suffixes:
-            print(f"[✅ ALT VALID SUFFIX] '{word}' = '{base[:-1]}' + '{suffix}' (from '{base}')")
+            if trace:
+                trace.event("[✅ ALT VALID SUFFIX] '{}' = '{}' + '{}' (from '{}')", word, base[:-1], suffix, base)
             return True
 
-    if debug:
-        print(f"[❌ NOT A SUFFIX VARIANT] (word='{word}', base='{base}')")
+    if trace:
+        trace.event("[❌ NOT A SUFFIX VARIANT] (word='{}', base='{}')", word, base)
     return False
 
 from Chatbot.extractors.color.utils.config_loader import load_json_from_data_dir
@@ -72,6 +76,7 @@ def normalize_expression_input(text: str) -> str:
 
 from nltk.corpus import wordnet
 def _inject_expression_modifiers(tokens, known_modifiers, known_tones, expression_map, debug=False):
+    trace = debug_trace(debug, "standalone._inject_expression_modifiers")
     def _synonym_candidates(word):
         syns = set()
         for synset in wordnet.synsets(word):
@@ -83,43 +88,43 @@ def _inject_expression_modifiers(tokens, known_modifiers, known_tones, expressio
     token_texts = [t.text for t in tokens]
     raw_text = normalize_expression_input(" ".join(token_texts))
 
-    if debug:
-        print("\n[🧪 TOKENS]")
+    if trace:
+        trace.event("\n[🧪 TOKENS]")
         for idx, t in enumerate(tokens):
-            print(f"  {idx:02d}: '{t.text}' (POS={t.pos_})")
+            trace.event("  {:02d}: '{}' (POS={})", idx, t.text, t.pos_)
 
-        print(f"\n[🧼 RAW TEXT] → '{raw_text}'")
-        print(f"[📚 EXPRESSION MAP SIZE] → {len(expression_map)}")
+        trace.event("\n[🧼 RAW TEXT] → '{}'", raw_text)
+        trace.event("[📚 EXPRESSION MAP SIZE] → {}", len(expression_map))
 
     matched_expressions = set()
 
     # ── Step 1: Forward match by alias or expression
-    if debug:
-        print("\n[🔍 DIRECT SPAN MATCHES]")
+    if trace:
+        trace.event("\n[🔍 DIRECT SPAN MATCHES]")
     for n in range(1, 4):
         for i in range(len(token_texts) - n + 1):
             span = " ".join(token_texts[i:i + n])
             norm_span = normalize_expression_input(span)
             matches = match_expression_aliases(norm_span, expression_map)
 
-            if debug:
-                print(f"  [SPAN] '{span}' → normalized: '{norm_span}'")
+            if trace:
+                trace.event("  [SPAN] '{}' → normalized: '{}'", span, norm_span)
                 if matches:
-                    print(f"    ✅ Matched expressions: {matches}")
+                    trace.event("    ✅ Matched expressions: {}", matches)
                 else:
-                    print("    ❌ No match")
+                    trace.event("    ❌ No match")
 
             if matches:
                 matched_expressions.update(matches)
 
     # ── Step 1B: Synonym fallback if no direct match
     if not matched_expressions:
-        if debug:
-            print("\n[🧠 SYNONYM FALLBACK]")
+        if trace:
+            trace.event("\n[🧠 SYNONYM FALLBACK]")
         for token in tokens:
             synonyms = _synonym_candidates(token.text)
-            if debug:
-                print(f"  [WORD] '{token.text}' → Synonyms: {sorted(synonyms)}")
+            if trace:
+                trace.event("  [WORD] '{}' → Synonyms: {}", token.text, sorted(synonyms))
 
             for syn in synonyms:
                 norm_syn = normalize_expression_input(syn)
@@ -127,13 +132,13 @@ def _inject_expression_modifiers(tokens, known_modifiers, known_tones, expressio
 
                 if matches:
                     matched_expressions.update(matches)
-                    if debug:
-                        print(f"    ✅ Matched via synonym '{syn}' → {matches}")
+                    if trace:
+                        trace.event("    ✅ Matched via synonym '{}' → {}", syn, matches)
 
     # ── Step 2: Reverse modifier match (only if forward+synonym failed)
     if not matched_expressions:
-        if debug:
-            print("\n[🔁 REVERSE MODIFIER INJECTION]")
+        if trace:
+            trace.event("\n[🔁 REVERSE MODIFIER INJECTION]")
         for token in tokens:
             resolved = resolve_modifier_token(
                 token.text,
@@ -144,63 +149,64 @@ def _inject_expression_modifiers(tokens, known_modifiers, known_tones, expressio
             )
 
             if resolved == token.text:
-                if debug:
-                    print(f"  ⛔ Skipping reverse match: '{token.text}' resolved to itself")
+                if trace:
+                    trace.event("  ⛔ Skipping reverse match: '{}' resolved to itself", token.text)
                 continue
 
-            if debug:
-                print(f"  [TOKEN] '{token.text}' → Resolved: '{resolved}'")
+            if trace:
+                trace.event("  [TOKEN] '{}' → Resolved: '{}'", token.text, resolved)
 
             if resolved:
                 for expr, conf in expression_map.items():
                     mod_set = conf.get("modifiers", [])
                     if resolved in mod_set:
                         matched_expressions.add(expr)
-                        if debug:
-                            print(f"    ✅ Modifier '{resolved}' found in expression '{expr}'")
+                        if trace:
+                            trace.event("    ✅ Modifier '{}' found in expression '{}'", resolved, expr)
 
     # ── Step 3: Inject modifiers from matched expressions
     injected_modifiers = set()
-    if debug:
-        print("\n[🧩 MODIFIER INJECTION]")
+    if trace:
+        trace.event("\n[🧩 MODIFIER INJECTION]")
     for expr in matched_expressions:
         mod_candidates = expression_map.get(expr, {}).get("modifiers", [])
-        if debug:
-            print(f"  [EXPR] '{expr}' → Modifiers: {sorted(mod_candidates)}")
+        if trace:
+            trace.event("  [EXPR] '{}' → Modifiers: {}", expr, sorted(mod_candidates))
 
         for mod in mod_candidates:
             if mod in known_modifiers:
                 injected_modifiers.add(mod)
-                if debug:
-                    print(f"    ✅ Injected modifier: '{mod}'")
+                if trace:
+                    trace.event("    ✅ Injected modifier: '{}'", mod)
             else:
-                if debug:
-                    print(f"    ⛔ Skipped unknown modifier: '{mod}'")
+                if trace:
+                    trace.event("    ⛔ Skipped unknown modifier: '{}'", mod)
 
-    if debug:
-        print(f"\n[✅ FINAL INJECTED MODIFIERS] → {sorted(injected_modifiers)}\n")
+    if trace:
+        trace.event("\n[✅ FINAL INJECTED MODIFIERS] → {}\n", sorted(injected_modifiers))
 
     return injected_modifiers
 def _extract_filtered_tokens(tokens, known_modifiers, known_tones, debug):
+    trace = debug_trace(debug, "standalone._extract_filtered_tokens")
     result = set()
 
     for tok in tokens:
         raw = normalize_token(tok.text)
 
-        if debug:
-            print(f"\n[🧪 TOKEN] '{tok.text}' → normalized: '{raw}' (POS={tok.pos_})")
-            print(f"[🔎 CHECK] In COSMETIC_NOUNS? → {raw in COSMETIC_NOUNS}")
+        if trace:
+            trace.event("\n[🧪 TOKEN] '{}' → normalized: '{}' (POS={})", tok.text, raw, tok.pos_)
+            trace.event("[🔎 CHECK] In COSMETIC_NOUNS? → {}", raw in COSMETIC_NOUNS)
 
         # ✅ Block known cosmetic nouns
         if raw in COSMETIC_NOUNS:
-            if debug:
-                print(f"[⛔ SKIPPED] Cosmetic noun '{raw}' blocked")
+            if trace:
+                trace.event("[⛔ SKIPPED] Cosmetic noun '{}' blocked", raw)
             continue
 
         # ✅ Skip connector words (and, or, etc.) via POS tag
         if tok.pos_ == "CCONJ":
-            if debug:
-                print(f"[⛔ SKIPPED] Connector '{raw}' ignored (POS=CCONJ)")
+            if trace:
+                trace.event("[⛔ SKIPPED] Connector '{}' ignored (POS=CCONJ)", raw)
             continue
 
         # ✅ First: try rule-based resolver
@@ -214,52 +220,53 @@ def _extract_filtered_tokens(tokens, known_modifiers, known_tones, debug):
 
                 if resolved_candidate in known_modifiers or resolved_candidate in known_tones:
                     resolved = resolved_candidate
-                    if debug:
-                        print(f"[🔁 SIMPLIFIED FALLBACK] '{raw}' → '{resolved}'")
-
-        if debug:
-            print(f"[🔍 RESOLVED] '{raw}' → '{resolved}'")
-            print(f"[📌 raw ∈ tones?] {raw in known_tones}")
-            print(f"[📌 resolved ∈ tones?] {resolved in known_tones if resolved else '—'}")
-            print(f"[📏 resolved == raw?] {resolved == raw if resolved else '—'}")
-            print(f"[📏 resolved starts with raw?] {resolved.startswith(raw) if resolved else '—'}")
-            print(f"[📐 contains hyphen?] {'-' in resolved if resolved else '—'}")
-            print(f"[🧮 total matches so far] {len(result)}")
+                    if trace:
+                        trace.event("[🔁 SIMPLIFIED FALLBACK] '{}' → '{}'", raw, resolved)
+
+        if trace:
+            trace.event("[🔍 RESOLVED] '{}' → '{}'", raw, resolved)
+            trace.event("[📌 raw ∈ tones?] {}", raw in known_tones)
+            trace.event("[📌 resolved ∈ tones?] {}", resolved in known_tones if resolved else '—')
+            trace.event("[📏 resolved == raw?] {}", resolved == raw if resolved else '—')
+            trace.event("[📏 resolved starts with raw?] {}", resolved.startswith(raw) if resolved else '—')
+            trace.event("[📐 contains hyphen?] {}", '-' in resolved if resolved else '—')
+            trace.event("[🧮 total matches so far] {}", len(result))
 
         # 🔒 Block fuzzy match result if too short to trust
         if len(raw) <= 3 and resolved != raw:
-            if debug:
-                print(f"[⛔ REJECTED] Token '{raw}' too short for safe fuzzy match → '{resolved}'")
+            if trace:
+                trace.event("[⛔ REJECTED] Token '{}' too short for safe fuzzy match → '{}'", raw, resolved)
             continue
 
         # 🔒 Reject fuzzy compound result unless raw is root
         if resolved and "-" in resolved and not resolved.startswith(raw):
-            if debug:
-                print(f"[⛔ REJECTED] Fuzzy '{raw}' → '{resolved}' (compound mismatch)")
+            if trace:
+                trace.event("[⛔ REJECTED] Fuzzy '{}' → '{}' (compound mismatch)", raw, resolved)
             continue
 
         # 🔒 Reject multi-word result from a single token
         if resolved and " " in resolved and " " not in raw:
-            if debug:
-                print(f"[⛔ REJECTED] Fuzzy '{raw}' → '{resolved}' (multi-word result from single token)")
+            if trace:
+                trace.event("[⛔ REJECTED] Fuzzy '{}' → '{}' (multi-word result from single token)", raw, resolved)
             continue
 
         # 🔒 If already have strong matches, skip risky fuzzy ones
         if len(result) >= 3 and resolved != raw:
-            if debug:
-                print(f"[⛔ REJECTED] Skipping fuzzy '{raw}' → '{resolved}' (already 3+ matches)")
+            if trace:
+                trace.event("[⛔ REJECTED] Skipping fuzzy '{}' → '{}' (already 3+ matches)", raw, resolved)
             continue
 
         if resolved:
             result.add(resolved)
-            if debug:
-                print(f"[🎯 STANDALONE MATCH] '{raw}' → '{resolved}'")
+            if trace:
+                trace.event("[🎯 STANDALONE MATCH] '{}' → '{}'", raw, resolved)
 
     return result
 def _finalize_standalone_phrases(injected, filtered, debug):
+    trace = debug_trace(debug, "standalone._finalize_standalone_phrases")
     combined = injected.union(filtered)
-    if debug:
-        print(f"[✅ FINAL STANDALONE SET] {combined}")
+    if trace:
+        trace.event("[✅ FINAL STANDALONE SET] {}", combined)
     return combined
 def extract_lone_tones(tokens, known_tones, debug=False):
     """
@@ -278,15 +285,16 @@ def extract_lone_tones(tokens, known_tones, debug=False):
     Returns:
         Set[str]: Set of matched tone tokens
     """
+    trace = debug_trace(debug, "standalone.extract_lone_tones")
     matches = set()
     for tok in tokens:
         raw = normalize_token(tok.text)
         if raw in COSMETIC_NOUNS:
-            if debug:
-                print(f"[⛔ COSMETIC BLOCK] '{raw}' blocked")
+            if trace:
+                trace.event("[⛔ COSMETIC BLOCK] '{}' blocked", raw)
             continue
         if raw in known_tones:
             matches.add(raw)
-            if debug:
-                print(f"[🎯 LONE TONE] Found '{raw}'")
+            if trace:
+                trace.event("[🎯 LONE TONE] Found '{}'", raw)
     return matches
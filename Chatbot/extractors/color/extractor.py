@@ -10,37 +10,62 @@ with sentiment awareness. This module orchestrates:
 - Resolving RGB values for phrases via LLM and fuzzy matching
 - Simplifying and categorizing extracted colors
 - Resolving conflicts between positive and negative color preferences
+- Processing each unique phrase of a request once (logic/phrase_queue.py)
+- Batch mode (`extract_color_pipeline_many`) for offline jobs over large corpora
+- Async mode (`extract_color_pipeline_async`) for asyncio servers: blocking
+  stages run on an executor and per-phrase lookups run concurrently
 
 This module is central to the shopping assistant's ability
 to understand user color preferences contextually and accurately.
 """
 
+import asyncio
+import contextvars
 import logging
 import json
-from typing import Set, Dict, Tuple, Any, List, Optional
+from concurrent.futures import Executor
+from functools import partial
+from itertools import islice
+from typing import Set, Dict, Tuple, Any, Iterable, Iterator, List, Optional, Union
 
 import webcolors
 
-from Chatbot.extractors.color.old.extract import extract_all_descriptive_color_phrases
-from Chatbot.extractors.color.old.llm import simplify_color_description_with_llm
-from Chatbot.extractors.color.old.extract import categorize_color_tokens_with_mapping
-from Chatbot.extractors.color.old.core import (
-    get_rgb_from_descriptive_color_llm_first,
-    find_similar_color_names
-)
+from Chatbot.extractors.color.extraction.phrase_aggregator import extract_all_descriptive_color_phrases
+from Chatbot.extractors.color.llm.simplifier import simplify_phrase_with_llm
+from Chatbot.extractors.color.logic.color_categorizer import build_tone_modifier_mappings
+from Chatbot.extractors.color.logic.phrase_queue import PhraseWorkQueue
+from Chatbot.extractors.color.logic.prefetch import ColorPrefetcher, get_prefetch_executor, guess_color_phrases
+from Chatbot.extractors.color.logic.tone_signatures import find_tone_conflicts
+from Chatbot.extractors.color.old.core.rgb_utils import get_rgb_from_descriptive_color_llm_first
+from Chatbot.extractors.color.llm.circuit_breaker import llm_available
+from Chatbot.extractors.color.llm.latency_budget import LatencyBudget
+from Chatbot.extractors.color.utils.palette_index import get_palette_rgb_map
+from Chatbot.extractors.color.utils.rgb_distance import find_similar_color_names
+from Chatbot.extractors.color.utils.rgb_grid import RGBNeighborGrid, get_default_rgb_grid
+from Chatbot.extractors.color.utils.telemetry import span, traced
 from Chatbot.extractors.general.old.sentiment import (
     contains_sentiment_splitter_with_segments,
-    classify_segments_by_sentiment_no_neutral
+    classify_segments_by_sentiment_no_neutral,
+    detect_sentiments,
+    split_texts_with_segments
 )
-from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
 
+# Level and handlers are left to the application (e.g. logging.basicConfig)
 logger = logging.getLogger("ColorPipeline")
-logger.setLevel(logging.DEBUG)
-if not logger.hasHandlers():
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(levelname)s] %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+
+# Wall-clock cap on all LLM work for one message (seconds)
+PIPELINE_LATENCY_BUDGET = 8.0
+
+# Texts per chunk in batch mode (parsing, classification and phrase dedup scope)
+PIPELINE_BATCH_SIZE = 32
+
+# Concurrent RGB / simplification lookups per message in async mode
+PHRASE_CONCURRENCY = 8
+
+PhraseResult = Tuple[Set[str], List[str], Optional[Tuple[int, int, int]]]
+
+# (RGB, palette matches, LLM simplification) of a phrase, before its own-text fallbacks
+PhraseLookup = Tuple[Optional[Tuple[int, int, int]], Optional[List[str]], Optional[List[str]]]
 
 
 def initialize_rgb_map() -> Dict[str, Tuple[int, int, int]]:
@@ -50,10 +75,7 @@ def initialize_rgb_map() -> Dict[str, Tuple[int, int, int]]:
     Returns:
         Dict[str, Tuple[int, int, int]]: Mapping of color names to RGB tuples.
     """
-    return {
-        name: webcolors.hex_to_rgb(value)
-        for name, value in {**webcolors.CSS4_COLORS, **webcolors.XKCD_COLORS}.items()
-    }
+    return dict(get_palette_rgb_map())
 
 
 def segment_and_classify_text(text: str) -> Dict[str, List[str]]:
@@ -66,18 +88,49 @@ def segment_and_classify_text(text: str) -> Dict[str, List[str]]:
     Returns:
         Dict[str, List[str]]: Dictionary with keys 'positive' and 'negative' mapping to lists of text segments.
     """
-    has_splitter, segments = contains_sentiment_splitter_with_segments(text)
-    sentiment_segments = classify_segments_by_sentiment_no_neutral(has_splitter, segments)
+    with span("sentiment_split"):
+        has_splitter, segments = contains_sentiment_splitter_with_segments(text)
+    with span("sentiment_classification"):
+        sentiment_segments = classify_segments_by_sentiment_no_neutral(has_splitter, segments)
     sentiment_segments.setdefault("positive", [])
     sentiment_segments.setdefault("negative", [])
     return sentiment_segments
 
 
+def segment_and_classify_texts(texts: List[str], batch_size: int = PIPELINE_BATCH_SIZE) -> List[Dict[str, List[str]]]:
+    """
+    Batched `segment_and_classify_text`: texts are parsed with `nlp.pipe` and
+    all their segments are classified in one sentiment pipeline call.
+
+    Args:
+        texts (List[str]): Raw input strings.
+        batch_size (int): Parser / classifier batch size.
+
+    Returns:
+        List[Dict[str, List[str]]]: One {'positive': [...], 'negative': [...]} per text, in order.
+    """
+    with span("sentiment_split"):
+        splits = list(split_texts_with_segments(texts, batch_size=batch_size))
+    with span("sentiment_classification"):
+        labels = iter(detect_sentiments([segment for _, segments in splits for segment in segments], batch_size))
+
+    results = []
+    for has_splitter, segments in splits:
+        sentiments = [next(labels) for _ in segments]
+        sentiment_segments = classify_segments_by_sentiment_no_neutral(has_splitter, segments, sentiments)
+        sentiment_segments.setdefault("positive", [])
+        sentiment_segments.setdefault("negative", [])
+        results.append(sentiment_segments)
+    return results
+
+
 def extract_color_pipeline(
     text: str,
     known_tones: Set[str],
     known_modifiers: Set[str],
-    rgb_map: Optional[Dict[str, Tuple[int, int, int]]] = None
+    rgb_map: Optional[Dict[str, Tuple[int, int, int]]] = None,
+    budget: Union[None, float, LatencyBudget] = PIPELINE_LATENCY_BUDGET,
+    prefetch: bool = False
 ) -> Dict[str, Dict[str, Any]]:
     """
     Extracts and analyzes color-related information from user input text.
@@ -87,26 +140,74 @@ def extract_color_pipeline(
         known_tones (Set[str]): Recognized base color tones.
         known_modifiers (Set[str]): Recognized color modifiers.
         rgb_map (Optional[Dict[str, Tuple[int, int, int]]]): Predefined color-to-RGB mapping.
+        budget (float | LatencyBudget | None): Latency budget shared by every LLM call
+            of this message; once spent, phrases use local fallbacks only (None = unlimited).
+        prefetch (bool): Pipelined mode — RGB lookups for lexically guessed phrases run
+            concurrently with sentiment classification (see logic/prefetch.py).
 
     Returns:
         Dict[str, Dict[str, Any]]: Output keyed by 'positive' and 'negative' sentiment labels,
                                    each mapping to extraction results.
     """
     logger.info(f"[🎤 INPUT TEXT] → {text}")
+    budget = LatencyBudget.coerce(budget)
 
-    rgb_map = rgb_map or initialize_rgb_map()
-    sentiment_segments = segment_and_classify_text(text)
+    # The shared grid only indexes the default palette
+    grid = None
+    if not rgb_map:
+        rgb_map = get_palette_rgb_map()
+        grid = get_default_rgb_grid()
+
+    prefetcher = None
+    if prefetch:
+        prefetcher = ColorPrefetcher(lambda phrase: resolve_phrase_rgb_safe(phrase, budget))
+        prefetcher.start(guess_color_phrases(text, known_tones, known_modifiers))
 
     output = {}
-    for sentiment in ["positive", "negative"]:
-        output[sentiment] = build_sentiment_output(
-            sentiment=sentiment,
-            segments=sentiment_segments[sentiment],
-            known_tones=known_tones,
-            known_modifiers=known_modifiers,
-            rgb_map=rgb_map
+    try:
+        sentiment_segments = segment_and_classify_text(text)
+        segments = sentiment_segments["positive"] + sentiment_segments["negative"]
+        segment_phrases = extract_segment_phrases(segments, known_tones, known_modifiers)
+
+        # Each unique phrase of the message is processed once, whatever the segment or sentiment
+        queue = queue_segment_phrases(segments, segment_phrases)
+        resolved = queue.run(
+            lambda phrase: lookup_phrase(phrase, rgb_map, known_modifiers, known_tones, grid, budget, prefetcher),
+            finish=_phrase_result
         )
+        logger.debug("[♻️ PHRASE DEDUP] %s", queue.stats())
+
+        for sentiment in ["positive", "negative"]:
+            output[sentiment] = build_sentiment_output(
+                sentiment=sentiment,
+                segments=sentiment_segments[sentiment],
+                known_tones=known_tones,
+                known_modifiers=known_modifiers,
+                rgb_map=rgb_map,
+                grid=grid,
+                budget=budget,
+                prefetcher=prefetcher,
+                resolved=resolved,
+                segment_phrases=segment_phrases
+            )
+    finally:
+        if prefetcher is not None:
+            logger.debug("[🚀 PREFETCH] %s", prefetcher.finish())
+
+    return finalize_output(output, known_tones)
+
+
+def finalize_output(output: Dict[str, Dict[str, Any]], known_tones: Set[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Resolves positive / negative tone conflicts in a pipeline output (in place).
 
+    Args:
+        output (Dict[str, Dict[str, Any]]): 'positive' and 'negative' sentiment outputs.
+        known_tones (Set[str]): Recognized base color tones.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: The same output, conflicts resolved.
+    """
     resolved = resolve_color_conflicts(
         positive=output["positive"]["matched_color_names"],
         negative=output["negative"]["matched_color_names"],
@@ -119,12 +220,201 @@ def extract_color_pipeline(
     if not resolved["positive"]:
         output["positive"]["base_rgb"] = None
 
-    logger.debug("[✅ FINAL OUTPUT STRUCTURE]")
-    logger.debug(json.dumps(output, indent=2))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[✅ FINAL OUTPUT STRUCTURE]")
+        logger.debug(json.dumps(output, indent=2))
 
     return output
 
 
+def extract_color_pipeline_many(
+    texts: Iterable[str],
+    known_tones: Set[str],
+    known_modifiers: Set[str],
+    rgb_map: Optional[Dict[str, Tuple[int, int, int]]] = None,
+    batch_size: int = PIPELINE_BATCH_SIZE,
+    budget: Union[None, float, LatencyBudget] = None
+) -> Iterator[Dict[str, Dict[str, Any]]]:
+    """
+    Batch variant of `extract_color_pipeline` for offline jobs.
+
+    Texts are consumed `batch_size` at a time, so any iterator can be
+    streamed without holding the corpus in memory. Per chunk: one
+    `nlp.pipe` parse, one sentiment classification call, phrase extraction
+    once per distinct segment, and RGB resolution once per distinct
+    phrase (looked up concurrently on the shared prefetch pool).
+
+    Args:
+        texts (Iterable[str]): Raw input strings (list, generator, file, ...).
+        known_tones (Set[str]): Recognized base color tones.
+        known_modifiers (Set[str]): Recognized color modifiers.
+        rgb_map (Optional[Dict[str, Tuple[int, int, int]]]): Predefined color-to-RGB mapping.
+        batch_size (int): Texts per chunk.
+        budget (float | LatencyBudget | None): Latency budget for the LLM calls
+            of each chunk (None = unlimited).
+
+    Yields:
+        Dict[str, Dict[str, Any]]: One `extract_color_pipeline` output per text, in input order.
+    """
+    grid = None
+    if not rgb_map:
+        rgb_map = get_palette_rgb_map()
+        grid = get_default_rgb_grid()
+
+    texts = iter(texts)
+    while True:
+        chunk = list(islice(texts, batch_size))
+        if not chunk:
+            return
+        chunk_budget = LatencyBudget.coerce(budget)
+        classified = segment_and_classify_texts(chunk, batch_size)
+
+        segments = [
+            segment for sentiment_segments in classified
+            for segment in sentiment_segments["positive"] + sentiment_segments["negative"]
+        ]
+        segment_phrases = extract_segment_phrases(segments, known_tones, known_modifiers)
+
+        queue = queue_segment_phrases(segments, segment_phrases)
+        resolved: Dict[str, PhraseResult] = queue.run(
+            lambda phrase: lookup_phrase(phrase, rgb_map, known_modifiers, known_tones, grid, chunk_budget),
+            executor=get_prefetch_executor(),
+            finish=_phrase_result
+        )
+        logger.debug("[📦 BATCH] %d texts → %s", len(chunk), queue.stats())
+
+        for sentiment_segments in classified:
+            output = {
+                sentiment: build_sentiment_output(
+                    sentiment=sentiment,
+                    segments=sentiment_segments[sentiment],
+                    known_tones=known_tones,
+                    known_modifiers=known_modifiers,
+                    rgb_map=rgb_map,
+                    grid=grid,
+                    budget=chunk_budget,
+                    resolved=resolved,
+                    segment_phrases=segment_phrases
+                )
+                for sentiment in ["positive", "negative"]
+            }
+            yield finalize_output(output, known_tones)
+
+
+async def extract_color_pipeline_async(
+    text: str,
+    known_tones: Set[str],
+    known_modifiers: Set[str],
+    rgb_map: Optional[Dict[str, Tuple[int, int, int]]] = None,
+    budget: Union[None, float, LatencyBudget] = PIPELINE_LATENCY_BUDGET,
+    concurrency: int = PHRASE_CONCURRENCY,
+    executor: Optional[Executor] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Async variant of `extract_color_pipeline`, with the same output.
+
+    Parsing, classification, phrase extraction and output assembly run on
+    `executor`, so the event loop is never blocked. The RGB and
+    simplification lookups of every distinct phrase of the message run
+    concurrently, at most `concurrency` at a time.
+
+    Args:
+        text (str): Raw user input string.
+        known_tones (Set[str]): Recognized base color tones.
+        known_modifiers (Set[str]): Recognized color modifiers.
+        rgb_map (Optional[Dict[str, Tuple[int, int, int]]]): Predefined color-to-RGB mapping.
+        budget (float | LatencyBudget | None): Latency budget shared by every LLM call
+            of this message (None = unlimited).
+        concurrency (int): Maximum concurrent lookups for this message.
+        executor (Optional[Executor]): Executor for blocking stages (default: the loop's).
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Output keyed by 'positive' and 'negative' sentiment labels.
+    """
+    logger.info(f"[🎤 INPUT TEXT] → {text}")
+    budget = LatencyBudget.coerce(budget)
+
+    grid = None
+    if not rgb_map:
+        rgb_map = get_palette_rgb_map()
+        grid = get_default_rgb_grid()
+
+    sentiment_segments = await _run_in_executor(executor, segment_and_classify_text, text)
+    segments = sentiment_segments["positive"] + sentiment_segments["negative"]
+    segment_phrases = await _run_in_executor(
+        executor, extract_segment_phrases, segments, known_tones, known_modifiers
+    )
+
+    queue = queue_segment_phrases(segments, segment_phrases)
+    unique_phrases = queue.unique_phrases()
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(*(
+        lookup_phrase_async(phrase, rgb_map, known_modifiers, known_tones, grid, budget, semaphore, executor)
+        for phrase in unique_phrases
+    ))
+    resolved = queue.fan_out(dict(zip(unique_phrases, results)), finish=_phrase_result)
+    logger.debug("[♻️ PHRASE DEDUP] %s", queue.stats())
+
+    def assemble() -> Dict[str, Dict[str, Any]]:
+        output = {
+            sentiment: build_sentiment_output(
+                sentiment=sentiment,
+                segments=sentiment_segments[sentiment],
+                known_tones=known_tones,
+                known_modifiers=known_modifiers,
+                rgb_map=rgb_map,
+                grid=grid,
+                budget=budget,
+                resolved=resolved,
+                segment_phrases=segment_phrases
+            )
+            for sentiment in ["positive", "negative"]
+        }
+        return finalize_output(output, known_tones)
+
+    return await _run_in_executor(executor, assemble)
+
+
+def _run_in_executor(executor: Optional[Executor], func, *args) -> "asyncio.Future":
+    """
+    `loop.run_in_executor` in a copy of the caller's context, so a trace
+    captured around an async call also sees the work done on the executor.
+    """
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(executor, contextvars.copy_context().run, partial(func, *args))
+
+
+def extract_segment_phrases(
+    segments: Iterable[str],
+    known_tones: Set[str],
+    known_modifiers: Set[str]
+) -> Dict[str, List[str]]:
+    """
+    Extracts the color phrases of each distinct segment once.
+
+    Returns:
+        Dict[str, List[str]]: Phrases keyed by segment, in first-seen order.
+    """
+    segment_phrases: Dict[str, List[str]] = {}
+    for segment in segments:
+        if segment not in segment_phrases:
+            segment_phrases[segment] = extract_phrases_from_segment_safe(segment, known_tones, known_modifiers)
+    return segment_phrases
+
+
+def queue_segment_phrases(
+    segments: Iterable[str],
+    segment_phrases: Dict[str, List[str]]
+) -> PhraseWorkQueue:
+    """
+    Queues the phrases of every segment occurrence (see logic/phrase_queue.py).
+    """
+    queue = PhraseWorkQueue()
+    for segment in segments:
+        queue.add(segment_phrases.get(segment, []))
+    return queue
+
+
 def extract_phrases_from_segment_safe(
     segment: str,
     known_tones: Set[str],
@@ -153,18 +443,22 @@ def extract_phrases_from_segment_safe(
         return []
 
 
-def resolve_phrase_rgb_safe(phrase: str) -> Optional[Tuple[int, int, int]]:
+def resolve_phrase_rgb_safe(
+    phrase: str,
+    budget: Optional[LatencyBudget] = None
+) -> Optional[Tuple[int, int, int]]:
     """
     Resolves RGB for a phrase using LLM, with error logging.
 
     Args:
         phrase (str): Color phrase.
+        budget (Optional[LatencyBudget]): Shared latency budget for the LLM calls.
 
     Returns:
         Optional[Tuple[int, int, int]]: RGB tuple or None.
     """
     try:
-        return get_rgb_from_descriptive_color_llm_first(phrase)
+        return get_rgb_from_descriptive_color_llm_first(phrase, budget=budget)
     except Exception as e:
         logger.warning(f"[⚠️ RGB ERROR] '{phrase}' → {e}")
         return None
@@ -174,8 +468,11 @@ def process_phrase(
     phrase: str,
     rgb_map: Dict[str, Tuple[int, int, int]],
     known_modifiers: Set[str],
-    known_tones: Set[str]
-) -> Tuple[Set[str], List[str], Optional[Tuple[int, int, int]]]:
+    known_tones: Set[str],
+    grid: Optional[RGBNeighborGrid] = None,
+    budget: Optional[LatencyBudget] = None,
+    prefetcher: Optional[ColorPrefetcher] = None
+) -> PhraseResult:
     """
     Processes a single color phrase: resolves RGB, finds similar colors, and simplifies it.
 
@@ -184,6 +481,9 @@ def process_phrase(
         rgb_map (Dict[str, Tuple[int, int, int]]): Color to RGB mapping.
         known_modifiers (Set[str]): Known modifiers.
         known_tones (Set[str]): Known tones.
+        grid (Optional[RGBNeighborGrid]): Neighbor grid built over `rgb_map`.
+        budget (Optional[LatencyBudget]): Shared latency budget for the LLM calls.
+        prefetcher (Optional[ColorPrefetcher]): Speculative lookups started for this message.
 
     Returns:
         Tuple containing:
@@ -191,26 +491,103 @@ def process_phrase(
             - simplified phrases (List[str])
             - RGB tuple or None
     """
-    matched_names = set()
-    simplified_phrases = []
+    found = lookup_phrase(phrase, rgb_map, known_modifiers, known_tones, grid, budget, prefetcher)
+    return _phrase_result(phrase, found)
 
-    rgb = resolve_phrase_rgb_safe(phrase)
-    if rgb:
-        matches = find_similar_color_names(rgb, rgb_map)
-        if matches:
-            matched_names.update(matches)
-        else:
-            matched_names.add(phrase)
 
-        simplified = simplify_color_description_with_llm(phrase)
-        if simplified:
-            simplified_phrases.extend(simplified)
-        else:
-            simplified_phrases.append(phrase)
+def lookup_phrase(
+    phrase: str,
+    rgb_map: Dict[str, Tuple[int, int, int]],
+    known_modifiers: Set[str],
+    known_tones: Set[str],
+    grid: Optional[RGBNeighborGrid] = None,
+    budget: Optional[LatencyBudget] = None,
+    prefetcher: Optional[ColorPrefetcher] = None
+) -> PhraseLookup:
+    """
+    The lookups of `process_phrase` (RGB, similar palette names, simplification),
+    without the phrase-text fallbacks, so one lookup can serve every spelling
+    of a normalized phrase.
+
+    Returns:
+        PhraseLookup: (RGB or None, matches or None, simplified phrases or None).
+    """
+    if prefetcher is not None:
+        rgb = prefetcher.resolve(phrase)
+    else:
+        rgb = resolve_phrase_rgb_safe(phrase, budget)
+    if not rgb:
+        return None, None, None
+
+    with span("palette_match"):
+        matches = find_similar_color_names(rgb, rgb_map, grid=grid)
+    simplified = simplify_phrase_with_llm(phrase, budget) if llm_available(budget) else None
+    return rgb, matches, simplified
+
+
+async def process_phrase_async(
+    phrase: str,
+    rgb_map: Dict[str, Tuple[int, int, int]],
+    known_modifiers: Set[str],
+    known_tones: Set[str],
+    grid: Optional[RGBNeighborGrid] = None,
+    budget: Optional[LatencyBudget] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    executor: Optional[Executor] = None
+) -> PhraseResult:
+    """
+    Async `process_phrase`: the blocking RGB and simplification lookups run on
+    `executor`, each holding a slot of `semaphore` (the message's concurrency cap).
+
+    Returns:
+        PhraseResult: Same as `process_phrase`.
+    """
+    found = await lookup_phrase_async(
+        phrase, rgb_map, known_modifiers, known_tones, grid, budget, semaphore, executor
+    )
+    return _phrase_result(phrase, found)
 
-        return matched_names, simplified_phrases, rgb
 
-    return set(), [], None
+async def lookup_phrase_async(
+    phrase: str,
+    rgb_map: Dict[str, Tuple[int, int, int]],
+    known_modifiers: Set[str],
+    known_tones: Set[str],
+    grid: Optional[RGBNeighborGrid] = None,
+    budget: Optional[LatencyBudget] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    executor: Optional[Executor] = None
+) -> PhraseLookup:
+    """
+    Async `lookup_phrase` (see `process_phrase_async`).
+    """
+    semaphore = semaphore or asyncio.Semaphore(PHRASE_CONCURRENCY)
+
+    async with semaphore:
+        rgb = await _run_in_executor(executor, resolve_phrase_rgb_safe, phrase, budget)
+    if not rgb:
+        return None, None, None
+
+    with span("palette_match"):
+        matches = find_similar_color_names(rgb, rgb_map, grid=grid)
+    simplified = None
+    if llm_available(budget):
+        async with semaphore:
+            simplified = await _run_in_executor(executor, simplify_phrase_with_llm, phrase, budget)
+    return rgb, matches, simplified
+
+
+def _phrase_result(phrase: str, found: PhraseLookup) -> PhraseResult:
+    """
+    Builds a phrase's result from a (possibly shared) lookup; the fallbacks
+    use this spelling of the phrase.
+    """
+    rgb, matches, simplified = found
+    if not rgb:
+        return set(), [], None
+    matched_names = set(matches) if matches else {phrase}
+    simplified_phrases = list(simplified) if simplified else [phrase]
+    return matched_names, simplified_phrases, rgb
 
 
 def build_sentiment_output(
@@ -218,7 +595,12 @@ def build_sentiment_output(
     segments: List[str],
     known_tones: Set[str],
     known_modifiers: Set[str],
-    rgb_map: Dict[str, Tuple[int, int, int]]
+    rgb_map: Dict[str, Tuple[int, int, int]],
+    grid: Optional[RGBNeighborGrid] = None,
+    budget: Optional[LatencyBudget] = None,
+    prefetcher: Optional[ColorPrefetcher] = None,
+    resolved: Optional[Dict[str, PhraseResult]] = None,
+    segment_phrases: Optional[Dict[str, List[str]]] = None
 ) -> Dict[str, Any]:
     """
     Processes all text segments for a single sentiment category.
@@ -231,6 +613,12 @@ def build_sentiment_output(
         known_tones (Set[str]): Recognized base color tones.
         known_modifiers (Set[str]): Recognized color modifiers.
         rgb_map (Dict[str, Tuple[int, int, int]]): Color name to RGB mapping.
+        grid (Optional[RGBNeighborGrid]): Neighbor grid built over `rgb_map`.
+        budget (Optional[LatencyBudget]): Shared latency budget for the LLM calls.
+        prefetcher (Optional[ColorPrefetcher]): Speculative lookups started for this message.
+        resolved (Optional[Dict[str, PhraseResult]]): `process_phrase` results already
+            computed for a batch, keyed by phrase.
+        segment_phrases (Optional[Dict[str, List[str]]]): Phrases already extracted, keyed by segment.
 
     Returns:
         Dict[str, Any]: Contains:
@@ -243,11 +631,19 @@ def build_sentiment_output(
     phrase_rgb_map = {}
 
     for segment in segments:
-        phrases = extract_phrases_from_segment_safe(segment, known_tones, known_modifiers)
+        if segment_phrases is not None and segment in segment_phrases:
+            phrases = segment_phrases[segment]
+        else:
+            phrases = extract_phrases_from_segment_safe(segment, known_tones, known_modifiers)
         seen_phrases = set(phrases)
 
         for phrase in phrases:
-            matched_names, simplified, rgb = process_phrase(phrase, rgb_map, known_modifiers, known_tones)
+            if resolved is not None and phrase in resolved:
+                matched_names, simplified, rgb = resolved[phrase]
+            else:
+                matched_names, simplified, rgb = process_phrase(
+                    phrase, rgb_map, known_modifiers, known_tones, grid, budget, prefetcher
+                )
             all_color_names.update(matched_names)
             simplified_phrases.extend(simplified)
             if rgb:
@@ -258,7 +654,7 @@ def build_sentiment_output(
     rep_rgb = next(iter(phrase_rgb_map.values()), None)
 
     # Categorize simplified phrases for downstream processing
-    _ = categorize_color_tokens_with_mapping(simplified_phrases, known_modifiers, known_tones)
+    _ = build_tone_modifier_mappings(simplified_phrases, known_tones, known_modifiers)
 
     return {
         "matched_color_names": sorted(all_color_names),
@@ -267,6 +663,7 @@ def build_sentiment_output(
     }
 
 
+@traced("conflict_resolution")
 def resolve_color_conflicts(
     positive: List[str],
     negative: List[str],
@@ -287,19 +684,9 @@ def resolve_color_conflicts(
         Dict[str, List[str]]: Cleaned positive and negative color lists with conflicts resolved.
     """
 
-    def extract_tones(color_name: str) -> Set[str]:
-        return {normalize_token(t) for t in color_name.split()} & known_tones
-
     positive_set = set(positive)
     negative_set = set(negative)
-    conflict_colors = positive_set.intersection(negative_set)
-
-    for neg_color in negative_set:
-        neg_tones = extract_tones(neg_color)
-        for pos_color in positive_set:
-            pos_tones = extract_tones(pos_color)
-            if neg_tones & pos_tones:
-                conflict_colors.add(pos_color)
+    conflict_colors = find_tone_conflicts(positive_set, negative_set, known_tones)
 
     cleaned_positive = sorted(positive_set - conflict_colors)
     cleaned_negative = sorted(negative_set | conflict_colors)
@@ -0,0 +1,200 @@
+# Chatbot/extractors/color/llm/circuit_breaker.py
+
+"""
+circuit_breaker.py
+==================
+
+Circuit breaker for the LLM endpoint.
+
+- closed: requests flow; `failure_threshold` consecutive failures trip it
+- open: requests are rejected immediately so callers go straight to the
+  local palette / fuzzy fallbacks; after `reset_timeout` seconds it turns
+- half_open: up to `half_open_probes` requests are let through as probes;
+  a success closes the circuit, a failure re-opens it
+
+A failure is a call that exhausted its retries (timeouts, transport
+errors, 429/5xx). Non-retryable 4xx replies prove the endpoint is up and
+count as successes.
+
+Used By:
+--------
+- llm_transport.LLMTransport / AsyncLLMTransport (shared 'openrouter' breaker)
+- llm_rgb / extractor (`llm_available`: skip LLM simplification while open)
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict
+
+from Chatbot.extractors.color.llm.rate_limiter import get_default_limiter
+
+LLM_BREAKER_NAME = "openrouter"
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30.0
+BREAKER_HALF_OPEN_PROBES = 1
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Thread-safe closed / open / half-open breaker with monitoring counters.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        half_open_probes: int = BREAKER_HALF_OPEN_PROBES,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Closes the circuit and clears every counter.
+        """
+        with self._lock:
+            self._state = CLOSED
+            self._opened_at = 0.0
+            self._consecutive_failures = 0
+            self._probes_in_flight = 0
+            self._counts = dict.fromkeys(("trips", "successes", "failures", "rejected", "probes"), 0)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def is_open(self) -> bool:
+        """
+        True while calls would be rejected (does not take a probe slot).
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == HALF_OPEN:
+                return self._probes_in_flight >= self.half_open_probes
+            return self._state == OPEN
+
+    def allow(self) -> bool:
+        """
+        Asks to make one call. Every allowed call must be followed by
+        `record_success`, `record_failure` or `release`.
+
+        Returns:
+            bool: False if the call must be skipped.
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                self._counts["probes"] += 1
+                return True
+            self._counts["rejected"] += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._counts["successes"] += 1
+            self._consecutive_failures = 0
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._probes_in_flight = 0
+                logger.info(f"[🔌 CIRCUIT CLOSED] '{self.name}' recovered")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._counts["failures"] += 1
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._trip()
+
+    def release(self) -> None:
+        """
+        Returns an allowed call's probe slot without an outcome (e.g., the
+        caller's budget ran out before any request was sent).
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes_in_flight:
+                self._probes_in_flight -= 1
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Returns the state plus trip / success / failure / rejected / probe counts.
+        """
+        with self._lock:
+            self._refresh()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                **self._counts,
+            }
+
+    def _refresh(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+
+    def _trip(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probes_in_flight = 0
+        self._counts["trips"] += 1
+        logger.warning(
+            f"[🔌 CIRCUIT OPEN] '{self.name}' after {self._consecutive_failures} consecutive failures; "
+            f"retrying in {self.reset_timeout:.0f}s"
+        )
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str = LLM_BREAKER_NAME, **kwargs) -> CircuitBreaker:
+    """
+    Returns the process-wide breaker for `name`; `kwargs` only apply on creation.
+    """
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **kwargs)
+        return _breakers[name]
+
+
+def circuit_breaker_stats() -> Dict[str, Dict[str, object]]:
+    """
+    Returns the stats of every breaker, keyed by name.
+    """
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
+
+
+def llm_available(budget=None) -> bool:
+    """
+    Returns False while the shared LLM circuit is open, `budget` (a
+    LatencyBudget) is spent or the daily token budget is used up;
+    callers then use local fallbacks only.
+    """
+    if budget is not None and budget.expired():
+        return False
+    limiter = get_default_limiter()
+    if limiter is not None and limiter.budget_exhausted():
+        return False
+    return not get_circuit_breaker().is_open()
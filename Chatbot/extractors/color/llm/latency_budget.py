@@ -0,0 +1,67 @@
+# Chatbot/extractors/color/llm/latency_budget.py
+
+"""
+latency_budget.py
+=================
+
+Wall-clock budget shared by every LLM call made for one request.
+
+A `LatencyBudget` is created once (e.g., by `extract_color_pipeline`) and
+passed down by reference as the `deadline` of each LLM call, so all
+phrases, retries and backoff sleeps of a message draw on the same
+absolute deadline instead of each getting a fresh timeout.
+
+Used By:
+--------
+- llm_transport.LLMTransport / AsyncLLMTransport (per-call deadline)
+- llm_rgb.get_rgb_from_descriptive_color_llm_first
+- extractor.extract_color_pipeline
+"""
+
+import time
+from typing import Callable, Optional, Union
+
+
+class LatencyBudget:
+    """
+    Absolute deadline; `seconds=None` means unlimited.
+    """
+
+    def __init__(self, seconds: Optional[float], clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._at = clock() + seconds if seconds is not None else None
+
+    @classmethod
+    def coerce(cls, budget: Union[None, float, "LatencyBudget"]) -> "LatencyBudget":
+        """
+        Returns `budget` itself if it already is a LatencyBudget, otherwise a
+        new budget of `budget` seconds (None → unlimited).
+        """
+        return budget if isinstance(budget, LatencyBudget) else cls(budget)
+
+    def remaining(self) -> Optional[float]:
+        """
+        Returns the seconds left (negative once spent), or None if unlimited.
+        """
+        return None if self._at is None else self._at - self._clock()
+
+    def clamp(self, seconds: float) -> float:
+        """
+        Returns `seconds` capped to what is left of the budget (never negative).
+        """
+        remaining = self.remaining()
+        return seconds if remaining is None else max(0.0, min(seconds, remaining))
+
+    def timeout(self, seconds: float) -> float:
+        """
+        Like `clamp`, floored at 1 ms so it is always a usable socket timeout.
+        """
+        return max(self.clamp(seconds), 1e-3)
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def __repr__(self) -> str:
+        remaining = self.remaining()
+        return "LatencyBudget(unlimited)" if remaining is None else f"LatencyBudget({remaining:.3f}s left)"
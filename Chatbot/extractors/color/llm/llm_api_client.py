@@ -4,6 +4,7 @@ llm_api_client.py
 
 Handles LLM requests for converting descriptive color phrases to RGB.
 Uses OpenRouter API with configurable prompt and retry-safe logic.
+HTTP goes through the pooled transports of llm_transport.py.
 """
 
 import os
@@ -11,15 +12,32 @@ import re
 import json
 import time
 import logging
-import requests
-from typing import Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from Chatbot.cache.llm_cache import FAILURE_RGB, known_failure, record_failure
+from Chatbot.extractors.color.llm.latency_budget import LatencyBudget
+from Chatbot.extractors.color.llm.llm_metrics import LLMCallMetrics
+from Chatbot.extractors.color.llm.llm_transport import (
+    LLM_API_URL,
+    AsyncLLMTransport,
+    Deadline,
+    LLMTransport,
+    extract_reply,
+    get_default_transport,
+)
+from Chatbot.extractors.color.llm.single_flight import get_single_flight
+from Chatbot.extractors.color.utils.telemetry import span
+from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
 
 # ------------------ LLM CONFIG ------------------ #
 
-LLM_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 LLM_MODEL = "mistralai/mistral-7b-instruct"
 LLM_MAX_TOKENS = 100
 LLM_TEMPERATURE = 0.4
+LLM_BATCH_SIZE = 8
+LLM_BATCH_TOKENS_PER_PHRASE = 24
+
+RGB_FLIGHT = get_single_flight("llm_rgb")
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +66,30 @@ def build_llm_request_payload(color_phrase: str) -> dict:
     }
 
 
+def build_batch_color_prompt(color_phrases: List[str]) -> str:
+    numbered = "\n".join(f"{i}. '{phrase}'" for i, phrase in enumerate(color_phrases, start=1))
+    return (
+        "What is the RGB color code for each descriptive color phrase below?\n"
+        "Respond ONLY with JSON lines, one line per phrase, in the same order, "
+        'each exactly like {"i": <number>, "rgb": [R, G, B]}, without any explanation.\n'
+        "Examples:\n"
+        "- 1. 'warm beige' → {\"i\": 1, \"rgb\": [245, 222, 179]}\n"
+        "- 2. 'deep lavender' → {\"i\": 2, \"rgb\": [150, 123, 182]}\n"
+        f"Phrases:\n{numbered}"
+    )
+
+
+def build_batch_request_payload(color_phrases: List[str]) -> dict:
+    return {
+        "model": LLM_MODEL,
+        "max_tokens": 20 + LLM_BATCH_TOKENS_PER_PHRASE * len(color_phrases),
+        "temperature": LLM_TEMPERATURE,
+        "messages": [
+            {"role": "user", "content": build_batch_color_prompt(color_phrases)}
+        ]
+    }
+
+
 def build_llm_headers(api_key: str) -> dict:
     return {
         "Authorization": f"Bearer {api_key}",
@@ -57,8 +99,11 @@ def build_llm_headers(api_key: str) -> dict:
 
 # ------------------ RGB PARSER ------------------ #
 
+_RGB_TUPLE = re.compile(r"\((\d{1,3}),\s*(\d{1,3}),\s*(\d{1,3})\)")
+
+
 def _parse_rgb_tuple(response: str, debug=False) -> Optional[Tuple[int, int, int]]:
-    match = re.search(r"\((\d{1,3}),\s*(\d{1,3}),\s*(\d{1,3})\)", response)
+    match = _RGB_TUPLE.search(response)
     if not match:
         if debug:
             logger.warning(f"[❌ PARSE FAIL] Could not extract RGB from response: {response}")
@@ -73,63 +118,324 @@ def _parse_rgb_tuple(response: str, debug=False) -> Optional[Tuple[int, int, int
     return None
 
 
+def _rgb_failure_reason(response: Optional[str]) -> str:
+    """
+    Classifies a reply `_parse_rgb_tuple` rejected, for negative caching.
+    """
+    if not response or not response.strip():
+        return "empty_reply"
+    return "out_of_range" if _RGB_TUPLE.search(response) else "unparsable"
+
+
+_BATCH_OBJECT = re.compile(r"\{[^{}]*\}")
+_BATCH_FIELDS = re.compile(
+    r'"?i"?\s*:\s*(\d+)[^\[]*\[\s*(\d{1,3})\s*,\s*(\d{1,3})\s*,\s*(\d{1,3})\s*\]'
+)
+
+
+def _valid_rgb(values) -> Optional[Tuple[int, int, int]]:
+    try:
+        r, g, b = (int(v) for v in values)
+    except (TypeError, ValueError):
+        return None
+    return (r, g, b) if all(0 <= val <= 255 for val in (r, g, b)) else None
+
+
+def _parse_batch_reply(response: str, count: int, debug=False) -> Dict[int, Tuple[int, int, int]]:
+    """
+    Parses a JSON-lines batch reply into {zero-based phrase index: RGB}.
+
+    Tolerates code fences, bullets, a single JSON array, missing "i"
+    (falls back to line order) and slightly malformed JSON. Items that
+    cannot be parsed, are out of range or out of bounds are left out.
+    """
+    objects = []
+    stripped = response.strip().strip("`").strip()
+    if stripped.startswith("json"):
+        stripped = stripped[4:]
+    try:
+        parsed = json.loads(stripped)
+        if isinstance(parsed, list):
+            objects = [item for item in parsed if isinstance(item, dict)]
+    except ValueError:
+        pass
+
+    if not objects:
+        for raw in _BATCH_OBJECT.findall(response):
+            try:
+                item = json.loads(raw)
+            except ValueError:
+                match = _BATCH_FIELDS.search(raw)
+                item = {"i": int(match.group(1)), "rgb": match.groups()[1:]} if match else None
+            if isinstance(item, dict):
+                objects.append(item)
+
+    results: Dict[int, Tuple[int, int, int]] = {}
+    for position, item in enumerate(objects):
+        try:
+            index = int(item.get("i", position + 1)) - 1
+        except (TypeError, ValueError):
+            continue
+        rgb = _valid_rgb(item.get("rgb", ()))
+        if rgb and 0 <= index < count and index not in results:
+            results[index] = rgb
+
+    if debug and len(results) < count:
+        logger.warning(f"[❌ BATCH PARSE] {count - len(results)}/{count} items unparsed: {response}")
+    return results
+
+
 # ------------------ MAIN REQUEST FUNCTION ------------------ #
 
+def _prepare_rgb_request(color_phrase: str, cache=None, debug: bool = False):
+    """
+    Shared pre-flight for the sync/async queries.
+
+    Returns:
+        Tuple: (cached_rgb, payload, headers); payload is None when no request is needed.
+    """
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    if not api_key:
+        logger.error("[⛔ NO API KEY] OPENROUTER_API_KEY not found in environment.")
+        return None, None, None
+
+    if cache:
+        cached = cache.get_rgb(color_phrase)
+        if cached:
+            if debug:
+                logger.info(f"[🗃️ CACHE HIT] '{color_phrase}' → {cached}")
+            return cached, None, None
+
+        failure = known_failure(cache, FAILURE_RGB, color_phrase)
+        if failure:
+            if debug:
+                logger.info(f"[🚫 NEGATIVE HIT] '{color_phrase}' → {failure['reason']} "
+                            f"({failure['attempts']} attempts)")
+            return None, None, None
+
+    return None, build_llm_request_payload(color_phrase), build_llm_headers(api_key)
+
+
+def _finish_rgb_request(color_phrase: str, reply: Optional[str], cache=None, debug: bool = False):
+    rgb = _parse_rgb_tuple(reply, debug=debug) if reply is not None else None
+
+    if rgb and cache:
+        cache.store_rgb(color_phrase, rgb)
+    elif reply is not None and cache:
+        # the model answered but not with a usable RGB: don't ask again soon
+        # (transport failures are left to the circuit breaker)
+        record_failure(cache, FAILURE_RGB, color_phrase, _rgb_failure_reason(reply))
+
+    if reply is None and debug:
+        logger.warning(f"[🚫 TOTAL FAILURE] '{color_phrase}' → No valid RGB response.")
+    return rgb
+
+
 def query_llm_for_rgb(
         color_phrase: str,
         llm_client=None,
         cache=None,
         retries: int = 2,
-        debug: bool = False
+        debug: bool = False,
+        transport: Optional[LLMTransport] = None,
+        deadline: Deadline = None,
+        metrics: Optional[LLMCallMetrics] = None
 ) -> Optional[Tuple[int, int, int]]:
     """
     Queries the LLM and parses an RGB tuple response.
-    Includes retry and logging.
+    Includes retry and logging. Concurrent misses for the same normalized
+    phrase share one request (see single_flight.py).
+
+    Args:
+        color_phrase (str): Descriptive phrase (e.g., 'rosy nude').
+        llm_client: Unused, kept for call compatibility.
+        cache: Optional ColorLLMCache.
+        retries (int): Retries after the first attempt.
+        debug (bool): Verbose logging.
+        transport (LLMTransport, optional): Defaults to the shared pooled transport.
+        deadline (float | LatencyBudget, optional): Overall budget, retries included; also caps
+            the wait on a concurrent request for the same phrase.
+        metrics (LLMCallMetrics, optional): Records tokens / latency as 'single'.
+
+    Returns:
+        Optional[Tuple[int, int, int]]: Parsed RGB or None.
+    """
+    cached, payload, headers = _prepare_rgb_request(color_phrase, cache, debug)
+    if payload is None:
+        return cached
+
+    def fetch():
+        if cache:
+            done = cache.get_rgb(color_phrase)
+            if done:
+                return done  # stored by a flight that finished after our miss
+        if debug:
+            logger.info(f"[📡 LLM QUERY] '{color_phrase}'")
+        reply = _post_single(payload, headers, transport, retries, deadline, metrics, mode="single")
+        return _finish_rgb_request(color_phrase, reply, cache, debug)
+
+    return RGB_FLIGHT.do(normalize_token(color_phrase), fetch, budget=deadline)
+
+
+def _post_single(payload, headers, transport, retries, deadline, metrics, mode: str) -> Optional[str]:
+    transport = transport or get_default_transport()
+    start = time.perf_counter()
+    with span("llm_rgb"):
+        body = transport.post_chat_body(payload, headers=headers, deadline=deadline, retries=retries)
+    if metrics is not None:
+        metrics.record(mode, 1, time.perf_counter() - start, (body or {}).get("usage"))
+    return extract_reply(body) if body is not None else None
+
+
+def query_llm_for_rgb_batch(
+        color_phrases: Iterable[str],
+        cache=None,
+        batch_size: int = LLM_BATCH_SIZE,
+        retries: int = 2,
+        debug: bool = False,
+        transport: Optional[LLMTransport] = None,
+        deadline: Deadline = None,
+        metrics: Optional[LLMCallMetrics] = None
+) -> Dict[str, Optional[Tuple[int, int, int]]]:
+    """
+    Resolves many phrases with one completion per `batch_size` phrases.
+
+    Cache hits are served first, phrases with a live negative entry are
+    skipped and duplicates are sent once. Items of a
+    batch reply that fail to parse are retried with single-phrase calls;
+    a batch whose request failed outright is not retried per phrase.
+
+    Args:
+        color_phrases (Iterable[str]): Descriptive phrases.
+        cache: Optional ColorLLMCache.
+        batch_size (int): Phrases per completion (1 = single-phrase mode).
+        retries (int): Retries per request after the first attempt.
+        debug (bool): Verbose logging.
+        transport (LLMTransport, optional): Defaults to the shared pooled transport.
+        deadline (float | LatencyBudget, optional): Overall budget for all requests.
+        metrics (LLMCallMetrics, optional): Records 'batch' / 'fallback' / 'single'.
+
+    Returns:
+        Dict[str, Optional[Tuple[int, int, int]]]: Phrase → RGB (None if unresolved).
     """
+    phrases = list(dict.fromkeys(color_phrases))
+    results: Dict[str, Optional[Tuple[int, int, int]]] = dict.fromkeys(phrases)
+
     api_key = os.getenv("OPENROUTER_API_KEY")
     if not api_key:
         logger.error("[⛔ NO API KEY] OPENROUTER_API_KEY not found in environment.")
-        return None
+        return results
 
-    if cache:
-        cached = cache.get_rgb(color_phrase)
+    pending = []
+    get_rgb_many = getattr(cache, "get_rgb_many", None)  # one round trip to a remote cache tier
+    hits = get_rgb_many(phrases) if get_rgb_many else {}
+    for phrase in phrases:
+        cached = hits.get(phrase) or (cache.get_rgb(phrase) if cache and not get_rgb_many else None)
         if cached:
-            if debug:
-                logger.info(f"[🗃️ CACHE HIT] '{color_phrase}' → {cached}")
-            return cached
+            results[phrase] = cached
+        elif not (cache and known_failure(cache, FAILURE_RGB, phrase)):
+            pending.append(phrase)
 
-    payload = build_llm_request_payload(color_phrase)
     headers = build_llm_headers(api_key)
+    transport = transport or get_default_transport()
+    budget = LatencyBudget.coerce(deadline)
+    batch_size = max(1, batch_size)
 
-    for attempt in range(retries + 1):
-        try:
-            response = requests.post(
-                LLM_API_URL,
-                headers=headers,
-                json=payload,
-                timeout=10
-            )
+    for offset in range(0, len(pending), batch_size):
+        chunk = pending[offset:offset + batch_size]
 
-            if debug:
-                logger.info(f"[📡 LLM QUERY] Attempt {attempt + 1}: '{color_phrase}'")
+        if len(chunk) == 1:
+            reply = _post_single(build_llm_request_payload(chunk[0]), headers, transport,
+                                 retries, budget, metrics, mode="single")
+            results[chunk[0]] = _finish_rgb_request(chunk[0], reply, cache, debug)
+            continue
 
-            if response.status_code != 200:
-                logger.warning(f"[⚠️ LLM FAILURE] Status {response.status_code}: {response.text}")
-                time.sleep(1.5 * (attempt + 1))
-                continue
+        if debug:
+            logger.info(f"[📡 LLM BATCH] {len(chunk)} phrases: {chunk}")
 
-            reply = response.json()["choices"][0]["message"]["content"]
-            rgb = _parse_rgb_tuple(reply, debug=debug)
+        start = time.perf_counter()
+        with span("llm_rgb"):
+            body = transport.post_chat_body(build_batch_request_payload(chunk), headers=headers,
+                                            deadline=budget, retries=retries, phrases=len(chunk))
+        if metrics is not None:
+            metrics.record("batch", len(chunk), time.perf_counter() - start, (body or {}).get("usage"))
+        if body is None:
+            continue
 
-            if rgb and cache:
-                cache.store_rgb(color_phrase, rgb)
+        parsed = _parse_batch_reply(extract_reply(body), len(chunk), debug=debug)
+        for index, phrase in enumerate(chunk):
+            rgb = parsed.get(index)
+            if rgb is None:
+                reply = _post_single(build_llm_request_payload(phrase), headers, transport,
+                                     retries, budget, metrics, mode="fallback")
+                rgb = _finish_rgb_request(phrase, reply, cache, debug)
+            elif cache:
+                cache.store_rgb(phrase, rgb)
+            results[phrase] = rgb
 
-            return rgb
+    return results
 
-        except Exception as e:
-            logger.error(f"[💥 EXCEPTION] LLM request failed on attempt {attempt + 1}: {e}")
-            time.sleep(1.5 * (attempt + 1))
 
-    if debug:
-        logger.warning(f"[🚫 TOTAL FAILURE] '{color_phrase}' → No valid RGB response.")
-    return None
+async def query_llm_for_rgb_async(
+        color_phrase: str,
+        transport: AsyncLLMTransport,
+        cache=None,
+        retries: int = 2,
+        debug: bool = False,
+        deadline: Deadline = None
+) -> Optional[Tuple[int, int, int]]:
+    """
+    Async variant of `query_llm_for_rgb` over an `AsyncLLMTransport`.
+    """
+    cached, payload, headers = _prepare_rgb_request(color_phrase, cache, debug)
+    if payload is None:
+        return cached
+
+    async def fetch():
+        if debug:
+            logger.info(f"[📡 LLM QUERY] '{color_phrase}'")
+        with span("llm_rgb"):
+            reply = await transport.post_chat(payload, headers=headers, deadline=deadline, retries=retries)
+        return _finish_rgb_request(color_phrase, reply, cache, debug)
+
+    return await RGB_FLIGHT.do_async(normalize_token(color_phrase), fetch, budget=deadline)
+
+
+# ------------------ SIMPLIFICATION CLIENT ------------------ #
+
+SIMPLIFY_MAX_TOKENS = 12
+
+
+def build_simplify_request_payload(prompt: str) -> dict:
+    return {
+        "model": LLM_MODEL,
+        "max_tokens": SIMPLIFY_MAX_TOKENS,
+        "temperature": LLM_TEMPERATURE,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ]
+    }
+
+
+class OpenRouterSimplifyClient:
+    """
+    The `llm_client` of simplifier.py: `simplify(prompt)` sends one
+    completion over the pooled transport (circuit breaker and rate limiter
+    included) and returns the stripped reply ('' if empty), or None when
+    the request failed.
+    """
+
+    def __init__(self, transport: Optional[LLMTransport] = None, deadline: Deadline = None, retries: int = 1):
+        self.transport = transport
+        self.deadline = deadline
+        self.retries = retries
+
+    def simplify(self, prompt: str) -> Optional[str]:
+        api_key = os.getenv("OPENROUTER_API_KEY")
+        if not api_key:
+            logger.error("[⛔ NO API KEY] OPENROUTER_API_KEY not found in environment.")
+            return None
+        transport = self.transport or get_default_transport()
+        reply = transport.post_chat(build_simplify_request_payload(prompt), headers=build_llm_headers(api_key),
+                                    deadline=self.deadline, retries=self.retries)
+        return reply.strip() if reply is not None else None
@@ -0,0 +1,89 @@
+# Chatbot/extractors/color/llm/llm_metrics.py
+
+"""
+llm_metrics.py
+==============
+
+Per-phrase cost accounting for LLM RGB calls.
+
+Each completion is recorded under a mode ('single', 'batch',
+'fallback') with the number of phrases it resolved, its wall-clock
+latency and the `usage` block of the response. Comparing modes gives
+the tokens and latency saved per phrase by batching.
+
+Used By:
+--------
+- llm_api_client.query_llm_for_rgb / query_llm_for_rgb_batch
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+
+_FIELDS = ("requests", "phrases", "latency_s", "prompt_tokens", "completion_tokens", "metered_phrases")
+
+
+class LLMCallMetrics:
+    """
+    Thread-safe counters per call mode.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._modes: Dict[str, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(_FIELDS, 0))
+
+    def record(self, mode: str, phrases: int, latency_s: float, usage: Optional[dict] = None) -> None:
+        """
+        Records one completion.
+
+        Args:
+            mode (str): Call mode ('single', 'batch', 'fallback').
+            phrases (int): Phrases the completion was meant to resolve.
+            latency_s (float): Wall-clock latency, retries included.
+            usage (dict, optional): Response `usage` block (prompt/completion tokens).
+        """
+        with self._lock:
+            stats = self._modes[mode]
+            stats["requests"] += 1
+            stats["phrases"] += phrases
+            stats["latency_s"] += latency_s
+            if usage:
+                stats["prompt_tokens"] += usage.get("prompt_tokens", 0)
+                stats["completion_tokens"] += usage.get("completion_tokens", 0)
+                stats["metered_phrases"] += phrases
+
+    def per_phrase(self, mode: str) -> Dict[str, float]:
+        """
+        Returns average tokens and latency per phrase for a mode.
+        """
+        with self._lock:
+            stats = dict(self._modes.get(mode, dict.fromkeys(_FIELDS, 0)))
+
+        phrases = stats["phrases"] or 1
+        metered = stats["metered_phrases"] or 1
+        return {
+            "requests": stats["requests"],
+            "phrases": stats["phrases"],
+            "tokens_per_phrase": (stats["prompt_tokens"] + stats["completion_tokens"]) / metered,
+            "prompt_tokens_per_phrase": stats["prompt_tokens"] / metered,
+            "latency_ms_per_phrase": stats["latency_s"] * 1000 / phrases,
+        }
+
+    def savings(self, mode: str = "batch", baseline: str = "single") -> Dict[str, float]:
+        """
+        Returns tokens and latency saved per phrase by `mode` versus `baseline`.
+        """
+        current, reference = self.per_phrase(mode), self.per_phrase(baseline)
+        return {
+            "tokens_saved_per_phrase": reference["tokens_per_phrase"] - current["tokens_per_phrase"],
+            "latency_ms_saved_per_phrase": reference["latency_ms_per_phrase"] - current["latency_ms_per_phrase"],
+        }
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            modes = list(self._modes)
+        return {mode: self.per_phrase(mode) for mode in modes}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._modes.clear()
@@ -6,15 +6,23 @@ llm_rgb.py
 
 Handles LLM-driven resolution of descriptive color names into RGB tuples.
 Attempts multi-step fallback: LLM → simplified match → XKCD/CSS → fuzzy RGB.
+While the LLM circuit is open or the request's latency budget is spent,
+LLM steps are skipped and the raw phrase goes straight to the local
+palette / fuzzy fallbacks.
 """
 import logging
-from typing import Optional, Tuple
-from webcolors import hex_to_rgb
-from matplotlib.colors import XKCD_COLORS, CSS4_COLORS
-
-from Chatbot.extractors.color.llm.llm_api_client import query_llm_for_rgb
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from Chatbot.extractors.color.llm.circuit_breaker import llm_available
+from Chatbot.extractors.color.llm.latency_budget import LatencyBudget
+from Chatbot.extractors.color.llm.llm_api_client import (
+    LLM_BATCH_SIZE,
+    query_llm_for_rgb,
+    query_llm_for_rgb_batch,
+)
 from Chatbot.extractors.color.llm.simplifier import simplify_color_description_with_llm
 from Chatbot.extractors.color.utils.rgb_distance import fuzzy_match_rgb_from_known_colors, is_within_rgb_margin
+from Chatbot.extractors.color.utils.palette_index import lookup_palette_rgb
 from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
 
 
@@ -23,7 +31,8 @@ def resolve_rgb_with_llm(
     all_webcolor_names: set,
     llm_client,
     cache=None,
-    debug=False
+    debug=False,
+    budget: Union[None, float, LatencyBudget] = None
 ) -> Optional[Tuple[int, int, int]]:
     """
     Full RGB resolution entry point: LLM first, then fallback.
@@ -33,7 +42,8 @@ def resolve_rgb_with_llm(
         all_webcolor_names=all_webcolor_names,
         llm_client=llm_client,
         cache=cache,
-        debug=debug
+        debug=debug,
+        budget=budget
     )
 
 def get_rgb_from_descriptive_color_llm_first(
@@ -41,28 +51,85 @@ def get_rgb_from_descriptive_color_llm_first(
     all_webcolor_names: set,
     llm_client,
     cache=None,
-    debug=False
+    debug=False,
+    budget: Union[None, float, LatencyBudget] = None
 ) -> Optional[Tuple[int, int, int]]:
     """
     Step-by-step resolution:
     1. Direct LLM RGB call
     2. Simplify → match in XKCD / CSS4
     3. Fuzzy match fallback from known set
+
+    `budget` (seconds or a shared LatencyBudget) bounds the LLM calls,
+    retries included; cache hits are served even once it is spent.
     """
     if debug:
         print(f"[🎯 RESOLVE RGB] Trying: '{input_color}'")
 
-    rgb = query_llm_for_rgb(input_color, llm_client, cache=cache, debug=debug)
+    budget = LatencyBudget.coerce(budget)
+    rgb = query_llm_for_rgb(input_color, llm_client, cache=cache, debug=debug, deadline=budget)
     if rgb:
         return rgb
 
-    simplified = simplify_color_description_with_llm(input_color, llm_client, cache=cache, debug=debug)
+    return _resolve_rgb_after_llm_miss(
+        input_color, all_webcolor_names, llm_client, cache=cache, debug=debug, budget=budget
+    )
+
+
+def resolve_rgbs_with_llm_batch(
+    phrases: Iterable[str],
+    all_webcolor_names: set,
+    llm_client,
+    cache=None,
+    batch_size: int = LLM_BATCH_SIZE,
+    debug=False,
+    budget: Union[None, float, LatencyBudget] = None,
+    **llm_kwargs
+) -> Dict[str, Optional[Tuple[int, int, int]]]:
+    """
+    Batched counterpart of `get_rgb_from_descriptive_color_llm_first`:
+    one completion per `batch_size` phrases, then the usual fallbacks for
+    phrases the LLM did not resolve.
+
+    Extra keyword arguments (transport, metrics, retries) are passed to
+    `query_llm_for_rgb_batch`; `budget` bounds the whole call.
+    """
+    budget = LatencyBudget.coerce(budget)
+    results = query_llm_for_rgb_batch(
+        phrases, cache=cache, batch_size=batch_size, debug=debug, deadline=budget, **llm_kwargs
+    )
+    for phrase, rgb in results.items():
+        if rgb is None:
+            results[phrase] = _resolve_rgb_after_llm_miss(
+                phrase, all_webcolor_names, llm_client, cache=cache, debug=debug, budget=budget
+            )
+    return results
+
+
+def _resolve_rgb_after_llm_miss(
+    input_color: str,
+    all_webcolor_names: set,
+    llm_client,
+    cache=None,
+    debug=False,
+    budget: Optional[LatencyBudget] = None
+) -> Optional[Tuple[int, int, int]]:
+    """
+    Steps 2–3 of the resolution: simplified palette match, then fuzzy name match.
+    """
+    if llm_available(budget):
+        simplified = simplify_color_description_with_llm(input_color, llm_client, cache=cache, debug=debug)
+    else:
+        if debug:
+            print(f"[🔌 LLM SKIPPED] '{input_color}' → local fallbacks only")
+        simplified = input_color
 
     rgb = _try_simplified_match(simplified, all_webcolor_names, debug=debug)
     if rgb:
         return rgb
 
-    rgb = fuzzy_match_rgb_from_known_colors(simplified, all_webcolor_names, debug=debug)
+    name = fuzzy_match_rgb_from_known_colors(simplified)
+    rgb = lookup_palette_rgb(name) if name else None
     if rgb:
         return rgb
 
@@ -74,23 +141,16 @@ def get_rgb_from_descriptive_color_llm_first(
 def _try_simplified_match(name: str, color_names: set, debug=False) -> Optional[Tuple[int, int, int]]:
     """
     Attempts to match a simplified phrase directly to known color names in CSS/XKCD.
+    Uses the shared palette index (spacing, hyphen and plural aliases included).
     """
     name = normalize_token(name).replace("-", " ")
 
-    if name in XKCD_COLORS:
-        hex_code = XKCD_COLORS[name]
-        if debug:
-            print(f"[🎨 XKCD MATCH] '{name}' → {hex_code}")
-        return hex_to_rgb(hex_code)
-
-    if name in CSS4_COLORS:
-        hex_code = CSS4_COLORS[name]
+    rgb = lookup_palette_rgb(name)
+    if rgb:
         if debug:
-            print(f"[🎨 CSS4 MATCH] '{name}' → {hex_code}")
-        return hex_to_rgb(hex_code)
+            print(f"[🎨 PALETTE MATCH] '{name}' → {rgb}")
+        return rgb
 
     if debug:
         print(f"[🕵️‍♀️ NOT FOUND] '{name}' not in XKCD or CSS4")
     return None
-
-
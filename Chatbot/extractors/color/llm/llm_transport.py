@@ -0,0 +1,455 @@
+# Chatbot/extractors/color/llm/llm_transport.py
+
+"""
+llm_transport.py
+================
+
+HTTP transport for OpenRouter chat-completions calls.
+
+- LLMTransport: pooled `requests.Session` (keep-alive, no TCP/TLS setup
+  per phrase) for the synchronous pipeline
+- AsyncLLMTransport: `httpx.AsyncClient` with a concurrency semaphore;
+  backoff uses `asyncio.sleep`, so retries never block the event loop
+
+Both retry transport errors, 429 and 5xx with jittered exponential
+backoff ("full jitter"), never retry other 4xx, and honour a per-request
+deadline (seconds or a shared LatencyBudget): no attempt or backoff sleep
+runs past it. An optional CircuitBreaker short-circuits calls while the
+endpoint is failing; the default transport uses the shared 'openrouter' one.
+
+`Retry-After` on 429/503 replaces the backoff when longer (a request is
+abandoned if the server asks for more than the deadline allows). An
+optional LLMRateLimiter paces requests across processes, is penalized on
+429 so every worker backs off, and records each completion's token usage.
+
+Used By:
+--------
+- llm_api_client.query_llm_for_rgb / query_llm_for_rgb_async
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable, Optional, Tuple, Union
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from Chatbot.extractors.color.llm.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from Chatbot.extractors.color.llm.latency_budget import LatencyBudget
+from Chatbot.extractors.color.llm.rate_limiter import (
+    LLM_RETRY_AFTER_MAX,
+    LLMRateLimiter,
+    get_default_limiter,
+    parse_retry_after,
+)
+
+LLM_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+LLM_TIMEOUT = 10.0
+LLM_RETRIES = 2
+LLM_BACKOFF_BASE = 0.5
+LLM_BACKOFF_MAX = 8.0
+LLM_POOL_SIZE = 16
+LLM_CONCURRENCY = 8
+
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Outcomes of one post (all attempts) as seen by the circuit breaker
+_OK, _REJECTED, _FAILED, _SKIPPED = "ok", "rejected", "failed", "skipped"
+
+Deadline = Union[None, float, LatencyBudget]
+
+logger = logging.getLogger(__name__)
+
+
+class LLMTransportError(Exception):
+    """
+    Raised for a malformed chat-completions response body.
+    """
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = LLM_BACKOFF_BASE,
+    cap: float = LLM_BACKOFF_MAX,
+    rng: Callable[[float, float], float] = random.uniform
+) -> float:
+    """
+    Full-jitter exponential backoff: uniform in [0, min(cap, base·2^attempt)].
+
+    Args:
+        attempt (int): Zero-based retry number.
+        base (float): First backoff ceiling in seconds.
+        cap (float): Largest backoff ceiling in seconds.
+        rng (Callable): Uniform sampler, injectable for tests.
+
+    Returns:
+        float: Delay in seconds.
+    """
+    return rng(0.0, min(cap, base * (2 ** attempt)))
+
+
+def extract_reply(body: dict) -> str:
+    """
+    Returns the first message content of a chat-completions body.
+    """
+    try:
+        return body["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError) as e:
+        raise LLMTransportError(f"Unexpected chat-completions body: {body!r}") from e
+
+
+def _settle(breaker: Optional[CircuitBreaker], outcome: str) -> None:
+    if breaker is None:
+        return
+    if outcome == _FAILED:
+        breaker.record_failure()
+    elif outcome == _SKIPPED:
+        breaker.release()
+    else:
+        breaker.record_success()
+
+
+def _retry_delay(transport, attempt: int, status: Optional[int], retry_after: Optional[float],
+                 budget: LatencyBudget) -> Optional[float]:
+    """
+    Seconds to wait before the next attempt, or None to give up because the
+    server's Retry-After exceeds the deadline (or LLM_RETRY_AFTER_MAX).
+    Penalizes the shared limiter on 429 so other workers back off too.
+    """
+    if status == 429 and transport.limiter is not None:
+        penalty = transport.backoff_base if retry_after is None else min(retry_after, LLM_RETRY_AFTER_MAX)
+        transport.limiter.penalize(penalty)
+
+    delay = backoff_delay(attempt, transport.backoff_base, transport.backoff_max)
+    if retry_after is not None:
+        remaining = budget.remaining()
+        if retry_after > LLM_RETRY_AFTER_MAX or (remaining is not None and retry_after > remaining):
+            logger.warning(f"[🚦 LLM RETRY-AFTER] Server asked for {retry_after:.1f}s → giving up")
+            return None
+        delay = max(delay, retry_after)
+    return budget.clamp(delay)
+
+
+def _circuit_open(breaker: Optional[CircuitBreaker]) -> bool:
+    if breaker is not None and not breaker.allow():
+        logger.warning(f"[🔌 LLM CIRCUIT OPEN] '{breaker.name}' → skipping request")
+        return True
+    return False
+
+
+class LLMTransport:
+    """
+    Synchronous chat-completions client over a pooled `requests.Session`.
+    """
+
+    def __init__(
+        self,
+        url: str = LLM_API_URL,
+        timeout: float = LLM_TIMEOUT,
+        retries: int = LLM_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE,
+        backoff_max: float = LLM_BACKOFF_MAX,
+        pool_size: int = LLM_POOL_SIZE,
+        session: Optional[requests.Session] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        breaker: Optional[CircuitBreaker] = None,
+        limiter: Optional[LLMRateLimiter] = None
+    ):
+        self.url = url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self.breaker = breaker
+        self.limiter = limiter
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def post_chat(
+        self,
+        payload: dict,
+        headers: Optional[dict] = None,
+        deadline: Deadline = None,
+        retries: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Sends a chat-completions request and returns the reply content.
+
+        Args:
+            payload (dict): Chat-completions JSON payload.
+            headers (dict, optional): Request headers (Authorization, ...).
+            deadline (float | LatencyBudget, optional): Overall budget, retries included.
+            retries (int, optional): Overrides the transport's retry count.
+
+        Returns:
+            Optional[str]: Reply content, or None when every attempt failed
+            (or the circuit is open).
+        """
+        body = self.post_chat_body(payload, headers=headers, deadline=deadline, retries=retries)
+        return extract_reply(body) if body is not None else None
+
+    def post_chat_body(
+        self,
+        payload: dict,
+        headers: Optional[dict] = None,
+        deadline: Deadline = None,
+        retries: Optional[int] = None,
+        phrases: int = 1
+    ) -> Optional[dict]:
+        """
+        Like `post_chat`, but returns the whole response body (e.g., for `usage`).
+        `phrases` is the number of phrases the request resolves (token ledger).
+        """
+        if _circuit_open(self.breaker):
+            return None
+        try:
+            body, outcome = self._post_with_retries(
+                payload, headers, LatencyBudget.coerce(deadline), retries, phrases
+            )
+        except BaseException:
+            _settle(self.breaker, _SKIPPED)  # cancelled: free the probe slot
+            raise
+        _settle(self.breaker, outcome)
+        return body
+
+    def _post_with_retries(
+        self,
+        payload: dict,
+        headers: Optional[dict],
+        budget: LatencyBudget,
+        retries: Optional[int],
+        phrases: int
+    ) -> Tuple[Optional[dict], str]:
+        retries = self.retries if retries is None else retries
+
+        for attempt in range(retries + 1):
+            if budget.expired():
+                logger.warning(f"[⏱️ LLM DEADLINE] Budget exhausted before attempt {attempt + 1}")
+                return None, _FAILED if attempt else _SKIPPED
+            if self.limiter is not None and not self.limiter.acquire(budget):
+                return None, _FAILED if attempt else _SKIPPED
+
+            status, retry_after = None, None
+            try:
+                response = self.session.post(
+                    self.url, headers=headers, json=payload, timeout=budget.timeout(self.timeout)
+                )
+                status = response.status_code
+                if status == 200:
+                    body = response.json()
+                    extract_reply(body)
+                    if self.limiter is not None:
+                        self.limiter.record_usage(body.get("usage"), phrases)
+                    return body, _OK
+                logger.warning(f"[⚠️ LLM FAILURE] Status {status}: {response.text[:200]}")
+                if status not in RETRYABLE_STATUS:
+                    return None, _REJECTED
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            except (requests.RequestException, ValueError, LLMTransportError) as e:
+                logger.error(f"[💥 EXCEPTION] LLM request failed on attempt {attempt + 1}: {e}")
+
+            if attempt < retries:
+                delay = _retry_delay(self, attempt, status, retry_after, budget)
+                if delay is None:
+                    break
+                if delay:
+                    self._sleep(delay)
+        return None, _FAILED
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class AsyncLLMTransport:
+    """
+    Asyncio chat-completions client over a pooled `httpx.AsyncClient`.
+
+    At most `concurrency` requests are in flight; backoff sleeps release
+    the slot and never block the event loop.
+    """
+
+    def __init__(
+        self,
+        url: str = LLM_API_URL,
+        timeout: float = LLM_TIMEOUT,
+        retries: int = LLM_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE,
+        backoff_max: float = LLM_BACKOFF_MAX,
+        pool_size: int = LLM_POOL_SIZE,
+        concurrency: int = LLM_CONCURRENCY,
+        client: Optional[httpx.AsyncClient] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        limiter: Optional[LLMRateLimiter] = None
+    ):
+        self.url = url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.concurrency = concurrency
+        self.breaker = breaker
+        self.limiter = limiter
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.client = client or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def post_chat(
+        self,
+        payload: dict,
+        headers: Optional[dict] = None,
+        deadline: Deadline = None,
+        retries: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Async counterpart of `LLMTransport.post_chat`.
+        """
+        body = await self.post_chat_body(payload, headers=headers, deadline=deadline, retries=retries)
+        return extract_reply(body) if body is not None else None
+
+    async def post_chat_body(
+        self,
+        payload: dict,
+        headers: Optional[dict] = None,
+        deadline: Deadline = None,
+        retries: Optional[int] = None,
+        phrases: int = 1
+    ) -> Optional[dict]:
+        """
+        Async counterpart of `LLMTransport.post_chat_body`.
+        """
+        if _circuit_open(self.breaker):
+            return None
+        try:
+            body, outcome = await self._post_with_retries(
+                payload, headers, LatencyBudget.coerce(deadline), retries, phrases
+            )
+        except BaseException:
+            _settle(self.breaker, _SKIPPED)  # cancelled: free the probe slot
+            raise
+        _settle(self.breaker, outcome)
+        return body
+
+    async def _post_with_retries(
+        self,
+        payload: dict,
+        headers: Optional[dict],
+        budget: LatencyBudget,
+        retries: Optional[int],
+        phrases: int
+    ) -> Tuple[Optional[dict], str]:
+        retries = self.retries if retries is None else retries
+
+        for attempt in range(retries + 1):
+            if budget.expired():
+                logger.warning(f"[⏱️ LLM DEADLINE] Budget exhausted before attempt {attempt + 1}")
+                return None, _FAILED if attempt else _SKIPPED
+            if self.limiter is not None and not await self._acquire(budget):
+                return None, _FAILED if attempt else _SKIPPED
+
+            status, retry_after = None, None
+            try:
+                async with self.semaphore:
+                    timeout = budget.timeout(self.timeout)
+                    response = await asyncio.wait_for(
+                        self.client.post(self.url, headers=headers, json=payload, timeout=timeout),
+                        timeout=timeout
+                    )
+                status = response.status_code
+                if status == 200:
+                    body = response.json()
+                    extract_reply(body)
+                    if self.limiter is not None:
+                        self.limiter.record_usage(body.get("usage"), phrases)
+                    return body, _OK
+                logger.warning(f"[⚠️ LLM FAILURE] Status {status}: {response.text[:200]}")
+                if status not in RETRYABLE_STATUS:
+                    return None, _REJECTED
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            except (httpx.HTTPError, asyncio.TimeoutError, ValueError, LLMTransportError) as e:
+                logger.error(f"[💥 EXCEPTION] LLM request failed on attempt {attempt + 1}: {e!r}")
+
+            if attempt < retries:
+                delay = _retry_delay(self, attempt, status, retry_after, budget)
+                if delay is None:
+                    break
+                if delay:
+                    await asyncio.sleep(delay)
+        return None, _FAILED
+
+    async def _acquire(self, budget: LatencyBudget) -> bool:
+        """
+        Non-blocking counterpart of `LLMRateLimiter.acquire`.
+        """
+        while True:
+            wait = self.limiter.try_acquire()
+            if wait is None:
+                logger.warning("[💸 LLM BUDGET] Daily token budget exhausted → offline resolution")
+                return False
+            if wait == 0.0:
+                return True
+            remaining = budget.remaining()
+            if remaining is not None and wait > remaining:
+                return False
+            await asyncio.sleep(wait)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncLLMTransport":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+
+_default_transport: Optional[LLMTransport] = None
+_default_lock = threading.Lock()
+
+
+def _reset_transport_after_fork() -> None:
+    # Never share pooled sockets with the parent: a forked child opens its own
+    global _default_transport, _default_lock
+    _default_transport, _default_lock = None, threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_transport_after_fork)
+
+
+def get_default_transport() -> LLMTransport:
+    """
+    Returns the process-wide pooled transport (created on first use).
+    """
+    global _default_transport
+    if _default_transport is None:
+        with _default_lock:
+            if _default_transport is None:
+                _default_transport = LLMTransport(breaker=get_circuit_breaker(), limiter=get_default_limiter())
+    return _default_transport
+
+
+def set_default_transport(transport: Optional[LLMTransport]) -> None:
+    """
+    Replaces the process-wide transport (e.g., to point at a stand-in server).
+    """
+    global _default_transport
+    with _default_lock:
+        _default_transport = transport
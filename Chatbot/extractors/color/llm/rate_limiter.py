@@ -0,0 +1,310 @@
+# Chatbot/extractors/color/llm/rate_limiter.py
+
+"""
+rate_limiter.py
+===============
+
+Client-side rate limiting and daily token accounting for LLM calls,
+shared by every worker process on the host.
+
+- Token bucket (`rate` requests/s, bursts up to `capacity`) whose state
+  lives in a small JSON file locked with flock (msvcrt on Windows), so
+  all processes using the same API key draw from one bucket
+- `penalize(seconds)` (on 429 / Retry-After) empties the bucket and
+  blocks every process until the server's cool-down has passed
+- Daily ledger (UTC) of requests, phrases, prompt and completion tokens;
+  once `daily_token_budget` is used up, `try_acquire` refuses and
+  callers degrade to offline (palette / fuzzy) resolution
+
+The budget is checked before a call, so in-flight requests may overshoot
+it by at most one completion each.
+
+Everything is opt-in: the default limiter throttles only when
+$LLM_RATE_LIMIT_PATH or $LLM_RATE_PER_SECOND is set (then at 4 req/s,
+bursts of 8, unless overridden), keeps the ledger without throttling when
+only $LLM_DAILY_TOKEN_BUDGET is set, and does not exist otherwise.
+
+Used By:
+--------
+- llm_transport.LLMTransport / AsyncLLMTransport (default transport)
+- circuit_breaker.llm_available
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from Chatbot.extractors.color.llm.latency_budget import LatencyBudget
+
+RATE_LIMIT_PATH_ENV = "LLM_RATE_LIMIT_PATH"
+RATE_PER_SECOND_ENV = "LLM_RATE_PER_SECOND"
+RATE_BURST_ENV = "LLM_RATE_BURST"
+DAILY_TOKEN_BUDGET_ENV = "LLM_DAILY_TOKEN_BUDGET"
+
+LLM_RATE_PER_SECOND = 4.0
+LLM_RATE_BURST = 8
+LLM_RETRY_AFTER_MAX = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parses a Retry-After header (delta-seconds or HTTP-date).
+
+    Args:
+        value (str, optional): Header value.
+        now (float, optional): Current epoch time, for HTTP-dates.
+
+    Returns:
+        Optional[float]: Seconds to wait (>= 0), or None if absent/unparseable.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, at - (time.time() if now is None else now))
+
+
+def _utc_day(now: float) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(now))
+
+
+class LLMRateLimiter:
+    """
+    File-backed token bucket plus daily token budget; `rate=None` keeps
+    the ledger and Retry-After blocks but never throttles.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rate: Optional[float] = LLM_RATE_PER_SECOND,
+        capacity: float = LLM_RATE_BURST,
+        daily_token_budget: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.path = path
+        self.rate = rate
+        self.capacity = capacity
+        self.daily_token_budget = daily_token_budget
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    # ------------------ STATE FILE ------------------ #
+
+    def _fresh_state(self, now: float) -> Dict:
+        return {
+            "tokens": float(self.capacity), "updated": now, "blocked_until": 0.0,
+            "day": _utc_day(now), "requests": 0, "phrases": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "throttled": 0,
+        }
+
+    @contextmanager
+    def _state(self, now: float) -> Iterator[Dict]:
+        """
+        Yields the shared state under an exclusive lock, then writes it back.
+        """
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                raw = os.read(fd, 1 << 16)
+                try:
+                    state = {**self._fresh_state(now), **json.loads(raw)} if raw else self._fresh_state(now)
+                except ValueError:
+                    state = self._fresh_state(now)  # torn / foreign file: start over
+                if state["day"] != _utc_day(now):
+                    state.update({key: 0 for key in ("requests", "phrases", "prompt_tokens",
+                                                     "completion_tokens", "throttled")})
+                    state["day"] = _utc_day(now)
+
+                yield state
+
+                data = json.dumps(state).encode("utf-8")
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, data)
+                os.ftruncate(fd, len(data))
+            finally:
+                if fcntl is None:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+                os.close(fd)  # also releases flock
+
+    def _exhausted(self, state: Dict) -> bool:
+        return (
+            self.daily_token_budget is not None
+            and state["prompt_tokens"] + state["completion_tokens"] >= self.daily_token_budget
+        )
+
+    # ------------------ BUCKET ------------------ #
+
+    def try_acquire(self) -> Optional[float]:
+        """
+        Takes one request token if available.
+
+        Returns:
+            Optional[float]: 0.0 when a token was taken, the seconds to wait
+            before the next one otherwise, or None when the daily budget is spent.
+        """
+        now = self._clock()
+        with self._state(now) as state:
+            if self._exhausted(state):
+                return None
+            if self.rate is None:
+                return max(0.0, state["blocked_until"] - now)
+            refill_from = max(state["updated"], state["blocked_until"])  # no refill while blocked
+            if now > refill_from:
+                state["tokens"] = min(self.capacity, state["tokens"] + (now - refill_from) * self.rate)
+            state["updated"] = now
+            if state["blocked_until"] > now:
+                return state["blocked_until"] - now
+            if state["tokens"] >= 1.0:
+                state["tokens"] -= 1.0
+                return 0.0
+            return (1.0 - state["tokens"]) / self.rate
+
+    def acquire(self, budget=None) -> bool:
+        """
+        Waits for a request token.
+
+        Args:
+            budget (float | LatencyBudget, optional): Gives up rather than wait past it.
+
+        Returns:
+            bool: True when a token was taken; False when the wait would exceed
+            `budget` or the daily token budget is spent.
+        """
+        budget = LatencyBudget.coerce(budget)
+        while True:
+            wait = self.try_acquire()
+            if wait is None:
+                logger.warning("[💸 LLM BUDGET] Daily token budget exhausted → offline resolution")
+                return False
+            if wait == 0.0:
+                return True
+            remaining = budget.remaining()
+            if remaining is not None and wait > remaining:
+                logger.warning(f"[🚦 LLM RATE LIMIT] Next slot in {wait:.2f}s exceeds the latency budget")
+                return False
+            self._sleep(wait)
+
+    def penalize(self, seconds: float) -> None:
+        """
+        Empties the bucket and blocks all processes for `seconds` (Retry-After).
+        """
+        now = self._clock()
+        with self._state(now) as state:
+            state["tokens"] = 0.0
+            state["updated"] = now
+            state["blocked_until"] = max(state["blocked_until"], now + seconds)
+            state["throttled"] += 1
+
+    # ------------------ TOKEN LEDGER ------------------ #
+
+    def record_usage(self, usage: Optional[dict], phrases: int = 1) -> None:
+        """
+        Adds one completion's `usage` block to today's ledger.
+
+        Args:
+            usage (dict, optional): Response usage (prompt_tokens / completion_tokens).
+            phrases (int): Phrases the completion resolved.
+        """
+        usage = usage or {}
+        with self._state(self._clock()) as state:
+            state["requests"] += 1
+            state["phrases"] += phrases
+            state["prompt_tokens"] += int(usage.get("prompt_tokens", 0))
+            state["completion_tokens"] += int(usage.get("completion_tokens", 0))
+
+    def budget_exhausted(self) -> bool:
+        if self.daily_token_budget is None:
+            return False
+        with self._state(self._clock()) as state:
+            return self._exhausted(state)
+
+    def usage(self) -> Dict[str, object]:
+        """
+        Returns today's ledger plus per-phrase token averages and budget headroom.
+        """
+        now = self._clock()
+        with self._state(now) as state:
+            snapshot = dict(state)
+        total = snapshot["prompt_tokens"] + snapshot["completion_tokens"]
+        phrases = snapshot["phrases"] or 1
+        return {
+            "day": snapshot["day"],
+            "requests": snapshot["requests"],
+            "phrases": snapshot["phrases"],
+            "prompt_tokens": snapshot["prompt_tokens"],
+            "completion_tokens": snapshot["completion_tokens"],
+            "prompt_tokens_per_phrase": snapshot["prompt_tokens"] / phrases,
+            "completion_tokens_per_phrase": snapshot["completion_tokens"] / phrases,
+            "daily_token_budget": self.daily_token_budget,
+            "remaining_tokens": None if self.daily_token_budget is None else max(0, self.daily_token_budget - total),
+            "throttled": snapshot["throttled"],
+            "blocked_for": max(0.0, snapshot["blocked_until"] - now),
+        }
+
+
+_default_limiter: Optional[LLMRateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_default_limiter() -> Optional[LLMRateLimiter]:
+    """
+    Returns the process-wide limiter configured from the environment:
+    $LLM_RATE_LIMIT_PATH (state file, shared by all workers),
+    $LLM_RATE_PER_SECOND, $LLM_RATE_BURST and $LLM_DAILY_TOKEN_BUDGET.
+
+    Returns None when none of $LLM_RATE_LIMIT_PATH, $LLM_RATE_PER_SECOND
+    or $LLM_DAILY_TOKEN_BUDGET is set (no client-side limiting).
+    """
+    global _default_limiter
+    if _default_limiter is None:
+        with _default_lock:
+            if _default_limiter is None:
+                path = os.environ.get(RATE_LIMIT_PATH_ENV)
+                rate = os.environ.get(RATE_PER_SECOND_ENV)
+                budget = os.environ.get(DAILY_TOKEN_BUDGET_ENV)
+                if not (path or rate or budget):
+                    return None
+                _default_limiter = LLMRateLimiter(
+                    path=path or os.path.join(tempfile.gettempdir(), "openrouter_rate_limit.json"),
+                    rate=float(rate or LLM_RATE_PER_SECOND) if (path or rate) else None,
+                    capacity=float(os.environ.get(RATE_BURST_ENV) or LLM_RATE_BURST),
+                    daily_token_budget=int(budget) if budget else None,
+                )
+    return _default_limiter
+
+
+def set_default_limiter(limiter: Optional[LLMRateLimiter]) -> None:
+    """
+    Replaces the process-wide limiter (None → rebuilt from the environment).
+    """
+    global _default_limiter
+    with _default_lock:
+        _default_limiter = limiter
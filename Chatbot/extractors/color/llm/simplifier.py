@@ -7,10 +7,18 @@ Handles simplification of descriptive color phrases using both rules and LLM.
 Also provides suffix fallback logic when direct match fails.
 """
 
+from typing import List
+
+from Chatbot.cache.llm_cache import FAILURE_SIMPLIFY, ColorLLMCache, known_failure, record_failure
+from Chatbot.extractors.color.llm.llm_api_client import OpenRouterSimplifyClient
+from Chatbot.extractors.color.llm.single_flight import get_single_flight
 from Chatbot.extractors.color.shared.vocab import known_tones
 from Chatbot.extractors.color.utils.modifier_resolution import resolve_modifier_token
+from Chatbot.extractors.color.utils.telemetry import span
 from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
 
+SIMPLIFY_FLIGHT = get_single_flight("llm_simplify")
+
 
 def simplify_phrase_if_needed(phrase: str, known_modifiers, known_tones, debug=False) -> str:
     if debug:
@@ -67,11 +75,45 @@ def simplify_color_description_with_llm(phrase: str, llm_client, cache=None, deb
                 print(f"[🗃️ CACHE HIT] '{phrase}' → '{cached}'")
             return cached
 
-    simplified = llm_client.simplify(prompt)
-
-    if cache:
-        cache.store_simplified(phrase, simplified)
+        failure = known_failure(cache, FAILURE_SIMPLIFY, phrase)
+        if failure:
+            if debug:
+                print(f"[🚫 NEGATIVE HIT] '{phrase}' → {failure['reason']} ({failure['attempts']} attempts)")
+            return phrase
+
+    def fetch():
+        with span("llm_simplify"):
+            simplified = llm_client.simplify(prompt)
+        if cache:
+            if simplified and (not isinstance(simplified, str) or simplified.strip()):
+                cache.store_simplified(phrase, simplified)
+            elif simplified is not None:
+                # the model answered with nothing usable: don't ask again soon
+                # (failed requests are left to the circuit breaker)
+                record_failure(cache, FAILURE_SIMPLIFY, phrase, "empty_reply")
+        return simplified or phrase
+
+    # concurrent misses for the same phrase share one LLM call
+    simplified = SIMPLIFY_FLIGHT.do(normalize_token(phrase), fetch)
 
     if debug:
         print(f"[🧠 LLM RESPONSE] '{phrase}' → '{simplified}'")
     return simplified
+
+
+def simplify_phrase_with_llm(phrase: str, budget=None) -> List[str]:
+    """
+    `simplify_color_description_with_llm` as the color pipeline calls it:
+    pooled OpenRouter client, shared ColorLLMCache, reply as a list
+    (the phrase itself when the LLM gave nothing usable).
+
+    Args:
+        phrase (str): Descriptive color phrase.
+        budget (float | LatencyBudget, optional): Caps the request.
+    """
+    simplified = simplify_color_description_with_llm(
+        phrase, OpenRouterSimplifyClient(deadline=budget), cache=ColorLLMCache.get_instance()
+    )
+    if isinstance(simplified, str):
+        return [simplified]
+    return list(simplified)
@@ -0,0 +1,190 @@
+# Chatbot/extractors/color/llm/single_flight.py
+
+"""
+single_flight.py
+================
+
+In-flight request coalescing ("single flight") for LLM lookups.
+
+When several threads (or asyncio tasks) miss the cache for the same
+normalized phrase at the same time, only the first caller runs the LLM
+request; the others wait on its future and receive the same result (or
+exception). Nothing is cached here: once the leader finishes, the key is
+released and the next miss starts a new flight.
+
+A follower waits at most for its own `budget`; if the leader has not
+finished by then, the follower gets None (a miss) while the leader keeps
+running for everyone else.
+
+Used By:
+--------
+- llm_api_client.query_llm_for_rgb / query_llm_for_rgb_async
+- simplifier.simplify_color_description_with_llm
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Hashable, Tuple, Union
+
+from Chatbot.extractors.color.llm.latency_budget import LatencyBudget
+
+
+class SingleFlight:
+    """
+    Per-key call deduplication with leader / coalesced counters.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._async_calls: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self._leaders = 0
+        self._coalesced = 0
+        self._errors = 0
+        self._timeouts = 0
+
+    def do(
+            self,
+            key: Hashable,
+            fn: Callable[..., Any],
+            *args,
+            budget: Union[None, float, LatencyBudget] = None,
+            **kwargs
+    ) -> Any:
+        """
+        Runs `fn(*args, **kwargs)` once per in-flight `key`.
+
+        Args:
+            key (Hashable): Coalescing key (e.g., normalized phrase).
+            fn (Callable): Work to run if no call for `key` is in flight.
+            budget (float | LatencyBudget, optional): How long a follower
+                waits for the leader (None → until it finishes).
+
+        Returns:
+            Any: The leader's result (its exception is re-raised to all
+            callers), or None for a follower whose budget ran out first.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self._leaders += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            remaining = LatencyBudget.coerce(budget).remaining()
+            try:
+                return future.result(timeout=None if remaining is None else max(remaining, 0.0))
+            except FutureTimeout:
+                self._count_timeout()
+                return None
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                self._errors += 1
+                del self._calls[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._calls[key]
+        future.set_result(result)
+        return result
+
+    async def do_async(
+            self,
+            key: Hashable,
+            fn: Callable[..., Any],
+            *args,
+            budget: Union[None, float, LatencyBudget] = None,
+            **kwargs
+    ) -> Any:
+        """
+        Asyncio variant of `do`: `fn` is a coroutine function; callers on
+        the same event loop share one task.
+        """
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+
+        with self._lock:
+            future = self._async_calls.get(slot)
+            leader = future is None
+            if leader:
+                future = self._async_calls[slot] = loop.create_future()
+                self._leaders += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            remaining = LatencyBudget.coerce(budget).remaining()
+            try:
+                return await asyncio.wait_for(
+                    asyncio.shield(future), None if remaining is None else max(remaining, 0.0)
+                )
+            except asyncio.TimeoutError:
+                self._count_timeout()
+                return None
+
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                self._errors += 1
+                del self._async_calls[slot]
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        with self._lock:
+            del self._async_calls[slot]
+        future.set_result(result)
+        return result
+
+    def _count_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns leader / coalesced / error / follower-timeout counts and
+        calls in flight.
+        """
+        with self._lock:
+            return {
+                "leaders": self._leaders,
+                "coalesced": self._coalesced,
+                "errors": self._errors,
+                "timeouts": self._timeouts,
+                "in_flight": len(self._calls) + len(self._async_calls),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._leaders = self._coalesced = self._errors = self._timeouts = 0
+
+
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """
+    Returns the process-wide flight group for `name` (created on first use).
+    """
+    with _flights_lock:
+        if name not in _flights:
+            _flights[name] = SingleFlight(name)
+        return _flights[name]
+
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Returns the counters of every flight group, keyed by name.
+    """
+    with _flights_lock:
+        flights = list(_flights.values())
+    return {flight.name: flight.stats() for flight in flights}
@@ -5,13 +5,13 @@ expression_matcher.py
 Handles stylistic expression matching based on defined tone mappings.
 Supports direct token scanning, alias mapping, context-aware promotion, and priority-based suppression.
 """
-from logging import debug
 from typing import List, Set, Dict
 import re
 from Chatbot.extractors.color.shared.constants import EXPRESSION_SUPPRESSION_RULES
 from Chatbot.extractors.color.utils.nlp_utils import are_antonyms
 from Chatbot.extractors.color.utils.token_utils import singularize
 from Chatbot.extractors.color.utils.config_loader import load_expression_context_rules
+from Chatbot.extractors.color.utils.trace import debug_trace
 from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
 
 
@@ -42,7 +42,7 @@ def get_valid_tokens(text: str, expression_map: Dict) -> List[str]:
 from rapidfuzz import fuzz
 
 
-def extract_alias_matches(text: str, expression_def: dict) -> Set[str]:
+def extract_alias_matches(text: str, expression_def: dict, debug: bool = False) -> Set[str]:
     """
     Matches aliases using literal or fuzzy logic, and returns the expression tags
     that had at least one alias matched.
@@ -50,6 +50,7 @@ def extract_alias_matches(text: str, expression_def: dict) -> Set[str]:
     Returns:
         Set[str]: Expression tags like {'elegant', 'romantic'}
     """
+    trace = debug_trace(debug, "expression_matcher.extract_alias_matches")
     text_lower = normalize_token(text)
     tokens = [singularize(tok) for tok in text_lower.split()]
     matched_expressions = set()
@@ -70,17 +71,16 @@ def extract_alias_matches(text: str, expression_def: dict) -> Set[str]:
                     score = fuzz.ratio(alias_lower, word)
 
                     if are_antonyms(alias_lower, word):
-                        if debug:
-                            print(f"[🚫 FUZZY BLOCKED: ANTONYMS] alias='{alias_lower}' vs token='{word}'")
+                        if trace:
+                            trace.event("[🚫 FUZZY BLOCKED: ANTONYMS] alias='{}' vs token='{}'", alias_lower, word)
                         continue
 
                     # Special negation check: block fuzzy match if 'no-X' vs 'X' appears
                     if alias_lower.startswith("no-"):
                         positive = alias_lower.replace("no-", "")
                         if positive in tokens:
-                            if debug:
-                                print(
-                                    f"[⚠️ FUZZY CONFLICT] alias='{alias_lower}' rejected due to presence of '{positive}' in input")
+                            if trace:
+                                trace.event("[⚠️ FUZZY CONFLICT] alias='{}' rejected due to presence of '{}' in input", alias_lower, positive)
                             continue
 
                     if score >= 80:
@@ -93,34 +93,35 @@ def map_expressions_to_tones(
     text: str,
     expression_def: Dict[str, Dict[str, List[str]]],
     known_tones: Set[str],
-    debug: bool = True
+    debug: bool = False
 ) -> Dict[str, List[str]]:
+    trace = debug_trace(debug, "expression_matcher.map_expressions_to_tones")
     results = {}
     text_lower = normalize_token(text)
-    raw_matched = extract_alias_matches(text, expression_def)
+    raw_matched = extract_alias_matches(text, expression_def, debug)
     tokens = [singularize(tok) for tok in text_lower.split()]
     context_map = load_expression_context_rules()
 
     # 🚀 Promote expressions via co-occurrence context
     promoted = apply_expression_context_rules(tokens, raw_matched, context_map)
-    if debug and promoted:
-        print(f"[📈 CONTEXT PROMOTED] → {promoted}")
+    if trace and promoted:
+        trace.event("[📈 CONTEXT PROMOTED] → {}", promoted)
 
     # Union matched + promoted before suppression
     raw_matched |= promoted
 
     longest_matched_aliases = apply_expression_suppression_rules(raw_matched)
-    if debug:
+    if trace:
         removed = raw_matched - longest_matched_aliases
         if removed:
-            print(f"[🧹 SUPPRESSED] Removed lower-priority expressions → {removed}")
+            trace.event("[🧹 SUPPRESSED] Removed lower-priority expressions → {}", removed)
 
     for expr, data in expression_def.items():
         aliases = data.get("aliases", [])
 
         if expr not in longest_matched_aliases and not any(alias in longest_matched_aliases for alias in aliases):
-            if debug:
-                print(f"[❌ SKIP] {expr}: no aliases matched for '{expr}'")
+            if trace:
+                trace.event("[❌ SKIP] {}: no aliases matched for '{}'", expr, expr)
             continue
 
         matched = [
@@ -130,22 +131,22 @@ def map_expressions_to_tones(
         ]
 
         if not matched:
-            if debug:
-                print(f"[🚫 BLOCKED] {expr}: fuzzy passed, but no alias survived literal/fuzzy match")
-                print(f"  Aliases: {aliases}")
-                print(f"  Input: '{text}'")
-                print(f"  longest_matched_aliases: {longest_matched_aliases}")
+            if trace:
+                trace.event("[🚫 BLOCKED] {}: fuzzy passed, but no alias survived literal/fuzzy match", expr)
+                trace.event("  Aliases: {}", aliases)
+                trace.event("  Input: '{}'", text)
+                trace.event("  longest_matched_aliases: {}", longest_matched_aliases)
             continue
 
-        if debug:
-            print(f"[✅ ALIAS MATCH] {expr}: kept aliases → {matched}")
+        if trace:
+            trace.event("[✅ ALIAS MATCH] {}: kept aliases → {}", expr, matched)
 
         modifiers = data.get("modifiers", [])
         valid_tones = [m for m in modifiers if m in known_tones]
         if valid_tones:
             results[expr] = valid_tones
-            if debug:
-                print(f"[✅ MAPPED] {expr} → {valid_tones}")
+            if trace:
+                trace.event("[✅ MAPPED] {} → {}", expr, valid_tones)
 
     return results
 
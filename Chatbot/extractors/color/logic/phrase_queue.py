@@ -0,0 +1,151 @@
+# Chatbot/extractors/color/logic/phrase_queue.py
+
+"""
+phrase_queue.py
+===============
+
+Request-scoped deduplication of phrase work.
+
+The same phrase often turns up several times in one request: in several
+segments, under both sentiments, or from both the compound and the
+standalone extraction pass. Each occurrence used to go through
+`process_phrase` again (RGB lookup, similar names, LLM simplification).
+
+`PhraseWorkQueue` collects every occurrence first, resolves each unique
+normalized phrase once (first-seen spelling as representative), and fans
+the results back out to every occurrence. Anything a result derives from
+the phrase text itself (e.g. the phrase as its own fallback name) is
+rebuilt per spelling by a `finish` step, so a later spelling never gets
+the representative's text. Per-request counters show the work saved;
+process-wide totals are in `phrase_dedup_stats()`.
+
+Used By:
+--------
+- extractor.extract_color_pipeline / extract_color_pipeline_many / extract_color_pipeline_async
+"""
+
+import threading
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, TypeVar
+
+from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
+
+T = TypeVar("T")
+
+_FIELDS = ("requests", "occurrences", "unique", "saved")
+
+
+class PhraseDedupStats:
+    """
+    Process-wide dedup counters (thread-safe).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for key, value in counts.items():
+                self._counts[key] += value
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            counts = dict(self._counts)
+        counts["saved_ratio"] = counts["saved"] / counts["occurrences"] if counts["occurrences"] else 0.0
+        return counts
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = dict.fromkeys(_FIELDS, 0)
+
+
+_stats = PhraseDedupStats()
+
+
+def phrase_dedup_stats() -> Dict[str, float]:
+    """
+    Returns cumulative requests / occurrences / unique / saved counts and
+    the share of phrase occurrences that did not need their own resolution.
+    """
+    return _stats.snapshot()
+
+
+def reset_phrase_dedup_stats() -> None:
+    _stats.reset()
+
+
+class PhraseWorkQueue(Generic[T]):
+    """
+    Usage:
+        queue = PhraseWorkQueue()
+        for segment in segments:
+            queue.add(phrases_of[segment])
+        resolved = queue.run(process)      # {phrase: result} for every spelling seen
+        resolved = queue.run(lookup, finish=lambda phrase, found: ...)   # per-spelling result
+        queue.stats()                      # {'occurrences': 5, 'unique': 3, 'saved': 2}
+    """
+
+    def __init__(self, key: Callable[[str], str] = normalize_token):
+        self._key = key
+        self._representatives: Dict[str, str] = {}   # key → first-seen phrase
+        self._spellings: Dict[str, str] = {}         # phrase → key
+        self.occurrences = 0
+        self._done = False
+
+    def add(self, phrases: Iterable[str]) -> None:
+        for phrase in phrases:
+            self.occurrences += 1
+            key = self._spellings.get(phrase)
+            if key is None:
+                key = self._spellings[phrase] = self._key(phrase)
+                self._representatives.setdefault(key, phrase)
+
+    def unique_phrases(self) -> List[str]:
+        """
+        Returns one representative phrase per normalized key, in first-seen order.
+        """
+        return list(self._representatives.values())
+
+    def fan_out(
+        self,
+        results: Dict[str, T],
+        finish: Optional[Callable[[str, T], Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Maps results keyed by representative to every spelling seen, and
+        records the request's counters.
+
+        Args:
+            results (Dict[str, T]): Result per phrase of `unique_phrases()`.
+            finish (Callable, optional): (spelling, shared result) → that spelling's result.
+
+        Returns:
+            Dict[str, Any]: Result per phrase as added (all spellings).
+        """
+        by_key = {self._spellings[phrase]: result for phrase, result in results.items()}
+        if not self._done:
+            self._done = True
+            stats = self.stats()
+            _stats.add(requests=1, occurrences=stats["occurrences"], unique=stats["unique"], saved=stats["saved"])
+        if finish is None:
+            return {phrase: by_key[key] for phrase, key in self._spellings.items()}
+        return {phrase: finish(phrase, by_key[key]) for phrase, key in self._spellings.items()}
+
+    def run(
+        self,
+        resolve: Callable[[str], T],
+        executor: Optional[Executor] = None,
+        finish: Optional[Callable[[str, T], Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Resolves each unique phrase once (concurrently on `executor` if given)
+        and fans the results out (through `finish`, if given).
+        """
+        unique = self.unique_phrases()
+        results = executor.map(resolve, unique) if executor is not None else map(resolve, unique)
+        return self.fan_out(dict(zip(unique, results)), finish)
+
+    def stats(self) -> Dict[str, int]:
+        unique = len(self._representatives)
+        return {"occurrences": self.occurrences, "unique": unique, "saved": self.occurrences - unique}
@@ -0,0 +1,206 @@
+# Chatbot/extractors/color/logic/prefetch.py
+
+"""
+prefetch.py
+===========
+
+Speculative RGB prefetch for the pipelined mode of `extract_color_pipeline`.
+
+A cheap lexical pass (no spaCy) guesses the color phrases of a message —
+modifier + tone bigrams ('dusty rose', 'soft-pink') and lone tones — and
+their RGB lookups (cache → LLM) are started on a small thread pool while
+sentiment classification runs, so network latency overlaps with model
+inference. When the real phrases are known, matching prefetches are
+consumed; the rest are cancelled if not started yet, or discarded, and
+counted as wasted.
+
+Used By:
+--------
+- extractor.extract_color_pipeline(prefetch=True)
+"""
+
+import logging
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from Chatbot.extractors.color.logic.compound_rule import is_blocked_modifier_tone_pair
+from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
+
+PREFETCH_WORKERS = 4
+PREFETCH_MAX_PHRASES = 8
+
+_WORD_RE = re.compile(r"[a-z]+(?:-[a-z]+)*")
+
+logger = logging.getLogger(__name__)
+
+RGB = Tuple[int, int, int]
+
+
+def guess_color_phrases(
+    text: str,
+    known_tones: Set[str],
+    known_modifiers: Set[str],
+    max_phrases: int = PREFETCH_MAX_PHRASES
+) -> List[str]:
+    """
+    Lexical guess of the color phrases in `text`.
+
+    Args:
+        text (str): Raw user input.
+        known_tones (Set[str]): Recognized base tones.
+        known_modifiers (Set[str]): Recognized modifiers.
+        max_phrases (int): Cap on the number of guesses.
+
+    Returns:
+        List[str]: Normalized phrases in order of appearance, without duplicates.
+    """
+    words = [normalize_token(word) for word in _WORD_RE.findall(text.lower())]
+    guesses: Dict[str, None] = {}
+
+    for index, word in enumerate(words):
+        if " " in word:  # hyphenated: 'soft-pink' → 'soft pink'
+            modifier, _, tone = word.rpartition(" ")
+            if tone in known_tones and modifier in known_modifiers:
+                guesses[word] = None
+            continue
+        if word not in known_tones:
+            continue
+        previous = words[index - 1] if index else ""
+        if previous in known_modifiers and not is_blocked_modifier_tone_pair(previous, word):
+            guesses[f"{previous} {word}"] = None
+        else:
+            guesses[word] = None
+
+    return list(guesses)[:max_phrases]
+
+
+class PrefetchStats:
+    """
+    Process-wide prefetch counters (thread-safe).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for key, value in counts.items():
+                self._counts[key] += value
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            counts = dict(self._counts)
+        counts["waste_ratio"] = counts["wasted"] / counts["prefetched"] if counts["prefetched"] else 0.0
+        return counts
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = dict.fromkeys(("prefetched", "used", "wasted", "cancelled", "missed"), 0)
+
+
+_stats = PrefetchStats()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def prefetch_stats() -> Dict[str, float]:
+    """
+    Returns cumulative prefetched / used / wasted / cancelled / missed counts
+    and the share of prefetches that were wasted.
+    """
+    return _stats.snapshot()
+
+
+def reset_prefetch_stats() -> None:
+    _stats.reset()
+
+
+def _reset_executor_after_fork() -> None:
+    # The parent's pool threads do not exist in a forked child
+    global _executor, _executor_lock
+    _executor, _executor_lock = None, threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_executor_after_fork)
+
+
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared prefetch thread pool (created on first use).
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="color-prefetch")
+    return _executor
+
+
+class ColorPrefetcher:
+    """
+    Speculative RGB lookups for one message.
+
+    Usage:
+        prefetcher = ColorPrefetcher(resolve).start(guess_color_phrases(text, tones, modifiers))
+        ...  # sentiment classification, phrase extraction
+        rgb = prefetcher.resolve(phrase)
+        prefetcher.finish()
+    """
+
+    def __init__(self, resolve: Callable[[str], Optional[RGB]], executor: Optional[ThreadPoolExecutor] = None):
+        self._resolve = resolve
+        self._executor = executor or get_prefetch_executor()
+        self._futures: Dict[str, Future] = {}
+        self._used: Set[str] = set()
+        self._missed = 0
+
+    def start(self, phrases: Iterable[str]) -> "ColorPrefetcher":
+        for phrase in phrases:
+            key = normalize_token(phrase)
+            if key not in self._futures:
+                self._futures[key] = self._executor.submit(self._resolve, phrase)
+        return self
+
+    def resolve(self, phrase: str) -> Optional[RGB]:
+        """
+        Returns the prefetched RGB for `phrase` (waiting if still in flight),
+        or resolves it now if it was not guessed.
+        """
+        key = normalize_token(phrase)
+        future = self._futures.get(key)
+        if future is None or future.cancelled():
+            self._missed += 1
+            return self._resolve(phrase)
+
+        self._used.add(key)
+        try:
+            return future.result()
+        except Exception as e:
+            logger.warning(f"[⚠️ PREFETCH FAIL] '{phrase}' → {e}; resolving inline")
+            return self._resolve(phrase)
+
+    def finish(self) -> Dict[str, int]:
+        """
+        Cancels or discards unused prefetches and records the counts.
+
+        Returns:
+            Dict[str, int]: This message's prefetched / used / wasted / cancelled / missed.
+        """
+        unused = [future for key, future in self._futures.items() if key not in self._used]
+        cancelled = sum(future.cancel() for future in unused)
+        counts = {
+            "prefetched": len(self._futures),
+            "used": len(self._used),
+            "wasted": len(unused) - cancelled,
+            "cancelled": cancelled,
+            "missed": self._missed,
+        }
+        _stats.add(**counts)
+        if unused:
+            logger.debug(f"[🗑️ PREFETCH WASTE] {counts}")
+        return counts
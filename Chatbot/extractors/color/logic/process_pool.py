@@ -0,0 +1,238 @@
+# Chatbot/extractors/color/logic/process_pool.py
+
+"""
+process_pool.py
+===============
+
+Multiprocess execution mode for batch extraction.
+
+Parsing, fuzzy matching, suffix stripping and splitting are CPU-bound
+Python and hold the GIL, so threads do not scale them; worker processes do.
+
+- Models and vocabularies (spaCy, sentiment classifier, palette / grid /
+  fuzzy indexes) are loaded once in the parent, which then runs
+  `gc.collect()` + `gc.freeze()` and forks the workers: the loaded objects
+  sit in the permanent GC generation, so collections in the workers do not
+  write to their pages and copy-on-write keeps them shared
+- Texts are sent in chunks (one IPC round trip per `chunk_size` texts),
+  with at most `workers * MAX_CHUNKS_IN_FLIGHT` chunks outstanding, so any
+  iterator is streamed and results come back in input order
+- Per-worker stats: chunks, texts, busy seconds and peak RSS
+
+Where fork is unavailable (Windows, macOS default) workers are spawned
+and load the models themselves.
+
+Usage:
+------
+    with ColorProcessPool(workers=8) as pool:
+        for output in pool.map(texts):
+            ...
+
+Used By:
+--------
+- benchmarks/bench_process_pool.py
+- Offline batch jobs
+"""
+
+import gc
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROCESS_POOL_CHUNK_SIZE = 64
+MAX_CHUNKS_IN_FLIGHT = 2
+
+logger = logging.getLogger(__name__)
+
+Extract = Callable[[List[str]], List[Any]]
+
+_worker_extract: Optional[Extract] = None
+
+
+# ------------------ DEFAULT WORKLOAD ------------------ #
+
+def preload_models() -> None:
+    """
+    Loads everything the extraction pipeline reads, so forked workers share it.
+    """
+    import Chatbot.extractors.color.extractor  # noqa: F401  (spaCy + sentiment model)
+    from Chatbot.extractors.color.shared.vocab import load_vocabularies
+    from Chatbot.extractors.color.utils.fuzzy_name_index import (
+        get_css4_name_index,
+        get_webcolor_name_index,
+        get_xkcd_name_index,
+    )
+    from Chatbot.extractors.color.utils.palette_index import get_palette_index, get_palette_rgb_map
+    from Chatbot.extractors.color.utils.rgb_grid import get_default_rgb_grid
+
+    load_vocabularies()
+    get_palette_rgb_map()
+    get_palette_index()
+    get_default_rgb_grid()
+    get_webcolor_name_index()
+    get_xkcd_name_index()
+    get_css4_name_index()
+
+
+def extract_colors(texts: List[str]) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    Default worker task: `extract_color_pipeline_many` over one chunk.
+    New cache entries are flushed so other workers see them.
+    """
+    from Chatbot.cache.llm_cache import ColorLLMCache
+    from Chatbot.extractors.color.extractor import extract_color_pipeline_many
+    from Chatbot.extractors.color.shared.vocab import load_vocabularies
+
+    known_tones, known_modifiers = load_vocabularies()
+    outputs = list(extract_color_pipeline_many(texts, known_tones, known_modifiers, batch_size=len(texts)))
+    ColorLLMCache.get_instance().flush()
+    return outputs
+
+
+# ------------------ WORKER SIDE ------------------ #
+
+def _peak_rss_kb() -> int:
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _init_worker(extract: Extract, preload: Optional[Callable[[], None]]) -> None:
+    global _worker_extract
+    _worker_extract = extract
+    if preload is not None:  # spawned workers start empty
+        preload()
+
+
+def _run_chunk(texts: List[str]) -> Tuple[int, List[Any], float, int]:
+    start = time.perf_counter()
+    outputs = _worker_extract(texts)
+    return os.getpid(), outputs, time.perf_counter() - start, _peak_rss_kb()
+
+
+# ------------------ POOL ------------------ #
+
+class ColorProcessPool:
+    """
+    Process pool for batch extraction with shared, pre-loaded models.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = PROCESS_POOL_CHUNK_SIZE,
+        extract: Extract = extract_colors,
+        preload: Optional[Callable[[], None]] = preload_models,
+        start_method: Optional[str] = None
+    ):
+        """
+        Args:
+            workers (int, optional): Worker processes (default: CPU count).
+            chunk_size (int): Texts per task.
+            extract (Callable): Task run in the workers, List[str] → one output per text.
+                Must be a module-level function when workers are spawned.
+            preload (Callable, optional): Loads shared state before the workers start.
+            start_method (str, optional): 'fork' (default where available) or 'spawn'.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.extract = extract
+        self.preload = preload
+        self.start_method = start_method or ("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+        self._pool = None
+        self._frozen = False
+        self._owns_freeze = False
+        self._worker_stats: Dict[int, Dict[str, float]] = {}
+        self.preload_seconds = 0.0
+
+    def start(self) -> "ColorProcessPool":
+        if self._pool is not None:
+            return self
+        context = multiprocessing.get_context(self.start_method)
+        forked = self.start_method == "fork"
+
+        if forked:
+            start = time.perf_counter()
+            if self.preload is not None:
+                self.preload()
+            self.preload_seconds = time.perf_counter() - start
+            gc.collect()
+            # gc.freeze() is process-wide: only the pool that froze first unfreezes
+            self._owns_freeze = gc.get_freeze_count() == 0
+            gc.freeze()
+            self._frozen = True
+            logger.info(f"[🧊 GC FREEZE] {gc.get_freeze_count()} objects shared with {self.workers} workers")
+
+        self._pool = context.Pool(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(self.extract, None if forked else self.preload)
+        )
+        return self
+
+    def map(self, texts: Iterable[str]) -> Iterator[Any]:
+        """
+        Yields `extract` outputs for `texts`, in input order.
+        """
+        self.start()
+        texts = iter(texts)
+        pending = deque()
+        max_pending = self.workers * MAX_CHUNKS_IN_FLIGHT
+
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(islice(texts, self.chunk_size))
+                if not chunk:
+                    break
+                pending.append((len(chunk), self._pool.apply_async(_run_chunk, (chunk,))))
+            if not pending:
+                return
+            count, result = pending.popleft()
+            pid, outputs, seconds, rss_kb = result.get()
+            self._record(pid, count, seconds, rss_kb)
+            yield from outputs
+
+    def _record(self, pid: int, texts: int, seconds: float, rss_kb: int) -> None:
+        stats = self._worker_stats.setdefault(pid, {"chunks": 0, "texts": 0, "busy_seconds": 0.0, "peak_rss_kb": 0})
+        stats["chunks"] += 1
+        stats["texts"] += texts
+        stats["busy_seconds"] += seconds
+        stats["peak_rss_kb"] = max(stats["peak_rss_kb"], rss_kb)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Returns per-worker stats (keyed by pid) and totals.
+        """
+        workers = {pid: dict(stats) for pid, stats in self._worker_stats.items()}
+        return {
+            "workers": workers,
+            "chunks": sum(stats["chunks"] for stats in workers.values()),
+            "texts": sum(stats["texts"] for stats in workers.values()),
+            "busy_seconds": sum(stats["busy_seconds"] for stats in workers.values()),
+            "preload_seconds": self.preload_seconds,
+            "frozen_objects": gc.get_freeze_count() if self._frozen else 0,
+        }
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._owns_freeze:
+            gc.unfreeze()
+        self._frozen = self._owns_freeze = False
+
+    def __enter__(self) -> "ColorProcessPool":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,130 @@
+# Chatbot/extractors/color/logic/tone_signatures.py
+"""
+tone_signatures.py
+==================
+
+Tone signatures for color names, as integer bitsets over `known_tones`.
+
+A color name's signature has one bit per known tone found among its
+normalized whitespace-split tokens ('dusty rose pink' → {rose, pink}).
+`normalize_token` turns '-' and '_' into spaces, so a hyphenated token
+can match a multi-word tone ('soft dusty-rose' → {dusty rose}). Signatures are
+computed once per name and memoized, so checking a whole positive list
+against a whole negative list is one OR-reduction plus one AND per name
+instead of a nested loop of string work.
+
+Used By:
+--------
+- extractor.resolve_color_conflicts
+"""
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Set
+
+from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
+
+SIGNATURE_CACHE_SIZE = 50_000
+
+
+class ToneSignatureIndex:
+    """
+    Bit assignment over known tones plus a memo of per-name signatures.
+
+    Every tone gets a bit, multi-word ones included: a single token such
+    as 'dusty-rose' normalizes to the multi-word tone 'dusty rose'.
+    """
+
+    def __init__(self, known_tones: Iterable[str]):
+        self._bits: Dict[str, int] = {
+            tone: 1 << pos
+            for pos, tone in enumerate(sorted(set(known_tones)))
+        }
+        self._token_bits: Dict[str, int] = {}
+        self._signatures: Dict[str, int] = {}
+
+    def token_signature(self, token: str) -> int:
+        bit = self._token_bits.get(token)
+        if bit is None:
+            bit = self._bits.get(normalize_token(token), 0)
+            if len(self._token_bits) >= SIGNATURE_CACHE_SIZE:
+                self._token_bits.clear()
+            self._token_bits[token] = bit
+        return bit
+
+    def signature(self, color_name: str) -> int:
+        """
+        Returns the tone bitset of a color name (0 if it has no known tone).
+
+        Args:
+            color_name (str): Color name (e.g., 'dusty rose').
+
+        Returns:
+            int: Bitset over known tones.
+        """
+        sig = self._signatures.get(color_name)
+        if sig is None:
+            sig = 0
+            for token in color_name.split():
+                sig |= self.token_signature(token)
+            if len(self._signatures) >= SIGNATURE_CACHE_SIZE:
+                self._signatures.clear()
+            self._signatures[color_name] = sig
+        return sig
+
+    def tones(self, signature: int) -> Set[str]:
+        """
+        Decodes a bitset back into tone names.
+        """
+        return {tone for tone, bit in self._bits.items() if signature & bit}
+
+
+@lru_cache(maxsize=8)
+def _cached_index(known_tones: FrozenSet[str]) -> ToneSignatureIndex:
+    return ToneSignatureIndex(known_tones)
+
+
+def get_tone_signature_index(known_tones: Iterable[str]) -> ToneSignatureIndex:
+    """
+    Returns the shared signature index for a tone vocabulary.
+
+    Args:
+        known_tones (Iterable[str]): Recognized base tones.
+
+    Returns:
+        ToneSignatureIndex: Index reused across calls with the same tones.
+    """
+    return _cached_index(frozenset(known_tones))
+
+
+def find_tone_conflicts(
+    positive: Iterable[str],
+    negative: Iterable[str],
+    known_tones: Iterable[str]
+) -> Set[str]:
+    """
+    Finds positive colors that conflict with the negative ones.
+
+    A positive color conflicts when it also appears in the negative list,
+    or when it shares at least one base tone with any negative color.
+    Sharing a tone with some negative color is the same as intersecting
+    the union of all negative signatures, so the check is O(P + N).
+
+    Args:
+        positive (Iterable[str]): Positive color names.
+        negative (Iterable[str]): Negative color names.
+        known_tones (Iterable[str]): Recognized base tones.
+
+    Returns:
+        Set[str]: Conflicting positive color names.
+    """
+    index = get_tone_signature_index(known_tones)
+    positive_set = set(positive)
+    negative_set = set(negative)
+
+    negative_mask = 0
+    for color in negative_set:
+        negative_mask |= index.signature(color)
+
+    conflicts = positive_set & negative_set
+    if negative_mask:
+        conflicts.update(color for color in positive_set if index.signature(color) & negative_mask)
+    return conflicts
@@ -9,163 +9,111 @@ Provides utilities to:
 - Fuzzy match simplified color phrases to known XKCD and CSS4 palettes.
 """
 
-import json
 import logging
 import os
-import re
-from typing import Optional, Tuple, List, Dict
-
-import requests
-import webcolors
-from matplotlib.colors import XKCD_COLORS, CSS4_COLORS
-from rapidfuzz import process
-
-from Chatbot.extractors.color.llm.simplifier import simplify_color_description_with_llm
+from typing import Optional, Tuple, List, Dict, Union
+
+from rapidfuzz import fuzz
+
+from Chatbot.cache.llm_cache import ColorLLMCache
+from Chatbot.extractors.color.llm.circuit_breaker import llm_available
+from Chatbot.extractors.color.llm.latency_budget import LatencyBudget
+from Chatbot.extractors.color.llm.llm_api_client import query_llm_for_rgb as query_llm_for_rgb_cached
+from Chatbot.extractors.color.llm.llm_transport import LLMTransport
+from Chatbot.extractors.color.llm.simplifier import simplify_phrase_with_llm
+from Chatbot.extractors.color.utils.fuzzy_name_index import get_css4_name_index, get_xkcd_name_index
+from Chatbot.extractors.color.utils.palette_index import lookup_palette_rgb
 from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
 
 logger = logging.getLogger(__name__)
 
-# Precompile RGB extraction regex for performance
-RGB_REGEX = re.compile(r'\{\s*"rgb"\s*:\s*\[\s*(\d{1,3})\s*,\s*(\d{1,3})\s*,\s*(\d{1,3})\s*\]\s*\}')
-
-
-def build_llm_request_payload(color_phrase: str) -> dict:
-    """
-    Builds the payload dictionary for the LLM RGB query.
-
-    Args:
-        color_phrase (str): Descriptive color name.
-
-    Returns:
-        dict: JSON payload for the LLM request.
-    """
-    prompt = (
-        f"You're a color matching assistant. Given the color name '{color_phrase}', "
-        "estimate its most accurate RGB value based on design and fashion industry standards. "
-        "Return only the result in this exact JSON format: {\"rgb\": [R, G, B]} "
-        "with integers between 0 and 255. No explanation.\n\n"
-        "Use examples like: 'dusty pink' → [213, 138, 148], 'peachy beige' → [243, 207, 183]"
-    )
-    return {
-        "model": "mistralai/mistral-7b-instruct",
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.2,
-        "max_tokens": 20,
-    }
-
-
-def build_llm_headers(api_key: str) -> dict:
-    """
-    Constructs HTTP headers for LLM API call.
-
-    Args:
-        api_key (str): API key for authorization.
 
-    Returns:
-        dict: Headers for the request.
+def query_llm_for_rgb(
+    color_phrase: str,
+    budget: Union[None, float, LatencyBudget] = None,
+    cache=None,
+    transport: Optional[LLMTransport] = None
+) -> Optional[Tuple[int, int, int]]:
     """
-    return {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
-
+    Queries the LLM to estimate the RGB value for a descriptive color phrase,
+    through llm_api_client.query_llm_for_rgb: shared ColorLLMCache (hits and
+    negative entries), single-flight per phrase, and the pooled transport
+    with the shared circuit breaker and rate limiter.
 
-def query_llm_for_rgb(color_phrase: str) -> Optional[Tuple[int, int, int]]:
-    """
-    Queries the LLM to estimate the RGB value for a descriptive color phrase.
+    The request uses llm_api_client's prompt and parser (an "(R, G, B)"
+    tuple reply), so entries cached here and by llm_api_client agree.
 
     Args:
         color_phrase (str): Descriptive color name.
+        budget (float | LatencyBudget, optional): Caps the request, retries included.
+        cache: Defaults to ColorLLMCache.get_instance().
+        transport (LLMTransport, optional): Defaults to the shared pooled transport.
 
     Returns:
-        Optional[Tuple[int, int, int]]: RGB tuple if successfully parsed; None otherwise.
+        Optional[Tuple[int, int, int]]: RGB tuple if successfully parsed; None otherwise
+        (also when the budget is spent, the circuit is open or the rate
+        limiter refuses the call).
+
+    Raises:
+        ValueError: If OPENROUTER_API_KEY is not set.
     """
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
+    if not os.getenv("OPENROUTER_API_KEY"):
         raise ValueError("OPENROUTER_API_KEY not found in environment variables.")
 
-    try:
-        headers = build_llm_headers(api_key)
-        payload = build_llm_request_payload(color_phrase)
-        response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers=headers,
-            data=json.dumps(payload),
-            timeout=10
-        )
-        response.raise_for_status()
-    except requests.RequestException as e:
-        logger.error(f"LLM request failed: {e}")
+    budget = LatencyBudget.coerce(budget)
+    if budget.expired():
         return None
+    if cache is None:
+        cache = ColorLLMCache.get_instance()
+    return query_llm_for_rgb_cached(color_phrase, cache=cache, transport=transport, deadline=budget)
 
-    try:
-        raw_output = response.json()["choices"][0]["message"]["content"].strip()
-    except (KeyError, json.JSONDecodeError) as e:
-        logger.error(f"Invalid JSON response from LLM: {e}")
-        return None
 
-    match = RGB_REGEX.search(raw_output)
-    if match:
-        try:
-            r, g, b = map(int, match.groups())
-            if all(0 <= val <= 255 for val in (r, g, b)):
-                return (r, g, b)
-            logger.warning(f"RGB values out of range: {r}, {g}, {b}")
-        except Exception as e:
-            logger.error(f"Error parsing RGB values: {e}")
-    else:
-        logger.warning(f"Unexpected LLM output format: {raw_output}")
-
-    return None
-
-
-def get_rgb_from_descriptive_color_llm_first(input_color: str) -> Optional[Tuple[int, int, int]]:
+def get_rgb_from_descriptive_color_llm_first(
+    input_color: str,
+    budget: Union[None, float, LatencyBudget] = None
+) -> Optional[Tuple[int, int, int]]:
     """
     Attempts to resolve the RGB value for a descriptive color term by:
     1. Querying the LLM directly.
-    2. Simplifying the color phrase and checking exact matches in XKCD and CSS4 palettes.
+    2. Simplifying the color phrase and checking exact matches in the XKCD/CSS4 palette index.
     3. Fuzzy matching known colors as a fallback.
 
+    Steps 1–2 are skipped (the raw phrase is matched locally) while the LLM
+    circuit is open or the latency budget is spent.
+
     Args:
         input_color (str): Descriptive color term.
+        budget (float | LatencyBudget, optional): Latency budget for the LLM steps.
 
     Returns:
         Optional[Tuple[int, int, int]]: RGB tuple if found, else None.
     """
+    budget = LatencyBudget.coerce(budget)
     try:
-        rgb = query_llm_for_rgb(input_color)
+        rgb = query_llm_for_rgb(input_color, budget=budget)
         if rgb:
             return rgb
     except Exception as e:
         logger.error(f"LLM RGB query failed for '{input_color}': {e}")
 
-    try:
-        simplified_list = simplify_color_description_with_llm(input_color)
-    except Exception as e:
-        logger.error(f"Failed to simplify color '{input_color}': {e}")
-        return None
+    if not llm_available(budget):
+        simplified_list = [input_color]
+    else:
+        try:
+            simplified_list = simplify_phrase_with_llm(input_color, budget)
+        except Exception as e:
+            logger.error(f"Failed to simplify color '{input_color}': {e}")
+            return None
 
     if not simplified_list:
         return None
 
     simplified = normalize_token(simplified_list[0])
 
-    # Exact match in XKCD colors
-    for name, hex_code in XKCD_COLORS.items():
-        clean_name = normalize_token(name.replace("xkcd:", ""))
-        if simplified == clean_name:
-            try:
-                return webcolors.hex_to_rgb(hex_code)
-            except ValueError as e:
-                logger.warning(f"Invalid hex code '{hex_code}' for XKCD color '{name}': {e}")
-            break
-
-    # Exact match in CSS4 colors
-    if simplified in CSS4_COLORS:
-        try:
-            return webcolors.hex_to_rgb(CSS4_COLORS[simplified])
-        except ValueError as e:
-            logger.warning(f"Invalid hex code '{CSS4_COLORS[simplified]}' for CSS4 color '{simplified}': {e}")
+    # Exact match in XKCD / CSS4 colors (O(1) palette index)
+    rgb = lookup_palette_rgb(simplified)
+    if rgb:
+        return rgb
 
     # Fuzzy match fallback
     try:
@@ -209,24 +157,12 @@ def fuzzy_match_rgb_from_known_colors(color_phrase: str) -> Optional[Tuple[int,
     """
     simplified = normalize_token(color_phrase)
 
-    try:
-        xkcd_names = [name.replace("xkcd:", "") for name in XKCD_COLORS]
-        best_match_xkcd, score_xkcd = process.extractOne(simplified, xkcd_names)
-        if score_xkcd >= 80:
-            hex_code = XKCD_COLORS.get(f"xkcd:{best_match_xkcd}")
-            if hex_code:
-                return webcolors.hex_to_rgb(hex_code)
-    except Exception as e:
-        logger.error(f"XKCD fuzzy matching failed for '{simplified}': {e}")
-
-    try:
-        css_names = list(CSS4_COLORS.keys())
-        best_match_css, score_css = process.extractOne(simplified, css_names)
-        if score_css >= 80:
-            hex_code = CSS4_COLORS.get(best_match_css)
-            if hex_code:
-                return webcolors.hex_to_rgb(hex_code)
-    except Exception as e:
-        logger.error(f"CSS4 fuzzy matching failed for '{simplified}': {e}")
+    for label, index in (("XKCD", get_xkcd_name_index()), ("CSS4", get_css4_name_index())):
+        try:
+            match = index.best_match(simplified, score_cutoff=80, scorer=fuzz.WRatio)
+            if match:
+                return match[1]
+        except Exception as e:
+            logger.error(f"{label} fuzzy matching failed for '{simplified}': {e}")
 
     return None
@@ -16,6 +16,7 @@ from Chatbot.extractors.color.old.core import tokenize_text
 from Chatbot.extractors.color.old.extract import extract_compound_phrases
 from Chatbot.extractors.color.old.extract import extract_standalone_phrases, extract_lone_tones
 from Chatbot.extractors.color.old.extract import extract_suffix_fallbacks
+from Chatbot.extractors.color.utils.telemetry import span
 
 
 
@@ -45,15 +46,19 @@ def extract_all_descriptive_color_phrases(
     tokens, token_counts = tokenize_text(text)
     blocked_nouns = {"lipstick", "blush"}
 
-    compounds, raw_compounds = extract_compound_phrases(
-        tokens, known_tones, known_modifiers, all_webcolor_names, debug
-    )
-    singles = extract_standalone_phrases(
-        tokens, token_counts, compounds, raw_compounds,
-        known_tones, known_modifiers, all_webcolor_names, blocked_nouns, debug
-    )
-    lone_tones = extract_lone_tones(tokens, raw_compounds, known_tones, blocked_nouns, debug)
-    suffix_tokens = extract_suffix_fallbacks(tokens, known_tones, known_modifiers, all_webcolor_names, debug)
+    with span("compound"):
+        compounds, raw_compounds = extract_compound_phrases(
+            tokens, known_tones, known_modifiers, all_webcolor_names, debug
+        )
+    with span("standalone"):
+        singles = extract_standalone_phrases(
+            tokens, token_counts, compounds, raw_compounds,
+            known_tones, known_modifiers, all_webcolor_names, blocked_nouns, debug
+        )
+    with span("lone_tones"):
+        lone_tones = extract_lone_tones(tokens, raw_compounds, known_tones, blocked_nouns, debug)
+    with span("suffix_fallback"):
+        suffix_tokens = extract_suffix_fallbacks(tokens, known_tones, known_modifiers, all_webcolor_names, debug)
 
     phrases = sorted(set(compounds) | set(singles) | set(lone_tones) | set(suffix_tokens))
     if debug:
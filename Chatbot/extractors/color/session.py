@@ -0,0 +1,300 @@
+# Chatbot/extractors/color/session.py
+
+"""
+session.py
+==========
+
+Incremental color extraction for chat sessions.
+
+Users refine preferences turn by turn ("peachy pink" … "actually not too
+shiny" … "and no red"). A `ColorSession` processes only the new turn and
+merges it into the preferences accumulated so far:
+
+- Phrases of already-seen segments and resolved phrases (RGB lookup,
+  similar names, simplification) are kept per session and reused, so a
+  phrase repeated in a later turn costs no LLM call. A phrase resolved
+  once the turn's budget had run out (local fallback only) is not kept,
+  so a later turn resolves it in full
+- Merging follows `extractor.resolve_color_conflicts`: a positive color
+  that shares a tone with a negative one moves to the negative side.
+  The latest turn wins over older ones — colors named again flip side,
+  and older negatives that conflict with a new positive are dropped
+- Memory is bounded: phrase / segment memos are LRU, and each side keeps
+  at most `max_colors` names (least recently mentioned dropped first)
+
+`SessionStore` holds sessions by id with an LRU cap and an idle TTL.
+
+Used By:
+--------
+- Chatbot/service/server.py (POST /extract with a "session_id")
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from Chatbot.cache.lru_ttl import BoundedTTLCache
+from Chatbot.extractors.color.llm.latency_budget import LatencyBudget
+from Chatbot.extractors.color.logic.tone_signatures import find_tone_conflicts
+
+SESSION_MEMO_SIZE = 256
+SESSION_MAX_COLORS = 256
+SESSION_MAX_SESSIONS = 10_000
+SESSION_IDLE_TTL = 30 * 60.0
+SESSION_TURN_BUDGET = 8.0
+
+SENTIMENTS = ("positive", "negative")
+
+RGB = Tuple[int, int, int]
+PhraseResult = Tuple[Set[str], List[str], Optional[RGB]]
+
+
+# ------------------ DEFAULT PIPELINE STAGES ------------------ #
+
+def _classify(text: str) -> Dict[str, List[str]]:
+    from Chatbot.extractors.color.extractor import segment_and_classify_text
+    return segment_and_classify_text(text)
+
+
+def _extract_phrases(known_tones: Set[str], known_modifiers: Set[str]) -> Callable[[str], List[str]]:
+    def extract(segment: str) -> List[str]:
+        from Chatbot.extractors.color.extractor import extract_phrases_from_segment_safe
+        return extract_phrases_from_segment_safe(segment, known_tones, known_modifiers)
+    return extract
+
+
+def _resolve_phrase(known_tones: Set[str], known_modifiers: Set[str]) -> Callable[[str, LatencyBudget], PhraseResult]:
+    def resolve(phrase: str, budget: LatencyBudget) -> PhraseResult:
+        from Chatbot.extractors.color.extractor import process_phrase
+        from Chatbot.extractors.color.utils.palette_index import get_palette_rgb_map
+        from Chatbot.extractors.color.utils.rgb_grid import get_default_rgb_grid
+        return process_phrase(
+            phrase, get_palette_rgb_map(), known_modifiers, known_tones, get_default_rgb_grid(), budget
+        )
+    return resolve
+
+
+# ------------------ SESSION ------------------ #
+
+class ColorSession:
+    """
+    Accumulated color preferences of one conversation.
+
+    Usage:
+        session = ColorSession(known_tones, known_modifiers)
+        session.add_turn("something peachy pink")
+        session.add_turn("and no red")["negative"]["matched_color_names"]
+    """
+
+    def __init__(
+        self,
+        known_tones: Optional[Set[str]] = None,
+        known_modifiers: Optional[Set[str]] = None,
+        classify: Optional[Callable[[str], Dict[str, List[str]]]] = None,
+        extract_phrases: Optional[Callable[[str], List[str]]] = None,
+        resolve_phrase: Optional[Callable[[str, LatencyBudget], PhraseResult]] = None,
+        memo_size: int = SESSION_MEMO_SIZE,
+        max_colors: int = SESSION_MAX_COLORS,
+        turn_budget: Optional[float] = SESSION_TURN_BUDGET
+    ):
+        """
+        Args:
+            known_tones (Set[str], optional): Recognized base tones (default: shared vocabulary).
+            known_modifiers (Set[str], optional): Recognized modifiers (default: shared vocabulary).
+            classify (Callable, optional): Text → {'positive': [...], 'negative': [...]} segments.
+            extract_phrases (Callable, optional): Segment → color phrases.
+            resolve_phrase (Callable, optional): (phrase, budget) → `process_phrase` result.
+            memo_size (int): Segments and phrases remembered (LRU).
+            max_colors (int): Color names kept per side.
+            turn_budget (float, optional): LLM latency budget per turn (None = unlimited).
+        """
+        if known_tones is None or known_modifiers is None:
+            from Chatbot.extractors.color.shared.vocab import load_vocabularies
+            default_tones, default_modifiers = load_vocabularies()
+            known_tones = default_tones if known_tones is None else known_tones
+            known_modifiers = default_modifiers if known_modifiers is None else known_modifiers
+        self.known_tones = known_tones
+        self.known_modifiers = known_modifiers
+        self._classify = classify or _classify
+        self._extract_phrases = extract_phrases or _extract_phrases(known_tones, known_modifiers)
+        self._resolve_phrase = resolve_phrase or _resolve_phrase(known_tones, known_modifiers)
+        self.max_colors = max_colors
+        self.turn_budget = turn_budget
+
+        self._segment_phrases = BoundedTTLCache(memo_size)
+        self._resolved = BoundedTTLCache(memo_size)
+        self._colors: Dict[str, Dict[str, int]] = {sentiment: {} for sentiment in SENTIMENTS}
+        self._base_rgb: Dict[str, Optional[RGB]] = dict.fromkeys(SENTIMENTS)
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.last_turn: Optional[Dict[str, Dict[str, Any]]] = None
+        self._counts = dict.fromkeys(("phrases", "phrase_hits", "segments", "segment_hits"), 0)
+
+    # ------------------ TURN PROCESSING ------------------ #
+
+    def _phrases(self, segment: str) -> List[str]:
+        self._counts["segments"] += 1
+        phrases = self._segment_phrases.get(segment)
+        if phrases is None:
+            phrases = self._extract_phrases(segment)
+            self._segment_phrases[segment] = phrases
+        else:
+            self._counts["segment_hits"] += 1
+        return phrases
+
+    def _resolve(self, phrase: str, budget: LatencyBudget) -> PhraseResult:
+        self._counts["phrases"] += 1
+        result = self._resolved.get(phrase)
+        if result is None:
+            result = self._resolve_phrase(phrase, budget)
+            if not budget.expired():
+                self._resolved[phrase] = result
+        else:
+            self._counts["phrase_hits"] += 1
+        return result
+
+    def _extract_turn(self, text: str) -> Dict[str, Dict[str, Any]]:
+        budget = LatencyBudget.coerce(self.turn_budget)
+        segments = self._classify(text)
+        turn = {}
+        for sentiment in SENTIMENTS:
+            names, base_rgb = set(), None
+            for segment in segments.get(sentiment, []):
+                for phrase in self._phrases(segment):
+                    matched, _, rgb = self._resolve(phrase, budget)
+                    names.update(matched)
+                    base_rgb = base_rgb or rgb
+            turn[sentiment] = {"matched_color_names": sorted(names), "base_rgb": base_rgb, "threshold": 60.0}
+        return turn
+
+    def _merge(self, turn: Dict[str, Dict[str, Any]]) -> None:
+        positive, negative = self._colors["positive"], self._colors["negative"]
+        new_positive = set(turn["positive"]["matched_color_names"])
+        new_negative = set(turn["negative"]["matched_color_names"])
+
+        # Latest turn wins: names mentioned again change side; older negatives
+        # that clash with a new positive are withdrawn
+        older_negative = set(negative) - new_negative
+        for name in find_tone_conflicts(older_negative, new_positive, self.known_tones):
+            del negative[name]
+        for name in new_positive:
+            positive[name] = self.turns
+            negative.pop(name, None)
+        for name in new_negative:
+            negative[name] = self.turns
+            positive.pop(name, None)
+
+        # resolve_color_conflicts semantics for everything that is left
+        for name in find_tone_conflicts(set(positive), set(negative), self.known_tones):
+            negative[name] = positive.pop(name)
+
+        for sentiment in SENTIMENTS:
+            colors = self._colors[sentiment]
+            if len(colors) > self.max_colors:
+                keep = sorted(colors, key=colors.get, reverse=True)[:self.max_colors]
+                self._colors[sentiment] = {name: colors[name] for name in keep}
+            if turn[sentiment]["base_rgb"]:
+                self._base_rgb[sentiment] = turn[sentiment]["base_rgb"]
+        if not self._colors["positive"]:
+            self._base_rgb["positive"] = None
+
+    def add_turn(self, text: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Extracts the new turn only and merges it into the session.
+
+        Args:
+            text (str): The user's latest message.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Merged preferences, shaped like the
+            `extract_color_pipeline` output.
+        """
+        with self._lock:
+            self.turns += 1
+            self.last_turn = self._extract_turn(text)
+            self._merge(self.last_turn)
+            return self._output()
+
+    def _output(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            sentiment: {
+                "matched_color_names": sorted(self._colors[sentiment]),
+                "base_rgb": self._base_rgb[sentiment],
+                "threshold": 60.0,
+            }
+            for sentiment in SENTIMENTS
+        }
+
+    def preferences(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return self._output()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counts)
+            stats.update(
+                turns=self.turns,
+                positive=len(self._colors["positive"]),
+                negative=len(self._colors["negative"]),
+                memo_segments=len(self._segment_phrases),
+                memo_phrases=len(self._resolved),
+            )
+        return stats
+
+
+# ------------------ STORE ------------------ #
+
+class SessionStore:
+    """
+    Sessions by id, LRU-capped at `max_sessions` and dropped after
+    `idle_ttl` seconds without a turn.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], ColorSession] = ColorSession,
+        max_sessions: int = SESSION_MAX_SESSIONS,
+        idle_ttl: Optional[float] = SESSION_IDLE_TTL
+    ):
+        self._factory = factory
+        self._sessions = BoundedTTLCache(max_sessions, ttl=idle_ttl)
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def get(self, session_id: str) -> ColorSession:
+        """
+        Returns the session (created on first use) and refreshes its idle timer.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._factory()
+                self.created += 1
+            self._sessions.set(session_id, session)
+            return session
+
+    def add_turn(self, session_id: str, text: str) -> Dict[str, Dict[str, Any]]:
+        return self.get(session_id).add_turn(text)
+
+    def drop(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id in self._sessions:
+                del self._sessions[session_id]
+                return True
+            return False
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "created": self.created,
+                "evicted": self._sessions.evictions,
+                "expired": self._sessions.expirations,
+            }
@@ -1,6 +1,11 @@
+from functools import lru_cache
+from typing import Set, Tuple
+
 import webcolors
 from matplotlib.colors import XKCD_COLORS
 
+from Chatbot.extractors.color.utils.config_loader import load_known_modifiers
+
 
 css3 = set(webcolors.CSS3_NAMES_TO_HEX.keys())
 css21 = set(webcolors.CSS21_NAMES_TO_HEX.keys())
@@ -14,5 +19,10 @@ known_tones = set(name.lower() for name in css3.union(css21).union(xkcd).union(c
 
 all_webcolor_names = set(name.lower() for name in css3.union(css21))
 
-print("terracotta" in known_tones)
-print("earthy" in known_tones)
+
+@lru_cache(maxsize=1)
+def load_vocabularies() -> Tuple[Set[str], Set[str]]:
+    """
+    Returns (known_tones, known_modifiers), loaded once per process.
+    """
+    return known_tones, load_known_modifiers()
@@ -15,6 +15,7 @@ from Chatbot.extractors.color.shared.constants import SEMANTIC_CONFLICTS
 from Chatbot.extractors.color.shared.vocab import known_tones
 from Chatbot.extractors.color.utils.token_utils import normalize_token
 from Chatbot.extractors.color.logic.compound_rule import is_blocked_modifier_tone_pair
+from Chatbot.extractors.color.utils.trace import debug_trace
 
 def is_known_tone(word: str) -> bool:
     return normalize_token(word) in known_tones
@@ -31,6 +32,7 @@ def match_direct_modifier(token: str, known_modifiers: set, debug: bool = False)
     - Irregular forms (via override map)
     - Hyphenated or space-separated compounds (e.g., 'soft-focus')
     """
+    trace = debug_trace(debug, "modifier_resolution.match_direct_modifier")
 
     raw = token
     token = token.strip().lower().replace("-", " ").strip()
@@ -44,8 +46,8 @@ def match_direct_modifier(token: str, known_modifiers: set, debug: bool = False)
         "rosier": "rose"
     }
     if token in OVERRIDE_MAP:
-        if debug:
-            print(f"[OVERRIDE] '{raw}' → '{OVERRIDE_MAP[token]}'")
+        if trace:
+            trace.event("[OVERRIDE] '{}' → '{}'", raw, OVERRIDE_MAP[token])
         return OVERRIDE_MAP[token]
 
     # Suffix stripping logic
@@ -57,34 +59,34 @@ def match_direct_modifier(token: str, known_modifiers: set, debug: bool = False)
         if token.endswith(suffix) and len(token) > len(suffix) + 2:
             base = token[: -len(suffix)]
             if base in known_modifiers:
-                if debug:
-                    print(f"[SUFFIX MATCH] '{raw}' → '{base}' (via -{suffix})")
+                if trace:
+                    trace.event("[SUFFIX MATCH] '{}' → '{}' (via -{})", raw, base, suffix)
                 return base
 
     # Special case: 'rosy' → 'rose'
     if token.endswith("y") and (token[:-1] + "e") in known_modifiers:
         fallback = token[:-1] + "e"
-        if debug:
-            print(f"[Y→E FALLBACK] '{raw}' → '{fallback}'")
+        if trace:
+            trace.event("[Y→E FALLBACK] '{}' → '{}'", raw, fallback)
         return fallback
 
     # Singularize
     singular = singularize(token)
     if singular in known_modifiers:
-        if debug:
-            print(f"[SINGULAR MATCH] '{raw}' → '{singular}'")
+        if trace:
+            trace.event("[SINGULAR MATCH] '{}' → '{}'", raw, singular)
         return singular
 
     # Compound fallback: pick any part if present
     if " " in token:
         for part in token.split():
             if part in known_modifiers:
-                if debug:
-                    print(f"[COMPOUND MATCH] '{raw}' → '{part}'")
+                if trace:
+                    trace.event("[COMPOUND MATCH] '{}' → '{}'", raw, part)
                 return part
 
-    if debug:
-        print(f"[NO MATCH] '{raw}' → no match in known_modifiers")
+    if trace:
+        trace.event("[NO MATCH] '{}' → no match in known_modifiers", raw)
     return None
 
 def match_suffix_fallback(token: str, known_modifiers: set) -> str | None:
@@ -136,12 +138,13 @@ def match_suffix_fallback(token: str, known_modifiers: set) -> str | None:
 
 
 
-def fuzzy_match_modifier_safe(raw_token: str, known_modifiers: set, threshold: int = 70) -> str:
+def fuzzy_match_modifier_safe(raw_token: str, known_modifiers: set, threshold: int = 70, debug: bool = False) -> str:
     """
     Attempts to fuzzy match a raw token to a known modifier.
     Returns the best match if score is above the threshold.
     Returns None if no match passes the threshold.
     """
+    trace = debug_trace(debug, "modifier_resolution.fuzzy_match_modifier_safe")
     raw_token = raw_token.lower().strip()
     best_match = None
     best_score = 0
@@ -157,12 +160,14 @@ def fuzzy_match_modifier_safe(raw_token: str, known_modifiers: set, threshold: i
     if best_score >= threshold:
         return best_match
 
-    print(f"[DEBUG] Best match for '{raw_token}': '{best_match}' with score {best_score}")
+    if trace:
+        trace.event("[DEBUG] Best match for '{}': '{}' with score {}", raw_token, best_match, best_score)
 
     return None
 
 
-def _fuzzy_match_modifier(raw: str, known_modifiers: set, threshold: float = 75, debug: bool = True) -> tuple[str, float] | None:
+def _fuzzy_match_modifier(raw: str, known_modifiers: set, threshold: float = 75, debug: bool = False) -> tuple[str, float] | None:
+    trace = debug_trace(debug, "modifier_resolution._fuzzy_match_modifier")
     best_score = 0
     best_match = None
     for candidate in known_modifiers:
@@ -180,12 +185,12 @@ def _fuzzy_match_modifier(raw: str, known_modifiers: set, threshold: float = 75,
             best_match = candidate
 
     if best_match and best_score >= threshold:
-        if debug:
-            print(f"[DEBUG] Best match: '{best_match}' with score {best_score}")
+        if trace:
+            trace.event("[DEBUG] Best match: '{}' with score {}", best_match, best_score)
         return best_match, best_score
 
-    if debug:
-        print("[DEBUG] No suitable match found (below threshold)")
+    if trace:
+        trace.event("[DEBUG] No suitable match found (below threshold)")
     return None
 
 import spacy
@@ -219,64 +224,65 @@ def resolve_modifier_token(
     Returns:
         str | None: The resolved modifier, or None if no match found.
     """
+    trace = debug_trace(debug, "modifier_resolution.resolve_modifier_token")
 
     token = raw_token.strip().lower()
     # ─── Shortcut: Accept if it's a valid tone
     if known_tones and token in known_tones:
-        if debug:
-            print(f"[🎯 KNOWN TONE SHORTCUT] '{raw_token}' is a valid tone → returning as-is")
+        if trace:
+            trace.event("[🎯 KNOWN TONE SHORTCUT] '{}' is a valid tone → returning as-is", raw_token)
         return token
 
     # Step 1: Direct match
     direct = match_direct_modifier(token, known_modifiers, debug)
     if direct:
-        if debug:
-            print(f"[✅ DIRECT MATCH] '{raw_token}' → '{direct}'")
+        if trace:
+            trace.event("[✅ DIRECT MATCH] '{}' → '{}'", raw_token, direct)
         return direct
 
     # Step 2: Lemmatization fallback
     lemma = lemmatize_token(token)
     if lemma in known_modifiers:
-        if debug:
-            print(f"[✅ LEMMA MATCH] '{raw_token}' → '{lemma}'")
+        if trace:
+            trace.event("[✅ LEMMA MATCH] '{}' → '{}'", raw_token, lemma)
         return lemma
 
     # Step 3: Suffix fallback
     suffix = match_suffix_fallback(token, known_modifiers)
     if suffix:
-        if debug:
-            print(f"[✅ SUFFIX MATCH] '{raw_token}' → '{suffix}'")
+        if trace:
+            trace.event("[✅ SUFFIX MATCH] '{}' → '{}'", raw_token, suffix)
         return suffix
 
     # Step 4: Fuzzy fallback
     if allow_fuzzy:
-        fuzzy = fuzzy_match_modifier_safe(token, known_modifiers)
+        fuzzy = fuzzy_match_modifier_safe(token, known_modifiers, debug=debug)
         if isinstance(fuzzy, tuple) and len(fuzzy) == 2:
             match, score = fuzzy
 
             # 🔍 Filtering to block unsafe semantic returns
             if match in {"blur", "classic", "luminous", "radiant", "off-white"}:
-                if debug:
-                    print(f"[⚠️ BLOCKED FUZZY] '{raw_token}' → '{match}' (score={score})")
+                if trace:
+                    trace.event("[⚠️ BLOCKED FUZZY] '{}' → '{}' (score={})", raw_token, match, score)
                 return None
 
             if len(match) > len(token) + 3 and score < 80:
-                if debug:
-                    print(f"[⚠️ SKIPPED: too long fuzzy match] '{raw_token}' → '{match}' (score={score})")
+                if trace:
+                    trace.event("[⚠️ SKIPPED: too long fuzzy match] '{}' → '{}' (score={})", raw_token, match, score)
                 return None
 
-            if debug:
-                print(f"[🔍 FUZZY MATCH] '{raw_token}' → '{match}' (score={score})")
+            if trace:
+                trace.event("[🔍 FUZZY MATCH] '{}' → '{}' (score={})", raw_token, match, score)
             return match
 
         elif isinstance(fuzzy, str):
             # fallback behavior if fuzzy_match_modifier_safe returns str (e.g. "bright")
-            if debug:
-                print(f"[🔍 FUZZY MATCH (no score)] '{raw_token}' → '{fuzzy}'")
+            if trace:
+                trace.event("[🔍 FUZZY MATCH (no score)] '{}' → '{}'", raw_token, fuzzy)
             return fuzzy
 
-    if debug:
-        print(f"[❌ NO MATCH] '{raw_token}' → None")
+    if trace:
+        trace.event("[❌ NO MATCH] '{}' → None", raw_token)
     return None
 
 def is_y_suffix_from_tone(word: str, known_tones: set) -> bool:
@@ -0,0 +1,182 @@
+# Chatbot/extractors/color/utils/palette_index.py
+
+"""
+palette_index.py
+================
+
+Precomputed name → RGB hash index over the XKCD and CSS4 palettes.
+
+Every palette name is normalized once (lowercase, hyphens/underscores
+to spaces, cosmetic singularization) and registered under a small set
+of aliases so that spacing, hyphen and plural variants resolve in O(1):
+
+- 'dusty rose', 'Dusty-Rose', 'dustyrose' → xkcd:dusty rose
+- 'light pink' → xkcd:light pink, 'lightpink' → css4:lightpink
+- 'roses', 'pinks' → singular entries
+
+Precedence:
+-----------
+1. Canonical names (XKCD first, then CSS4)
+2. Aliases (spaceless, plural, apostrophe-free), never overriding 1.
+
+Used By:
+--------
+- LLM RGB resolution (simplified phrase → palette match)
+- Legacy rgb_utils exact-name fallback
+- Default RGB map / neighbor grid of the extraction pipeline
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from matplotlib.colors import CSS4_COLORS, XKCD_COLORS
+from webcolors import hex_to_rgb
+
+from Chatbot.cache.mmap_store import MmapRGBStore
+from Chatbot.extractors.color.utils.token_utils import normalize_token
+
+PALETTE_STORE_PATH_ENV = "COLOR_PALETTE_STORE_PATH"
+
+
+def palette_key(name: str) -> str:
+    """
+    Normalizes a color name into its palette index key.
+
+    Args:
+        name (str): Raw color name (e.g., 'xkcd:Dusty-Rose', ' light  pink ').
+
+    Returns:
+        str: Normalized key (e.g., 'dusty rose', 'light pink').
+    """
+    name = name.lower().strip()
+    if name.startswith("xkcd:"):
+        name = name[len("xkcd:"):]
+    return " ".join(normalize_token(name).split())
+
+
+def _alias_keys(name: str) -> Tuple[str, ...]:
+    """
+    Builds the alias keys registered for a single palette name.
+
+    Args:
+        name (str): Palette name without the 'xkcd:' prefix.
+
+    Returns:
+        Tuple[str, ...]: Spaceless, plural and apostrophe-free variants.
+    """
+    key = palette_key(name)
+    aliases = [key.replace(" ", "")]
+
+    for plural in (name + "s", name + "es"):
+        aliases.append(palette_key(plural))
+
+    if "'" in key:
+        stripped = key.replace("'", "")
+        aliases.extend([stripped, stripped.replace(" ", "")])
+
+    return tuple(alias for alias in aliases if alias and alias != key)
+
+
+def build_palette_index(
+    palettes: Optional[Iterable[Dict[str, str]]] = None
+) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Builds the normalized name → RGB index for the given palettes.
+
+    Args:
+        palettes (Iterable[Dict[str, str]], optional): Name → hex mappings,
+            in precedence order. Defaults to (XKCD_COLORS, CSS4_COLORS).
+
+    Returns:
+        Dict[str, Tuple[int, int, int]]: Index keyed by normalized names and aliases.
+    """
+    palettes = list(palettes) if palettes is not None else [XKCD_COLORS, CSS4_COLORS]
+    entries = [
+        (name.replace("xkcd:", ""), tuple(hex_to_rgb(hex_code)))
+        for palette in palettes
+        for name, hex_code in palette.items()
+    ]
+
+    index: Dict[str, Tuple[int, int, int]] = {}
+
+    # Pass 1: canonical names always win over aliases
+    for name, rgb in entries:
+        index.setdefault(palette_key(name), rgb)
+
+    # Pass 2: aliases only fill free slots
+    for name, rgb in entries:
+        for alias in _alias_keys(name):
+            index.setdefault(alias, rgb)
+
+    return index
+
+
+def build_palette_rgb_map() -> Dict[str, Tuple[int, int, int]]:
+    """
+    Builds the raw CSS4 + XKCD palette keyed by matplotlib names
+    ('xkcd:' prefix kept).
+
+    Returns:
+        Dict[str, Tuple[int, int, int]]: Palette name → RGB mapping.
+    """
+    return {
+        name: tuple(hex_to_rgb(hex_code))
+        for name, hex_code in {**CSS4_COLORS, **XKCD_COLORS}.items()
+    }
+
+
+@lru_cache(maxsize=1)
+def get_palette_rgb_map() -> Mapping[str, Tuple[int, int, int]]:
+    """
+    Returns the shared CSS4 + XKCD palette, once per process.
+
+    When $COLOR_PALETTE_STORE_PATH names an existing store file (see
+    `Chatbot.cache.mmap_store.write_rgb_store`), the palette is served
+    from the memory-mapped file instead of a per-process dict.
+
+    Returns:
+        Mapping[str, Tuple[int, int, int]]: Palette name → RGB mapping.
+    """
+    path = os.environ.get(PALETTE_STORE_PATH_ENV)
+    if path and os.path.exists(path):
+        return MmapRGBStore(path)
+    return build_palette_rgb_map()
+
+
+@lru_cache(maxsize=1)
+def get_palette_index() -> Dict[str, Tuple[int, int, int]]:
+    """
+    Returns the shared XKCD + CSS4 palette index, built once per process.
+
+    Returns:
+        Dict[str, Tuple[int, int, int]]: Normalized name → RGB index.
+    """
+    return build_palette_index()
+
+
+def lookup_palette_rgb(
+    name: str,
+    index: Optional[Dict[str, Tuple[int, int, int]]] = None
+) -> Optional[Tuple[int, int, int]]:
+    """
+    Resolves a color name to RGB through the palette index in O(1).
+
+    Args:
+        name (str): Color name or simplified phrase (e.g., 'Dusty-Rose').
+        index (Dict[str, Tuple[int, int, int]], optional): Custom index.
+            Defaults to the shared XKCD + CSS4 index.
+
+    Returns:
+        Optional[Tuple[int, int, int]]: RGB tuple if the name is known, else None.
+    """
+    if not name or not isinstance(name, str):
+        return None
+
+    index = index if index is not None else get_palette_index()
+    key = palette_key(name)
+
+    rgb = index.get(key)
+    if rgb is None and " " in key:
+        rgb = index.get(key.replace(" ", ""))
+    return rgb
@@ -15,7 +15,9 @@ Used By:
 """
 
 from typing import Tuple, Dict, Optional, List
-from Chatbot.extractors.color.shared.vocab import all_webcolor_names
+from Chatbot.extractors.color.utils.fuzzy_name_index import get_webcolor_name_index
+
+FUZZY_NAME_CUTOFF = 0.75
 
 
 def rgb_distance(rgb1: Tuple[int, int, int], rgb2: Tuple[int, int, int]) -> float:
@@ -81,7 +83,8 @@ def choose_representative_rgb(
 def find_similar_color_names(
     base_rgb: Tuple[int, int, int],
     known_rgb_map: Dict[str, Tuple[int, int, int]],
-    threshold: float = 60.0
+    threshold: float = 60.0,
+    grid=None
 ) -> List[str]:
     """
     Finds color names from a known map that are perceptually similar to a target RGB.
@@ -90,10 +93,15 @@ def find_similar_color_names(
         base_rgb: Target RGB color.
         known_rgb_map: Mapping from name → RGB tuple.
         threshold: Max allowable distance.
+        grid (RGBNeighborGrid, optional): Prebuilt grid over `known_rgb_map`.
+            When given, only the candidates of the target's cell are checked.
 
     Returns:
         List[str]: Sorted matching color names within margin.
     """
+    if grid is not None:
+        return grid.query(base_rgb, threshold)
+
     return sorted([
         name for name, rgb in known_rgb_map.items()
         if is_within_rgb_margin(rgb, base_rgb, margin=threshold)
@@ -106,16 +114,14 @@ def fuzzy_match_rgb_from_known_colors(
     """
     Attempts to match a phrase to the closest known named RGB color.
 
+    Uses the prebuilt webcolor name index (0.75 similarity cutoff) instead of
+    scanning all names with difflib on every miss.
+
     Args:
         phrase (str): Simplified color phrase (e.g., 'peachy nude').
-        known_rgb_map (Dict[str, Tuple]): Reference RGB names.
 
     Returns:
         str or None: Closest color name within margin, if found.
     """
-    import difflib
-
-    candidates = difflib.get_close_matches(phrase, all_webcolor_names, n=1, cutoff=0.75)
-    if candidates:
-        return candidates[0]
-    return None
+    match = get_webcolor_name_index().best_match(phrase, score_cutoff=FUZZY_NAME_CUTOFF * 100)
+    return match[0] if match else None
@@ -0,0 +1,299 @@
+# Chatbot/extractors/color/utils/rgb_grid.py
+
+"""
+rgb_grid.py
+===========
+
+Precomputed RGB quantization grid for "named colors within distance"
+queries over a fixed palette.
+
+The RGB cube is split into 2^bits cells per axis (32³ cells of 8 units
+by default). For every cell the grid stores the palette entries whose
+distance to the cell's box can be ≤ `threshold`, so a query only checks
+the handful of candidates of its own cell instead of the whole palette:
+
+- Cell lists are stored as CSR arrays (offsets + indices), built in numpy
+- Candidates are confirmed with a vectorized distance check; values on the
+  margin are re-checked with `is_within_rgb_margin`, so results equal the
+  brute-force scan exactly
+- Thresholds above the build threshold fall back to brute force
+
+The grid can be built at startup or saved to a single binary file and
+loaded with `np.memmap`, so worker processes share the same pages.
+
+Used By:
+--------
+- rgb_distance.find_similar_color_names (optional `grid`)
+- Color extraction pipeline (default palette)
+"""
+
+import json
+import os
+import struct
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from Chatbot.extractors.color.utils.palette_index import get_palette_rgb_map
+from Chatbot.extractors.color.utils.rgb_distance import is_within_rgb_margin
+
+GRID_BITS = 5
+GRID_THRESHOLD = 60.0
+RGB_GRID_PATH_ENV = "COLOR_RGB_GRID_PATH"
+
+_MAGIC = b"RGBGRID1"
+_HEADER = struct.Struct("<8sIIdQQ")  # magic, bits, entries, threshold, nnz, names_len
+_ALIGN = 8
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class RGBNeighborGrid:
+    """
+    Cell → candidate-entries grid over a name → RGB palette.
+
+    - `query(rgb, threshold)` returns the same sorted names as a full
+      `is_within_rgb_margin` scan of the palette
+    - `save(path)` / `load(path)` round-trip through one mmap-able file
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        rgb: np.ndarray,
+        offsets: np.ndarray,
+        indices: np.ndarray,
+        bits: int,
+        threshold: float
+    ):
+        self._names = names
+        self._rgb = rgb
+        self._offsets = offsets
+        self._indices = indices
+        self._bits = bits
+        self._shift = 8 - bits
+        self._threshold = float(threshold)
+
+    @classmethod
+    def build(
+        cls,
+        rgb_map: Dict[str, Tuple[int, int, int]],
+        threshold: float = GRID_THRESHOLD,
+        bits: int = GRID_BITS
+    ) -> "RGBNeighborGrid":
+        """
+        Builds the grid for a palette.
+
+        A cell keeps an entry when the entry's distance to the cell's box
+        (integer bounds, widened by one unit) is within `threshold`, which
+        is a lower bound on its distance to any point of the cell.
+
+        Args:
+            rgb_map (Dict[str, Tuple[int, int, int]]): Palette name → RGB (0–255).
+            threshold (float): Largest distance the grid answers exactly.
+            bits (int): Cells per axis = 2^bits (1–8).
+
+        Returns:
+            RGBNeighborGrid: Built grid.
+        """
+        if not 1 <= bits <= 8:
+            raise ValueError(f"bits must be in [1, 8], got {bits}")
+
+        names = list(rgb_map.keys())
+        rgb = np.array([tuple(value) for value in rgb_map.values()], dtype=np.int64).reshape(-1, 3)
+        if rgb.size and (rgb.min() < 0 or rgb.max() > 255):
+            raise ValueError("RGB values must be in [0, 255]")
+
+        cells = 1 << bits
+        size = 256 // cells
+        lows = np.arange(cells, dtype=np.int64)[:, None] * size
+        highs = lows + size  # closed upper bound also covers fractional queries
+
+        # Per-axis squared box distances: (cells, entries)
+        axis_d2 = [
+            np.square(np.maximum(np.maximum(lows - rgb[:, axis], rgb[:, axis] - highs), 0))
+            for axis in range(3)
+        ]
+        limit = (threshold + 1e-6) ** 2
+
+        counts = np.zeros(cells ** 3, dtype=np.int64)
+        chunks = []
+        for r in range(cells):
+            d2 = axis_d2[0][r][None, None, :] + axis_d2[1][:, None, :] + axis_d2[2][None, :, :]
+            cell_ids, entry_ids = np.nonzero((d2 <= limit).reshape(cells * cells, -1))
+            counts[r * cells * cells:(r + 1) * cells * cells] = np.bincount(cell_ids, minlength=cells * cells)
+            chunks.append(entry_ids)
+
+        offsets = np.zeros(cells ** 3 + 1, dtype=np.uint32 if counts.sum() < 2 ** 32 else np.uint64)
+        np.cumsum(counts, out=offsets[1:])
+        index_dtype = np.uint16 if len(names) <= 0xFFFF else np.uint32
+        indices = np.concatenate(chunks).astype(index_dtype) if chunks else np.zeros(0, dtype=index_dtype)
+
+        return cls(names, rgb.astype(np.uint8), offsets, indices, bits, threshold)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+
+    @property
+    def bits(self) -> int:
+        return self._bits
+
+    def covers(self, threshold: float) -> bool:
+        """
+        Returns True if the grid answers `threshold` without brute force.
+        """
+        return threshold <= self._threshold
+
+    def cell_candidates(self, rgb: Tuple[int, int, int]) -> np.ndarray:
+        """
+        Returns the palette positions stored in the cell of an RGB value.
+
+        Args:
+            rgb (Tuple[int, int, int]): Query color, components in [0, 255].
+
+        Returns:
+            np.ndarray: Palette positions (superset of matches ≤ grid threshold).
+        """
+        r, g, b = (int(component) >> self._shift for component in rgb)
+        cell = (r << (2 * self._bits)) | (g << self._bits) | b
+        return self._indices[int(self._offsets[cell]):int(self._offsets[cell + 1])]
+
+    def query(self, base_rgb: Tuple[int, int, int], threshold: float = GRID_THRESHOLD) -> List[str]:
+        """
+        Finds palette names within `threshold` of `base_rgb`.
+
+        Args:
+            base_rgb (Tuple[int, int, int]): Target RGB color.
+            threshold (float): Max allowable distance.
+
+        Returns:
+            List[str]: Sorted matching names (same as a brute-force scan).
+        """
+        if not self.covers(threshold) or any(not 0 <= component <= 255 for component in base_rgb):
+            positions = np.arange(len(self._names))
+        else:
+            positions = self.cell_candidates(base_rgb)
+        if not len(positions):
+            return []
+
+        candidates = self._rgb[positions].astype(np.float64)
+        distances = np.sqrt(np.square(candidates - np.asarray(base_rgb, dtype=np.float64)).sum(axis=1))
+
+        # Values within rounding noise of the margin are re-checked with the scalar function
+        borderline = np.abs(distances - threshold) <= 1e-9 * max(1.0, abs(threshold))
+        keep = (distances <= threshold) & ~borderline
+        for pos in np.flatnonzero(borderline):
+            keep[pos] = is_within_rgb_margin(tuple(int(v) for v in candidates[pos]), base_rgb, margin=threshold)
+
+        return sorted(self._names[int(positions[pos])] for pos in np.flatnonzero(keep))
+
+    def save(self, path: str) -> None:
+        """
+        Writes the grid to a single binary file that `load()` can mmap.
+
+        Layout: header | rgb (uint8, n×3) | offsets | indices | names (UTF-8, '\\n'-joined),
+        each array section aligned to 8 bytes.
+
+        Args:
+            path (str): Output file path.
+        """
+        names_blob = "\n".join(self._names).encode("utf-8")
+        header = _HEADER.pack(
+            _MAGIC, self._bits, len(self._names), self._threshold, len(self._indices), len(names_blob)
+        )
+        meta = json.dumps({
+            "offsets_dtype": self._offsets.dtype.str,
+            "indices_dtype": self._indices.dtype.str,
+        }).encode("utf-8")
+
+        with open(path, "wb") as f:
+            f.write(header)
+            f.write(struct.pack("<I", len(meta)))
+            f.write(meta)
+            for array in (self._rgb, self._offsets, self._indices):
+                f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.write(names_blob)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = "r") -> "RGBNeighborGrid":
+        """
+        Loads a grid written by `save()`.
+
+        Args:
+            path (str): Grid file path.
+            mmap_mode (str, optional): np.memmap mode ('r' shares pages between
+                processes). None reads the arrays into memory.
+
+        Returns:
+            RGBNeighborGrid: Loaded grid.
+        """
+        with open(path, "rb") as f:
+            magic, bits, entries, threshold, nnz, names_len = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"Not an RGB grid file: {path}")
+            (meta_len,) = struct.unpack("<I", f.read(4))
+            meta = json.loads(f.read(meta_len).decode("utf-8"))
+            position = f.tell()
+
+            layout = []
+            for dtype, count in (
+                (np.dtype(np.uint8), entries * 3),
+                (np.dtype(meta["offsets_dtype"]), (1 << (3 * bits)) + 1),
+                (np.dtype(meta["indices_dtype"]), nnz),
+            ):
+                position = _aligned(position)
+                layout.append((dtype, count, position))
+                position += dtype.itemsize * count
+
+            f.seek(position)
+            names = f.read(names_len).decode("utf-8").split("\n") if entries else []
+
+        arrays = []
+        for dtype, count, offset in layout:
+            if mmap_mode and count:
+                arrays.append(np.memmap(path, dtype=dtype, mode=mmap_mode, offset=offset, shape=(count,)))
+            else:
+                arrays.append(np.fromfile(path, dtype=dtype, count=count, offset=offset))
+
+        rgb, offsets, indices = arrays
+        return cls(names, rgb.reshape(-1, 3), offsets, indices, bits, threshold)
+
+
+@lru_cache(maxsize=1)
+def get_default_rgb_grid() -> RGBNeighborGrid:
+    """
+    Returns the grid over the CSS4 + XKCD palette (`get_palette_rgb_map`).
+
+    Loads the file named by $COLOR_RGB_GRID_PATH when it exists and matches
+    the palette; otherwise builds the grid in memory.
+    """
+    rgb_map = get_palette_rgb_map()
+    path = os.environ.get(RGB_GRID_PATH_ENV)
+
+    if path and os.path.exists(path):
+        grid = RGBNeighborGrid.load(path)
+        if grid._names == list(rgb_map.keys()):
+            return grid
+
+    return RGBNeighborGrid.build(rgb_map)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the default RGB neighbor grid file.")
+    parser.add_argument("out", help="Output grid file path")
+    parser.add_argument("--threshold", type=float, default=GRID_THRESHOLD)
+    parser.add_argument("--bits", type=int, default=GRID_BITS)
+    args = parser.parse_args()
+
+    RGBNeighborGrid.build(get_palette_rgb_map(), threshold=args.threshold, bits=args.bits).save(args.out)
+    print(f"[🎨 RGB GRID] wrote {args.out}")
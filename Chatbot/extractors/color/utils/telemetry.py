@@ -0,0 +1,338 @@
+# Chatbot/extractors/color/utils/telemetry.py
+
+"""
+telemetry.py
+============
+
+Per-stage timing for the color pipeline: spans, latency histograms and
+counters, exported in Prometheus text format or as JSON.
+
+- `span(stage)` (context manager) and `@traced(stage)` (sync or async
+  functions) time a stage into the `color_pipeline_stage_seconds`
+  histogram; stages that raise also count in
+  `color_pipeline_stage_errors_total`
+- `count(name, ...)` / `observe(name, value, ...)` for ad-hoc metrics
+- Export: `render_prometheus()` (served by the HTTP service at
+  /metrics/prometheus, or standalone with `start_metrics_server(port)`),
+  `telemetry_snapshot()` / `export_json(path)`; with
+  $COLOR_TELEMETRY_EXPORT set, the JSON file is written at exit
+
+Disabled by default ($COLOR_TELEMETRY=1 or `enable_telemetry()` turns it
+on). When disabled, `span` returns a shared no-op object and `traced`
+calls straight through: one flag check per stage, nothing recorded.
+
+Stages: sentiment_split, sentiment_classification, compound, standalone,
+lone_tones, suffix_fallback, llm_rgb, llm_simplify, palette_match,
+conflict_resolution.
+
+Used By:
+--------
+- extractor (split, classification, palette match, conflicts)
+- old.extract.phrase_extractor / extraction.phrase_aggregator (phrase passes)
+- llm.llm_api_client, llm.simplifier (LLM calls, including the legacy rgb_utils resolver)
+- Chatbot/service/server.py
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Sequence, Tuple
+
+TELEMETRY_ENV = "COLOR_TELEMETRY"
+TELEMETRY_EXPORT_ENV = "COLOR_TELEMETRY_EXPORT"
+
+STAGE_SECONDS = "color_pipeline_stage_seconds"
+STAGE_ERRORS = "color_pipeline_stage_errors_total"
+
+STAGES = (
+    "sentiment_split", "sentiment_classification", "compound", "standalone", "lone_tones",
+    "suffix_fallback", "llm_rgb", "llm_simplify", "palette_match", "conflict_resolution",
+)
+
+# Seconds; from sub-millisecond lexical passes up to LLM calls with retries
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_HELP = {
+    STAGE_SECONDS: "Wall-clock time per color pipeline stage.",
+    STAGE_ERRORS: "Color pipeline stages that raised.",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (cumulative on export, as Prometheus expects).
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Dict[str, int]:
+        result, running = {}, 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            result["+Inf" if bound == float("inf") else f"{bound:g}"] = running
+        return result
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "buckets": self.cumulative(),
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("_telemetry", "stage", "start")
+
+    def __init__(self, telemetry: "Telemetry", stage: str):
+        self._telemetry = telemetry
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._telemetry.observe(STAGE_SECONDS, time.perf_counter() - self.start, stage=self.stage)
+        if exc_type is not None:
+            self._telemetry.count(STAGE_ERRORS, stage=self.stage)
+        return False
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Telemetry:
+    """
+    Thread-safe metric registry with an on/off switch.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+
+    def span(self, stage: str):
+        return _Span(self, stage) if self.enabled else _NOOP_SPAN
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Returns {'counters': {name: [{labels, value}]}, 'histograms': {name: [{labels, count, sum, ...}]}}.
+        """
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in sorted(series.items())]
+                for name, series in sorted(self._counters.items())
+            }
+            histograms = {
+                name: [{"labels": dict(key), **histogram.snapshot()} for key, histogram in sorted(series.items())]
+                for name, series in sorted(self._histograms.items())
+            }
+        return {"enabled": self.enabled, "counters": counters, "histograms": histograms}
+
+    def render_prometheus(self) -> str:
+        """
+        Returns all metrics in the Prometheus text exposition format (0.0.4).
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, series in snapshot["counters"].items():
+            lines += [f"# HELP {name} {_HELP.get(name, name)}", f"# TYPE {name} counter"]
+            lines += [f"{name}{_format_labels(item['labels'])} {item['value']:g}" for item in series]
+        for name, series in snapshot["histograms"].items():
+            lines += [f"# HELP {name} {_HELP.get(name, name)}", f"# TYPE {name} histogram"]
+            for item in series:
+                for bound, count in item["buckets"].items():
+                    lines.append(f"{name}_bucket{_format_labels({**item['labels'], 'le': bound})} {count}")
+                lines.append(f"{name}_sum{_format_labels(item['labels'])} {item['sum']:.9g}")
+                lines.append(f"{name}_count{_format_labels(item['labels'])} {item['count']}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _enabled_from_env() -> bool:
+    return os.environ.get(TELEMETRY_ENV, "") not in ("", "0") or bool(os.environ.get(TELEMETRY_EXPORT_ENV))
+
+
+_telemetry = Telemetry(enabled=_enabled_from_env())
+
+
+# ------------------ MODULE API ------------------ #
+
+def get_telemetry() -> Telemetry:
+    return _telemetry
+
+
+def enable_telemetry() -> None:
+    _telemetry.enabled = True
+
+
+def disable_telemetry() -> None:
+    _telemetry.enabled = False
+
+
+def telemetry_enabled() -> bool:
+    return _telemetry.enabled
+
+
+def span(stage: str):
+    """
+    Times a pipeline stage:
+
+        with span("compound"):
+            ...
+    """
+    return _telemetry.span(stage)
+
+
+def traced(stage: str) -> Callable:
+    """
+    Decorator form of `span` for sync and async functions.
+    """
+    def decorate(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _telemetry.enabled:
+                    return await func(*args, **kwargs)
+                with _Span(_telemetry, stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _telemetry.enabled:
+                return func(*args, **kwargs)
+            with _Span(_telemetry, stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    _telemetry.count(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    _telemetry.observe(name, value, **labels)
+
+
+def telemetry_snapshot() -> Dict[str, object]:
+    return _telemetry.snapshot()
+
+
+def render_prometheus() -> str:
+    return _telemetry.render_prometheus()
+
+
+def reset_telemetry() -> None:
+    _telemetry.reset()
+
+
+def export_json(path: str) -> str:
+    """
+    Writes the snapshot to `path` (atomically) and returns the path.
+    """
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"exported_at": time.time(), **telemetry_snapshot()}, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def start_metrics_server(port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serves GET /metrics (Prometheus text) from a daemon thread, for
+    processes without the HTTP service (batch jobs, warm-up, benchmarks).
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="color-metrics", daemon=True).start()
+    return server
+
+
+if os.environ.get(TELEMETRY_EXPORT_ENV):
+    atexit.register(lambda: export_json(os.environ[TELEMETRY_EXPORT_ENV]))
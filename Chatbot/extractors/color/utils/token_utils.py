@@ -14,13 +14,15 @@ Used By:
 """
 from typing import Set, List, Optional
 
+from Chatbot.extractors.color.utils.trace import debug_trace
+
 
 
 def split_glued_tokens(
     token: str,
     known_tokens: Set[str],
     known_modifiers: Set[str],
-    debug: bool = True
+    debug: bool = False
 ) -> List[str]:
     """
     Attempts to split a glued token (e.g. 'earthyrose') into known tokens/modifiers,
@@ -35,6 +37,7 @@ def split_glued_tokens(
     Returns:
         List[str]: List of recognized token parts from the input.
     """
+    trace = debug_trace(debug, "token_utils.split_glued_tokens")
 
     token = normalize_token(token)
     # Combine bases for suffix generation
@@ -51,9 +54,9 @@ def split_glued_tokens(
                 augmented_vocab.add(base + "y")
                 augmented_vocab.add(base + "ed")
 
-    if debug:
-        print(f"\n🔍 Starting split for: '{token}'")
-        print(f"📦 Augmented vocab size: {len(augmented_vocab)}")
+    if trace:
+        trace.event("\n🔍 Starting split for: '{}'", token)
+        trace.event("📦 Augmented vocab size: {}", len(augmented_vocab))
 
     def is_valid_token(t: str) -> bool:
         if t in augmented_vocab:
@@ -66,37 +69,38 @@ def split_glued_tokens(
 
     def recursive_split(t: str) -> Optional[List[str]]:
         if is_valid_token(t):
-            if debug:
-                print(f"✅ Recognized token: '{t}'")
+            if trace:
+                trace.event("✅ Recognized token: '{}'", t)
             return [t]
 
         for i in range(3, len(t) - 2):
             left, right = t[:i], t[i:]
-            if debug:
-                print(f"↪️ Trying recursive split: '{left}' + '{right}'")
+            if trace:
+                trace.event("↪️ Trying recursive split: '{}' + '{}'", left, right)
 
             left_split = recursive_split(left)
             right_split = recursive_split(right)
 
             if left_split is not None and right_split is not None:
-                if debug:
-                    print(f"✅ Recursive split success: {left_split + right_split}")
+                if trace:
+                    trace.event("✅ Recursive split success: {}", left_split + right_split)
                 return left_split + right_split
 
-        if debug:
-            print(f"❌ No recursive split found for: '{t}'")
+        if trace:
+            trace.event("❌ No recursive split found for: '{}'", t)
         return None
 
     # First try recursive splitting
     parts = recursive_split(token)
     if parts:
-        if debug:
-            print(f"✅ Final recursive parts: {parts}")
+        if trace:
+            trace.event("✅ Final recursive parts: {}", parts)
         parts = [normalize_token(p) for p in parts]
         return parts
 
     # Improved fallback: find the longest known token anywhere in the glued token
-    sorted_vocab = sorted(augmented_vocab, key=len, reverse=True)
+    # Ties broken alphabetically: set order varies with the hash seed
+    sorted_vocab = sorted(augmented_vocab, key=lambda word: (-len(word), word))
     longest_word = ""
     longest_idx = -1
     for known_word in sorted_vocab:
@@ -116,13 +120,13 @@ def split_glued_tokens(
         if suffix:
             parts.append(suffix)  # raw suffix, no recursion
 
-        if debug:
-            print(f"🪄 Fallback split at '{longest_word}': {parts}")
+        if trace:
+            trace.event("🪄 Fallback split at '{}': {}", longest_word, parts)
 
         return parts
 
-    if debug:
-        print(f"❌ Unable to split token: '{token}'")
+    if trace:
+        trace.event("❌ Unable to split token: '{}'", token)
     return []
 
 def singularize(word: str) -> str:
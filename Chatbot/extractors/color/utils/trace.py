@@ -0,0 +1,216 @@
+# Chatbot/extractors/color/utils/trace.py
+
+"""
+trace.py
+========
+
+Structured debug tracing for the extraction passes, replacing the
+`if debug: print(f"...")` paths.
+
+- A trace is captured per request: `with capture_trace() as trace:`
+  around any extraction call (context-local, so concurrent requests on
+  other threads or tasks are not mixed in)
+- Functions call `trace = debug_trace(debug, "module.function")` once and
+  guard each event with `if trace:`. With no active trace and debug off
+  that is None, so events cost one truthiness check: no f-string, no I/O
+- Events keep a format template and its arguments; the message is only
+  formatted when the trace is printed or exported
+- `debug=True` still prints the same lines as before (and records them
+  when a trace is active)
+
+Replay:
+-------
+    trace.replay()                      # prints the debug output
+    trace.save("trace.json")
+    python -m Chatbot.extractors.color.utils.trace trace.json --source compound --timestamps
+
+Used By:
+--------
+- extraction.compound / extraction.standalone
+- utils.token_utils / utils.modifier_resolution
+- logic.expression_matcher / general.utils.fuzzy_match
+- Chatbot/service/server.py ({"trace": true} requests)
+"""
+
+import argparse
+import json
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+_MUTABLE = (list, set, dict)
+
+
+class TraceEvent:
+    """
+    One debug event: template + arguments, formatted on demand.
+    """
+
+    __slots__ = ("at", "source", "template", "args", "debug", "_message")
+
+    def __init__(self, at: float, source: str, template: str, args: Sequence[Any] = (),
+                 debug: bool = False, message: Optional[str] = None):
+        self.at = at
+        self.source = source
+        self.template = template
+        self.args = tuple(args)
+        self.debug = debug
+        self._message = message
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            self._message = self.template.format(*self.args)
+        return self._message
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "at": round(self.at, 6),
+            "source": self.source,
+            "debug": self.debug,
+            "template": self.template,
+            "message": self.message,
+        }
+
+
+class Trace:
+    """
+    Events recorded during one request, in order.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self.started = time.perf_counter()
+        self.events: List[TraceEvent] = []
+
+    def record(self, source: str, template: str, args: Sequence[Any], debug: bool = False) -> None:
+        # Containers are copied: the message must show them as they were
+        args = tuple(type(arg)(arg) if isinstance(arg, _MUTABLE) else arg for arg in args)
+        self.events.append(TraceEvent(time.perf_counter() - self.started, source, template, args, debug))
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def select(self, sources: Sequence[str] = (), debug_only: bool = False) -> List[TraceEvent]:
+        """
+        Events whose source starts with one of `sources` (all if empty);
+        `debug_only` keeps the ones that were printed at the time.
+        """
+        return [
+            event for event in self.events
+            if (not sources or event.source.startswith(tuple(sources)))
+            and (event.debug or not debug_only)
+        ]
+
+    def lines(self, sources: Sequence[str] = (), debug_only: bool = False, timestamps: bool = False) -> List[str]:
+        if not timestamps:
+            return [event.message for event in self.select(sources, debug_only)]
+        width = max((len(event.source) for event in self.events), default=0)
+        return [
+            f"+{event.at * 1000:9.3f} ms  {event.source:<{width}} │ {event.message}"
+            for event in self.select(sources, debug_only)
+        ]
+
+    def replay(self, file=None, **kwargs) -> None:
+        """
+        Prints the events as the debug output would have shown them.
+        """
+        for line in self.lines(**kwargs):
+            print(line, file=file or sys.stdout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "events": [event.to_dict() for event in self.events]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Trace":
+        trace = cls(data.get("name"))
+        trace.events = [
+            TraceEvent(item["at"], item["source"], item.get("template", ""), debug=item.get("debug", False),
+                       message=item["message"])
+            for item in data.get("events", [])
+        ]
+        return trace
+
+    def save(self, path: str) -> str:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "Trace":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+class _Tracer:
+    """
+    What `debug_trace` hands to a function: records into the active trace
+    and/or prints, for one source.
+    """
+
+    __slots__ = ("trace", "source", "echo")
+
+    def __init__(self, trace: Optional[Trace], source: str, echo: bool):
+        self.trace = trace
+        self.source = source
+        self.echo = echo
+
+    def event(self, template: str, *args) -> None:
+        if self.trace is not None:
+            self.trace.record(self.source, template, args, self.echo)
+        if self.echo:
+            print(template.format(*args))
+
+
+_current: ContextVar[Optional[Trace]] = ContextVar("color_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+def debug_trace(debug: bool, source: str) -> Optional[_Tracer]:
+    """
+    Returns the event sink for one function call, or None when there is
+    nothing to do (debug off and no trace being captured).
+
+    Args:
+        debug (bool): The function's own debug flag (events are printed).
+        source (str): "module.function", used to filter on replay.
+    """
+    trace = _current.get()
+    if trace is None and not debug:
+        return None
+    return _Tracer(trace, source, debug)
+
+
+@contextmanager
+def capture_trace(name: Optional[str] = None) -> Iterator[Trace]:
+    """
+    Records every traced event of the enclosed code into a new Trace.
+    """
+    trace = Trace(name)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pretty-prints a saved color extraction trace.")
+    parser.add_argument("path", help="trace file written by Trace.save (or a /extract trace reply)")
+    parser.add_argument("--source", action="append", default=[], help="source prefix filter (repeatable)")
+    parser.add_argument("--debug-only", action="store_true", help="only events printed at the time")
+    parser.add_argument("--timestamps", action="store_true")
+    args = parser.parse_args(argv)
+
+    trace = Trace.load(args.path)
+    print(f"[🧵 TRACE] {trace.name or args.path}: {len(trace)} events")
+    trace.replay(sources=args.source, debug_only=args.debug_only, timestamps=args.timestamps)
+
+
+if __name__ == "__main__":
+    main()
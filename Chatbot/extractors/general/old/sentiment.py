@@ -10,7 +10,7 @@ Handles:
 
 import re
 import spacy
-from typing import List, Dict, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from transformers import pipeline
 
 from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
@@ -28,20 +28,26 @@ _LABEL_MAP = {
     "I'm unsure or neutral": "neutral"
 }
 _sentiment_pipeline = pipeline("zero-shot-classification", model=_SENTIMENT_MODEL_NAME)
+SENTIMENT_BATCH_SIZE = 16
 
 # ─────────────────────────────────────────────
 # Main Entry: Classify all segments
 # ─────────────────────────────────────────────
-def classify_segments_by_sentiment_no_neutral(has_splitter: bool, segments: List[str]) -> Dict[str, List[str]]:
+def classify_segments_by_sentiment_no_neutral(
+    has_splitter: bool,
+    segments: List[str],
+    sentiments: Optional[List[str]] = None
+) -> Dict[str, List[str]]:
     """
     Runs classification on each segment. If neutral is returned,
     it uses negation to infer whether it leans positive or negative.
+    `sentiments` holds labels already predicted by `detect_sentiments`.
     """
     classification = {"positive": [], "negative": []}
 
-    for seg in segments:
+    for index, seg in enumerate(segments):
         try:
-            sentiment = detect_sentiment(seg)
+            sentiment = sentiments[index] if sentiments is not None else detect_sentiment(seg)
             mapped = map_sentiment(sentiment, seg)
             classification[mapped].append(seg)
         except Exception as e:
@@ -64,6 +70,23 @@ def detect_sentiment(text: str) -> str:
         return "neutral"
 
 
+def detect_sentiments(texts: List[str], batch_size: int = SENTIMENT_BATCH_SIZE) -> List[str]:
+    """
+    Batched `detect_sentiment`: one pipeline call classifies all `texts`.
+    Falls back to one call per text if the batch fails.
+    """
+    if not texts:
+        return []
+    try:
+        results = _sentiment_pipeline(list(texts), _CANDIDATE_LABELS, batch_size=batch_size)
+        if isinstance(results, dict):
+            results = [results]
+        return [_LABEL_MAP.get(result["labels"][0], "neutral") for result in results]
+    except Exception as e:
+        print(f"[❌ Sentiment batch failed] → {e}; classifying one by one")
+        return [detect_sentiment(text) for text in texts]
+
+
 def map_sentiment(predicted: str, text: str) -> str:
     """
     Applies fallback logic for neutral labels using negation detection.
@@ -78,12 +101,14 @@ def map_sentiment(predicted: str, text: str) -> str:
 # ─────────────────────────────────────────────
 # Clause Segmentation
 # ─────────────────────────────────────────────
-def contains_sentiment_splitter_with_segments(text: str) -> Tuple[bool, List[str]]:
+def contains_sentiment_splitter_with_segments(text: str, doc=None) -> Tuple[bool, List[str]]:
     """
     Detects whether the sentence contains a clause-level sentiment split
     and returns segmented parts. Uses dependency parsing and punctuation fallback.
+    `doc` is the already parsed text, if any.
     """
-    doc = nlp(text)
+    if doc is None:
+        doc = nlp(text)
 
     if should_skip_split_due_to_or_negation(doc):
         return False, [text.strip()]
@@ -95,6 +120,16 @@ def contains_sentiment_splitter_with_segments(text: str) -> Tuple[bool, List[str
     return fallback_split_on_punctuation(text)
 
 
+def split_texts_with_segments(texts: Iterable[str], batch_size: int = 64) -> Iterator[Tuple[bool, List[str]]]:
+    """
+    `contains_sentiment_splitter_with_segments` over many texts, parsed
+    in batches with `nlp.pipe`. Yields one result per text, in order.
+    """
+    texts = list(texts)
+    for text, doc in zip(texts, nlp.pipe(texts, batch_size=batch_size)):
+        yield contains_sentiment_splitter_with_segments(text, doc=doc)
+
+
 def should_skip_split_due_to_or_negation(doc) -> bool:
     has_neg = any(tok.dep_ == "neg" for tok in doc)
     has_or = any(normalize_token(tok.text)== "or" for tok in doc)
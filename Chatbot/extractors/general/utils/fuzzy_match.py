@@ -21,6 +21,7 @@ import re
 from fuzzywuzzy import fuzz
 from Chatbot.extractors.color.shared.constants import SEMANTIC_CONFLICTS
 from Chatbot.extractors.color.utils.token_utils import normalize_token, split_glued_tokens
+from Chatbot.extractors.color.utils.trace import debug_trace
 from Chatbot.extractors.color.utils.config_loader import load_known_modifiers
 from Chatbot.extractors.general.utils.tokenizer import get_tokens_and_counts
 known_modifiers = load_known_modifiers()
@@ -28,7 +29,8 @@ known_modifiers = load_known_modifiers()
 # 🔹 Primary Interface: Expression Alias Matching
 # ──────────────────────────────────────────────────────────────
 
-def match_expression_aliases(input_text, expression_map, debug=True):
+def match_expression_aliases(input_text, expression_map, debug=False):
+    trace = debug_trace(debug, "fuzzy_match.match_expression_aliases")
     tokens = list(get_tokens_and_counts(input_text).keys())
     matched_expressions = set()
     matched_aliases = set()
@@ -41,8 +43,8 @@ def match_expression_aliases(input_text, expression_map, debug=True):
         # ⏫ First match multiword aliases (to suppress inner tokens like 'glam' in 'soft glam')
         for alias in multiword_aliases + singleword_aliases:
             if _should_accept_match(alias, input_text, tokens, matched_aliases, debug):
-                if debug:
-                    print(f"[✅ MATCH] Alias '{alias}' matched → {expr}")
+                if trace:
+                    trace.event("[✅ MATCH] Alias '{}' matched → {}", alias, expr)
                 matched_expressions.add(expr)
                 matched_aliases.add(alias.strip().lower())
                 break
@@ -52,12 +54,12 @@ def match_expression_aliases(input_text, expression_map, debug=True):
             modifiers = props.get("modifiers", [])
             for mod in modifiers:
                 score = fuzz.ratio(mod.lower(), input_text.lower())
-                if debug:
-                    print(f"[🔍 MODIFIER FUZZ] '{input_text}' vs '{mod}' → {score}")
+                if trace:
+                    trace.event("[🔍 MODIFIER FUZZ] '{}' vs '{}' → {}", input_text, mod, score)
                 if score >= 90:
                     matched_expressions.add(expr)
-                    if debug:
-                        print(f"[✅ MODIFIER MATCH] '{input_text}' ~ '{mod}' → {expr}")
+                    if trace:
+                        trace.event("[✅ MODIFIER MATCH] '{}' ~ '{}' → {}", input_text, mod, expr)
                     break
 
     # 🧼 Final cleanup: suppress any expression whose alias is embedded in a longer match
@@ -78,8 +80,8 @@ def match_expression_aliases(input_text, expression_map, debug=True):
 
             for matched in matched_aliases:
                 if norm_alias in matched and norm_alias != matched:
-                    if debug:
-                        print(f"[🚫 EMBEDDED ALIAS REMOVED] '{norm_alias}' inside '{matched}'")
+                    if trace:
+                        trace.event("[🚫 EMBEDDED ALIAS REMOVED] '{}' inside '{}'", norm_alias, matched)
                     to_remove.add(expr)
 
     matched_expressions -= to_remove
@@ -91,10 +93,11 @@ def match_expression_aliases(input_text, expression_map, debug=True):
 # 🔹 Core Matching Dispatcher
 # ──────────────────────────────────────────────────────────────
 
-def _should_accept_match(alias, input_text, tokens, matched_aliases=None, debug=True):
+def _should_accept_match(alias, input_text, tokens, matched_aliases=None, debug=False):
+    trace = debug_trace(debug, "fuzzy_match._should_accept_match")
     if input_text and alias in input_text.lower():
-        if debug:
-            print(f"[✅ DIRECT CONTAINS MATCH] alias '{alias}' found inside input → accepting")
+        if trace:
+            trace.event("[✅ DIRECT CONTAINS MATCH] alias '{}' found inside input → accepting", alias)
         return True
 
     alias = alias.strip().lower()
@@ -104,8 +107,8 @@ def _should_accept_match(alias, input_text, tokens, matched_aliases=None, debug=
 
     for matched in matched_aliases:
         if alias in matched and matched != alias:
-            if debug:
-                print(f"[⛔ SKIP] '{alias}' is part of already matched multiword: '{matched}'")
+            if trace:
+                trace.event("[⛔ SKIP] '{}' is part of already matched multiword: '{}'", alias, matched)
             return False
 
     return (
@@ -119,28 +122,30 @@ def _should_accept_match(alias, input_text, tokens, matched_aliases=None, debug=
 # ──────────────────────────────────────────────────────────────
 
 def _handle_multiword_alias(alias, input_text, debug):
+    trace = debug_trace(debug, "fuzzy_match._handle_multiword_alias")
     if _is_exact_alias_match(alias, input_text):
-        if debug: print(f"[✅ EXACT MATCH] '{alias}' == '{input_text}'")
+        if trace: trace.event("[✅ EXACT MATCH] '{}' == '{}'", alias, input_text)
         return True
     return _is_multiword_alias_match(alias, input_text, debug=debug)
 
-def _is_multiword_alias_match(alias, input_text, threshold=85, debug=True):
+def _is_multiword_alias_match(alias, input_text, threshold=85, debug=False):
+    trace = debug_trace(debug, "fuzzy_match._is_multiword_alias_match")
     norm_alias = alias.strip().lower()
     norm_input = input_text.strip().lower()
 
     if fuzz.partial_ratio(norm_alias, norm_input) >= threshold:
-        if debug: print(f"[🔍 FUZZ.partial_ratio] {norm_alias} ~ {norm_input}")
+        if trace: trace.event("[🔍 FUZZ.partial_ratio] {} ~ {}", norm_alias, norm_input)
         return True
 
     alias_parts = norm_alias.split()
     input_parts = norm_input.split()
 
     if len(alias_parts) == 2 and sorted(alias_parts) == sorted(input_parts):
-        if debug: print(f"[🔀 REORDERED MATCH] '{alias}' parts found in input")
+        if trace: trace.event("[🔀 REORDERED MATCH] '{}' parts found in input", alias)
         return True
 
     if fuzz.token_set_ratio(norm_alias, norm_input) >= 85 and _has_token_overlap(norm_alias, norm_input):
-        if debug: print(f"[🌀 TOKEN SET MATCH] {norm_alias} ~ {norm_input}")
+        if trace: trace.event("[🌀 TOKEN SET MATCH] {} ~ {}", norm_alias, norm_input)
         return True
 
     return False
@@ -148,16 +153,17 @@ def _has_token_overlap(a: str, b: str) -> bool:
     return bool(set(a.split()) & set(b.split()))
 
 
-def should_accept_multiword_alias(alias: str, input_text: str, threshold: int = 80, debug: bool = True, strict: bool = True):
+def should_accept_multiword_alias(alias: str, input_text: str, threshold: int = 80, debug: bool = False, strict: bool = True):
+    trace = debug_trace(debug, "fuzzy_match.should_accept_multiword_alias")
     norm_alias = normalize_token(alias)
     norm_input = normalize_token(input_text)
 
     if norm_alias == norm_input:
-        if debug: print("[✅ MATCH] Exact normalized match")
+        if trace: trace.event("[✅ MATCH] Exact normalized match")
         return True
 
     score = fuzz.partial_ratio(norm_alias, norm_input)
-    if debug: print(f"[🔍 FUZZ.partial_ratio] → {score}")
+    if trace: trace.event("[🔍 FUZZ.partial_ratio] → {}", score)
     if score >= threshold:
         return True
 
@@ -177,11 +183,11 @@ def should_accept_multiword_alias(alias: str, input_text: str, threshold: int =
             matched += 1
 
     if matched == len(alias_parts):
-        if debug: print("[✅ MATCH] All alias parts passed strict fuzzy containment")
+        if trace: trace.event("[✅ MATCH] All alias parts passed strict fuzzy containment")
         return True
 
     loose_score = fuzz.token_set_ratio(alias, input_text)
-    if debug: print(f"[🧪 FUZZ.token_set_ratio] → {loose_score}")
+    if trace: trace.event("[🧪 FUZZ.token_set_ratio] → {}", loose_score)
     return loose_score >= 92 and (len(alias.split()) > 2 or len(input_text.split()) > 2)
 
 # ──────────────────────────────────────────────────────────────
@@ -189,14 +195,15 @@ def should_accept_multiword_alias(alias: str, input_text: str, threshold: int =
 # ──────────────────────────────────────────────────────────────
 
 def _handle_singleword_alias(alias, input_text, tokens, matched_aliases, debug):
+    trace = debug_trace(debug, "fuzzy_match._handle_singleword_alias")
     for matched in matched_aliases:
         if alias in matched and len(matched.split()) > 1:
-            if debug:
-                print(f"[⛔ BLOCKED: token inside multiword] '{alias}' in '{matched}'")
+            if trace:
+                trace.event("[⛔ BLOCKED: token inside multiword] '{}' in '{}'", alias, matched)
             return False
 
     if _is_exact_alias_match(alias, input_text):
-        if debug: print(f"[✅ EXACT MATCH] '{alias}' == '{input_text}'")
+        if trace: trace.event("[✅ EXACT MATCH] '{}' == '{}'", alias, input_text)
         return True
 
     return _is_token_fuzzy_match(alias, tokens, matched_aliases=matched_aliases, debug=debug)
@@ -211,30 +218,31 @@ def _is_token_fuzzy_match(
     tokens,
     input_text=None,
     matched_aliases=None,
-    debug=True,
+    debug=False,
     min_score=85
 ):
+    trace = debug_trace(debug, "fuzzy_match._is_token_fuzzy_match")
     alias = alias.strip().lower()
     matched_aliases = matched_aliases or set()
 
     if input_text:
         input_tokens = input_text.strip().lower().split()
         if len(input_tokens) == 2 and alias in input_tokens:
-            if debug:
-                print(f"[⛔ BLOCKED: TOKEN FUZZY] '{alias}' inside 2-word phrase: '{input_text}'")
+            if trace:
+                trace.event("[⛔ BLOCKED: TOKEN FUZZY] '{}' inside 2-word phrase: '{}'", alias, input_text)
             return False
 
     for token in tokens:
         token = token.strip().lower()
 
         if frozenset({alias, token}) in SEMANTIC_CONFLICTS:
-            if debug:
-                print(f"[🚫 FUZZY BLOCKED by SEMANTIC_CONFLICTS] '{token}' vs '{alias}'")
+            if trace:
+                trace.event("[🚫 FUZZY BLOCKED by SEMANTIC_CONFLICTS] '{}' vs '{}'", token, alias)
             return False
 
         score = fuzz.ratio(token, alias)
-        if debug:
-            print(f"[🔍 FUZZ.ratio] '{token}' vs '{alias}' → {score}")
+        if trace:
+            trace.event("[🔍 FUZZ.ratio] '{}' vs '{}' → {}", token, alias, score)
         if score >= min_score:
             return True
 
@@ -242,8 +250,8 @@ def _is_token_fuzzy_match(
         if 70 <= score < min_score and alias.endswith("y"):
             root = alias[:-1]
             if token.startswith(root) or root.startswith(token):
-                if debug:
-                    print(f"[🌱 ROOT MATCH] '{token}' vs '{alias}' → accepting by suffix root")
+                if trace:
+                    trace.event("[🌱 ROOT MATCH] '{}' vs '{}' → accepting by suffix root", token, alias)
                 return True
 
     return False
@@ -24,13 +24,8 @@ from Chatbot.cache.llm_cache import load_cache_from_file
 # ──────────────────────────────────────────────────────────
 # LOGGER
 # ──────────────────────────────────────────────────────────
+# Level and handlers are left to the application (e.g. logging.basicConfig)
 logger = logging.getLogger("ColorPipeline")
-logger.setLevel(logging.DEBUG)
-if not logger.hasHandlers():
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(levelname)s] %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
 
 load_cache_from_file()
 
@@ -0,0 +1,144 @@
+# Chatbot/service/micro_batcher.py
+
+"""
+micro_batcher.py
+================
+
+Gathers concurrent single-item requests into micro-batches.
+
+Callers submit one item each and get a Future. A background thread takes
+the first waiting item, keeps collecting for up to `max_wait` seconds (or
+until `max_batch_size` items are queued), and runs `process_batch` once on
+the whole batch. spaCy's `nlp.pipe` and the sentiment model amortize much
+better over a batch than over single texts, at the cost of at most
+`max_wait` extra latency under light load.
+
+If `process_batch` raises on a batch, its items are retried one at a
+time, so only the request that actually fails gets the error.
+
+Used By:
+--------
+- server.ColorService
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+MICRO_BATCH_SIZE = 32
+MICRO_BATCH_WAIT = 0.01
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Usage:
+        batcher = MicroBatcher(lambda texts: [len(text) for text in texts])
+        batcher.submit("dusty rose").result()
+        batcher.close()
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = MICRO_BATCH_SIZE,
+        max_wait: float = MICRO_BATCH_WAIT,
+        name: str = "micro-batcher"
+    ):
+        """
+        Args:
+            process_batch (Callable): List of items → one result per item, in order.
+            max_batch_size (int): Largest batch handed to `process_batch`.
+            max_wait (float): Seconds to wait for more items after the first one.
+            name (str): Worker thread name.
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(("batches", "items", "errors", "split_batches", "largest_batch"), 0)
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _collect(self, first) -> List[tuple]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                self._queue.put(_STOP)  # finish this batch, then stop
+                break
+            batch.append(entry)
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            self._run([entry for entry in self._collect(first) if entry[1].set_running_or_notify_cancel()])
+
+    def _run(self, batch: List[tuple]) -> None:
+        if not batch:
+            return
+        items = [item for item, _ in batch]
+        try:
+            results = self.process_batch(items)
+            if len(results) != len(items):
+                raise ValueError(f"process_batch returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            if len(batch) > 1:
+                logger.warning(f"[⚠️ BATCH FAILED] {len(items)} items → {e}; retrying one by one")
+                self._count(split=1)
+                for entry in batch:
+                    self._run([entry])
+                return
+            logger.error(f"[💥 ITEM FAILED] {items[0]!r} → {e}")
+            self._count(errors=1)
+            batch[0][1].set_exception(e)
+            return
+        self._count(batches=1, items=len(items), largest=len(items))
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _count(self, batches: int = 0, items: int = 0, errors: int = 0, split: int = 0, largest: int = 0) -> None:
+        with self._lock:
+            self._counts["batches"] += batches
+            self._counts["items"] += items
+            self._counts["errors"] += errors
+            self._counts["split_batches"] += split
+            self._counts["largest_batch"] = max(self._counts["largest_batch"], largest)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns batches / items / failed items / batches split after a failure /
+        largest batch, mean batch size and queue depth.
+        """
+        with self._lock:
+            stats = dict(self._counts)
+        stats["mean_batch_size"] = stats["items"] / stats["batches"] if stats["batches"] else 0.0
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Processes what is already queued, then stops the worker thread.
+        """
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
@@ -0,0 +1,354 @@
+# Chatbot/service/server.py
+
+"""
+server.py
+=========
+
+Built-in HTTP/JSON service around the color extraction pipeline
+(standard library only).
+
+- Models are loaded once, in a warm-up thread started with the server;
+  `/readyz` turns 200 when it is done (503 before, with the error if it failed)
+- Concurrent requests are gathered into micro-batches (see
+  micro_batcher.py) and run through `extract_color_pipeline_many`, so
+  spaCy and the sentiment model see batches instead of single texts
+- One thread per connection, HTTP/1.1 keep-alive
+
+Endpoints:
+----------
+    POST /extract   {"text": "..."} → {"result": {...}}
+                    {"texts": [...]} → {"results": [...]}
+                    {"text": "...", "session_id": "..."} → {"result": {...}, "turn": n}
+                    {"text": "...", "trace": true} → {"result": {...}, "trace": {...}}
+                    (debug trace of the extraction passes, see utils/trace.py)
+                    (preferences merged over the session's turns, see session.py)
+    DELETE /sessions/<id>
+    GET  /healthz   liveness
+    GET  /readyz    readiness (after warm-up)
+    GET  /metrics   request counts, latency percentiles, batch sizes
+    GET  /metrics/prometheus
+                    per-stage pipeline histograms (see utils/telemetry.py)
+
+Usage:
+------
+    python -m Chatbot.service.server --port 8080 --batch-size 32 --wait-ms 10
+
+Used By:
+--------
+- Deployment (serving entry point)
+- benchmarks/load_test_service.py
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import unquote
+
+from Chatbot.extractors.color.session import SessionStore
+from Chatbot.extractors.color.utils.telemetry import render_prometheus
+from Chatbot.extractors.color.utils.trace import Trace, capture_trace
+from Chatbot.service.micro_batcher import MICRO_BATCH_SIZE, MICRO_BATCH_WAIT, MicroBatcher
+
+BATCH_SIZE_ENV = "COLOR_SERVICE_BATCH_SIZE"
+BATCH_WAIT_MS_ENV = "COLOR_SERVICE_BATCH_WAIT_MS"
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8080
+REQUEST_TIMEOUT = 30.0
+MAX_BODY_BYTES = 1 << 20
+LATENCY_WINDOW = 4096
+
+WARMUP_TEXTS = ["I love soft pink but not bright red"]
+
+logger = logging.getLogger(__name__)
+
+
+def percentiles(values: Iterable[float], points: Sequence[float] = (50, 95, 99)) -> Dict[str, float]:
+    """
+    Nearest-rank percentiles, e.g. {'p50': ..., 'p95': ..., 'p99': ...} (0.0 when empty).
+    """
+    ordered = sorted(values)
+    result = {}
+    for point in points:
+        if not ordered:
+            result[f"p{point:g}"] = 0.0
+            continue
+        rank = max(1, int(-(-point * len(ordered) // 100)))  # ceil
+        result[f"p{point:g}"] = ordered[min(rank, len(ordered)) - 1]
+    return result
+
+
+# ------------------ PIPELINE ------------------ #
+
+def extract_batch(texts: List[str]) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    Runs one micro-batch through `extract_color_pipeline_many`.
+
+    The batch shares one PIPELINE_LATENCY_BUDGET for its LLM calls. That
+    is intended: the texts start together and every request waits for the
+    whole batch anyway, so each one gets the same wall-clock cap as a
+    single `extract_color_pipeline` call.
+    """
+    from Chatbot.extractors.color.extractor import PIPELINE_LATENCY_BUDGET, extract_color_pipeline_many
+    from Chatbot.extractors.color.shared.vocab import load_vocabularies
+
+    known_tones, known_modifiers = load_vocabularies()
+    return list(extract_color_pipeline_many(
+        texts, known_tones, known_modifiers, batch_size=len(texts), budget=PIPELINE_LATENCY_BUDGET
+    ))
+
+
+def warm_up() -> None:
+    """
+    Loads models and indexes, then runs one extraction (lazy model init).
+    Any failure propagates, so the service does not report ready.
+    """
+    from Chatbot.extractors.color.logic.process_pool import preload_models
+
+    preload_models()
+    extract_batch(WARMUP_TEXTS)
+
+
+# ------------------ SERVICE ------------------ #
+
+class ColorService:
+    """
+    Micro-batched extraction with readiness and request metrics.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[str]], List[Any]] = extract_batch,
+        warm_up: Optional[Callable[[], None]] = warm_up,
+        max_batch_size: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        request_timeout: float = REQUEST_TIMEOUT,
+        sessions: Optional[SessionStore] = None
+    ):
+        """
+        Args:
+            process_batch (Callable): List of texts → one output per text.
+            warm_up (Callable, optional): Run once before the service reports ready.
+            max_batch_size (int, optional): Micro-batch size (default: $COLOR_SERVICE_BATCH_SIZE or 32).
+            max_wait (float, optional): Micro-batch wait window in seconds
+                (default: $COLOR_SERVICE_BATCH_WAIT_MS or 10 ms).
+            request_timeout (float): Seconds a request waits for its batch.
+            sessions (SessionStore, optional): Chat sessions (default: a new store).
+        """
+        if max_batch_size is None:
+            max_batch_size = int(os.environ.get(BATCH_SIZE_ENV, MICRO_BATCH_SIZE))
+        if max_wait is None:
+            max_wait = float(os.environ.get(BATCH_WAIT_MS_ENV, MICRO_BATCH_WAIT * 1000)) / 1000
+        self.batcher = MicroBatcher(process_batch, max_batch_size=max_batch_size, max_wait=max_wait)
+        self._process_batch = process_batch
+        self.request_timeout = request_timeout
+        self.sessions = sessions if sessions is not None else SessionStore()
+        self._warm_up = warm_up
+        self.ready = threading.Event()
+        self.warmup_error: Optional[str] = None
+        self.warmup_seconds = 0.0
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._counts = dict.fromkeys(("requests", "texts", "errors", "rejected"), 0)
+
+    def start_warm_up(self) -> threading.Thread:
+        def run():
+            start = time.perf_counter()
+            try:
+                if self._warm_up is not None:
+                    self._warm_up()
+            except Exception as e:
+                self.warmup_error = f"{type(e).__name__}: {e}"
+                logger.error(f"[💥 WARM-UP FAILED] {self.warmup_error}")
+                return
+            self.warmup_seconds = time.perf_counter() - start
+            self.ready.set()
+            logger.info(f"[✅ READY] warm-up took {self.warmup_seconds:.1f}s")
+
+        thread = threading.Thread(target=run, name="color-service-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def extract(self, texts: List[str]) -> List[Any]:
+        """
+        Submits each text to the micro-batcher and waits for the results.
+        """
+        futures = [self.batcher.submit(text) for text in texts]
+        deadline = time.monotonic() + self.request_timeout
+        return [future.result(max(0.0, deadline - time.monotonic())) for future in futures]
+
+    def extract_traced(self, text: str) -> Tuple[Any, Trace]:
+        """
+        Runs one text outside the micro-batcher, on the calling thread, so
+        its debug trace holds this request's events only.
+        """
+        with capture_trace(name=text) as trace:
+            result = self._process_batch([text])[0]
+        return result, trace
+
+    def record(self, seconds: float, texts: int = 0, error: bool = False, rejected: bool = False) -> None:
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts["texts"] += texts
+            self._counts["errors"] += error
+            self._counts["rejected"] += rejected
+            if not (error or rejected):
+                self._latencies.append(seconds)
+
+    def metrics(self) -> Dict[str, object]:
+        with self._lock:
+            counts = dict(self._counts)
+            latencies = list(self._latencies)
+        latency_ms = {key: value * 1000 for key, value in percentiles(latencies).items()}
+        return {
+            **counts,
+            "ready": self.ready.is_set(),
+            "uptime_s": time.time() - self.started,
+            "warmup_s": self.warmup_seconds,
+            "latency_ms": latency_ms,
+            "batches": self.batcher.stats(),
+            "sessions": self.sessions.stats(),
+        }
+
+    def make_server(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> ThreadingHTTPServer:
+        return _Server((host, port), _handler_class(self))
+
+    def close(self) -> None:
+        self.batcher.close()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def _handler_class(service: ColorService):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status: int, body: dict) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _reply_text(self, status: int, text: str, content_type: str) -> None:
+            data = text.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/healthz":
+                self._reply(200, {"status": "ok"})
+            elif self.path == "/readyz":
+                ready = service.ready.is_set()
+                body = {"ready": ready}
+                if service.warmup_error:
+                    body["error"] = service.warmup_error
+                self._reply(200 if ready else 503, body)
+            elif self.path == "/metrics":
+                self._reply(200, service.metrics())
+            elif self.path == "/metrics/prometheus":
+                self._reply_text(200, render_prometheus(), "text/plain; version=0.0.4")
+            else:
+                self._reply(404, {"error": f"no route {self.path}"})
+
+        def do_POST(self):
+            start = time.perf_counter()
+            length = int(self.headers.get("Content-Length", 0))
+            if length > MAX_BODY_BYTES:
+                self.close_connection = True  # body left unread
+                service.record(0.0, rejected=True)
+                return self._reply(413, {"error": "body too large"})
+            raw = self.rfile.read(length)
+            if self.path != "/extract":
+                return self._reply(404, {"error": f"no route {self.path}"})
+            if not service.ready.is_set():
+                service.record(0.0, rejected=True)
+                return self._reply(503, {"error": "warming up"})
+
+            try:
+                body = json.loads(raw or b"{}")
+                single = isinstance(body.get("text"), str)
+                texts = [body["text"]] if single else body.get("texts")
+                if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                    raise ValueError('expected {"text": str} or {"texts": [str, ...]}')
+                session_id = body.get("session_id")
+                if session_id is not None and not single:
+                    raise ValueError('"session_id" takes a single "text"')
+                traced = body.get("trace") is True
+                if traced and (not single or session_id is not None):
+                    raise ValueError('"trace" takes a single "text" without "session_id"')
+            except (ValueError, AttributeError) as e:
+                service.record(0.0, rejected=True)
+                return self._reply(400, {"error": str(e)})
+
+            try:
+                if session_id is not None:
+                    session = service.sessions.get(str(session_id))
+                    reply = {"result": session.add_turn(texts[0]), "turn": session.turns}
+                elif traced:
+                    result, trace = service.extract_traced(texts[0])
+                    reply = {"result": result, "trace": trace.to_dict()}
+                else:
+                    results = service.extract(texts)
+                    reply = {"result": results[0]} if single else {"results": results}
+            except Exception as e:
+                service.record(time.perf_counter() - start, len(texts), error=True)
+                return self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+            service.record(time.perf_counter() - start, len(texts))
+            self._reply(200, reply)
+
+        def do_DELETE(self):
+            if not self.path.startswith("/sessions/"):
+                return self._reply(404, {"error": f"no route {self.path}"})
+            dropped = service.sessions.drop(unquote(self.path[len("/sessions/"):]))
+            self._reply(200 if dropped else 404, {"dropped": dropped})
+
+    return Handler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--batch-size", type=int, default=None, help=f"default ${BATCH_SIZE_ENV} or {MICRO_BATCH_SIZE}")
+    parser.add_argument("--wait-ms", type=float, default=None,
+                        help=f"micro-batch wait window (default ${BATCH_WAIT_MS_ENV} or {MICRO_BATCH_WAIT * 1000:g})")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+
+    service = ColorService(
+        max_batch_size=args.batch_size,
+        max_wait=None if args.wait_ms is None else args.wait_ms / 1000
+    )
+    server = service.make_server(args.host, args.port)
+    service.start_warm_up()
+    logger.info(f"[🌐 SERVING] http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# Chatbot/tests/cache/backend/test_backend.py
+
+import io
+import os
+import tempfile
+import unittest
+
+from Chatbot.cache.backend import RemoteCacheBackend
+from Chatbot.cache.llm_cache import ColorLLMCache
+from Chatbot.cache.resp_client import RESPClient, RESPError, encode_command, read_reply
+from Chatbot.extractors.color.llm.circuit_breaker import CircuitBreaker
+from Chatbot.tests.support.fake_resp_server import FakeRESPServer, free_port
+
+
+class TestRESPCodec(unittest.TestCase):
+
+    def run_case(self, raw, expected):
+        result = read_reply(io.BytesIO(raw))
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case(b"+OK\r\n", "OK")
+    def test_case_02(self): self.run_case(b":42\r\n", 42)
+    def test_case_03(self): self.run_case(b"$5\r\nhello\r\n", b"hello")
+    def test_case_04(self): self.run_case(b"$-1\r\n", None)
+    def test_case_05(self): self.run_case(b"*2\r\n$1\r\na\r\n$-1\r\n", [b"a", None])
+
+    def test_error_reply(self):
+        self.assertIsInstance(read_reply(io.BytesIO(b"-ERR nope\r\n")), RESPError)
+
+    def test_encode(self):
+        self.assertEqual(b"*2\r\n$3\r\nGET\r\n$5\r\nros\xc3\xa9\r\n", encode_command("GET", "rosé"))
+
+    def test_from_url(self):
+        client = RESPClient.from_url("redis://:secret@cache.local:6380/2")
+        self.assertEqual(("cache.local", 6380, 2, "secret"), (client.host, client.port, client.db, client.password))
+
+
+class TestRemoteCacheBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeRESPServer().start()
+        self.breaker = CircuitBreaker("test_remote", failure_threshold=2, reset_timeout=60)
+        self.backend = RemoteCacheBackend(RESPClient(port=self.server.port, timeout=0.2), breaker=self.breaker)
+
+    def tearDown(self):
+        self.backend.close()
+        self.server.stop()
+
+    def test_round_trip_and_ttl(self):
+        self.assertTrue(self.backend.set_many({"v1:rgb:rose": [192, 115, 122], "v1:rgb:sand": [1, 2, 3]}, ttl=60))
+        self.assertEqual({"v1:rgb:rose": [192, 115, 122]}, self.backend.get_many(["v1:rgb:rose", "v1:rgb:mint"]))
+        self.assertEqual([b"SET", b"color_llm:v1:rgb:rose", b"[192, 115, 122]", b"PX", b"60000"],
+                         self.server.commands[0])
+        self.assertEqual({"hits": 1, "misses": 1, "writes": 2, "errors": 0, "skipped": 0, "breaker": "closed"},
+                         self.backend.stats())
+
+    def test_pipelined_multi_get_on_one_connection(self):
+        self.backend.set_many({f"k{i}": i for i in range(20)})
+        self.assertEqual({f"k{i}": i for i in range(20)}, self.backend.get_many([f"k{i}" for i in range(20)]))
+        self.assertEqual(1, len(self.server.connections))
+
+    def test_degrades_when_down(self):
+        self.backend.set_many({"rose": [1, 2, 3]})
+        self.server.stop()
+        self.assertEqual({}, self.backend.get_many(["rose"]))
+        self.assertFalse(self.backend.set_many({"sand": [1, 2, 3]}))
+        self.assertFalse(self.backend.available())
+        self.assertEqual({}, self.backend.get_many(["rose"]))
+        self.assertEqual((2, 1), (self.backend.stats()["errors"], self.backend.stats()["skipped"]))
+
+    def test_timeout_is_a_miss(self):
+        self.backend.set_many({"rose": [1, 2, 3]})
+        self.server.delay = 0.5
+        self.assertEqual({}, self.backend.get_many(["rose"]))
+
+    def test_rejected_auth_is_a_failure(self):
+        server = FakeRESPServer(password="secret").start()
+        self.addCleanup(server.stop)
+        breaker = CircuitBreaker("test_auth", failure_threshold=2, reset_timeout=60)
+        backend = RemoteCacheBackend.from_url(f"redis://:bad@127.0.0.1:{server.port}/0", timeout=0.2, breaker=breaker)
+        self.addCleanup(backend.close)
+        self.assertEqual({}, backend.get_many(["rose"]))
+        self.assertFalse(backend.set_many({"rose": [1, 2, 3]}))
+        self.assertEqual({}, backend.get_many(["rose"]))
+        self.assertEqual((2, 1, "open"), (backend.stats()["errors"], backend.stats()["skipped"], breaker.state))
+        self.assertEqual([], backend.client._sockets)
+
+        good = RemoteCacheBackend.from_url(f"redis://:secret@127.0.0.1:{server.port}/0", timeout=0.2,
+                                           breaker=CircuitBreaker("test_auth_ok"))
+        self.addCleanup(good.close)
+        self.assertTrue(good.set_many({"rose": [1, 2, 3]}))
+        self.assertEqual({"rose": [1, 2, 3]}, good.get_many(["rose"]))
+
+    def test_reconnects_do_not_accumulate_sockets(self):
+        client = self.backend.client
+        for _ in range(5):
+            self.backend.get_many(["rose"])
+            client._drop()
+        self.assertEqual([], client._sockets)
+
+    def test_unreachable_from_start(self):
+        backend = RemoteCacheBackend(RESPClient(port=free_port(), timeout=0.2), breaker=CircuitBreaker("t"))
+        self.assertEqual({}, backend.get_many(["rose"]))
+
+
+class TestColorLLMCacheRemoteTier(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = FakeRESPServer().start()
+        self.cache = ColorLLMCache.get_instance()
+        self.cache.clear()
+        self.cache.reset_stats()
+        self.saved = self.cache._path
+        self.cache._path = os.path.join(self.tmp.name, "color_llm_cache.sqlite3")
+        self.breaker = CircuitBreaker("test_cache_remote", failure_threshold=1, reset_timeout=60)
+        self.backend = RemoteCacheBackend(RESPClient(port=self.server.port, timeout=0.2), breaker=self.breaker)
+        self.cache.set_backend(self.backend)
+
+    def tearDown(self):
+        self.cache.set_backend(None)
+        self.cache.clear()
+        self.cache._path = self.saved
+        self.backend.close()
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def test_flush_writes_through_and_other_node_reads(self):
+        self.cache.store_rgb("Dusty Rose", (192, 115, 122))
+        self.cache.store_simplified("peachy", ["light peach"])
+        self.cache.flush()
+        os.remove(self.cache._path)  # another node: nothing local
+        self.cache.clear()
+        self.assertEqual((192, 115, 122), self.cache.get_rgb("dusty rose"))
+        self.assertEqual(["light peach"], self.cache.get_simplified("peachy"))
+        self.assertEqual(2, self.cache.stats()["remote"]["hits"])
+
+    def test_get_rgb_many(self):
+        self.cache.store_rgb("rose", (1, 1, 1))
+        self.cache.store_rgb("sand", (2, 2, 2))
+        self.cache.flush()
+        self.cache.clear()
+        self.cache.get_rgb("rose")   # warms memory
+        self.server.commands.clear()
+        result = self.cache.get_rgb_many(["rose", "sand", "mint", "Sand"])
+        self.assertEqual({"rose": (1, 1, 1), "sand": (2, 2, 2), "mint": None, "Sand": (2, 2, 2)}, result)
+        self.assertEqual([b"GET", b"GET"], [command[0] for command in self.server.commands])
+
+    def test_local_hits_are_copied_up(self):
+        self.cache.set_backend(None)
+        self.cache.store_rgb("rose", (1, 1, 1))
+        self.cache.flush()
+        self.cache.clear()
+        self.cache.set_backend(self.backend)
+        self.assertEqual((1, 1, 1), self.cache.get_rgb("rose"))
+        self.assertIn(f"color_llm:{self.cache.tag}:rgb:rose".encode(), self.server.data)
+
+    def test_remote_down_falls_back_to_local(self):
+        self.cache.store_rgb("rose", (1, 1, 1))
+        self.cache.flush()
+        self.cache.clear()
+        self.server.stop()
+        self.assertEqual((1, 1, 1), self.cache.get_rgb("rose"))
+        self.assertIsNone(self.cache.get_rgb("mint"))
+        self.assertEqual("open", self.cache.stats()["remote"]["backend"]["breaker"])
+
+
+if __name__ == "__main__":
+    unittest.main()
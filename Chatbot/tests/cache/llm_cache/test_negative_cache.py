@@ -0,0 +1,137 @@
+# Chatbot/tests/cache/llm_cache/test_negative_cache.py
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from Chatbot.cache import llm_cache
+from Chatbot.cache.llm_cache import FAILURE_RGB, FAILURE_SIMPLIFY, ColorLLMCache
+from Chatbot.extractors.color.llm.llm_api_client import (
+    _rgb_failure_reason,
+    query_llm_for_rgb,
+    query_llm_for_rgb_batch,
+)
+from Chatbot.extractors.color.llm.llm_transport import LLMTransport
+from Chatbot.tests.support.fake_openrouter import FakeOpenRouter
+
+
+class TestFailureReason(unittest.TestCase):
+
+    def run_case(self, reply, expected):
+        result = _rgb_failure_reason(reply)
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case("", "empty_reply")
+    def test_case_02(self): self.run_case("   ", "empty_reply")
+    def test_case_03(self): self.run_case("I am not sure which color that is.", "unparsable")
+    def test_case_04(self): self.run_case("(300, 20, 20)", "out_of_range")
+
+
+class TestNegativeEntries(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ColorLLMCache.get_instance()
+        self.cache.clear()
+        self.cache.reset_stats()
+        self.saved = (self.cache._path, self.cache.negative_ttl)
+        self.cache._path = os.path.join(self.tmp.name, "color_llm_cache.sqlite3")
+
+    def tearDown(self):
+        self.cache.clear()
+        self.cache._path, self.cache.negative_ttl = self.saved
+        self.tmp.cleanup()
+
+    def test_attempts_and_backoff(self):
+        first = self.cache.store_failure(FAILURE_RGB, "That TikTok color", "unparsable")
+        second = self.cache.store_failure(FAILURE_RGB, "that tiktok color", "empty_reply")
+        self.assertEqual((1, 2), (first["attempts"], second["attempts"]))
+        self.assertEqual(first["first_seen"], second["first_seen"])
+        self.assertAlmostEqual(2 * self.cache.negative_ttl, second["expires"] - second["last_seen"])
+        self.assertEqual("empty_reply", self.cache.get_failure(FAILURE_RGB, "that tiktok color")["reason"])
+        self.assertIsNone(self.cache.get_failure(FAILURE_SIMPLIFY, "that tiktok color"))
+
+    def test_ttl_is_capped(self):
+        for _ in range(8):
+            record = self.cache.store_failure(FAILURE_RGB, "idk", "unparsable")
+        self.assertAlmostEqual(llm_cache.NEGATIVE_TTL_MAX_FACTOR * self.cache.negative_ttl,
+                               record["expires"] - record["last_seen"])
+
+    def test_expired_entry_is_a_miss_but_counts_attempts(self):
+        self.cache.negative_ttl = 0.001
+        self.cache.store_failure(FAILURE_RGB, "idk", "unparsable")
+        time.sleep(0.01)
+        self.assertIsNone(self.cache.get_failure(FAILURE_RGB, "idk"))
+        self.assertEqual(2, self.cache.store_failure(FAILURE_RGB, "idk", "unparsable")["attempts"])
+
+    def test_persisted_across_clear(self):
+        self.cache.store_failure(FAILURE_SIMPLIFY, "something nice", "empty_reply")
+        self.cache.flush()
+        self.cache.clear()
+        self.assertEqual(1, self.cache.get_failure(FAILURE_SIMPLIFY, "something nice")["attempts"])
+        self.assertEqual(2, self.cache.store_failure(FAILURE_SIMPLIFY, "something nice", "empty_reply")["attempts"])
+
+    def test_success_resolves_failure(self):
+        self.cache.store_failure(FAILURE_RGB, "dusty rose", "unparsable")
+        self.cache.flush()
+        self.cache.store_rgb("dusty rose", (192, 115, 122))
+        self.assertIsNone(self.cache.get_failure(FAILURE_RGB, "dusty rose"))
+        self.cache.flush()
+        self.cache.clear()
+        self.assertIsNone(self.cache.get_failure(FAILURE_RGB, "dusty rose"))
+        self.assertEqual([], self.cache.failure_report())
+
+    def test_report_orders_by_attempts(self):
+        for phrase, count in (("idk", 1), ("that tiktok color", 3), ("something nice", 2)):
+            for _ in range(count):
+                self.cache.store_failure(FAILURE_RGB, phrase, "unparsable")
+        self.cache.flush()
+        self.cache.store_failure(FAILURE_RGB, "idk", "unparsable")
+        self.cache.store_failure(FAILURE_RGB, "idk", "unparsable")
+        report = self.cache.failure_report(limit=2)
+        self.assertEqual([("idk", 3), ("that tiktok color", 3)], [(r["key"], r["attempts"]) for r in report])
+
+
+class TestQueriesSkipKnownFailures(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ColorLLMCache.get_instance()
+        self.cache.clear()
+        self.saved = self.cache._path
+        self.cache._path = os.path.join(self.tmp.name, "color_llm_cache.sqlite3")
+        self.server = FakeOpenRouter(responder=lambda payload: "No idea, sorry.").start()
+        self.transport = LLMTransport(url=self.server.url, sleep=lambda seconds: None)
+        self.env = patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.transport.close()
+        self.server.stop()
+        self.cache.clear()
+        self.cache._path = self.saved
+        self.tmp.cleanup()
+
+    def test_single_query(self):
+        for _ in range(3):
+            self.assertIsNone(query_llm_for_rgb("that tiktok color", cache=self.cache, transport=self.transport))
+        self.assertEqual(1, len(self.server.payloads))
+        self.assertEqual("unparsable", self.cache.get_failure(FAILURE_RGB, "that tiktok color")["reason"])
+
+    def test_batch_skips_known_failures(self):
+        self.cache.store_failure(FAILURE_RGB, "idk", "unparsable")
+        result = query_llm_for_rgb_batch(["idk"], cache=self.cache, transport=self.transport)
+        self.assertEqual({"idk": None}, result)
+        self.assertEqual(0, len(self.server.payloads))
+
+    def test_transport_failure_is_not_cached(self):
+        self.server.script.extend([{"status": 503}] * 3)
+        self.assertIsNone(query_llm_for_rgb("rosy", cache=self.cache, transport=self.transport))
+        self.assertIsNone(self.cache.get_failure(FAILURE_RGB, "rosy"))
+
+
+if __name__ == "__main__":
+    unittest.main()
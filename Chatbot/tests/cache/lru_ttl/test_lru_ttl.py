@@ -0,0 +1,152 @@
+# Chatbot/tests/cache/lru_ttl/test_lru_ttl.py
+
+import os
+import tempfile
+import time
+import unittest
+
+from Chatbot.cache.llm_cache import ColorLLMCache, admit_rgb, admit_simplified
+from Chatbot.cache.lru_ttl import BoundedTTLCache
+from Chatbot.cache.sqlite_store import SQLiteColorStore
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBoundedTTLCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = BoundedTTLCache(2, ttl=10, tag="v1", clock=self.clock)
+
+    def test_evicts_least_recently_used(self):
+        self.cache["rose"] = [1, 1, 1]
+        self.cache["sand"] = [2, 2, 2]
+        self.cache.get("rose")
+        self.cache["mint"] = [3, 3, 3]
+        self.assertEqual(["rose", "mint"], list(self.cache))
+        self.assertEqual(1, self.cache.evictions)
+
+    def test_entries_expire(self):
+        self.cache["rose"] = [1, 1, 1]
+        self.clock.now += 10
+        self.assertIsNone(self.cache.get("rose"))
+        self.assertNotIn("rose", self.cache)
+        self.assertEqual(1, self.cache.expirations)
+
+    def test_explicit_expiry_and_tag(self):
+        self.cache.set("rose", [1, 1, 1], expires_at=None)
+        self.cache.set("sand", [2, 2, 2], tag="v0")
+        self.clock.now += 3600
+        self.assertEqual([1, 1, 1], self.cache["rose"])
+        with self.assertRaises(KeyError):
+            self.cache["sand"]
+
+    def test_tag_change_invalidates(self):
+        self.cache["rose"] = [1, 1, 1]
+        self.cache.tag = "v2"
+        self.assertIsNone(self.cache.get("rose"))
+
+    def test_behaves_like_dict(self):
+        self.assertEqual({}, self.cache)
+        self.cache["rose"] = [1, 1, 1]
+        self.assertEqual({"rose": [1, 1, 1]}, self.cache)
+        self.cache.clear()
+        self.assertEqual(0, len(self.cache))
+
+
+class TestAdmission(unittest.TestCase):
+
+    def run_case(self, admit, value, expected):
+        result = admit(value)
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case(admit_rgb, (243, 207, 183), True)
+    def test_case_02(self): self.run_case(admit_rgb, [0, 0, 255], True)
+    def test_case_03(self): self.run_case(admit_rgb, (256, 0, 0), False)
+    def test_case_04(self): self.run_case(admit_rgb, (-1, 0, 0), False)
+    def test_case_05(self): self.run_case(admit_rgb, (1.5, 0, 0), False)
+    def test_case_06(self): self.run_case(admit_rgb, (1, 2), False)
+    def test_case_07(self): self.run_case(admit_rgb, None, False)
+    def test_case_08(self): self.run_case(admit_rgb, "243,207,183", False)
+    def test_case_09(self): self.run_case(admit_simplified, ["light peach"], True)
+    def test_case_10(self): self.run_case(admit_simplified, "light peach", True)
+    def test_case_11(self): self.run_case(admit_simplified, [], False)
+    def test_case_12(self): self.run_case(admit_simplified, [""], False)
+    def test_case_13(self): self.run_case(admit_simplified, None, False)
+
+
+class TestColorLLMCacheTiers(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ColorLLMCache.get_instance()
+        self.cache.clear()
+        self.cache.reset_stats()
+        self.saved = (self.cache._path, self.cache.tag)
+        self.cache._path = os.path.join(self.tmp.name, "color_llm_cache.sqlite3")
+
+    def tearDown(self):
+        self.cache.clear()
+        self.cache._path = self.saved[0]
+        self.cache.set_tag(self.saved[1])
+        self.tmp.cleanup()
+
+    def test_rejects_invalid_entries(self):
+        self.cache.store_rgb("bad", (300, 0, 0))
+        self.cache.store_simplified("empty", [])
+        self.assertIsNone(self.cache.get_rgb("bad"))
+        self.assertEqual([], self.cache.get_simplified("empty"))
+        self.assertEqual(2, self.cache.stats()["rejected"])
+        self.assertEqual(0, self.cache.flush())
+
+    def test_hit_ratio_per_tier(self):
+        self.cache.store_rgb("rose", (192, 115, 122))
+        self.cache.flush()
+        self.cache.clear()
+        self.cache.get_rgb("rose")   # sqlite hit, promoted
+        self.cache.get_rgb("rose")   # memory hit
+        self.cache.get_rgb("unknown")
+        stats = self.cache.stats()
+        self.assertEqual({"hits": 1, "misses": 2, "hit_ratio": 1 / 3},
+                         {k: stats["memory"][k] for k in ("hits", "misses", "hit_ratio")})
+        self.assertEqual({"hits": 1, "misses": 1, "hit_ratio": 0.5}, stats["sqlite"])
+
+    def test_persisted_ttl(self):
+        self.cache.store_rgb("rose", (192, 115, 122), ttl=-1)   # never expires
+        self.cache.store_rgb("sand", (194, 178, 128), ttl=0.01)
+        self.cache.flush()
+        self.cache.clear()
+        time.sleep(0.02)
+        self.assertEqual((192, 115, 122), self.cache.get_rgb("rose"))
+        self.assertIsNone(self.cache.get_rgb("sand"))
+        self.assertEqual(1, SQLiteColorStore(self.cache._path).purge())
+
+    def test_tag_change_is_a_miss(self):
+        self.cache.store_rgb("rose", (192, 115, 122))
+        self.cache.set_tag("other-model")
+        self.assertIsNone(self.cache.get_rgb("rose"))
+        self.cache.set_tag(self.saved[1])
+        self.assertEqual((192, 115, 122), self.cache.get_rgb("rose"))
+
+    def test_eviction_keeps_unflushed_entries(self):
+        saved = self.cache._rgb_cache.maxsize
+        self.cache._rgb_cache.maxsize = 2
+        try:
+            for i in range(5):
+                self.cache.store_rgb(f"tone {i}", (i, i, i))
+            self.assertEqual(2, len(self.cache._rgb_cache))
+            self.assertEqual(5, self.cache.flush())
+            self.assertEqual((0, 0, 0), self.cache.get_rgb("tone 0"))
+        finally:
+            self.cache._rgb_cache.maxsize = saved
+
+
+if __name__ == "__main__":
+    unittest.main()
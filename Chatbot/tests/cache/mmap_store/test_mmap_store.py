@@ -0,0 +1,175 @@
+# Chatbot/tests/cache/mmap_store/test_mmap_store.py
+
+import os
+import struct
+import tempfile
+import time
+import unittest
+
+from Chatbot.cache.llm_cache import ColorLLMCache
+from Chatbot.cache.mmap_store import MmapRGBStore, write_rgb_store
+from Chatbot.extractors.color.utils.palette_index import build_palette_rgb_map
+
+
+class TestMmapRGBStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "rgb.store")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_palette_round_trip(self):
+        palette = build_palette_rgb_map()
+        write_rgb_store(self.path, palette)
+        store = MmapRGBStore(self.path)
+        self.assertEqual(len(palette), len(store))
+        for name, rgb in palette.items():
+            self.assertEqual(rgb, store[name], msg=name)
+        self.assertEqual(sorted(palette), list(store))
+        self.assertEqual(palette, dict(store.items()))
+        store.close()
+
+    def test_missing_keys(self):
+        write_rgb_store(self.path, {"dusty rose": (192, 115, 122)})
+        store = MmapRGBStore(self.path)
+        self.assertIsNone(store.get("dusty pink"))
+        self.assertEqual((0, 0, 0), store.get("", (0, 0, 0)))
+        self.assertNotIn("dusty", store)
+        self.assertNotIn(None, store)
+        with self.assertRaises(KeyError):
+            store["rose"]
+        store.close()
+
+    def test_unicode_and_empty(self):
+        write_rgb_store(self.path, {"rosé": (250, 200, 210), "crème": (255, 253, 208)})
+        store = MmapRGBStore(self.path)
+        self.assertEqual((250, 200, 210), store["rosé"])
+        self.assertEqual(["crème", "rosé"], list(store))
+        store.close()
+
+        write_rgb_store(self.path, {})
+        empty = MmapRGBStore(self.path)
+        self.assertEqual(0, len(empty))
+        self.assertIsNone(empty.get("pink"))
+        empty.close()
+
+    def test_tag_round_trip(self):
+        write_rgb_store(self.path, {"dusty rose": (192, 115, 122)}, tag="gpt-4o:v2ü")
+        store = MmapRGBStore(self.path)
+        self.assertEqual(("gpt-4o:v2ü", (192, 115, 122)), (store.tag, store["dusty rose"]))
+        store.close()
+
+        write_rgb_store(self.path, {"dusty rose": (192, 115, 122)})
+        store = MmapRGBStore(self.path)
+        self.assertEqual("", store.tag)
+        store.close()
+
+    def test_reads_untagged_version_1(self):
+        write_rgb_store(self.path, {"rosé": (250, 200, 210), "crème": (255, 253, 208)})
+        with open(self.path, "r+b") as f:
+            f.seek(8)
+            f.write(struct.pack("<I", 1))
+        store = MmapRGBStore(self.path)
+        self.assertEqual(("", (250, 200, 210)), (store.tag, store["rosé"]))
+        store.close()
+
+    def test_expired_entries_read_as_missing(self):
+        write_rgb_store(self.path, {"rose": (255, 0, 127), "mint": (170, 255, 200), "plum": (142, 69, 133)},
+                        expires={"rose": 1_000.0, "mint": 2_000.0})
+        store = MmapRGBStore(self.path, clock=lambda: 1_500.0)
+        self.assertEqual((None, (170, 255, 200)), (store.get("rose"), store.get("mint")))
+        self.assertNotIn("rose", store)
+        self.assertEqual(["mint", "plum"], list(store))
+        self.assertEqual((2, 2_000.0, None), (len(store), store.expires_at("mint"), store.expires_at("plum")))
+        store.close()
+
+    def test_rejects_foreign_file(self):
+        for content in (b"", b"not a store at all, just some bytes here"):
+            with open(self.path, "wb") as f:
+                f.write(content)
+            with self.assertRaises(ValueError):
+                MmapRGBStore(self.path)
+
+
+class TestColorLLMCacheSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ColorLLMCache.get_instance()
+        self.cache.clear()
+        self.saved = (self.cache._path, self.cache._rgb_store_path)
+        self.cache._path = os.path.join(self.tmp.name, "cache.json")
+
+    def tearDown(self):
+        self.cache.clear()
+        self.cache._path, self.cache._rgb_store_path = self.saved
+        self.tmp.cleanup()
+
+    def test_snapshot_serves_lookups(self):
+        self.cache.store_rgb("peachy beige", (243, 207, 183))
+        path = self.cache.snapshot_rgb(os.path.join(self.tmp.name, "rgb.store"))
+        self.assertEqual({}, self.cache._rgb_cache)
+        self.assertEqual((243, 207, 183), self.cache.get_rgb("Peachy Beige"))
+
+        self.cache.store_rgb("cool mint", (180, 255, 240))
+        self.assertEqual((180, 255, 240), self.cache.get_rgb("cool mint"))
+        self.assertEqual((243, 207, 183), MmapRGBStore(path)["peachy beige"])
+
+    def test_snapshot_keeps_expiry(self):
+        self.cache.store_rgb("fading coral", (250, 128, 114), ttl=0.05)
+        self.cache.store_rgb("warm pink", (200, 120, 140), ttl=-1)
+        path = self.cache.snapshot_rgb(os.path.join(self.tmp.name, "rgb.store"))
+        self.assertIsNotNone(MmapRGBStore(path).expires_at("fading coral"))
+        self.assertIsNone(MmapRGBStore(path).expires_at("warm pink"))
+        time.sleep(1.1)  # expiries are stored to the second
+        self.assertIsNone(self.cache.get_rgb("fading coral"))
+        self.assertEqual((200, 120, 140), self.cache.get_rgb("warm pink"))
+
+        self.cache.snapshot_rgb()
+        self.assertEqual(["warm pink"], list(MmapRGBStore(path)))
+
+    def test_save_merges_store_and_reload_maps_it(self):
+        self.cache.store_rgb("warm pink", (200, 120, 140))
+        self.cache.snapshot_rgb(os.path.join(self.tmp.name, "rgb.store"))
+        self.cache.store_rgb("rosy", (230, 150, 160))
+        self.cache.save()
+
+        self.cache.clear()
+        self.cache.load()
+        self.assertIsNotNone(self.cache._rgb_store)
+        self.assertEqual({}, self.cache._rgb_cache)
+        self.assertEqual((200, 120, 140), self.cache.get_rgb("warm pink"))
+        self.assertEqual((230, 150, 160), self.cache.get_rgb("rosy"))
+
+    def test_snapshot_of_another_tag_is_not_mapped(self):
+        tag = self.cache.tag
+        self.addCleanup(self.cache.set_tag, tag)
+        self.cache.store_rgb("warm pink", (200, 120, 140))
+        path = self.cache.snapshot_rgb(os.path.join(self.tmp.name, "rgb.store"))
+        self.assertEqual(tag, MmapRGBStore(path).tag)
+
+        self.cache.set_tag("v-next")
+        self.cache.clear()
+        self.cache.load()
+        self.assertIsNone(self.cache._rgb_store)
+        self.assertIsNone(self.cache.get_rgb("warm pink"))
+
+        self.cache.set_tag(tag)
+        self.cache.load()
+        self.assertEqual((200, 120, 140), self.cache.get_rgb("warm pink"))
+
+    def test_without_store_path(self):
+        self.cache._rgb_store_path = None
+        self.assertIsNone(self.cache.snapshot_rgb())
+
+    def test_clear_detaches_store(self):
+        self.cache.store_rgb("sand", (194, 178, 128))
+        self.cache.snapshot_rgb(os.path.join(self.tmp.name, "rgb.store"))
+        self.cache.clear()
+        self.assertIsNone(self.cache.get_rgb("sand"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+# Chatbot/tests/cache/sqlite_store/test_sqlite_store.py
+
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import unittest
+
+from Chatbot.cache import llm_cache
+from Chatbot.cache.llm_cache import ColorLLMCache
+from Chatbot.cache.sqlite_store import SQLiteColorStore
+
+
+def _write_shades(path, worker, count):
+    store = SQLiteColorStore(path)
+    for i in range(count):
+        store.put_rgb(f"shade {worker}-{i}", (worker, i % 256, 7))
+    store.close()
+
+
+class TestSQLiteColorStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.sqlite3")
+        self.store = SQLiteColorStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_point_lookups(self):
+        self.store.put_many([("dusty rose", (192, 115, 122))], [("peachy", ["light peach"])])
+        self.assertEqual((192, 115, 122), self.store.get_rgb("dusty rose"))
+        self.assertEqual(["light peach"], self.store.get_simplified("peachy"))
+        self.assertIsNone(self.store.get_rgb("unknown"))
+        self.assertIsNone(self.store.get_simplified("unknown"))
+
+    def test_upsert_replaces(self):
+        self.store.put_rgb("sand", (1, 2, 3))
+        self.store.put_rgb("sand", (194, 178, 128))
+        self.assertEqual((194, 178, 128), self.store.get_rgb("sand"))
+        self.assertEqual((1, 0), self.store.count())
+
+    def test_wal_mode(self):
+        mode = self.store._conn().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual("wal", mode)
+
+    def test_failed_batch_rolls_back(self):
+        with self.assertRaises(ValueError):
+            self.store.put_many([("ok", (1, 2, 3)), ("bad", ("x", 0, 0))])
+        self.assertIsNone(self.store.get_rgb("ok"))
+
+    def test_threads_use_own_connections(self):
+        self.store.put_rgb("mint", (180, 255, 240))
+        results = []
+        thread = threading.Thread(target=lambda: results.append(self.store.get_rgb("mint")))
+        thread.start()
+        thread.join()
+        self.assertEqual([(180, 255, 240)], results)
+
+    def test_concurrent_writers_across_processes(self):
+        context = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+        self.store.put_rgb("parent", (0, 0, 0))
+        workers = [context.Process(target=_write_shades, args=(self.path, w, 50)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+        self.assertEqual([0, 0, 0, 0], [worker.exitcode for worker in workers])
+        self.assertEqual((201, 0), self.store.count())
+        self.assertEqual((3, 49, 7), self.store.get_rgb("shade 3-49"))
+
+
+class TestColorLLMCacheSQLite(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ColorLLMCache.get_instance()
+        self.cache.clear()
+        self.cache.reset_stats()
+        self.saved = self.cache._path
+        self.cache._path = os.path.join(self.tmp.name, "color_llm_cache.sqlite3")
+
+    def tearDown(self):
+        self.cache.clear()
+        self.cache._path = self.saved
+        self.tmp.cleanup()
+
+    def test_reads_do_not_create_file(self):
+        self.assertIsNone(self.cache.get_rgb("warm pink"))
+        self.assertFalse(os.path.exists(self.cache._path))
+
+    def test_flush_writes_only_new_entries(self):
+        self.cache.store_rgb("Warm Pink", (200, 120, 140))
+        self.cache.store_simplified("dusty", ["muted rose"])
+        self.assertEqual(2, self.cache.flush())
+        self.assertEqual(0, self.cache.flush())
+
+        self.cache.clear()
+        self.assertEqual((200, 120, 140), self.cache.get_rgb("warm pink"))
+        self.assertEqual(["muted rose"], self.cache.get_simplified("dusty"))
+        self.assertEqual(2, self.cache.stats()["sqlite"]["hits"])
+
+    def test_autoflush(self):
+        for i in range(llm_cache.FLUSH_EVERY):
+            self.cache.store_rgb(f"tone {i}", (i, i, i))
+        self.assertEqual((llm_cache.FLUSH_EVERY, 0), SQLiteColorStore(self.cache._path).count())
+
+    def test_workers_share_file(self):
+        self.cache.store_rgb("rosy", (230, 150, 160))
+        self.cache.save()
+        SQLiteColorStore(self.cache._path).put_rgb("from worker", (1, 2, 3), tag=self.cache.tag)
+        self.assertEqual((1, 2, 3), self.cache.get_rgb("from worker"))
+
+    def test_clear_persistent(self):
+        self.cache.store_rgb("sand", (194, 178, 128))
+        self.cache.flush()
+        self.cache.clear(persistent=True)
+        self.assertIsNone(self.cache.get_rgb("sand"))
+
+    def test_legacy_json_imported_once(self):
+        legacy = os.path.join(self.tmp.name, llm_cache.LEGACY_JSON_NAME)
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump({"rgb": {"peachy beige": [243, 207, 183]}, "simplified": {"peachy": ["light peach"]}}, f)
+        self.cache.load()
+        self.assertEqual((243, 207, 183), self.cache.get_rgb("peachy beige"))
+        self.assertEqual(["light peach"], self.cache.get_simplified("peachy"))
+        self.assertEqual(2, self.cache.stats()["sqlite"]["hits"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# Chatbot/tests/cache/warmup/test_warmup.py
+
+import json
+import os
+import tempfile
+import unittest
+import zlib
+from unittest.mock import patch
+
+from Chatbot.cache.llm_cache import FAILURE_RGB, ColorLLMCache
+from Chatbot.cache.warmup import DEFAULT_CATALOGS, collect_phrases, split_color_field, warm_cache
+from Chatbot.extractors.color.llm.llm_transport import LLMTransport
+from Chatbot.tests.support.fake_openrouter import FakeOpenRouter, batch_rgb_responder
+
+
+def fake_rgb(phrase):
+    digest = zlib.crc32(phrase.encode("utf-8"))
+    return digest & 255, (digest >> 8) & 255, (digest >> 16) & 255
+
+
+class TestSplitColorField(unittest.TestCase):
+
+    def run_case(self, value, expected):
+        result = split_color_field(value)
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case("pink nude", ["pink nude"])
+    def test_case_02(self): self.run_case("rose, coral", ["rose", "coral"])
+    def test_case_03(self): self.run_case("pink / nude", ["pink", "nude"])
+    def test_case_04(self): self.run_case(["soft pink", "berry;plum"], ["soft pink", "berry", "plum"])
+    def test_case_05(self): self.run_case(None, [])
+    def test_case_06(self): self.run_case("", [])
+
+
+class TestCollectPhrases(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def test_default_catalog(self):
+        phrases = collect_phrases(DEFAULT_CATALOGS)
+        self.assertIn("pink nude", phrases)
+        self.assertEqual(len(phrases), len(set(phrases)))
+
+    def test_schemas_and_dedup(self):
+        products = self.write("products.json", json.dumps([{"color": "Dusty-Rose"}, {"color": "warm beige"}]))
+        metadata = self.write("metadata.json", json.dumps({"colors": ["warm beige", "mauve"]}))
+        large = self.write("catalog.jsonl", '{"color": "mauve, plum"}\n\n{"name": "no color"}\n')
+        self.assertEqual(
+            ["dusty rose", "warm beige", "mauve", "plum"], collect_phrases([products, metadata, large])
+        )
+
+
+class TestWarmCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ColorLLMCache.get_instance()
+        self.cache.clear()
+        self.saved = self.cache._path
+        self.cache._path = os.path.join(self.tmp.name, "color_llm_cache.sqlite3")
+
+    def tearDown(self):
+        self.cache.clear()
+        self.cache._path = self.saved
+        self.tmp.cleanup()
+
+    def test_offline_then_idempotent(self):
+        phrases = ["dusty rose", "soft purple", "zzz not a color"]
+        first = warm_cache(phrases, self.cache, chunk_size=2)
+        self.assertEqual((2, 0, ["zzz not a color"]), (first["offline"], first["cached"], first["unresolved"]))
+        self.assertAlmostEqual(2 / 3, first["coverage"])
+
+        self.cache.clear()  # new process: only the SQLite file is left
+        second = warm_cache(phrases, self.cache)
+        self.assertEqual((0, 2), (second["offline"], second["cached"]))
+
+    def test_fuzzy_matches_are_not_cached(self):
+        report = warm_cache(["olivine"], self.cache)   # fuzzy: 'olive'
+        self.assertEqual((0, ["olivine"]), (report["offline"], report["unresolved"]))
+        self.assertIsNone(self.cache.get_rgb("olivine"))
+
+    def test_fuzzy_only_phrases_go_to_llm(self):
+        with FakeOpenRouter(responder=batch_rgb_responder(fake_rgb)) as server, \
+                patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"}):
+            transport = LLMTransport(url=server.url, sleep=lambda seconds: None)
+            report = warm_cache(["olivine"], self.cache, use_llm=True, transport=transport)
+            transport.close()
+        self.assertEqual((0, 1), (report["offline"], report["llm"]))
+        self.assertEqual(fake_rgb("olivine"), self.cache.get_rgb("olivine"))
+
+    def test_llm_for_offline_misses(self):
+        self.cache.store_failure(FAILURE_RGB, "that tiktok color", "unparsable")
+        with FakeOpenRouter(responder=batch_rgb_responder(fake_rgb)) as server, \
+                patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"}):
+            transport = LLMTransport(url=server.url, sleep=lambda seconds: None)
+            report = warm_cache(["dusty rose", "glazed donut", "latte foam", "that tiktok color"], self.cache,
+                                use_llm=True, batch_size=1, workers=2, transport=transport)
+            transport.close()
+        self.assertEqual((1, 2, 1, []), (report["offline"], report["llm"], report["known_failures"],
+                                         report["unresolved"]))
+        self.assertEqual(fake_rgb("latte foam"), self.cache.get_rgb("latte foam"))
+        self.assertEqual(2, len(server.payloads))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# Chatbot/tests/extractors/color/extractor/test_extract_color_pipeline_async.py
+
+import asyncio
+import logging
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from Chatbot.extractors.color.utils.trace import capture_trace, debug_trace
+from Chatbot.tests.support.color_stages import MODIFIERS, TONES, ColorStages, extract_phrases, import_extractor
+
+extractor = import_extractor()
+
+TEXTS = [
+    "I love dusty pink, but not red",
+    "soft rose",
+    "no coral but warm beige",
+    "dusty-pink or dusty pink, not dusty pink",
+    "nothing in particular",
+    "soft rose, muted plum, deep plum, light peach",
+]
+
+
+def traced_extract_phrases(segment, **kwargs):
+    phrases = extract_phrases(segment)
+    trace = debug_trace(False, "test.phrases")
+    if trace:
+        trace.event("'{}' → {}", segment, phrases)
+    return phrases
+
+
+class TracedStages(ColorStages):
+
+    def resolve_rgb(self, phrase, budget=None):
+        trace = debug_trace(False, "test.rgb")
+        if trace:
+            trace.event("rgb '{}'", phrase)
+        return super().resolve_rgb(phrase, budget)
+
+
+class TestExtractColorPipelineAsync(unittest.TestCase):
+
+    def setUp(self):
+        logger = logging.getLogger("ColorPipeline")
+        level, logger.level = logger.level, logging.WARNING
+        self.addCleanup(setattr, logger, "level", level)
+
+    def run_case(self, text, concurrency=8, executor=None, simplify=True):
+        with ColorStages(simplify).patch(extractor):
+            expected = extractor.extract_color_pipeline(text, TONES, MODIFIERS, budget=None)
+        stages = ColorStages(simplify)
+        with stages.patch(extractor):
+            actual = asyncio.run(extractor.extract_color_pipeline_async(
+                text, TONES, MODIFIERS, budget=None, concurrency=concurrency, executor=executor
+            ))
+        self.assertEqual(expected, actual, msg=f"\nExpected : {expected}\nActual   : {actual}")
+        return stages
+
+    def test_case_01(self): self.run_case(TEXTS[0])
+    def test_case_02(self): self.run_case(TEXTS[1])
+    def test_case_03(self): self.run_case(TEXTS[2])
+    def test_case_04(self): self.run_case(TEXTS[3])
+    def test_case_05(self): self.run_case(TEXTS[4])
+    def test_case_06(self): self.run_case(TEXTS[5], concurrency=1)
+    def test_case_07(self): self.run_case(TEXTS[5], simplify=False)
+
+    def test_custom_executor(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            self.run_case(TEXTS[5], executor=executor)
+
+    def test_each_phrase_resolved_once(self):
+        stages = self.run_case(TEXTS[3])
+        self.assertEqual(["dusty-pink"], stages.rgb_calls)
+
+    def test_captured_trace_sees_executor_work(self):
+        stages = TracedStages()
+        with stages.patch(extractor), patch.object(extractor, "extract_all_descriptive_color_phrases",
+                                                   traced_extract_phrases):
+            with capture_trace("async") as trace:
+                asyncio.run(extractor.extract_color_pipeline_async("soft rose, not red", TONES, MODIFIERS,
+                                                                   budget=None))
+        self.assertEqual(["'soft rose' → ['soft rose']", "'not red' → ['red']"], trace.lines(["test.phrases"]))
+        self.assertEqual({"rgb 'soft rose'", "rgb 'red'"}, set(trace.lines(["test.rgb"])))
+
+    def test_concurrent_traces_are_separate(self):
+        async def traced(text):
+            with capture_trace(text) as trace:
+                await extractor.extract_color_pipeline_async(text, TONES, MODIFIERS, budget=None)
+            return trace
+
+        async def main():
+            return await asyncio.gather(traced("soft rose"), traced("not red"))
+
+        with TracedStages().patch(extractor), patch.object(extractor, "extract_all_descriptive_color_phrases",
+                                                           traced_extract_phrases):
+            first, second = asyncio.run(main())
+        self.assertEqual(["rgb 'soft rose'"], first.lines(["test.rgb"]))
+        self.assertEqual(["rgb 'red'"], second.lines(["test.rgb"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
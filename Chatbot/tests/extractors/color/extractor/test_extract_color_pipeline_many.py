@@ -0,0 +1,67 @@
+# Chatbot/tests/extractors/color/extractor/test_extract_color_pipeline_many.py
+
+import logging
+import unittest
+
+from Chatbot.tests.support.color_stages import MODIFIERS, TONES, ColorStages, import_extractor
+
+extractor = import_extractor()
+
+TEXTS = [
+    "I love dusty pink, but not red",
+    "soft rose",
+    "no coral but warm beige",
+    "dusty-pink or mauve",
+    "nothing in particular",
+    "soft rose, muted plum",
+    "not nude, deep plum",
+]
+
+
+class TestExtractColorPipelineMany(unittest.TestCase):
+
+    def setUp(self):
+        logger = logging.getLogger("ColorPipeline")
+        level, logger.level = logger.level, logging.WARNING
+        self.addCleanup(setattr, logger, "level", level)
+
+    def per_text(self, texts):
+        with ColorStages().patch(extractor):
+            return [extractor.extract_color_pipeline(text, TONES, MODIFIERS, budget=None) for text in texts]
+
+    def run_case(self, texts, batch_size):
+        stages = ColorStages()
+        with stages.patch(extractor):
+            actual = list(extractor.extract_color_pipeline_many(iter(texts), TONES, MODIFIERS, batch_size=batch_size))
+        expected = self.per_text(texts)
+        self.assertEqual(expected, actual, msg=f"\nExpected : {expected}\nActual   : {actual}")
+        return stages
+
+    def test_case_01(self): self.run_case(TEXTS, batch_size=32)
+    def test_case_02(self): self.run_case(TEXTS, batch_size=1)
+    def test_case_03(self): self.run_case(TEXTS, batch_size=3)
+    def test_case_04(self): self.run_case(TEXTS[:1], batch_size=32)
+    def test_case_05(self): self.run_case([], batch_size=32)
+
+    def test_each_phrase_resolved_once_per_chunk(self):
+        stages = self.run_case(["soft rose", "soft rose, red", "not red"], batch_size=32)
+        self.assertEqual(["red", "soft rose"], sorted(stages.rgb_calls))
+
+    def test_streams_in_input_order(self):
+        consumed = []
+
+        def texts():
+            for text in TEXTS:
+                consumed.append(text)
+                yield text
+
+        with ColorStages().patch(extractor):
+            stream = extractor.extract_color_pipeline_many(texts(), TONES, MODIFIERS, batch_size=2)
+            first = next(stream)
+            self.assertEqual(TEXTS[:2], consumed)   # one chunk read, not the whole corpus
+            rest = list(stream)
+        self.assertEqual(self.per_text(TEXTS), [first] + rest)
+
+
+if __name__ == "__main__":
+    unittest.main()
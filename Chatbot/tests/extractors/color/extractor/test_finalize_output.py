@@ -0,0 +1,46 @@
+# Chatbot/tests/extractors/color/extractor/test_finalize_output.py
+
+import logging
+import unittest
+from unittest.mock import patch
+
+from Chatbot.tests.support.color_stages import TONES, import_extractor
+
+extractor = import_extractor()
+
+
+def _output(positive, negative):
+    return {
+        "positive": {"matched_color_names": positive, "base_rgb": (1, 2, 3), "threshold": 60.0},
+        "negative": {"matched_color_names": negative, "base_rgb": None, "threshold": 60.0},
+    }
+
+
+class TestFinalizeOutput(unittest.TestCase):
+
+    def run_case(self, positive, negative, expected):
+        output = extractor.finalize_output(_output(positive, negative), TONES)
+        result = (output["positive"]["matched_color_names"], output["negative"]["matched_color_names"])
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case(["soft rose"], [], (["soft rose"], []))
+    def test_case_02(self): self.run_case(["dusty pink", "deep plum"], ["pink"], (["deep plum"], ["dusty pink", "pink"]))
+
+    def test_level_is_left_to_the_application(self):
+        self.assertEqual(logging.NOTSET, logging.getLogger("ColorPipeline").level)
+
+    def test_output_dump_only_at_debug(self):
+        logger = logging.getLogger("ColorPipeline")
+        self.addCleanup(setattr, logger, "level", logger.level)
+        with patch.object(extractor.json, "dumps", wraps=extractor.json.dumps) as dumps:
+            logger.setLevel(logging.INFO)
+            extractor.finalize_output(_output(["rose"], []), TONES)
+            self.assertEqual(0, dumps.call_count)
+            logger.setLevel(logging.DEBUG)
+            with self.assertLogs(logger, logging.DEBUG):
+                extractor.finalize_output(_output(["rose"], []), TONES)
+            self.assertEqual(1, dumps.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+# Chatbot/tests/extractors/color/extractor/test_queue_segment_phrases.py
+
+import asyncio
+import logging
+import unittest
+from unittest.mock import patch
+
+from Chatbot.tests.support.color_stages import MODIFIERS, TONES, ColorStages, fake_rgb, import_extractor
+
+extractor = import_extractor()
+
+TEXT = "dusty-pink or dusty pink"
+
+
+class TestSpellingFallbacks(unittest.TestCase):
+    """
+    Spellings of one normalized phrase share a lookup but keep their own
+    fallback name and simplified phrase.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("ColorPipeline")
+        level, logger.level = logger.level, logging.WARNING
+        self.addCleanup(setattr, logger, "level", level)
+
+    def run_case(self, run, simplify, expected_simplified):
+        stages = ColorStages(simplify)
+        simplified = []
+        mappings = lambda phrases, tones, modifiers: simplified.extend(phrases)
+        with stages.patch(extractor), \
+                patch.object(extractor, "find_similar_color_names", lambda rgb, rgb_map, grid=None: []), \
+                patch.object(extractor, "build_tone_modifier_mappings", mappings):
+            output = run()
+        result = (output["positive"]["matched_color_names"], simplified, stages.rgb_calls)
+        expected = (["dusty pink", "dusty-pink"], expected_simplified, ["dusty-pink"])
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+        self.assertEqual(fake_rgb("dusty pink"), output["positive"]["base_rgb"])
+
+    def sync(self):
+        return extractor.extract_color_pipeline(TEXT, TONES, MODIFIERS, budget=None)
+
+    def many(self):
+        return next(extractor.extract_color_pipeline_many([TEXT], TONES, MODIFIERS))
+
+    def async_(self):
+        return asyncio.run(extractor.extract_color_pipeline_async(TEXT, TONES, MODIFIERS, budget=None))
+
+    def test_case_01(self): self.run_case(self.sync, False, ["dusty-pink", "dusty pink"])
+    def test_case_02(self): self.run_case(self.many, False, ["dusty-pink", "dusty pink"])
+    def test_case_03(self): self.run_case(self.async_, False, ["dusty-pink", "dusty pink"])
+    def test_case_04(self): self.run_case(self.sync, True, ["simple dusty pink"] * 2)
+    def test_case_05(self): self.run_case(self.many, True, ["simple dusty pink"] * 2)
+    def test_case_06(self): self.run_case(self.async_, True, ["simple dusty pink"] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+# Chatbot/tests/extractors/color/llm/circuit_breaker/test_circuit_breaker.py
+
+import asyncio
+import time
+import unittest
+
+from Chatbot.extractors.color.llm.circuit_breaker import CircuitBreaker, circuit_breaker_stats, get_circuit_breaker
+from Chatbot.extractors.color.llm.latency_budget import LatencyBudget
+from Chatbot.extractors.color.llm.llm_transport import AsyncLLMTransport, LLMTransport
+from Chatbot.tests.support.fake_openrouter import FakeOpenRouter
+
+PAYLOAD = {"messages": [{"role": "user", "content": "Now: 'rosy nude' →"}]}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=10.0, clock=self.clock)
+
+    def fail(self, times):
+        for _ in range(times):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+
+    def test_trips_after_consecutive_failures(self):
+        self.fail(2)
+        self.assertEqual("closed", self.breaker.state)
+        self.fail(1)
+        self.assertEqual("open", self.breaker.state)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual({"trips": 1, "rejected": 1}, {k: self.breaker.stats()[k] for k in ("trips", "rejected")})
+
+    def test_success_resets_failure_streak(self):
+        self.fail(2)
+        self.breaker.allow()
+        self.breaker.record_success()
+        self.fail(2)
+        self.assertEqual("closed", self.breaker.state)
+
+    def test_half_open_probe_success_closes(self):
+        self.fail(3)
+        self.clock.now = 10.0
+        self.assertEqual("half_open", self.breaker.state)
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())  # one probe at a time
+        self.assertTrue(self.breaker.is_open())
+        self.breaker.record_success()
+        self.assertEqual("closed", self.breaker.state)
+        self.assertEqual(1, self.breaker.stats()["probes"])
+
+    def test_half_open_probe_failure_reopens(self):
+        self.fail(3)
+        self.clock.now = 10.0
+        self.fail(1)
+        self.assertEqual("open", self.breaker.state)
+        self.assertEqual(2, self.breaker.stats()["trips"])
+        self.clock.now = 15.0
+        self.assertEqual("open", self.breaker.state)
+
+    def test_release_frees_probe_slot(self):
+        self.fail(3)
+        self.clock.now = 10.0
+        self.assertTrue(self.breaker.allow())
+        self.breaker.release()
+        self.assertTrue(self.breaker.allow())
+
+    def test_is_open_does_not_take_probe(self):
+        self.fail(3)
+        self.clock.now = 10.0
+        self.assertFalse(self.breaker.is_open())
+        self.assertTrue(self.breaker.allow())
+
+    def test_named_breakers_are_shared(self):
+        self.assertIs(get_circuit_breaker("openrouter"), get_circuit_breaker())
+        self.assertIn("openrouter", circuit_breaker_stats())
+
+
+class TestTransportCircuit(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeOpenRouter().start()
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=5.0, clock=self.clock)
+        self.transport = LLMTransport(url=self.server.url, retries=1, sleep=lambda s: None, breaker=self.breaker)
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.stop()
+
+    def test_open_circuit_skips_requests(self):
+        self.server.script.extend({"status": 503} for _ in range(4))
+        self.assertIsNone(self.transport.post_chat(PAYLOAD))
+        self.assertIsNone(self.transport.post_chat(PAYLOAD))
+        self.assertEqual("open", self.breaker.state)
+        self.assertEqual(4, self.server.request_count)
+
+        self.assertIsNone(self.transport.post_chat(PAYLOAD))
+        self.assertEqual(4, self.server.request_count)
+
+        self.clock.now = 5.0
+        self.assertEqual("(231, 180, 188)", self.transport.post_chat(PAYLOAD))
+        self.assertEqual("closed", self.breaker.state)
+        self.assertEqual(5, self.server.request_count)
+
+    def test_non_retryable_4xx_is_not_a_failure(self):
+        self.server.script.extend({"status": 400} for _ in range(3))
+        for _ in range(3):
+            self.transport.post_chat(PAYLOAD)
+        self.assertEqual("closed", self.breaker.state)
+
+    def test_spent_budget_sends_nothing(self):
+        budget = LatencyBudget(0.0)
+        self.assertIsNone(self.transport.post_chat(PAYLOAD, deadline=budget))
+        self.assertEqual(0, self.server.request_count)
+        self.assertEqual(0, self.breaker.stats()["failures"])
+
+    def test_async_transport_open_circuit(self):
+        self.server.script.extend({"status": 500} for _ in range(2))
+
+        async def run():
+            async with AsyncLLMTransport(url=self.server.url, retries=0, breaker=self.breaker) as transport:
+                return [await transport.post_chat(PAYLOAD) for _ in range(3)]
+
+        self.assertEqual([None, None, None], asyncio.run(run()))
+        self.assertEqual(2, self.server.request_count)
+        self.assertEqual(1, self.breaker.stats()["rejected"])
+
+    def test_shared_budget_caps_sequential_calls(self):
+        slow = FakeOpenRouter(delay=0.5).start()
+        transport = LLMTransport(url=slow.url, retries=3, sleep=lambda s: None)
+        budget = LatencyBudget(0.3)
+        start = time.monotonic()
+        for _ in range(3):
+            self.assertIsNone(transport.post_chat(PAYLOAD, deadline=budget))
+        elapsed = time.monotonic() - start
+        transport.close()
+        slow.stop()
+        self.assertLess(elapsed, 0.6)
+
+
+if __name__ == "__main__":
+    unittest.main()
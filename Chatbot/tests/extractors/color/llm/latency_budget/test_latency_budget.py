@@ -0,0 +1,46 @@
+# Chatbot/tests/extractors/color/llm/latency_budget/test_latency_budget.py
+
+import unittest
+
+from Chatbot.extractors.color.llm.latency_budget import LatencyBudget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLatencyBudget(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.budget = LatencyBudget(2.0, clock=self.clock)
+
+    def run_case(self, elapsed, method, arg, expected):
+        self.clock.now = 100.0 + elapsed
+        result = getattr(self.budget, method)(*arg)
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case(0.0, "remaining", (), 2.0)
+    def test_case_02(self): self.run_case(0.5, "clamp", (10.0,), 1.5)
+    def test_case_03(self): self.run_case(0.5, "clamp", (1.0,), 1.0)
+    def test_case_04(self): self.run_case(3.0, "clamp", (1.0,), 0.0)
+    def test_case_05(self): self.run_case(3.0, "timeout", (1.0,), 1e-3)
+    def test_case_06(self): self.run_case(1.9, "expired", (), False)
+    def test_case_07(self): self.run_case(2.0, "expired", (), True)
+
+    def test_unlimited(self):
+        budget = LatencyBudget(None)
+        self.assertEqual((None, 5.0, False), (budget.remaining(), budget.clamp(5.0), budget.expired()))
+
+    def test_coerce_keeps_shared_budget(self):
+        self.assertIs(self.budget, LatencyBudget.coerce(self.budget))
+        self.assertFalse(LatencyBudget.coerce(None).expired())
+        self.assertTrue(LatencyBudget.coerce(0).expired())
+
+
+if __name__ == "__main__":
+    unittest.main()
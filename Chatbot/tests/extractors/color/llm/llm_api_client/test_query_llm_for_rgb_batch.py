@@ -0,0 +1,121 @@
+# Chatbot/tests/extractors/color/llm/llm_api_client/test_query_llm_for_rgb_batch.py
+
+import os
+import unittest
+import zlib
+from unittest.mock import patch
+
+from Chatbot.extractors.color.llm.llm_api_client import (
+    _parse_batch_reply,
+    build_batch_color_prompt,
+    query_llm_for_rgb_batch,
+)
+from Chatbot.extractors.color.llm.llm_metrics import LLMCallMetrics
+from Chatbot.extractors.color.llm.llm_transport import LLMTransport
+from Chatbot.tests.support.fake_openrouter import FakeOpenRouter, batch_rgb_responder
+
+
+def fake_rgb(phrase):
+    digest = zlib.crc32(phrase.encode("utf-8"))
+    return digest & 255, (digest >> 8) & 255, (digest >> 16) & 255
+
+
+class InMemoryCache:
+    def __init__(self, rgb=None):
+        self.rgb = dict(rgb or {})
+
+    def get_rgb(self, phrase):
+        return self.rgb.get(phrase)
+
+    def store_rgb(self, phrase, rgb):
+        self.rgb[phrase] = rgb
+
+
+class TestParseBatchReply(unittest.TestCase):
+
+    def run_case(self, reply, count, expected):
+        result = _parse_batch_reply(reply, count)
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case('{"i": 1, "rgb": [1, 2, 3]}\n{"i": 2, "rgb": [4, 5, 6]}', 2, {0: (1, 2, 3), 1: (4, 5, 6)})
+    def test_case_02(self): self.run_case('```json\n{"i": 2, "rgb": [4, 5, 6]}\n```', 2, {1: (4, 5, 6)})
+    def test_case_03(self): self.run_case('[{"i": 1, "rgb": [9, 9, 9]}]', 1, {0: (9, 9, 9)})
+    def test_case_04(self): self.run_case('- {i: 1, rgb: [10, 20, 30]}', 1, {0: (10, 20, 30)})
+    def test_case_05(self): self.run_case('{"rgb": [1, 1, 1]}\n{"rgb": [2, 2, 2]}', 2, {0: (1, 1, 1), 1: (2, 2, 2)})
+    def test_case_06(self): self.run_case('{"i": 1, "rgb": [1, 2, 300]}', 1, {})
+    def test_case_07(self): self.run_case('{"i": 5, "rgb": [1, 2, 3]}', 2, {})
+    def test_case_08(self): self.run_case('{"i": 1, "rgb": [1, 2]}', 1, {})
+    def test_case_09(self): self.run_case('Sorry, I cannot help with that.', 3, {})
+    def test_case_10(self): self.run_case('{"i": 1, "rgb": [1, 2, 3]}\n{"i": 1, "rgb": [7, 7, 7]}', 2, {0: (1, 2, 3)})
+
+    def test_prompt_numbers_phrases(self):
+        prompt = build_batch_color_prompt(["rosy nude", "deep lavender"])
+        self.assertIn("1. 'rosy nude'\n2. 'deep lavender'", prompt)
+
+
+class TestQueryLLMForRGBBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeOpenRouter(responder=batch_rgb_responder(fake_rgb)).start()
+        self.transport = LLMTransport(url=self.server.url, sleep=lambda seconds: None)
+        self.env = patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.transport.close()
+        self.server.stop()
+
+    def test_one_request_per_batch(self):
+        phrases = [f"shade {i}" for i in range(10)]
+        result = query_llm_for_rgb_batch(phrases, batch_size=4, transport=self.transport)
+        self.assertEqual({phrase: fake_rgb(phrase) for phrase in phrases}, result)
+        self.assertEqual(3, self.server.request_count)
+
+    def test_cache_hits_and_duplicates(self):
+        cache = InMemoryCache({"warm beige": (245, 222, 179)})
+        result = query_llm_for_rgb_batch(
+            ["warm beige", "rosy nude", "rosy nude", "ink"], cache=cache, transport=self.transport
+        )
+        self.assertEqual(["warm beige", "rosy nude", "ink"], list(result))
+        self.assertEqual((245, 222, 179), result["warm beige"])
+        self.assertEqual(1, self.server.request_count)
+        self.assertEqual(fake_rgb("ink"), cache.get_rgb("ink"))
+
+    def test_unparsed_items_fall_back_to_single_calls(self):
+        self.server.script.append({"body": {"choices": [{"message": {"content": '{"i": 1, "rgb": [1, 2, 3]}'}}]}})
+        metrics = LLMCallMetrics()
+        result = query_llm_for_rgb_batch(["a", "b", "c"], transport=self.transport, metrics=metrics)
+        self.assertEqual({"a": (1, 2, 3), "b": fake_rgb("b"), "c": fake_rgb("c")}, result)
+        self.assertEqual(3, self.server.request_count)
+        self.assertEqual(2, metrics.per_phrase("fallback")["requests"])
+
+    def test_failed_batch_is_not_split(self):
+        self.server.script.append({"status": 400})
+        result = query_llm_for_rgb_batch(["a", "b"], transport=self.transport)
+        self.assertEqual({"a": None, "b": None}, result)
+        self.assertEqual(1, self.server.request_count)
+
+    def test_batch_size_one_is_single_mode(self):
+        metrics = LLMCallMetrics()
+        query_llm_for_rgb_batch(["a", "b"], batch_size=1, transport=self.transport, metrics=metrics)
+        self.assertEqual(2, metrics.per_phrase("single")["requests"])
+        self.assertIn("Now: 'a'", self.server.payloads[0]["messages"][0]["content"])
+
+    def test_metrics_show_savings(self):
+        metrics = LLMCallMetrics()
+        phrases = [f"soft shade {i}" for i in range(8)]
+        query_llm_for_rgb_batch(phrases, batch_size=1, transport=self.transport, metrics=metrics)
+        query_llm_for_rgb_batch(phrases, batch_size=8, transport=self.transport, metrics=metrics)
+        savings = metrics.savings("batch", "single")
+        self.assertGreater(savings["tokens_saved_per_phrase"], 0)
+        self.assertEqual(8, metrics.per_phrase("batch")["phrases"])
+
+    def test_without_api_key(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual({"a": None}, query_llm_for_rgb_batch(["a"], transport=self.transport))
+        self.assertEqual(0, self.server.request_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
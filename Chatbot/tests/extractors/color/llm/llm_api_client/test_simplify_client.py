@@ -0,0 +1,45 @@
+# Chatbot/tests/extractors/color/llm/llm_api_client/test_simplify_client.py
+
+import os
+import unittest
+from unittest.mock import patch
+
+from Chatbot.extractors.color.llm.llm_api_client import OpenRouterSimplifyClient
+from Chatbot.extractors.color.llm.llm_transport import LLMTransport
+from Chatbot.tests.support.fake_openrouter import FakeOpenRouter
+
+
+class TestOpenRouterSimplifyClient(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeOpenRouter(responder=lambda payload: "  soft pink\n").start()
+        self.transport = LLMTransport(url=self.server.url, sleep=lambda seconds: None)
+        self.client = OpenRouterSimplifyClient(transport=self.transport)
+        self.env = patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.transport.close()
+        self.server.stop()
+
+    def test_reply_is_stripped(self):
+        self.assertEqual("soft pink", self.client.simplify("What is 'blushy'?"))
+        self.assertEqual("What is 'blushy'?", self.server.payloads[0]["messages"][0]["content"])
+
+    def test_empty_reply(self):
+        self.server.responder = lambda payload: "  "
+        self.assertEqual("", self.client.simplify("What is 'blushy'?"))
+
+    def test_failure_is_none(self):
+        self.server.script.extend([{"status": 400}])
+        self.assertIsNone(self.client.simplify("What is 'blushy'?"))
+
+    def test_without_api_key(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(self.client.simplify("What is 'blushy'?"))
+        self.assertEqual(0, self.server.request_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+# Chatbot/tests/extractors/color/llm/llm_transport/test_llm_transport.py
+
+import asyncio
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+from Chatbot.extractors.color.llm.llm_api_client import query_llm_for_rgb, query_llm_for_rgb_async
+from Chatbot.extractors.color.llm.llm_transport import (
+    AsyncLLMTransport,
+    LLMTransport,
+    backoff_delay,
+)
+from Chatbot.tests.support.fake_openrouter import FakeOpenRouter
+
+PAYLOAD = {"model": "test", "messages": [{"role": "user", "content": "hi"}]}
+
+
+class TestBackoffDelay(unittest.TestCase):
+
+    def test_full_jitter_bounds(self):
+        for attempt, ceiling in [(0, 0.5), (1, 1.0), (3, 4.0), (10, 8.0)]:
+            self.assertEqual(ceiling, backoff_delay(attempt, rng=lambda lo, hi: hi))
+            self.assertEqual(0.0, backoff_delay(attempt, rng=lambda lo, hi: lo))
+            self.assertLessEqual(backoff_delay(attempt), ceiling)
+
+
+class TestLLMTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeOpenRouter().start()
+        self.sleeps = []
+        self.transport = LLMTransport(url=self.server.url, sleep=self.sleeps.append, backoff_base=0.01)
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.stop()
+
+    def test_reuses_one_connection(self):
+        for _ in range(5):
+            self.assertEqual("(231, 180, 188)", self.transport.post_chat(PAYLOAD))
+        self.assertEqual(5, self.server.request_count)
+        self.assertEqual(1, len(self.server.connections))
+
+    def test_retries_retryable_status_with_backoff(self):
+        self.server.script.extend([{"status": 503}, {"status": 429}])
+        self.assertEqual("(231, 180, 188)", self.transport.post_chat(PAYLOAD))
+        self.assertEqual(3, self.server.request_count)
+        self.assertEqual(2, len(self.sleeps))
+        self.assertTrue(all(0 <= delay <= 0.02 for delay in self.sleeps))
+
+    def test_does_not_retry_client_errors(self):
+        self.server.script.append({"status": 401})
+        self.assertIsNone(self.transport.post_chat(PAYLOAD))
+        self.assertEqual(1, self.server.request_count)
+        self.assertEqual([], self.sleeps)
+
+    def test_gives_up_after_retries(self):
+        self.server.script.extend([{"status": 500}] * 5)
+        self.assertIsNone(self.transport.post_chat(PAYLOAD, retries=1))
+        self.assertEqual(2, self.server.request_count)
+
+    def test_malformed_body_is_retried(self):
+        self.server.script.append({"body": {"unexpected": True}})
+        self.assertEqual("(231, 180, 188)", self.transport.post_chat(PAYLOAD))
+
+    def test_deadline_bounds_total_time(self):
+        self.server.script.extend([{"delay": 0.5}] * 3)
+        start = time.monotonic()
+        self.assertIsNone(self.transport.post_chat(PAYLOAD, deadline=0.2))
+        self.assertLess(time.monotonic() - start, 0.45)
+
+    def test_query_llm_for_rgb_through_transport(self):
+        with patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"}):
+            self.assertEqual((231, 180, 188), query_llm_for_rgb("rosy nude", transport=self.transport))
+        self.assertIn("rosy nude", self.server.payloads[0]["messages"][0]["content"])
+
+
+class TestAsyncLLMTransport(unittest.TestCase):
+
+    def test_concurrency_limit_and_pooling(self):
+        async def run(url):
+            async with AsyncLLMTransport(url=url, concurrency=3) as transport:
+                return await asyncio.gather(*[transport.post_chat(PAYLOAD) for _ in range(12)])
+
+        with FakeOpenRouter(delay=0.05) as server:
+            replies = asyncio.run(run(server.url))
+        self.assertEqual(["(231, 180, 188)"] * 12, replies)
+        self.assertLessEqual(server.max_in_flight, 3)
+        self.assertLessEqual(len(server.connections), 3)
+
+    def test_backoff_does_not_block_event_loop(self):
+        ticks = []
+
+        async def ticker():
+            for _ in range(10):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def run(url):
+            async with AsyncLLMTransport(url=url, backoff_base=0.2) as transport:
+                reply, _ = await asyncio.gather(transport.post_chat(PAYLOAD), ticker())
+                return reply
+
+        with FakeOpenRouter() as server:
+            server.script.extend([{"status": 503}, {"status": 503}])
+            self.assertEqual("(231, 180, 188)", asyncio.run(run(server.url)))
+        self.assertEqual(10, len(ticks))
+        self.assertLess(max(b - a for a, b in zip(ticks, ticks[1:])), 0.1)
+
+    def test_deadline(self):
+        async def run(url):
+            async with AsyncLLMTransport(url=url) as transport:
+                return await transport.post_chat(PAYLOAD, deadline=0.2)
+
+        with FakeOpenRouter(delay=0.5) as server:
+            start = time.monotonic()
+            self.assertIsNone(asyncio.run(run(server.url)))
+            self.assertLess(time.monotonic() - start, 0.45)
+
+    def test_query_llm_for_rgb_async(self):
+        async def run(url):
+            async with AsyncLLMTransport(url=url) as transport:
+                return await query_llm_for_rgb_async("warm beige", transport)
+
+        with FakeOpenRouter(responder=lambda payload: "(245, 222, 179)") as server:
+            with patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"}):
+                self.assertEqual((245, 222, 179), asyncio.run(run(server.url)))
+
+
+if __name__ == "__main__":
+    unittest.main()
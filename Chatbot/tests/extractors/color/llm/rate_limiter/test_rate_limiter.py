@@ -0,0 +1,193 @@
+# Chatbot/tests/extractors/color/llm/rate_limiter/test_rate_limiter.py
+
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from Chatbot.extractors.color.llm.latency_budget import LatencyBudget
+from Chatbot.extractors.color.llm.llm_transport import LLMTransport
+from Chatbot.extractors.color.llm.rate_limiter import (
+    LLMRateLimiter,
+    get_default_limiter,
+    parse_retry_after,
+    set_default_limiter,
+)
+from Chatbot.tests.support.fake_openrouter import FakeOpenRouter
+
+PAYLOAD = {"messages": [{"role": "user", "content": "Now: 'rosy nude' →"}]}
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _take_tokens(path, count, queue):
+    limiter = LLMRateLimiter(path, rate=1e-6, capacity=5)
+    queue.put(sum(limiter.try_acquire() == 0.0 for _ in range(count)))
+
+
+class TestParseRetryAfter(unittest.TestCase):
+
+    def run_case(self, value, expected):
+        result = parse_retry_after(value, now=1_445_412_480.0)
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case("3", 3.0)
+    def test_case_02(self): self.run_case("0.5", 0.5)
+    def test_case_03(self): self.run_case("-4", 0.0)
+    def test_case_04(self): self.run_case("Wed, 21 Oct 2015 07:28:10 GMT", 10.0)
+    def test_case_05(self): self.run_case("Wed, 21 Oct 2015 07:27:00 GMT", 0.0)
+    def test_case_06(self): self.run_case("soon", None)
+    def test_case_07(self): self.run_case(None, None)
+
+
+class TestLLMRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "rate.json")
+        self.clock = FakeClock()
+        self.sleeps = []
+
+        def sleep(seconds):
+            self.sleeps.append(seconds)
+            self.clock.now += seconds
+
+        self.limiter = LLMRateLimiter(self.path, rate=2.0, capacity=2, daily_token_budget=100,
+                                      clock=self.clock, sleep=sleep)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_bucket_refills_at_rate(self):
+        self.assertEqual([0.0, 0.0, 0.5], [self.limiter.try_acquire() for _ in range(3)])
+        self.clock.now += 0.5
+        self.assertEqual(0.0, self.limiter.try_acquire())
+
+    def test_acquire_waits_for_token(self):
+        for _ in range(3):
+            self.assertTrue(self.limiter.acquire())
+        self.assertEqual([0.5], self.sleeps)
+
+    def test_acquire_respects_latency_budget(self):
+        self.limiter.acquire()
+        self.limiter.acquire()
+        self.assertFalse(self.limiter.acquire(LatencyBudget(0.1, clock=self.clock)))
+        self.assertEqual([], self.sleeps)
+
+    def test_penalize_blocks_and_empties_bucket(self):
+        self.limiter.penalize(3.0)
+        self.assertEqual(3.0, self.limiter.try_acquire())
+        self.clock.now += 3.0
+        self.assertEqual(0.5, self.limiter.try_acquire())
+        self.assertEqual(1, self.limiter.usage()["throttled"])
+
+    def test_daily_budget_degrades_then_resets(self):
+        self.limiter.record_usage({"prompt_tokens": 70, "completion_tokens": 10}, phrases=4)
+        self.assertFalse(self.limiter.budget_exhausted())
+        self.limiter.record_usage({"prompt_tokens": 15, "completion_tokens": 5})
+        self.assertTrue(self.limiter.budget_exhausted())
+        self.assertIsNone(self.limiter.try_acquire())
+        self.assertFalse(self.limiter.acquire())
+
+        self.clock.now += 86_400
+        self.assertFalse(self.limiter.budget_exhausted())
+        self.assertEqual(0, self.limiter.usage()["prompt_tokens"])
+
+    def test_usage_per_phrase(self):
+        self.limiter.record_usage({"prompt_tokens": 60, "completion_tokens": 20}, phrases=4)
+        usage = self.limiter.usage()
+        self.assertEqual((15.0, 5.0, 20), (usage["prompt_tokens_per_phrase"],
+                                           usage["completion_tokens_per_phrase"], usage["remaining_tokens"]))
+
+    def test_bucket_is_shared_across_processes(self):
+        context = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+        queue = context.Queue()
+        workers = [context.Process(target=_take_tokens, args=(self.path, 3, queue)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(10)
+        self.assertEqual(5, queue.get(timeout=5) + queue.get(timeout=5))
+
+    def test_corrupt_state_file_is_reset(self):
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        self.assertEqual(0.0, self.limiter.try_acquire())
+
+
+class TestDefaultLimiter(unittest.TestCase):
+    """
+    Client-side limiting is opt-in through the environment.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(set_default_limiter, None)
+        set_default_limiter(None)
+
+    def run_case(self, env, expected):
+        env = {key: value.format(tmp=self.tmp.name) for key, value in env.items()}
+        names = ("LLM_RATE_LIMIT_PATH", "LLM_RATE_PER_SECOND", "LLM_RATE_BURST", "LLM_DAILY_TOKEN_BUDGET")
+        with patch.dict(os.environ, {name: env.get(name, "") for name in names}):
+            limiter = get_default_limiter()
+        result = None if limiter is None else (limiter.rate, limiter.capacity, limiter.daily_token_budget)
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case({}, None)
+    def test_case_02(self): self.run_case({"LLM_RATE_BURST": "3"}, None)
+    def test_case_03(self): self.run_case({"LLM_RATE_LIMIT_PATH": "{tmp}/rate.json"}, (4.0, 8.0, None))
+    def test_case_04(self): self.run_case({"LLM_RATE_PER_SECOND": "2", "LLM_RATE_BURST": "3"}, (2.0, 3.0, None))
+    def test_case_05(self): self.run_case({"LLM_DAILY_TOKEN_BUDGET": "500"}, (None, 8.0, 500))
+
+    def test_budget_only_never_throttles(self):
+        limiter = LLMRateLimiter(os.path.join(self.tmp.name, "rate.json"), rate=None, daily_token_budget=10)
+        self.assertEqual([0.0] * 20, [limiter.try_acquire() for _ in range(20)])
+        limiter.record_usage({"prompt_tokens": 10})
+        self.assertIsNone(limiter.try_acquire())
+
+
+class TestTransportRateLimiting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = FakeOpenRouter().start()
+        self.sleeps = []
+        self.limiter = LLMRateLimiter(os.path.join(self.tmp.name, "rate.json"), rate=1000.0, capacity=10,
+                                      daily_token_budget=60, sleep=self.sleeps.append)
+        self.transport = LLMTransport(url=self.server.url, retries=1, sleep=self.sleeps.append,
+                                      backoff_base=0.01, limiter=self.limiter)
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def test_retry_after_sets_delay_and_penalizes(self):
+        self.server.script.append({"status": 429, "headers": {"Retry-After": "2"}})
+        self.assertIsNotNone(self.transport.post_chat(PAYLOAD))
+        self.assertEqual(2.0, self.sleeps[0])
+        self.assertEqual(1, self.limiter.usage()["throttled"])
+
+    def test_retry_after_beyond_deadline_gives_up(self):
+        self.server.script.append({"status": 503, "headers": {"Retry-After": "30"}})
+        self.assertIsNone(self.transport.post_chat(PAYLOAD, deadline=5.0))
+        self.assertEqual(1, self.server.request_count)
+
+    def test_usage_recorded_until_budget_spent(self):
+        while self.transport.post_chat(PAYLOAD) is not None:
+            pass
+        usage = self.limiter.usage()
+        self.assertGreaterEqual(usage["prompt_tokens"] + usage["completion_tokens"], 60)
+        self.assertEqual(usage["requests"], self.server.request_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
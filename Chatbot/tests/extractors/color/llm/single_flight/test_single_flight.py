@@ -0,0 +1,156 @@
+# Chatbot/tests/extractors/color/llm/single_flight/test_single_flight.py
+
+import asyncio
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from Chatbot.extractors.color.llm.llm_api_client import RGB_FLIGHT, query_llm_for_rgb, query_llm_for_rgb_async
+from Chatbot.extractors.color.llm.llm_transport import AsyncLLMTransport, LLMTransport
+from Chatbot.extractors.color.llm.single_flight import SingleFlight, get_single_flight, single_flight_stats
+from Chatbot.tests.support.fake_openrouter import FakeOpenRouter
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight("test")
+        release = threading.Event()
+        calls = []
+
+        def work():
+            calls.append(1)
+            release.wait(5)
+            return "rosy"
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            futures = [pool.submit(flight.do, "rosy nude", work) for _ in range(6)]
+            while flight.stats()["coalesced"] < 5:
+                time.sleep(0.005)
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(["rosy"] * 6, results)
+        self.assertEqual(1, len(calls))
+        self.assertEqual({"leaders": 1, "coalesced": 5, "errors": 0, "timeouts": 0, "in_flight": 0}, flight.stats())
+
+    def test_distinct_keys_run_separately(self):
+        flight = SingleFlight("test")
+        self.assertEqual([1, 2], [flight.do("a", lambda: 1), flight.do("b", lambda: 2)])
+        self.assertEqual(2, flight.stats()["leaders"])
+
+    def test_key_released_after_completion(self):
+        flight = SingleFlight("test")
+        flight.do("a", lambda: 1)
+        self.assertEqual(2, flight.do("a", lambda: 2))
+
+    def test_exception_reaches_all_callers(self):
+        flight = SingleFlight("test")
+        release = threading.Event()
+
+        def work():
+            release.wait(5)
+            raise RuntimeError("boom")
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(flight.do, "a", work) for _ in range(3)]
+            while flight.stats()["coalesced"] < 2:
+                time.sleep(0.005)
+            release.set()
+            errors = [type(future.exception()) for future in futures]
+
+        self.assertEqual([RuntimeError] * 3, errors)
+        self.assertEqual(1, flight.stats()["errors"])
+        self.assertEqual(0, flight.stats()["in_flight"])
+
+    def test_follower_budget_is_a_miss(self):
+        flight = SingleFlight("test")
+        release = threading.Event()
+
+        def work():
+            release.wait(5)
+            return "rosy"
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            leader = pool.submit(flight.do, "a", work)
+            while flight.stats()["in_flight"] < 1:
+                time.sleep(0.005)
+            self.assertIsNone(flight.do("a", work, budget=0.05))
+            release.set()
+            self.assertEqual("rosy", leader.result())
+        self.assertEqual({"leaders": 1, "coalesced": 1, "timeouts": 1}, {
+            name: count for name, count in flight.stats().items() if name in ("leaders", "coalesced", "timeouts")
+        })
+
+    def test_async_follower_budget_is_a_miss(self):
+        flight = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.2)
+            return "mauve"
+
+        async def run():
+            return await asyncio.gather(flight.do_async("mauve", work), flight.do_async("mauve", work, budget=0.02))
+
+        self.assertEqual(["mauve", None], asyncio.run(run()))
+        self.assertEqual(1, flight.stats()["timeouts"])
+
+    def test_async_callers_share_one_task(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "mauve"
+
+        async def run():
+            return await asyncio.gather(*(flight.do_async("mauve", work) for _ in range(4)))
+
+        self.assertEqual(["mauve"] * 4, asyncio.run(run()))
+        self.assertEqual(1, len(calls))
+        self.assertEqual(3, flight.stats()["coalesced"])
+
+    def test_named_groups_are_shared(self):
+        self.assertIs(get_single_flight("llm_rgb"), RGB_FLIGHT)
+        self.assertIn("llm_rgb", single_flight_stats())
+
+
+class TestCoalescedRGBQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeOpenRouter(delay=0.3).start()
+        self.env = patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"})
+        self.env.start()
+        RGB_FLIGHT.reset_stats()
+
+    def tearDown(self):
+        self.env.stop()
+        self.server.stop()
+
+    def test_identical_phrases_send_one_request(self):
+        transport = LLMTransport(url=self.server.url)
+        phrases = ["Rosy Nude", "rosy nude", "ROSY NUDE", "rosy nude"]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda phrase: query_llm_for_rgb(phrase, transport=transport), phrases))
+        transport.close()
+
+        self.assertEqual([(231, 180, 188)] * 4, results)
+        self.assertEqual(1, self.server.request_count)
+        self.assertEqual(3, RGB_FLIGHT.stats()["coalesced"])
+
+    def test_async_identical_phrases_send_one_request(self):
+        async def run():
+            async with AsyncLLMTransport(url=self.server.url) as transport:
+                return await asyncio.gather(*(query_llm_for_rgb_async("dusty rose", transport) for _ in range(3)))
+
+        self.assertEqual([(231, 180, 188)] * 3, asyncio.run(run()))
+        self.assertEqual(1, self.server.request_count)
+        self.assertEqual(2, RGB_FLIGHT.stats()["coalesced"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+# Chatbot/tests/extractors/color/logic/phrase_queue/test_phrase_queue.py
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from Chatbot.extractors.color.logic.phrase_queue import (
+    PhraseWorkQueue,
+    phrase_dedup_stats,
+    reset_phrase_dedup_stats,
+)
+
+
+class TestPhraseWorkQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        reset_phrase_dedup_stats()
+
+    def resolve(self, phrase):
+        self.calls.append(phrase)
+        return phrase.upper()
+
+    def run_case(self, segments, expected_calls, expected_stats):
+        queue = PhraseWorkQueue()
+        for phrases in segments:
+            queue.add(phrases)
+        resolved = queue.run(self.resolve)
+        for phrases in segments:
+            for phrase in phrases:
+                self.assertIn(phrase, resolved)
+        result = (self.calls, queue.stats())
+        expected = (expected_calls, expected_stats)
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case([["dusty rose"]], ["dusty rose"], {"occurrences": 1, "unique": 1, "saved": 0})
+    def test_case_02(self): self.run_case([["rose", "red"], ["rose"]], ["rose", "red"], {"occurrences": 3, "unique": 2, "saved": 1})
+    def test_case_03(self): self.run_case([["Dusty-Rose"], ["dusty rose"]], ["Dusty-Rose"], {"occurrences": 2, "unique": 1, "saved": 1})
+    def test_case_04(self): self.run_case([["pinks", "pink"], ["pink"]], ["pinks"], {"occurrences": 3, "unique": 1, "saved": 2})
+    def test_case_05(self): self.run_case([[], []], [], {"occurrences": 0, "unique": 0, "saved": 0})
+
+    def test_results_fan_out_to_every_spelling(self):
+        queue = PhraseWorkQueue()
+        queue.add(["Soft-Pink", "soft pink", "red"])
+        self.assertEqual({"Soft-Pink": "SOFT-PINK", "soft pink": "SOFT-PINK", "red": "RED"}, queue.run(self.resolve))
+
+    def test_finish_rebuilds_each_spelling(self):
+        queue = PhraseWorkQueue()
+        queue.add(["Soft-Pink", "soft pink", "red"])
+        resolved = queue.run(self.resolve, finish=lambda phrase, result: (phrase, result))
+        expected = {"Soft-Pink": ("Soft-Pink", "SOFT-PINK"), "soft pink": ("soft pink", "SOFT-PINK"), "red": ("red", "RED")}
+        self.assertEqual(expected, resolved)
+        self.assertEqual(["Soft-Pink", "red"], self.calls)
+
+    def test_concurrent_resolution(self):
+        queue = PhraseWorkQueue()
+        queue.add(["rose", "red", "rose", "beige"])
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            resolved = queue.run(self.resolve, executor=executor)
+        self.assertEqual({"rose": "ROSE", "red": "RED", "beige": "BEIGE"}, resolved)
+        self.assertEqual(3, len(self.calls))
+
+    def test_fan_out_of_external_results(self):
+        queue = PhraseWorkQueue()
+        queue.add(["rose", "Rose"])
+        self.assertEqual(["rose"], queue.unique_phrases())
+        self.assertEqual({"rose": 1, "Rose": 1}, queue.fan_out({"rose": 1}))
+
+    def test_process_wide_counters(self):
+        for phrases in (["rose", "rose"], ["red"]):
+            queue = PhraseWorkQueue()
+            queue.add(phrases)
+            queue.run(self.resolve)
+            queue.fan_out({phrase: None for phrase in queue.unique_phrases()})  # counted once per request
+        stats = phrase_dedup_stats()
+        self.assertEqual((2, 3, 2, 1), (stats["requests"], stats["occurrences"], stats["unique"], stats["saved"]))
+        self.assertAlmostEqual(1 / 3, stats["saved_ratio"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+# Chatbot/tests/extractors/color/logic/prefetch/test_prefetch.py
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from Chatbot.extractors.color.logic.prefetch import (
+    ColorPrefetcher,
+    guess_color_phrases,
+    prefetch_stats,
+    reset_prefetch_stats,
+)
+
+TONES = {"pink", "rose", "beige", "nude", "red", "night"}
+MODIFIERS = {"dusty", "soft", "warm", "light", "deep"}
+
+
+class TestGuessColorPhrases(unittest.TestCase):
+
+    def run_case(self, text, expected):
+        result = guess_color_phrases(text, TONES, MODIFIERS)
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case("I love dusty rose but not red", ["dusty rose", "red"])
+    def test_case_02(self): self.run_case("Soft-pink or warm beige, please", ["soft pink", "warm beige"])
+    def test_case_03(self): self.run_case("pink, PINK and pinks", ["pink"])
+    def test_case_04(self): self.run_case("something glowy for tonight", [])
+    def test_case_05(self): self.run_case("a light night look", ["night"])
+    def test_case_06(self): self.run_case("very dusty", [])
+    def test_case_07(self): self.run_case("nude lips, deep red nails", ["nude", "deep red"])
+
+    def test_max_phrases(self):
+        self.assertEqual(2, len(guess_color_phrases("pink rose beige nude", TONES, MODIFIERS, max_phrases=2)))
+
+
+class TestColorPrefetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.calls = []
+        self.lock = threading.Lock()
+        reset_prefetch_stats()
+
+    def tearDown(self):
+        self.executor.shutdown(wait=True)
+
+    def resolver(self, delay=0.0):
+        def resolve(phrase):
+            with self.lock:
+                self.calls.append(phrase)
+            time.sleep(delay)
+            return (len(phrase), 0, 0)
+        return resolve
+
+    def test_lookups_overlap_with_classification(self):
+        prefetcher = ColorPrefetcher(self.resolver(0.2), executor=self.executor).start(["dusty rose", "red"])
+        start = time.monotonic()
+        time.sleep(0.2)  # sentiment classification
+        results = [prefetcher.resolve("Dusty Rose"), prefetcher.resolve("red")]
+        elapsed = time.monotonic() - start
+
+        self.assertEqual([(10, 0, 0), (3, 0, 0)], results)
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(2, len(self.calls))
+
+    def test_unguessed_phrase_resolved_inline(self):
+        prefetcher = ColorPrefetcher(self.resolver(), executor=self.executor).start(["red"])
+        self.assertEqual((4, 0, 0), prefetcher.resolve("nude"))
+        self.assertEqual(1, prefetcher.finish()["missed"])
+
+    def test_unused_prefetches_are_wasted(self):
+        prefetcher = ColorPrefetcher(self.resolver(), executor=self.executor).start(["red", "pink", "beige"])
+        prefetcher.resolve("red")
+        time.sleep(0.05)
+        counts = prefetcher.finish()
+        self.assertEqual({"prefetched": 3, "used": 1, "wasted": 2, "cancelled": 0, "missed": 0}, counts)
+        self.assertAlmostEqual(2 / 3, prefetch_stats()["waste_ratio"])
+
+    def test_queued_prefetches_are_cancelled(self):
+        gate = threading.Event()
+        single = ThreadPoolExecutor(max_workers=1)
+        prefetcher = ColorPrefetcher(lambda phrase: gate.wait(5), executor=single).start(["red", "pink"])
+        counts = prefetcher.finish()
+        gate.set()
+        single.shutdown(wait=True)
+        self.assertEqual((1, 1), (counts["wasted"], counts["cancelled"]))
+
+    def test_failed_prefetch_falls_back_inline(self):
+        attempts = []
+
+        def flaky(phrase):
+            attempts.append(phrase)
+            if len(attempts) == 1:
+                raise RuntimeError("boom")
+            return (1, 2, 3)
+
+        prefetcher = ColorPrefetcher(flaky, executor=self.executor).start(["red"])
+        self.assertEqual((1, 2, 3), prefetcher.resolve("red"))
+        self.assertEqual(2, len(attempts))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+# Chatbot/tests/extractors/color/logic/process_pool/test_process_pool.py
+
+import gc
+import logging
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from Chatbot.cache.llm_cache import ColorLLMCache
+from Chatbot.extractors.color.logic.prefetch import get_prefetch_executor
+from Chatbot.extractors.color.logic.process_pool import MAX_CHUNKS_IN_FLIGHT, ColorProcessPool
+from Chatbot.extractors.color.shared.vocab import load_vocabularies
+from Chatbot.tests.support.color_stages import ColorStages, import_extractor
+
+extractor = import_extractor()
+
+_PRELOADED = {}
+
+
+def _preload():
+    _PRELOADED["palette"] = {"rose": (255, 0, 127)}
+
+
+def _lengths(texts):
+    return [len(text) for text in texts]
+
+
+def _preloaded(texts):
+    return [(_PRELOADED.get("palette", {}).get(text), gc.get_freeze_count() > 0) for text in texts]
+
+
+def _threaded(texts):
+    return list(get_prefetch_executor().map(str.upper, texts))
+
+
+@unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "needs fork")
+class TestColorProcessPool(unittest.TestCase):
+
+    def run_case(self, texts, expected, extract=_lengths):
+        with ColorProcessPool(workers=2, chunk_size=4, extract=extract, preload=None) as pool:
+            result = list(pool.map(texts))
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case(["rose", "red", "dusty pink"], [4, 3, 10])
+    def test_case_02(self): self.run_case([], [])
+    def test_case_03(self): self.run_case((f"t{i}" for i in range(50)), [len(f"t{i}") for i in range(50)], extract=_lengths)
+    def test_case_04(self): self.run_case(["rose", "mint"], ["ROSE", "MINT"], extract=_threaded)
+
+    def test_preloaded_state_is_inherited_and_frozen(self):
+        with ColorProcessPool(workers=2, chunk_size=2, extract=_preloaded, preload=_preload) as pool:
+            result = list(pool.map(["rose", "red"]))
+            self.assertGreater(pool.stats()["frozen_objects"], 0)
+        self.assertEqual([((255, 0, 127), True), (None, True)], result)
+        self.assertEqual(0, gc.get_freeze_count())
+
+    def test_outer_freeze_is_left_in_place(self):
+        gc.freeze()
+        self.addCleanup(gc.unfreeze)
+        frozen = gc.get_freeze_count()
+        with ColorProcessPool(workers=1, chunk_size=2, extract=_lengths, preload=None) as pool:
+            list(pool.map(["rose"]))
+        self.assertGreaterEqual(gc.get_freeze_count(), frozen)
+
+    def test_per_worker_stats(self):
+        with ColorProcessPool(workers=2, chunk_size=16, extract=_lengths, preload=None) as pool:
+            list(pool.map(str(i) for i in range(100)))
+            stats = pool.stats()
+        self.assertEqual((100, 7), (stats["texts"], stats["chunks"]))
+        self.assertLessEqual(len(stats["workers"]), 2)
+        self.assertNotIn(os.getpid(), stats["workers"])
+        self.assertEqual(100, sum(worker["texts"] for worker in stats["workers"].values()))
+
+    def test_input_is_streamed(self):
+        consumed = []
+
+        def texts():
+            for i in range(10_000):
+                consumed.append(i)
+                yield str(i)
+
+        with ColorProcessPool(workers=2, chunk_size=8, extract=_lengths, preload=None) as pool:
+            outputs = pool.map(texts())
+            next(outputs)
+            self.assertLessEqual(len(consumed), (2 * MAX_CHUNKS_IN_FLIGHT + 1) * 8)
+            self.assertEqual(9_999, sum(1 for _ in outputs))
+
+    def test_prefetch_pool_created_before_fork(self):
+        get_prefetch_executor().submit(int).result()  # parent threads exist before the fork
+        self.run_case(["a", "b", "c"], ["A", "B", "C"], extract=_threaded)
+
+
+
+@unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "needs fork")
+class TestDefaultWorkload(unittest.TestCase):
+    """
+    The default preload (preload_models) and task (extract_colors), with
+    stubbed model stages inherited by the forked workers.
+    """
+
+    TEXTS = ["I love dusty pink, but not red", "soft rose", "no coral but warm beige", "nothing", "deep plum"]
+
+    def setUp(self):
+        logger = logging.getLogger("ColorPipeline")
+        level, logger.level = logger.level, logging.WARNING
+        self.addCleanup(setattr, logger, "level", level)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cache = ColorLLMCache.get_instance()
+        self.addCleanup(setattr, cache, "_path", cache._path)
+        cache._path = os.path.join(tmp.name, "color_llm_cache.sqlite3")
+        self.addCleanup(ColorLLMCache.get_instance().clear)
+        self.addCleanup(ColorStages().patch(extractor).close)
+
+    def test_matches_in_process_extraction(self):
+        known_tones, known_modifiers = load_vocabularies()
+        expected = list(extractor.extract_color_pipeline_many(self.TEXTS, known_tones, known_modifiers))
+        with ColorProcessPool(workers=2, chunk_size=2) as pool:
+            result = list(pool.map(self.TEXTS))
+            stats = pool.stats()
+        self.assertEqual(expected, result)
+        self.assertEqual((5, 3), (stats["texts"], stats["chunks"]))
+        self.assertGreater(stats["frozen_objects"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+# Chatbot/tests/extractors/color/logic/tone_signatures/test_find_tone_conflicts.py
+
+import random
+import unittest
+
+from matplotlib.colors import XKCD_COLORS
+
+from Chatbot.extractors.color.logic.tone_signatures import (
+    find_tone_conflicts,
+    get_tone_signature_index,
+)
+from Chatbot.extractors.color.shared.vocab import known_tones
+from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
+
+XKCD_NAMES = sorted(name.replace("xkcd:", "") for name in XKCD_COLORS)
+
+
+def nested_loop_conflicts(positive, negative, tones):
+    """Reference: the original pairwise implementation."""
+    def extract_tones(color_name):
+        return {normalize_token(t) for t in color_name.split()} & tones
+
+    positive_set = set(positive)
+    negative_set = set(negative)
+    conflict_colors = positive_set.intersection(negative_set)
+    for neg_color in negative_set:
+        neg_tones = extract_tones(neg_color)
+        for pos_color in positive_set:
+            if neg_tones & extract_tones(pos_color):
+                conflict_colors.add(pos_color)
+    return conflict_colors
+
+
+class TestFindToneConflicts(unittest.TestCase):
+
+    def run_case(self, positive, negative, expected, tones=None):
+        tones = tones if tones is not None else {"pink", "rose", "beige", "red", "blue"}
+        result = find_tone_conflicts(positive, negative, tones)
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case(["dusty rose"], ["rose"], {"dusty rose"})
+    def test_case_02(self): self.run_case(["soft pink"], ["red"], set())
+    def test_case_03(self): self.run_case(["beige"], ["beige"], {"beige"})
+    def test_case_04(self): self.run_case(["pinks"], ["hot pink"], {"pinks"})
+    def test_case_05(self): self.run_case(["rose pink", "blue"], ["rose"], {"rose pink"})
+    def test_case_06(self): self.run_case([], ["rose"], set())
+    def test_case_07(self): self.run_case(["rose"], [], set())
+    def test_case_08(self): self.run_case(["shimmer"], ["shimmer"], {"shimmer"})
+    def test_case_09(self): self.run_case(["dusty rose"], ["rose dusty"], set(), tones={"dusty rose"})
+    def test_case_10(self): self.run_case(["Red-Blue"], ["blue"], set())
+    def test_case_11(self): self.run_case(["soft dusty-rose"], ["dusty-rose"], {"soft dusty-rose"}, tones=known_tones)
+    def test_case_12(self): self.run_case(["dusty_rose pink"], ["dusty-rose"], {"dusty_rose pink"}, tones={"dusty rose"})
+    def test_case_13(self): self.run_case(["dusty rose"], ["dusty-rose"], set(), tones={"dusty rose"})
+
+
+class TestMatchesNestedLoop(unittest.TestCase):
+
+    def test_random_xkcd_expansions(self):
+        rng = random.Random(30)
+        for _ in range(40):
+            positive = rng.sample(XKCD_NAMES, rng.randint(0, 300))
+            negative = rng.sample(XKCD_NAMES, rng.randint(0, 60))
+            self.assertEqual(
+                nested_loop_conflicts(positive, negative, known_tones),
+                find_tone_conflicts(positive, negative, known_tones)
+            )
+
+    def test_random_hyphenated_multiword_tones(self):
+        rng = random.Random(31)
+        multiword = sorted(tone for tone in known_tones if " " in tone)
+        words = sorted({word for name in XKCD_NAMES for word in name.split()})
+
+        def name():
+            parts = rng.sample(words, rng.randint(0, 2)) + [rng.choice(multiword).replace(" ", rng.choice("-_"))]
+            rng.shuffle(parts)
+            return " ".join(parts)
+
+        for _ in range(40):
+            positive = [name() for _ in range(rng.randint(0, 60))] + rng.sample(XKCD_NAMES, 20)
+            negative = [name() for _ in range(rng.randint(0, 10))]
+            self.assertEqual(
+                nested_loop_conflicts(positive, negative, known_tones),
+                find_tone_conflicts(positive, negative, known_tones)
+            )
+
+    def test_signature_decodes_to_tones(self):
+        index = get_tone_signature_index(known_tones)
+        for name in XKCD_NAMES[::10]:
+            expected = {normalize_token(t) for t in name.split()} & known_tones
+            self.assertEqual(expected, index.tones(index.signature(name)), msg=name)
+
+    def test_index_is_shared_per_vocabulary(self):
+        self.assertIs(get_tone_signature_index(known_tones), get_tone_signature_index(set(known_tones)))
+        self.assertIsNot(get_tone_signature_index(known_tones), get_tone_signature_index({"pink"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
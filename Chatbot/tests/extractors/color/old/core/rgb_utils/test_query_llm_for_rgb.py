@@ -0,0 +1,136 @@
+# Chatbot/tests/extractors/color/old/core/rgb_utils/test_query_llm_for_rgb.py
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from Chatbot.cache.llm_cache import FAILURE_RGB, FAILURE_SIMPLIFY, ColorLLMCache
+from Chatbot.extractors.color.llm.latency_budget import LatencyBudget
+from Chatbot.extractors.color.llm.llm_transport import LLMTransport, set_default_transport
+from Chatbot.tests.support.color_stages import fake_rgb, import_model_module
+from Chatbot.tests.support.fake_openrouter import FakeOpenRouter
+
+rgb_utils = import_model_module("Chatbot.extractors.color.old.core.rgb_utils")
+
+
+def rgb_responder(payload):
+    phrase = payload["messages"][0]["content"].split("'")[1]
+    return "({}, {}, {})".format(*fake_rgb(phrase))
+
+
+class OpenRouterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ColorLLMCache.get_instance()
+        self.saved = self.cache._path
+        self.cache._path = os.path.join(self.tmp.name, "color_llm_cache.sqlite3")
+        self.cache.clear()
+        self.server = FakeOpenRouter(responder=rgb_responder).start()
+        self.transport = LLMTransport(url=self.server.url, sleep=lambda seconds: None)
+        self.env = patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.transport.close()
+        self.server.stop()
+        self.cache.clear()
+        self.cache._path = self.saved
+        self.tmp.cleanup()
+
+    def query(self, phrase, budget=None):
+        return rgb_utils.query_llm_for_rgb(phrase, budget, transport=self.transport)
+
+
+class TestQueryLLMForRGB(OpenRouterTestCase):
+
+    def test_resolves_and_caches(self):
+        self.assertEqual(fake_rgb("dusty rose"), self.query("dusty rose"))
+        self.assertEqual(fake_rgb("dusty rose"), self.cache.get_rgb("dusty rose"))
+        self.assertEqual(fake_rgb("dusty rose"), self.query("dusty rose"))
+        self.assertEqual(1, self.server.request_count)
+
+    def test_cache_hit_skips_request(self):
+        self.cache.store_rgb("warm beige", (245, 222, 179))
+        self.assertEqual((245, 222, 179), self.query("warm beige"))
+        self.assertEqual(0, self.server.request_count)
+
+    def test_concurrent_misses_share_one_request(self):
+        self.server.delay = 0.2
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.query("muted plum"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([fake_rgb("muted plum")] * 4, results)
+        self.assertEqual(1, self.server.request_count)
+
+    def test_spent_budget_skips_request(self):
+        budget = LatencyBudget(0.0)
+        self.assertIsNone(self.query("soft coral", budget))
+        self.assertEqual(0, self.server.request_count)
+
+    def test_missing_api_key_raises(self):
+        with patch.dict(os.environ, {"OPENROUTER_API_KEY": ""}):
+            with self.assertRaises(ValueError):
+                self.query("dusty rose")
+        self.assertEqual(0, self.server.request_count)
+
+    def test_asks_for_an_rgb_tuple(self):
+        self.query("dusty rose")
+        prompt = self.server.payloads[0]["messages"][0]["content"]
+        self.assertIn("RGB tuple in the form (R, G, B)", prompt)
+        self.assertNotIn('{"rgb"', prompt)
+
+    def test_pipeline_resolver_uses_cache(self):
+        self.cache.store_rgb("deep mauve", (120, 60, 90))
+        self.assertEqual((120, 60, 90), rgb_utils.get_rgb_from_descriptive_color_llm_first("deep mauve"))
+        self.assertEqual(0, self.server.request_count)
+
+
+class TestPooledTransport(OpenRouterTestCase):
+
+    def setUp(self):
+        super().setUp()
+        set_default_transport(self.transport)
+        self.addCleanup(set_default_transport, None)
+
+    def test_pipeline_resolver_reuses_one_connection(self):
+        self.server.responder = lambda payload: "not a color"   # RGB misses go on to simplification
+        for phrase in ("dusty rose", "warm beige", "muted plum", "soft coral"):
+            rgb_utils.get_rgb_from_descriptive_color_llm_first(phrase)
+        self.assertEqual(8, self.server.request_count)           # one RGB + one simplify call each
+        self.assertEqual(1, len(self.server.connections))
+
+
+class TestNegativeCache(OpenRouterTestCase):
+
+    def setUp(self):
+        super().setUp()
+        set_default_transport(self.transport)
+        self.addCleanup(set_default_transport, None)
+
+    def test_unresolvable_phrase_is_not_resent(self):
+        self.server.responder = lambda payload: "not a color" if "RGB" in payload["messages"][0]["content"] else ""
+        self.assertIsNone(rgb_utils.get_rgb_from_descriptive_color_llm_first("that tiktok color"))
+        self.assertEqual(2, self.server.request_count)           # RGB + simplification
+        self.assertEqual(1, self.cache.get_failure(FAILURE_RGB, "that tiktok color")["attempts"])
+        self.assertEqual(1, self.cache.get_failure(FAILURE_SIMPLIFY, "that tiktok color")["attempts"])
+
+        self.assertIsNone(rgb_utils.get_rgb_from_descriptive_color_llm_first("that tiktok color"))
+        self.assertEqual(2, self.server.request_count)
+
+    def test_failed_requests_are_not_negative(self):
+        self.server.script.extend([{"status": 400}, {"status": 400}])
+        rgb_utils.get_rgb_from_descriptive_color_llm_first("dusty rose")
+        self.assertIsNone(self.cache.get_failure(FAILURE_RGB, "dusty rose"))
+        self.assertIsNone(self.cache.get_failure(FAILURE_SIMPLIFY, "dusty rose"))
+        self.assertEqual(fake_rgb("dusty rose"), rgb_utils.get_rgb_from_descriptive_color_llm_first("dusty rose"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+# Chatbot/tests/extractors/color/session/test_session.py
+
+import logging
+import time
+import unittest
+
+from Chatbot.extractors.color.session import ColorSession, SessionStore
+from Chatbot.tests.support.color_stages import MODIFIERS, ColorStages, import_extractor
+from Chatbot.tests.support.color_stages import TONES as STAGE_TONES
+
+extractor = import_extractor()
+
+TONES = {"pink", "red", "peach", "rose", "beige"}
+PHRASES = {
+    "peachy pink": ({"peach pink", "light pink"}, (255, 200, 180)),
+    "pink": ({"pink", "light pink"}, (255, 192, 203)),
+    "red": ({"red", "cherry red"}, (255, 0, 0)),
+    "rose": ({"rose", "dusty rose"}, (200, 120, 130)),
+    "beige": ({"beige"}, (245, 245, 220)),
+}
+
+
+def classify(text):
+    positive, _, negative = text.partition("no ")
+    return {"positive": [positive] if positive.strip() else [], "negative": [negative] if negative else []}
+
+
+def extract_phrases(segment):
+    return [phrase for phrase in sorted(PHRASES, key=len, reverse=True) if phrase in segment
+            and not any(phrase != other and phrase in other and other in segment for other in PHRASES)]
+
+
+class FakeResolver:
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, phrase, budget):
+        self.calls.append(phrase)
+        names, rgb = PHRASES[phrase]
+        return set(names), [phrase], rgb
+
+
+def make_session(**kwargs):
+    resolver = FakeResolver()
+    session = ColorSession(TONES, set(), classify=classify, extract_phrases=extract_phrases,
+                           resolve_phrase=resolver, **kwargs)
+    return session, resolver
+
+
+class TestColorSession(unittest.TestCase):
+
+    def run_case(self, turns, positive, negative):
+        session, _ = make_session()
+        for text in turns:
+            result = session.add_turn(text)
+        expected = (positive, negative)
+        actual = (result["positive"]["matched_color_names"], result["negative"]["matched_color_names"])
+        self.assertEqual(expected, actual, msg=f"\nExpected : {expected}\nActual   : {actual}")
+
+    def test_case_01(self): self.run_case(["peachy pink"], ["light pink", "peach pink"], [])
+    def test_case_02(self): self.run_case(["peachy pink", "no red"], ["light pink", "peach pink"], ["cherry red", "red"])
+    def test_case_03(self): self.run_case(["rose", "beige"], ["beige", "dusty rose", "rose"], [])
+    def test_case_04(self): self.run_case(["peachy pink", "no pink"], [], ["light pink", "peach pink", "pink"])
+    def test_case_05(self): self.run_case(["no red", "red"], ["cherry red", "red"], [])
+    def test_case_06(self): self.run_case(["rose no red", "beige"], ["beige", "dusty rose", "rose"], ["cherry red", "red"])
+    def test_case_07(self): self.run_case(["rose", "no rose", "rose"], ["dusty rose", "rose"], [])
+
+    def test_only_new_phrases_are_resolved(self):
+        session, resolver = make_session()
+        session.add_turn("peachy pink")
+        session.add_turn("rose no red")
+        session.add_turn("peachy pink no red")
+        self.assertEqual(["peachy pink", "rose", "red"], resolver.calls)
+        stats = session.stats()
+        self.assertEqual((3, 2), (stats["turns"], stats["phrase_hits"]))
+
+    def test_base_rgb(self):
+        session, _ = make_session()
+        self.assertEqual((255, 192, 203), session.add_turn("pink")["positive"]["base_rgb"])
+        self.assertEqual((200, 120, 130), session.add_turn("rose")["positive"]["base_rgb"])
+        result = session.add_turn("no rose pink")
+        self.assertEqual((None, (255, 192, 203)), (result["positive"]["base_rgb"], result["negative"]["base_rgb"]))
+
+    def test_last_turn_is_unmerged(self):
+        session, _ = make_session()
+        session.add_turn("pink")
+        session.add_turn("beige")
+        self.assertEqual(["beige"], session.last_turn["positive"]["matched_color_names"])
+
+    def test_colors_are_bounded(self):
+        session, _ = make_session(max_colors=3)
+        for text in ("pink", "red", "beige"):
+            result = session.add_turn(text)
+        self.assertEqual(["beige", "cherry red", "red"], result["positive"]["matched_color_names"])
+
+    def test_memo_is_bounded(self):
+        session, resolver = make_session(memo_size=1)
+        for text in ("pink", "red", "pink"):
+            session.add_turn(text)
+        self.assertEqual(["pink", "red", "pink"], resolver.calls)
+        self.assertEqual(1, session.stats()["memo_phrases"])
+
+    def test_phrases_resolved_on_a_spent_budget_are_not_memoized(self):
+        session, resolver = make_session(turn_budget=0.0)
+        for text in ("pink", "pink"):
+            session.add_turn(text)
+        self.assertEqual(["pink", "pink"], resolver.calls)
+        self.assertEqual(0, session.stats()["memo_phrases"])
+
+
+class TestDefaultStages(unittest.TestCase):
+    """
+    ColorSession with its default stages (extractor.py), model stages stubbed.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("ColorPipeline")
+        level, logger.level = logger.level, logging.WARNING
+        self.addCleanup(setattr, logger, "level", level)
+        self.stages = ColorStages()
+        self.addCleanup(self.stages.patch(extractor).close)
+
+    def test_first_turn_matches_pipeline(self):
+        text = "I love dusty pink, but not red"
+        expected = extractor.extract_color_pipeline(text, STAGE_TONES, MODIFIERS, budget=None)
+        result = ColorSession(STAGE_TONES, MODIFIERS, turn_budget=None).add_turn(text)
+        for sentiment in ("positive", "negative"):
+            self.assertEqual(expected[sentiment]["matched_color_names"], result[sentiment]["matched_color_names"])
+
+    def test_repeated_phrase_is_resolved_once(self):
+        session = ColorSession(STAGE_TONES, MODIFIERS, turn_budget=None)
+        session.add_turn("soft rose")
+        session.add_turn("soft rose, not red")
+        self.assertEqual(["soft rose", "red"], self.stages.rgb_calls)
+        self.assertEqual(["soft rose", "red"], self.stages.simplify_calls)
+
+    def test_spent_budget_is_retried_next_turn(self):
+        session = ColorSession(STAGE_TONES, MODIFIERS, turn_budget=0.0)
+        session.add_turn("soft rose")
+        session.add_turn("soft rose")
+        self.assertEqual(["soft rose", "soft rose"], self.stages.rgb_calls)
+
+
+class TestSessionStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = SessionStore(lambda: make_session()[0], max_sessions=2, idle_ttl=60)
+
+    def test_same_session_per_id(self):
+        self.store.add_turn("a", "pink")
+        self.assertEqual(["light pink", "pink"], self.store.add_turn("a", "no red")["positive"]["matched_color_names"])
+        self.assertEqual(2, self.store.get("a").turns)
+        self.assertEqual(1, self.store.stats()["created"])
+
+    def test_least_recently_used_session_is_evicted(self):
+        for session_id in ("a", "b", "a", "c"):
+            self.store.get(session_id)
+        self.assertEqual((True, False, True), ("a" in self.store, "b" in self.store, "c" in self.store))
+        self.assertEqual(1, self.store.stats()["evicted"])
+
+    def test_idle_sessions_expire(self):
+        store = SessionStore(lambda: make_session()[0], idle_ttl=0.05)
+        store.get("a").add_turn("pink")
+        time.sleep(0.1)
+        self.assertEqual(0, store.get("a").turns)
+        self.assertEqual({"sessions": 1, "created": 2, "evicted": 0, "expired": 1}, store.stats())
+
+    def test_drop(self):
+        self.store.get("a")
+        self.assertEqual((True, False), (self.store.drop("a"), self.store.drop("a")))
+        self.assertEqual(0, len(self.store))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# Chatbot/tests/extractors/color/utils/fuzzy_name_index/test_fuzzy_name_index.py
+
+import difflib
+import unittest
+
+import webcolors
+from matplotlib.colors import CSS4_COLORS, XKCD_COLORS
+from rapidfuzz import fuzz, process
+
+from Chatbot.extractors.color.shared.vocab import all_webcolor_names
+from Chatbot.extractors.color.utils.fuzzy_name_index import (
+    FuzzyNameIndex,
+    get_webcolor_name_index,
+    get_xkcd_name_index,
+    get_css4_name_index,
+)
+
+REGRESSION_QUERIES = [
+    "white", "sky blue", "misty rose", "light goldenrod yellow", "hot pink",
+    "lavendar", "grren", "bluee", "salmn", "sea grn",
+    "ligt pink", "blak", "turqoise", "fuschia", "beig",
+    "navy blu", "corall", "peachpuf", "dark olive", "gray blue",
+    "dusty pink", "peachy nude", "pinkish", "rosy", "terracota",
+    "maroone", "chocolat", "goldenrod", "slate grey", "midnight blu",
+    "mint", "olive drab", "burlywod", "powderblue", "mediumorchid",
+    "aubergine", "mauve", "lilac", "bordeaux", "blush",
+    "", "a", "zz", "xyz xyz", "pink nude",
+]
+
+
+def legacy_difflib_match(phrase):
+    candidates = difflib.get_close_matches(phrase, all_webcolor_names, n=1, cutoff=0.75)
+    return candidates[0] if candidates else None
+
+
+def legacy_extract_one(phrase):
+    xkcd_names = [name.replace("xkcd:", "") for name in XKCD_COLORS]
+    best, score, _ = process.extractOne(phrase, xkcd_names)
+    if score >= 80:
+        return webcolors.hex_to_rgb(XKCD_COLORS[f"xkcd:{best}"])
+    best, score, _ = process.extractOne(phrase, list(CSS4_COLORS.keys()))
+    if score >= 80:
+        return webcolors.hex_to_rgb(CSS4_COLORS[best])
+    return None
+
+
+class TestWebcolorIndexMatchesDifflib(unittest.TestCase):
+
+    def test_regression_set(self):
+        index = get_webcolor_name_index()
+        for query in REGRESSION_QUERIES:
+            match = index.best_match(query, score_cutoff=75)
+            self.assertEqual(legacy_difflib_match(query), match[0] if match else None, msg=query)
+
+    def test_every_name_matches_itself(self):
+        index = get_webcolor_name_index()
+        for name in all_webcolor_names:
+            self.assertEqual((name, tuple(webcolors.name_to_rgb(name)), 100.0), index.best_match(name))
+
+
+class TestLegacyIndexMatchesExtractOne(unittest.TestCase):
+
+    def test_regression_set(self):
+        for query in [q for q in REGRESSION_QUERIES if q]:
+            expected = legacy_extract_one(query)
+            result = None
+            for index in (get_xkcd_name_index(), get_css4_name_index()):
+                match = index.best_match(query, score_cutoff=80, scorer=fuzz.WRatio)
+                if match:
+                    result = match[1]
+                    break
+            self.assertEqual(expected, result, msg=query)
+
+
+class TestRatioScan(unittest.TestCase):
+
+    def brute_force(self, names, query, cutoff):
+        best = None
+        for name in names:
+            score = fuzz.ratio(query, name, score_cutoff=cutoff)
+            if score and (best is None or (score, name) > best):
+                best = (score, name)
+        return best[1] if best else None
+
+    def test_matches_brute_force(self):
+        names = get_xkcd_name_index().names
+        index = FuzzyNameIndex({name: (0, 0, 0) for name in names})
+        queries = [name[:-1] for name in names[::7]] + [name[1:] + "x" for name in names[::11]]
+        for cutoff in (60, 75, 90):
+            for query in queries + REGRESSION_QUERIES:
+                match = index.best_match(query, score_cutoff=cutoff)
+                self.assertEqual(self.brute_force(names, query, cutoff), match[0] if match else None, msg=query)
+
+    def test_returns_rgb_and_score(self):
+        index = FuzzyNameIndex({"dusty rose": (192, 115, 122)})
+        name, rgb, score = index.best_match("dusty rse")
+        self.assertEqual("dusty rose", name)
+        self.assertEqual((192, 115, 122), rgb)
+        self.assertGreaterEqual(score, 75)
+
+    def test_empty_inputs(self):
+        self.assertIsNone(FuzzyNameIndex({}).best_match("pink"))
+        self.assertIsNone(get_webcolor_name_index().best_match(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
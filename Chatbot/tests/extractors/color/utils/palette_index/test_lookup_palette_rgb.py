@@ -0,0 +1,81 @@
+# Chatbot/tests/extractors/color/utils/palette_index/test_lookup_palette_rgb.py
+
+import unittest
+from matplotlib.colors import CSS4_COLORS, XKCD_COLORS
+from webcolors import hex_to_rgb
+
+from Chatbot.extractors.color.utils.palette_index import (
+    lookup_palette_rgb,
+    build_palette_index,
+    get_palette_index,
+    palette_key,
+)
+
+
+class TestLookupPaletteRgb(unittest.TestCase):
+
+    def run_case(self, name, expected):
+        result = lookup_palette_rgb(name)
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    # Canonical XKCD names (previously unreachable because of the 'xkcd:' prefix)
+    def test_case_01(self): self.run_case("dusty rose", (192, 115, 122))
+    def test_case_02(self): self.run_case("xkcd:dusty rose", (192, 115, 122))
+    def test_case_03(self): self.run_case("moss", (118, 153, 88))
+    def test_case_04(self): self.run_case("light pink", (255, 209, 223))
+    def test_case_05(self): self.run_case("pink", (255, 129, 192))
+
+    # Spacing / hyphen / case variants
+    def test_case_06(self): self.run_case("Dusty-Rose", (192, 115, 122))
+    def test_case_07(self): self.run_case("dustyrose", (192, 115, 122))
+    def test_case_08(self): self.run_case("  dusty   rose ", (192, 115, 122))
+    def test_case_09(self): self.run_case("Light_Pink", (255, 209, 223))
+    def test_case_10(self): self.run_case("off-white", (255, 255, 228))
+
+    # CSS4 canonical names win over XKCD aliases
+    def test_case_11(self): self.run_case("lightpink", (255, 182, 193))
+    def test_case_12(self): self.run_case("peachpuff", (255, 218, 185))
+    def test_case_13(self): self.run_case("peach puff", (255, 218, 185))
+    def test_case_14(self): self.run_case("cornflowerblue", (100, 149, 237))
+    def test_case_15(self): self.run_case("rebeccapurple", (102, 51, 153))
+
+    # Plural / apostrophe variants
+    def test_case_16(self): self.run_case("roses", (207, 98, 117))
+    def test_case_17(self): self.run_case("pinks", (255, 129, 192))
+    def test_case_18(self): self.run_case("robins egg", (109, 237, 253))
+    def test_case_19(self): self.run_case("robin's egg", (109, 237, 253))
+    def test_case_20(self): self.run_case("peaches", (255, 176, 124))
+
+    # Misses
+    def test_case_21(self): self.run_case("peachy nude", None)
+    def test_case_22(self): self.run_case("", None)
+    def test_case_23(self): self.run_case(None, None)
+    def test_case_24(self): self.run_case("luxurious", None)
+    def test_case_25(self): self.run_case("xkcd:", None)
+
+
+class TestBuildPaletteIndex(unittest.TestCase):
+
+    def test_every_xkcd_name_resolves(self):
+        for name, hex_code in XKCD_COLORS.items():
+            self.assertEqual(tuple(hex_to_rgb(hex_code)), lookup_palette_rgb(name), msg=name)
+
+    def test_every_css4_name_resolves_or_is_shadowed_by_xkcd(self):
+        index = get_palette_index()
+        xkcd_keys = {palette_key(name) for name in XKCD_COLORS}
+        for name, hex_code in CSS4_COLORS.items():
+            if palette_key(name) in xkcd_keys:
+                continue
+            self.assertEqual(tuple(hex_to_rgb(hex_code)), index[palette_key(name)], msg=name)
+
+    def test_custom_palette_precedence(self):
+        index = build_palette_index([{"soft pink": "#ffc0cb"}, {"softpink": "#000000"}])
+        self.assertEqual((0, 0, 0), lookup_palette_rgb("softpink", index))
+        self.assertEqual((255, 192, 203), lookup_palette_rgb("soft-pink", index))
+
+    def test_index_is_shared(self):
+        self.assertIs(get_palette_index(), get_palette_index())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+# Chatbot/tests/extractors/color/utils/rgb_grid/test_rgb_grid.py
+
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from Chatbot.extractors.color.utils.palette_index import get_palette_rgb_map
+from Chatbot.extractors.color.utils.rgb_distance import find_similar_color_names
+from Chatbot.extractors.color.utils.rgb_grid import RGBNeighborGrid, get_default_rgb_grid
+
+
+def brute_force(base_rgb, threshold, rgb_map=None):
+    return find_similar_color_names(base_rgb, rgb_map or get_palette_rgb_map(), threshold)
+
+
+class TestRGBNeighborGridExactness(unittest.TestCase):
+
+    def test_random_queries_match_brute_force(self):
+        grid = get_default_rgb_grid()
+        rng = random.Random(28)
+        for _ in range(1500):
+            rgb = tuple(rng.randint(0, 255) for _ in range(3))
+            threshold = rng.choice([0.0, 10.0, 25.5, 40.0, 59.9, 60.0])
+            self.assertEqual(brute_force(rgb, threshold), grid.query(rgb, threshold), msg=(rgb, threshold))
+
+    def test_cube_corners_and_cell_edges(self):
+        grid = get_default_rgb_grid()
+        for r in (0, 7, 8, 127, 128, 248, 255):
+            for g in (0, 63, 64, 255):
+                for b in (0, 7, 8, 255):
+                    self.assertEqual(brute_force((r, g, b), 60.0), grid.query((r, g, b)), msg=(r, g, b))
+
+    def test_palette_colors_find_themselves(self):
+        grid = get_default_rgb_grid()
+        for name, rgb in list(get_palette_rgb_map().items())[::25]:
+            self.assertIn(name, grid.query(rgb, 0.0))
+
+    def test_exact_boundary_distance(self):
+        rgb_map = {"a": (0, 0, 0), "b": (3, 4, 0), "c": (36, 48, 0)}
+        grid = RGBNeighborGrid.build(rgb_map, threshold=60.0)
+        self.assertEqual(["a", "b", "c"], grid.query((0, 0, 0), 60.0))
+        self.assertEqual(["a", "b"], grid.query((0, 0, 0), 5.0))
+        self.assertEqual(["a"], grid.query((0, 0, 0), 4.999))
+
+    def test_float_queries(self):
+        grid = get_default_rgb_grid()
+        for rgb in [(7.6, 200.2, 15.9), (255.0, 0.5, 128.49)]:
+            self.assertEqual(brute_force(rgb, 45.0), grid.query(rgb, 45.0))
+
+    def test_other_grid_sizes(self):
+        for bits in (3, 6):
+            grid = RGBNeighborGrid.build(get_palette_rgb_map(), threshold=30.0, bits=bits)
+            for rgb in [(10, 20, 30), (200, 100, 50), (255, 255, 255)]:
+                self.assertEqual(brute_force(rgb, 30.0), grid.query(rgb, 30.0))
+
+
+class TestRGBNeighborGridFallback(unittest.TestCase):
+
+    def test_threshold_above_build_threshold(self):
+        grid = RGBNeighborGrid.build(get_palette_rgb_map(), threshold=20.0)
+        self.assertFalse(grid.covers(60.0))
+        self.assertEqual(brute_force((120, 40, 90), 60.0), grid.query((120, 40, 90), 60.0))
+
+    def test_out_of_range_query(self):
+        grid = get_default_rgb_grid()
+        self.assertEqual(brute_force((300, -5, 10), 60.0), grid.query((300, -5, 10)))
+
+    def test_empty_palette(self):
+        grid = RGBNeighborGrid.build({})
+        self.assertEqual([], grid.query((1, 2, 3)))
+
+    def test_invalid_palette(self):
+        with self.assertRaises(ValueError):
+            RGBNeighborGrid.build({"bad": (0, 0, 300)})
+        with self.assertRaises(ValueError):
+            RGBNeighborGrid.build({}, bits=9)
+
+
+class TestRGBNeighborGridPersistence(unittest.TestCase):
+
+    def test_save_and_mmap_load(self):
+        grid = get_default_rgb_grid()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "palette.grid")
+            grid.save(path)
+
+            for mmap_mode in ("r", None):
+                loaded = RGBNeighborGrid.load(path, mmap_mode=mmap_mode)
+                self.assertEqual(len(grid), len(loaded))
+                self.assertEqual(grid.threshold, loaded.threshold)
+                for rgb in [(255, 182, 193), (0, 0, 128), (17, 230, 99)]:
+                    self.assertEqual(grid.query(rgb), loaded.query(rgb))
+                if mmap_mode:
+                    self.assertIsInstance(loaded._indices, np.memmap)
+                del loaded
+
+    def test_rejects_foreign_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "not.grid")
+            with open(path, "wb") as f:
+                f.write(b"\0" * 64)
+            with self.assertRaises(ValueError):
+                RGBNeighborGrid.load(path)
+
+
+class TestFindSimilarColorNamesWithGrid(unittest.TestCase):
+
+    def test_grid_and_scan_agree(self):
+        rgb_map = get_palette_rgb_map()
+        grid = get_default_rgb_grid()
+        for rgb in [(255, 192, 203), (210, 180, 140), (64, 224, 208)]:
+            self.assertEqual(
+                find_similar_color_names(rgb, rgb_map),
+                find_similar_color_names(rgb, rgb_map, grid=grid)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+# Chatbot/tests/extractors/color/utils/telemetry/test_telemetry.py
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+import urllib.request
+
+from Chatbot.extractors.color.utils import telemetry
+from Chatbot.extractors.color.utils.telemetry import (
+    STAGE_ERRORS,
+    STAGE_SECONDS,
+    Histogram,
+    Telemetry,
+    disable_telemetry,
+    enable_telemetry,
+    export_json,
+    render_prometheus,
+    reset_telemetry,
+    span,
+    start_metrics_server,
+    telemetry_snapshot,
+    traced,
+)
+
+
+class TestHistogram(unittest.TestCase):
+
+    def run_case(self, values, expected):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in values:
+            histogram.observe(value)
+        result = histogram.cumulative()
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case([], {"0.1": 0, "1": 0, "+Inf": 0})
+    def test_case_02(self): self.run_case([0.05], {"0.1": 1, "1": 1, "+Inf": 1})
+    def test_case_03(self): self.run_case([0.1], {"0.1": 1, "1": 1, "+Inf": 1})
+    def test_case_04(self): self.run_case([0.5, 2.0], {"0.1": 0, "1": 1, "+Inf": 2})
+    def test_case_05(self): self.run_case([0.01, 0.5, 5, 50], {"0.1": 1, "1": 2, "+Inf": 4})
+
+
+class TestTelemetry(unittest.TestCase):
+
+    def setUp(self):
+        reset_telemetry()
+        enable_telemetry()
+
+    def tearDown(self):
+        disable_telemetry()
+        reset_telemetry()
+
+    def stage(self, name, stage):
+        series = telemetry_snapshot()["histograms" if name == STAGE_SECONDS else "counters"].get(name, [])
+        return next((item for item in series if item["labels"] == {"stage": stage}), None)
+
+    def test_disabled_records_nothing(self):
+        disable_telemetry()
+        with span("compound"):
+            pass
+        traced("standalone")(lambda: None)()
+        self.assertEqual({}, telemetry_snapshot()["histograms"])
+        self.assertIs(span("compound"), span("lone_tones"))  # shared no-op
+
+    def test_span_observes_stage(self):
+        for _ in range(3):
+            with span("compound"):
+                pass
+        self.assertEqual(3, self.stage(STAGE_SECONDS, "compound")["count"])
+
+    def test_traced_sync_keeps_result_and_name(self):
+        @traced("palette_match")
+        def match(rgb):
+            return [rgb]
+
+        self.assertEqual([(1, 2, 3)], match((1, 2, 3)))
+        self.assertEqual("match", match.__name__)
+        self.assertEqual(1, self.stage(STAGE_SECONDS, "palette_match")["count"])
+
+    def test_traced_async(self):
+        @traced("llm_rgb")
+        async def fetch():
+            await asyncio.sleep(0)
+            return (1, 2, 3)
+
+        self.assertEqual((1, 2, 3), asyncio.run(fetch()))
+        self.assertEqual(1, self.stage(STAGE_SECONDS, "llm_rgb")["count"])
+
+    def test_errors_are_counted_and_reraised(self):
+        with self.assertRaises(ValueError):
+            with span("llm_simplify"):
+                raise ValueError("boom")
+        self.assertEqual(1, self.stage(STAGE_ERRORS, "llm_simplify")["value"])
+        self.assertEqual(1, self.stage(STAGE_SECONDS, "llm_simplify")["count"])
+
+    def test_prometheus_format(self):
+        with span("suffix_fallback"):
+            pass
+        text = render_prometheus()
+        self.assertIn(f"# TYPE {STAGE_SECONDS} histogram", text)
+        self.assertIn(f'{STAGE_SECONDS}_bucket{{stage="suffix_fallback",le="+Inf"}} 1', text)
+        self.assertIn(f'{STAGE_SECONDS}_count{{stage="suffix_fallback"}} 1', text)
+
+    def test_prometheus_escapes_labels(self):
+        registry = Telemetry(enabled=True)
+        registry.count("color_events_total", phrase='say "hi"\\\n')
+        self.assertIn('color_events_total{phrase="say \\"hi\\"\\\\\\n"} 1', registry.render_prometheus())
+
+    def test_empty_registry_renders_nothing(self):
+        self.assertEqual("", Telemetry(enabled=True).render_prometheus())
+
+    def test_export_json_round_trip(self):
+        with span("conflict_resolution"):
+            pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = export_json(os.path.join(tmp, "telemetry.json"))
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.assertEqual([], [name for name in os.listdir(tmp) if ".tmp." in name])
+        self.assertEqual(1, data["histograms"][STAGE_SECONDS][0]["count"])
+
+    def test_metrics_server(self):
+        with span("sentiment_split"):
+            pass
+        server = start_metrics_server(port=0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            self.assertIn('stage="sentiment_split"', response.read().decode())
+
+    def test_module_registry_is_shared(self):
+        self.assertIs(telemetry.get_telemetry(), telemetry.get_telemetry())
+        self.assertTrue(telemetry.telemetry_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# Chatbot/tests/extractors/color/utils/trace/test_trace.py
+
+import io
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+
+from Chatbot.extractors.color.shared.vocab import known_tones
+from Chatbot.extractors.color.utils.config_loader import load_known_modifiers
+from Chatbot.extractors.color.utils.token_utils import split_glued_tokens
+from Chatbot.extractors.color.utils.trace import Trace, capture_trace, current_trace, debug_trace, main
+
+known_modifiers = load_known_modifiers()
+known_tokens = known_tones.union(known_modifiers)
+
+
+def _split(token, debug=False):
+    stdout = io.StringIO()
+    with redirect_stdout(stdout):
+        result = split_glued_tokens(token, known_tokens, known_modifiers, debug=debug)
+    return result, stdout.getvalue()
+
+
+class TestDebugTrace(unittest.TestCase):
+
+    def test_no_trace_no_debug_is_none(self):
+        self.assertIsNone(debug_trace(False, "test.source"))
+
+    def test_events_are_formatted_lazily(self):
+        class Loud:
+            formatted = 0
+
+            def __format__(self, spec):
+                Loud.formatted += 1
+                return "loud"
+
+        with capture_trace() as trace:
+            debug_trace(False, "test.source").event("[🧪 VALUE] {}", Loud())
+        self.assertEqual(0, Loud.formatted)
+        self.assertEqual(["[🧪 VALUE] loud"], trace.lines())
+
+    def test_containers_are_copied(self):
+        parts = ["dusty"]
+        with capture_trace() as trace:
+            debug_trace(False, "test.source").event("parts: {}", parts)
+        parts.append("rose")
+        self.assertEqual(["parts: ['dusty']"], trace.lines())
+
+    def test_trace_is_context_local(self):
+        seen = []
+        with capture_trace():
+            thread = threading.Thread(target=lambda: seen.append(current_trace()))
+            thread.start()
+            thread.join()
+        self.assertEqual([None], seen)
+        self.assertIsNone(current_trace())
+
+    def test_source_filter_and_timestamps(self):
+        with capture_trace() as trace, redirect_stdout(io.StringIO()):
+            debug_trace(False, "compound.extract_from_glued").event("a")
+            debug_trace(True, "standalone.extract_lone_tones").event("b")
+        self.assertEqual(["a"], trace.lines(sources=["compound"]))
+        self.assertEqual(["b"], trace.lines(debug_only=True))
+        first = trace.lines(timestamps=True)[0]
+        self.assertRegex(first, r"^\+ +\d+\.\d{3} ms  compound\.extract_from_glued +│ a$")
+
+
+class TestSplitGluedTokensTrace(unittest.TestCase):
+
+    def test_debug_off_prints_nothing(self):
+        self.assertEqual((["dusty", "rose"], ""), _split("dustyrose"))
+
+    def test_captured_trace_reproduces_debug_output(self):
+        for token in ("dustyrose", "softpinkish", "qqq"):
+            _, printed = _split(token, debug=True)
+            with capture_trace() as trace:
+                _split(token)
+            replayed = io.StringIO()
+            trace.replay(file=replayed)
+            self.assertTrue(printed)
+            self.assertEqual(printed, replayed.getvalue(), msg=token)
+
+    def test_saved_trace_replays_from_cli(self):
+        _, printed = _split("mutedbeige", debug=True)
+        with capture_trace(name="mutedbeige") as trace:
+            _split("mutedbeige")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = trace.save(os.path.join(tmp, "trace.json"))
+            self.assertEqual(trace.lines(), Trace.load(path).lines())
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                main([path])
+        header, _, body = stdout.getvalue().partition("\n")
+        self.assertEqual(f"[🧵 TRACE] mutedbeige: {len(trace)} events", header)
+        self.assertEqual(printed, body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+# Chatbot/tests/service/micro_batcher/test_micro_batcher.py
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from Chatbot.service.micro_batcher import MicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.batches = []
+
+    def tearDown(self):
+        self.batcher.close(5)
+
+    def lengths(self, texts):
+        self.batches.append(list(texts))
+        return [len(text) for text in texts]
+
+    def run_case(self, texts, expected, max_batch_size=8, max_wait=0.05):
+        self.batcher = MicroBatcher(self.lengths, max_batch_size=max_batch_size, max_wait=max_wait)
+        futures = [self.batcher.submit(text) for text in texts]
+        result = [future.result(5) for future in futures]
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case(["rose"], [4])
+    def test_case_02(self): self.run_case(["rose", "red", "dusty pink"], [4, 3, 10])
+    def test_case_03(self): self.run_case([str(i) for i in range(20)], [len(str(i)) for i in range(20)], max_batch_size=4)
+
+    def test_concurrent_requests_share_a_batch(self):
+        self.batcher = MicroBatcher(self.lengths, max_batch_size=32, max_wait=0.1)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda text: self.batcher.submit(text).result(5), ["a", "bb", "ccc"] * 4))
+        self.assertEqual([1, 2, 3] * 4, results)
+        self.assertLessEqual(len(self.batches), 2)
+        self.assertEqual(12, self.batcher.stats()["items"])
+
+    def test_batch_size_is_capped(self):
+        self.run_case(["x"] * 10, [1] * 10, max_batch_size=3)
+        self.assertEqual(3, self.batcher.stats()["largest_batch"])
+        self.assertTrue(all(len(batch) <= 3 for batch in self.batches))
+
+    def test_lone_request_waits_at_most_the_window(self):
+        self.batcher = MicroBatcher(self.lengths, max_batch_size=32, max_wait=0.05)
+        start = time.monotonic()
+        self.assertEqual(4, self.batcher.submit("rose").result(5))
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_failure_is_raised_to_every_caller(self):
+        def fail(texts):
+            raise RuntimeError("model crashed")
+
+        self.batcher = MicroBatcher(fail, max_wait=0.05)
+        futures = [self.batcher.submit(text) for text in ("rose", "red")]
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(5)
+        self.assertEqual(2, self.batcher.stats()["errors"])
+
+    def test_poisoned_item_fails_alone(self):
+        def poisoned(texts):
+            if "poison" in texts:
+                raise RuntimeError("bad text")
+            return self.lengths(texts)
+
+        self.batcher = MicroBatcher(poisoned, max_batch_size=8, max_wait=0.1)
+        futures = [self.batcher.submit(text) for text in ("rose", "poison", "dusty pink")]
+        self.assertEqual(4, futures[0].result(5))
+        with self.assertRaises(RuntimeError):
+            futures[1].result(5)
+        self.assertEqual(10, futures[2].result(5))
+        stats = self.batcher.stats()
+        self.assertEqual((1, 1, 2), (stats["errors"], stats["split_batches"], stats["items"]))
+        self.assertEqual([["rose"], ["dusty pink"]], self.batches)
+
+    def test_wrong_result_count_fails_the_batch(self):
+        self.batcher = MicroBatcher(lambda texts: [], max_wait=0.01)
+        with self.assertRaises(ValueError):
+            self.batcher.submit("rose").result(5)
+
+    def test_close_drains_queue(self):
+        gate = threading.Event()
+
+        def slow(texts):
+            gate.wait(5)
+            return list(texts)
+
+        self.batcher = MicroBatcher(slow, max_batch_size=1, max_wait=0.0)
+        futures = [self.batcher.submit(text) for text in ("a", "b", "c")]
+        gate.set()
+        self.batcher.close(5)
+        self.assertEqual(["a", "b", "c"], [future.result(0) for future in futures])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+# Chatbot/tests/service/server/test_server.py
+
+import http.client
+import json
+import logging
+import threading
+import unittest
+from unittest.mock import patch
+
+from Chatbot.extractors.color.session import ColorSession, SessionStore
+from Chatbot.extractors.color.utils.trace import debug_trace
+from Chatbot.extractors.color.utils.telemetry import disable_telemetry, enable_telemetry, reset_telemetry, span
+from Chatbot.service.server import WARMUP_TEXTS, ColorService, extract_batch, percentiles
+from Chatbot.tests.support.color_stages import ColorStages, import_extractor
+
+extractor = import_extractor()
+
+
+class TestPercentiles(unittest.TestCase):
+
+    def run_case(self, values, expected):
+        result = percentiles(values)
+        self.assertEqual(expected, result, msg=f"\nExpected : {expected}\nActual   : {result}")
+
+    def test_case_01(self): self.run_case([], {"p50": 0.0, "p95": 0.0, "p99": 0.0})
+    def test_case_02(self): self.run_case([7], {"p50": 7, "p95": 7, "p99": 7})
+    def test_case_03(self): self.run_case(range(1, 101), {"p50": 50, "p95": 95, "p99": 99})
+    def test_case_04(self): self.run_case([3, 1, 2, 4], {"p50": 2, "p95": 4, "p99": 4})
+
+
+def _fake_session():
+    return ColorSession(
+        {"red", "pink"}, set(),
+        classify=lambda text: {"positive": [], "negative": [text[3:]]} if text.startswith("no ") else
+        {"positive": [text], "negative": []},
+        extract_phrases=lambda segment: [segment],
+        resolve_phrase=lambda phrase, budget: ({phrase}, [phrase], (1, 2, 3)),
+    )
+
+
+def _fake_pipeline(texts):
+    return [{"positive": {"matched_color_names": [text], "base_rgb": None, "threshold": 60.0}} for text in texts]
+
+
+class TestColorService(unittest.TestCase):
+
+    def setUp(self):
+        self.gate = threading.Event()
+        self.service = ColorService(_fake_pipeline, warm_up=lambda: self.gate.wait(5), max_wait=0.01,
+                                    sessions=SessionStore(_fake_session))
+        self.server = self.service.make_server(port=0)
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self.thread.start()
+        self.warmup = self.service.start_warm_up()
+        self.conn = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=5)
+
+    def tearDown(self):
+        self.gate.set()
+        self.conn.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.close()
+
+    def request(self, method, path, body=None):
+        data = None if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode())
+        self.conn.request(method, path, body=data, headers={"Content-Type": "application/json"})
+        response = self.conn.getresponse()
+        return response.status, json.loads(response.read())
+
+    def become_ready(self):
+        self.gate.set()
+        self.warmup.join(5)
+
+    def test_health_before_ready(self):
+        self.assertEqual((200, {"status": "ok"}), self.request("GET", "/healthz"))
+        self.assertEqual((503, {"ready": False}), self.request("GET", "/readyz"))
+        self.assertEqual(503, self.request("POST", "/extract", {"text": "rose"})[0])
+
+    def test_ready_after_warm_up(self):
+        self.become_ready()
+        self.assertEqual((200, {"ready": True}), self.request("GET", "/readyz"))
+
+    def test_extract_single_and_many(self):
+        self.become_ready()
+        status, body = self.request("POST", "/extract", {"text": "rose"})
+        self.assertEqual(200, status)
+        self.assertEqual(["rose"], body["result"]["positive"]["matched_color_names"])
+        status, body = self.request("POST", "/extract", {"texts": ["rose", "red"]})
+        self.assertEqual([["rose"], ["red"]], [r["positive"]["matched_color_names"] for r in body["results"]])
+
+    def test_session_turns_are_merged(self):
+        self.become_ready()
+        self.request("POST", "/extract", {"text": "pink", "session_id": "s1"})
+        status, body = self.request("POST", "/extract", {"text": "no red", "session_id": "s1"})
+        self.assertEqual((200, 2), (status, body["turn"]))
+        self.assertEqual((["pink"], ["red"]), (body["result"]["positive"]["matched_color_names"],
+                                               body["result"]["negative"]["matched_color_names"]))
+        self.assertEqual((200, {"dropped": True}), self.request("DELETE", "/sessions/s1"))
+        self.assertEqual((404, {"dropped": False}), self.request("DELETE", "/sessions/s1"))
+        self.assertEqual(400, self.request("POST", "/extract", {"texts": ["a"], "session_id": "s1"})[0])
+
+    def test_traced_request_returns_its_trace(self):
+        def traced_pipeline(texts):
+            trace = debug_trace(False, "test.pipeline")
+            if trace:
+                trace.event("[🧪 TEXT] '{}'", texts[0])
+            return _fake_pipeline(texts)
+
+        self.service._process_batch = traced_pipeline
+        self.become_ready()
+        status, body = self.request("POST", "/extract", {"text": "rose", "trace": True})
+        self.assertEqual(200, status)
+        self.assertEqual(["rose"], body["result"]["positive"]["matched_color_names"])
+        self.assertEqual(["[🧪 TEXT] 'rose'"], [event["message"] for event in body["trace"]["events"]])
+        self.assertEqual(400, self.request("POST", "/extract", {"texts": ["a"], "trace": True})[0])
+
+    def test_bad_requests(self):
+        self.become_ready()
+        self.assertEqual(400, self.request("POST", "/extract", b"{not json")[0])
+        self.assertEqual(400, self.request("POST", "/extract", {"texts": [1, 2]})[0])
+        self.assertEqual(404, self.request("GET", "/nope")[0])
+
+    def test_pipeline_error_is_500(self):
+        self.service.batcher.process_batch = lambda texts: 1 / 0
+        self.become_ready()
+        status, body = self.request("POST", "/extract", {"text": "rose"})
+        self.assertEqual(500, status)
+        self.assertIn("ZeroDivisionError", body["error"])
+
+    def test_warm_up_failure_keeps_service_unready(self):
+        def broken():
+            raise OSError("model not found")
+
+        service = ColorService(_fake_pipeline, warm_up=broken)
+        service.start_warm_up().join(5)
+        self.assertFalse(service.ready.is_set())
+        self.assertEqual("OSError: model not found", service.warmup_error)
+        service.close()
+
+    def test_concurrent_requests_are_batched_and_counted(self):
+        self.become_ready()
+        port = self.server.server_address[1]
+
+        def call(i):
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("POST", "/extract", body=json.dumps({"text": f"c{i}"}))
+            conn.getresponse().read()
+            conn.close()
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        status, metrics = self.request("GET", "/metrics")
+        self.assertEqual(200, status)
+        self.assertEqual((16, 16, 0), (metrics["requests"], metrics["texts"], metrics["errors"]))
+        self.assertEqual(16, metrics["batches"]["items"])
+        self.assertLess(metrics["batches"]["batches"], 16)
+        self.assertEqual({"p50", "p95", "p99"}, set(metrics["latency_ms"]))
+    def test_prometheus_metrics(self):
+        enable_telemetry()
+        self.addCleanup(disable_telemetry)
+        self.addCleanup(reset_telemetry)
+        with span("palette_match"):
+            pass
+        self.conn.request("GET", "/metrics/prometheus")
+        response = self.conn.getresponse()
+        text = response.read().decode()
+        self.assertEqual(200, response.status)
+        self.assertTrue(response.getheader("Content-Type").startswith("text/plain"))
+        self.assertIn('color_pipeline_stage_seconds_count{stage="palette_match"} 1', text)
+
+
+
+class TestDefaultWarmUp(unittest.TestCase):
+    """
+    The real `warm_up` (preload_models + one extraction) with stubbed model stages.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("ColorPipeline")
+        level, logger.level = logger.level, logging.WARNING
+        self.addCleanup(setattr, logger, "level", level)
+        self.stages = ColorStages()
+        self.addCleanup(self.stages.patch(extractor).close)
+        self.service = ColorService()
+        self.addCleanup(self.service.close)
+
+    def test_warm_up_runs_an_extraction(self):
+        self.service.start_warm_up().join(60)
+        self.assertIsNone(self.service.warmup_error)
+        self.assertTrue(self.service.ready.is_set())
+        self.assertEqual(["soft pink", "red"], self.stages.rgb_calls)
+        self.assertEqual(extract_batch(WARMUP_TEXTS), self.service.extract(WARMUP_TEXTS))
+
+    def test_batch_has_the_pipeline_budget(self):
+        budgets = []
+        many = extractor.extract_color_pipeline_many
+
+        def recording(texts, *args, budget=None, **kwargs):
+            budgets.append(budget)
+            return many(texts, *args, budget=budget, **kwargs)
+
+        with patch.object(extractor, "extract_color_pipeline_many", recording):
+            extract_batch(WARMUP_TEXTS)
+        self.assertEqual([extractor.PIPELINE_LATENCY_BUDGET], budgets)
+
+    def test_warm_up_extraction_failure_keeps_service_unready(self):
+        def broken(segments, batch_size=16):
+            raise RuntimeError("sentiment model not installed")
+
+        with patch.object(extractor, "detect_sentiments", broken):
+            self.service.start_warm_up().join(60)
+        self.assertFalse(self.service.ready.is_set())
+        self.assertEqual("RuntimeError: sentiment model not installed", self.service.warmup_error)
+
+
+if __name__ == "__main__":
+    unittest.main()
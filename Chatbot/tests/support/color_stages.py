@@ -0,0 +1,200 @@
+# Chatbot/tests/support/color_stages.py
+
+"""
+color_stages.py
+===============
+
+Deterministic stand-ins for the model-backed stages of the color pipeline
+(extractor.py), so its orchestration runs without spaCy models,
+transformers or the LLM.
+
+- `import_extractor()` imports Chatbot.extractors.color.extractor
+  (`import_model_module(name)` any module with import-time model loads);
+  where the spaCy model or transformers is not installed, those loads get
+  a blank English pipeline and a classifier that raises (every stage that
+  would use them is replaced by `ColorStages`). Errors from the repo's
+  own imports are not masked
+- Repo modules imported that way are taken back out of `sys.modules`
+  right away, so other test files import (or fail to import) exactly as
+  they would without this helper; `model_modules()` puts them back for
+  the duration of a test, for code that imports the extractor lazily
+- `ColorStages().patch(extractor)` replaces clause splitting (on ' but '
+  and ','), sentiment (a clause with 'no' / 'not' is negative), phrase
+  extraction ('[modifier ]tone', spelling kept), RGB resolution (crc32 of
+  the normalized phrase) and LLM simplification, and records the RGB /
+  simplify calls; it also enters `model_modules()`
+"""
+
+import importlib
+import importlib.util
+import re
+import sys
+import threading
+import types
+import zlib
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from unittest import mock
+
+from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
+
+EXTRACTOR = "Chatbot.extractors.color.extractor"
+REPO_PACKAGE = "Chatbot"
+
+# Repo modules imported against the blank pipeline, kept out of sys.modules
+_blank_modules: Dict[str, types.ModuleType] = {}
+
+TONES = {"pink", "rose", "red", "nude", "beige", "coral", "mauve", "plum", "peach"}
+MODIFIERS = {"dusty", "soft", "warm", "deep", "muted", "light"}
+
+_PHRASE = re.compile(
+    r"\b(?:(?:%s)[ -])?(?:%s)\b" % ("|".join(sorted(MODIFIERS)), "|".join(sorted(TONES))), re.IGNORECASE
+)
+_NEGATION = re.compile(r"\b(?:no|not)\b", re.IGNORECASE)
+
+
+def _is_missing_model(error: BaseException) -> bool:
+    if isinstance(error, OSError):
+        return "en_core_web_sm" in str(error)
+    return isinstance(error, ModuleNotFoundError) and error.name == "transformers"
+
+
+def _no_classifier(*args, **kwargs):
+    def classify(*args, **kwargs):
+        raise RuntimeError("sentiment model not installed")
+    return classify
+
+
+def import_extractor() -> types.ModuleType:
+    return import_model_module(EXTRACTOR)
+
+
+def import_model_module(name: str) -> types.ModuleType:
+    if name in _blank_modules:
+        return _blank_modules[name]
+    try:
+        return importlib.import_module(name)
+    except (OSError, ImportError) as e:
+        if not _is_missing_model(e):
+            raise
+
+    import spacy
+    blank = spacy.blank("en")
+    stub_transformers = importlib.util.find_spec("transformers") is None
+    before = set(sys.modules)
+    if stub_transformers:
+        sys.modules["transformers"] = types.SimpleNamespace(pipeline=_no_classifier)
+    try:
+        with mock.patch("spacy.load", return_value=blank):
+            module = importlib.import_module(name)
+    finally:
+        if stub_transformers:
+            sys.modules.pop("transformers", None)
+        added = {
+            key: sys.modules[key] for key in set(sys.modules) - before
+            if key == REPO_PACKAGE or key.startswith(REPO_PACKAGE + ".")
+        }
+        _blank_modules.update(added)
+        _detach(added)
+    return module
+
+
+def _parent_and_child(key: str) -> Tuple[Optional[types.ModuleType], str]:
+    parent, _, child = key.rpartition(".")
+    return sys.modules.get(parent), child
+
+
+def _detach(modules: Dict[str, types.ModuleType]) -> None:
+    for key, module in modules.items():
+        sys.modules.pop(key, None)
+    for key, module in modules.items():
+        parent, child = _parent_and_child(key)
+        if parent is not None and getattr(parent, child, None) is module:
+            delattr(parent, child)
+
+
+@contextmanager
+def model_modules() -> Iterator[None]:
+    """
+    Puts the repo modules imported against the blank pipeline back into
+    `sys.modules` (and onto their packages) until exit.
+    """
+    installed = {key: module for key, module in _blank_modules.items() if key not in sys.modules}
+    sys.modules.update(installed)
+    for key in sorted(installed):
+        parent, child = _parent_and_child(key)
+        if parent is not None:
+            setattr(parent, child, installed[key])
+    try:
+        yield
+    finally:
+        _detach(installed)
+
+
+def fake_rgb(phrase: str) -> Tuple[int, int, int]:
+    digest = zlib.crc32(normalize_token(phrase).encode("utf-8"))
+    return digest & 255, (digest >> 8) & 255, (digest >> 16) & 255
+
+
+def split_clauses(text: str) -> Tuple[bool, List[str]]:
+    segments = [part.strip() for part in re.split(r",| but ", text) if part.strip()]
+    return len(segments) > 1, segments or [text.strip()]
+
+
+def sentiment_of(segment: str) -> str:
+    return "negative" if _NEGATION.search(segment) else "positive"
+
+
+def classify(has_splitter: bool, segments: List[str], sentiments: Optional[List[str]] = None):
+    sentiments = sentiments if sentiments is not None else [sentiment_of(segment) for segment in segments]
+    classification = {"positive": [], "negative": []}
+    for segment, sentiment in zip(segments, sentiments):
+        classification[sentiment].append(segment)
+    return classification
+
+
+def extract_phrases(segment: str, **kwargs) -> List[str]:
+    return list(dict.fromkeys(match.group(0).lower() for match in _PHRASE.finditer(segment)))
+
+
+class ColorStages:
+    """
+    Usage:
+        stages = ColorStages()
+        with stages.patch(extractor):
+            extractor.extract_color_pipeline(text, TONES, MODIFIERS)
+        stages.rgb_calls          # phrases sent to the RGB resolver
+    """
+
+    def __init__(self, simplify: bool = True):
+        self.simplify = simplify
+        self.rgb_calls: List[str] = []
+        self.simplify_calls: List[str] = []
+        self._lock = threading.Lock()
+
+    def resolve_rgb(self, phrase: str, budget=None) -> Tuple[int, int, int]:
+        with self._lock:
+            self.rgb_calls.append(phrase)
+        return fake_rgb(phrase)
+
+    def simplify_phrase(self, phrase: str, budget=None) -> List[str]:
+        with self._lock:
+            self.simplify_calls.append(phrase)
+        return [f"simple {normalize_token(phrase)}"] if self.simplify else []
+
+    def patch(self, extractor: types.ModuleType) -> ExitStack:
+        stack = ExitStack()
+        stack.enter_context(model_modules())
+        replacements = {
+            "contains_sentiment_splitter_with_segments": split_clauses,
+            "split_texts_with_segments": lambda texts, batch_size=64: (split_clauses(text) for text in texts),
+            "detect_sentiments": lambda segments, batch_size=16: [sentiment_of(segment) for segment in segments],
+            "classify_segments_by_sentiment_no_neutral": classify,
+            "extract_all_descriptive_color_phrases": extract_phrases,
+            "get_rgb_from_descriptive_color_llm_first": self.resolve_rgb,
+            "simplify_phrase_with_llm": self.simplify_phrase,
+            "llm_available": lambda budget=None: True,
+        }
+        for name, replacement in replacements.items():
+            stack.enter_context(mock.patch.object(extractor, name, replacement))
+        return stack
@@ -0,0 +1,171 @@
+# Chatbot/tests/support/fake_openrouter.py
+
+"""
+fake_openrouter.py
+==================
+
+Local stand-in for the OpenRouter chat-completions endpoint.
+
+- Serves HTTP/1.1 keep-alive on 127.0.0.1 (random port) from a thread
+- Replies `{"choices": [{"message": {"content": ...}}], "usage": {...}}`
+  with content from `responder(payload)` (default: an RGB tuple) and
+  token counts estimated at ~4 characters per token
+- `batch_rgb_responder` answers multi-phrase prompts with JSON lines
+- `script` queues per-request overrides: status, headers, delay, body
+- Records payloads, distinct client connections and peak concurrency
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+CHAT_PATH = "/api/v1/chat/completions"
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients hanging up mid-request are expected in deadline tests
+
+
+def default_responder(payload: dict) -> str:
+    return "(231, 180, 188)"
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, (len(text) + 3) // 4)
+
+
+def prompt_text(payload: dict) -> str:
+    return "\n".join(message.get("content", "") for message in payload.get("messages", []))
+
+
+def batch_rgb_responder(rgb_for: Callable[[str], tuple]) -> Callable[[dict], str]:
+    """
+    Builds a responder that answers numbered-phrase batch prompts with
+    `{"i": n, "rgb": [...]}` lines and single prompts with '(R, G, B)'.
+    """
+    def respond(payload: dict) -> str:
+        text = prompt_text(payload)
+        if "Phrases:" in text:
+            lines = text.split("Phrases:", 1)[1].strip().splitlines()
+            replies = []
+            for line in lines:
+                number, _, phrase = line.partition(". ")
+                replies.append(json.dumps({"i": int(number), "rgb": list(rgb_for(phrase.strip("'")))}))
+            return "\n".join(replies)
+        phrase = text.rsplit("Now: '", 1)[-1].split("'", 1)[0]
+        return "({}, {}, {})".format(*rgb_for(phrase))
+
+    return respond
+
+
+class FakeOpenRouter:
+    """
+    Usage:
+        with FakeOpenRouter() as server:
+            server.script.append({"status": 503})
+            transport = LLMTransport(url=server.url)
+    """
+
+    def __init__(self, responder: Optional[Callable[[dict], str]] = None, delay: float = 0.0):
+        self.responder = responder or default_responder
+        self.delay = delay
+        self.script = deque()
+        self.payloads = []
+        self.connections = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = _QuietServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{CHAT_PATH}"
+
+    @property
+    def request_count(self) -> int:
+        return len(self.payloads)
+
+    def start(self) -> "FakeOpenRouter":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._thread.join()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOpenRouter":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _next_action(self) -> Dict:
+        with self._lock:
+            return self.script.popleft() if self.script else {}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # headers and body are separate writes
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                action = server._next_action()
+
+                with server._lock:
+                    server.payloads.append(payload)
+                    server.connections.add(self.client_address)
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(action.get("delay", server.delay))
+                    status = action.get("status", 200)
+                    if self.path != CHAT_PATH:
+                        status = 404
+                    if "body" in action:
+                        body = action["body"]
+                    elif status == 200:
+                        content = server.responder(payload)
+                        prompt_tokens = estimate_tokens(prompt_text(payload))
+                        completion_tokens = estimate_tokens(content)
+                        body = {
+                            "choices": [{"message": {"role": "assistant", "content": content}}],
+                            "usage": {
+                                "prompt_tokens": prompt_tokens,
+                                "completion_tokens": completion_tokens,
+                                "total_tokens": prompt_tokens + completion_tokens,
+                            },
+                        }
+                    else:
+                        body = {"error": {"code": status, "message": "scripted failure"}}
+
+                    raw = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(raw)))
+                    for key, value in action.get("headers", {}).items():
+                        self.send_header(key, value)
+                    self.end_headers()
+                    self.wfile.write(raw)
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True  # client gave up (deadline / timeout)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+        return Handler
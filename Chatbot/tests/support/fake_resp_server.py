@@ -0,0 +1,152 @@
+# Chatbot/tests/support/fake_resp_server.py
+
+"""
+fake_resp_server.py
+===================
+
+Local stand-in for a Redis-protocol key-value server.
+
+- Serves RESP2 on 127.0.0.1 (random port) from a thread, one thread per
+  connection; commands of a pipeline are answered in order
+- Supports PING, AUTH, SELECT, GET, MGET, SET (EX / PX), DEL, DBSIZE and
+  FLUSHDB, with per-key expiry
+- With `password`, AUTH checks it (WRONGPASS otherwise)
+- `delay` slows every reply (timeout tests); `stop()` drops every client
+  connection and `start()` brings it back on the same port
+- Records executed commands and distinct client connections
+"""
+
+import socket
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from Chatbot.cache.resp_client import read_reply
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients hanging up mid-request are expected in failure tests
+
+
+class FakeRESPServer:
+    """
+    Usage:
+        with FakeRESPServer() as server:
+            client = RESPClient(port=server.port)
+    """
+
+    def __init__(self, delay: float = 0.0, port: int = 0, password: Optional[str] = None):
+        self.delay = delay
+        self.password = password
+        self.port = port
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.commands: List[List[bytes]] = []
+        self.connections = set()
+        self._sockets = set()
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    # ------------------ COMMANDS ------------------ #
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and expires <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, command: List[bytes]) -> bytes:
+        name, args = command[0].upper(), command[1:]
+        with self._lock:
+            self.commands.append(command)
+            if name == b"PING":
+                return b"+PONG\r\n"
+            if name == b"AUTH" and self.password is not None and args[-1] != self.password.encode("utf-8"):
+                return b"-WRONGPASS invalid username-password pair or user is disabled.\r\n"
+            if name in (b"AUTH", b"SELECT"):
+                return b"+OK\r\n"
+            if name == b"GET":
+                return _bulk(self._get(args[0]))
+            if name == b"MGET":
+                return b"*%d\r\n" % len(args) + b"".join(_bulk(self._get(key)) for key in args)
+            if name == b"SET":
+                expires = None
+                if len(args) >= 4 and args[2].upper() == b"EX":
+                    expires = time.time() + int(args[3])
+                elif len(args) >= 4 and args[2].upper() == b"PX":
+                    expires = time.time() + int(args[3]) / 1000
+                self.data[args[0]] = (args[1], expires)
+                return b"+OK\r\n"
+            if name == b"DEL":
+                return b":%d\r\n" % sum(self.data.pop(key, None) is not None for key in args)
+            if name == b"DBSIZE":
+                return b":%d\r\n" % len(self.data)
+            if name == b"FLUSHDB":
+                self.data.clear()
+                return b"+OK\r\n"
+        return b"-ERR unknown command '%s'\r\n" % name
+
+    # ------------------ SERVER ------------------ #
+
+    def start(self) -> "FakeRESPServer":
+        owner = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                owner.connections.add(self.client_address)
+                owner._sockets.add(self.request)
+                while True:
+                    try:
+                        command = read_reply(self.rfile)
+                    except (ConnectionError, OSError, ValueError):
+                        return
+                    if owner.delay:
+                        time.sleep(owner.delay)
+                    self.wfile.write(owner.execute(command))
+                    self.wfile.flush()
+
+        self._server = _Server(("127.0.0.1", self.port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for sock in list(self._sockets):  # drop open client connections too
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+                sock.close()
+            except OSError:
+                pass
+        self._sockets.clear()
+
+    def __enter__(self) -> "FakeRESPServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
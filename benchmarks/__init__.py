@@ -0,0 +1,8 @@
+"""
+Benchmarks Package
+------------------
+Standalone performance scripts for the color extraction stack.
+Run from the repository root, e.g.:
+
+    python -m benchmarks.bench_fuzzy_name_index
+"""
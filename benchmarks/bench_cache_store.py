@@ -0,0 +1,77 @@
+# benchmarks/bench_cache_store.py
+
+"""
+bench_cache_store.py
+====================
+
+Whole-file JSON cache (previous ColorLLMCache format) vs. the SQLite WAL
+store: startup, adding a handful of entries and persisting them, and
+point lookups, at a given cache size.
+
+Usage:
+------
+    python -m benchmarks.bench_cache_store --entries 200000 --new 50 --lookups 20000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from Chatbot.cache.sqlite_store import SQLiteColorStore
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--new", type=int, default=50, help="entries added before persisting")
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    rgb = {f"shade {i}": [rng.randrange(256) for _ in range(3)] for i in range(args.entries)}
+    new = [(f"new shade {i}", (1, 2, 3)) for i in range(args.new)]
+    keys = rng.sample(list(rgb), min(args.lookups, len(rgb)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "cache.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"rgb": rgb, "simplified": {}}, f, indent=2)
+        store = SQLiteColorStore(os.path.join(tmp, "cache.sqlite3"))
+        store.put_many(rgb.items())
+        store.close()
+
+        def json_load():
+            with open(json_path, encoding="utf-8") as f:
+                return json.load(f)
+
+        def json_save(data):
+            data["rgb"].update((key, list(value)) for key, value in new)
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+
+        json_start, data = timed(json_load)
+        json_write, _ = timed(lambda: json_save(data))
+        json_get, _ = timed(lambda: [data["rgb"].get(key) for key in keys])
+
+        sqlite_start, store = timed(lambda: SQLiteColorStore(os.path.join(tmp, "cache.sqlite3")))
+        sqlite_write, _ = timed(lambda: store.put_many(new))
+        sqlite_get, _ = timed(lambda: [store.get_rgb(key) for key in keys])
+        store.close()
+
+    print(f"[📊 CACHE STORE] {args.entries} entries, {args.new} new, {len(keys)} lookups")
+    print(f"  {'backend':<8} {'startup ms':>11} {'persist ms':>11} {'µs/lookup':>10}")
+    print(f"  {'json':<8} {json_start:>11.1f} {json_write:>11.1f} {json_get * 1000 / len(keys):>10.2f}")
+    print(f"  {'sqlite':<8} {sqlite_start:>11.1f} {sqlite_write:>11.1f} {sqlite_get * 1000 / len(keys):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/bench_fuzzy_name_index.py
+
+"""
+bench_fuzzy_name_index.py
+=========================
+
+Queries-per-second comparison of the fuzzy color-name resolvers:
+
+- difflib.get_close_matches over all webcolor names (0.75 cutoff)
+- FuzzyNameIndex over the same names (0.75 cutoff)
+- Legacy rapidfuzz extractOne, rebuilding XKCD/CSS4 name lists per call (80 cutoff)
+- FuzzyNameIndex over XKCD/CSS4 with WRatio (80 cutoff)
+
+Usage:
+------
+    python -m benchmarks.bench_fuzzy_name_index --queries 2000
+"""
+
+import argparse
+import difflib
+import random
+import string
+import time
+from typing import Callable, List
+
+from matplotlib.colors import CSS4_COLORS, XKCD_COLORS
+from rapidfuzz import fuzz, process
+
+from Chatbot.extractors.color.shared.vocab import all_webcolor_names
+from Chatbot.extractors.color.utils.fuzzy_name_index import (
+    get_css4_name_index,
+    get_webcolor_name_index,
+    get_xkcd_name_index,
+)
+
+
+def build_queries(count: int, seed: int = 7) -> List[str]:
+    """
+    Builds a mix of exact names, single-typo names and spliced names.
+    """
+    rng = random.Random(seed)
+    names = sorted(all_webcolor_names) + [name.replace("xkcd:", "") for name in XKCD_COLORS]
+    queries = []
+    for _ in range(count):
+        name = rng.choice(names)
+        mode = rng.random()
+        if mode < 0.2:
+            queries.append(name)
+        elif mode < 0.8:
+            chars = list(name)
+            chars[rng.randrange(len(chars))] = rng.choice(string.ascii_lowercase)
+            queries.append("".join(chars))
+        else:
+            other = rng.choice(names)
+            queries.append(name[: len(name) // 2] + other[len(other) // 2:])
+    return queries
+
+
+def measure_qps(fn: Callable[[str], object], queries: List[str]) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def legacy_extract_one(phrase: str):
+    xkcd_names = [name.replace("xkcd:", "") for name in XKCD_COLORS]
+    _, score, _ = process.extractOne(phrase, xkcd_names)
+    if score >= 80:
+        return True
+    _, score, _ = process.extractOne(phrase, list(CSS4_COLORS.keys()))
+    return score >= 80
+
+
+def indexed_extract_one(phrase: str):
+    for index in (get_xkcd_name_index(), get_css4_name_index()):
+        if index.best_match(phrase, score_cutoff=80, scorer=fuzz.WRatio):
+            return True
+    return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    queries = build_queries(args.queries)
+    webcolor_index = get_webcolor_name_index()
+    get_xkcd_name_index(), get_css4_name_index()
+
+    results = {
+        "difflib (0.75)": measure_qps(
+            lambda q: difflib.get_close_matches(q, all_webcolor_names, n=1, cutoff=0.75), queries),
+        "FuzzyNameIndex ratio (0.75)": measure_qps(
+            lambda q: webcolor_index.best_match(q, score_cutoff=75), queries),
+        "legacy extractOne (80)": measure_qps(legacy_extract_one, queries),
+        "FuzzyNameIndex WRatio (80)": measure_qps(indexed_extract_one, queries),
+    }
+
+    print(f"[📊 FUZZY NAME RESOLVERS] {len(queries)} queries")
+    for label, qps in results.items():
+        print(f"  {label:<30} {qps:>12,.0f} q/s")
+
+
+if __name__ == "__main__":
+    main()
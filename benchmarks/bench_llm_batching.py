@@ -0,0 +1,65 @@
+# benchmarks/bench_llm_batching.py
+
+"""
+bench_llm_batching.py
+=====================
+
+Tokens and latency per phrase, single-phrase prompts vs batched prompts,
+against the local OpenRouter stand-in (fixed per-request latency to model
+the network/queueing round trip; tokens estimated at ~4 chars/token).
+
+Usage:
+------
+    python -m benchmarks.bench_llm_batching --phrases 48 --latency 0.15 --batch-sizes 1 4 8 16
+"""
+
+import argparse
+import os
+import zlib
+
+from Chatbot.extractors.color.llm.llm_api_client import query_llm_for_rgb_batch
+from Chatbot.extractors.color.llm.llm_metrics import LLMCallMetrics
+from Chatbot.extractors.color.llm.llm_transport import LLMTransport
+from Chatbot.tests.support.fake_openrouter import FakeOpenRouter, batch_rgb_responder
+
+MODIFIERS = ["dusty", "soft", "warm", "cool", "muted", "peachy", "rosy", "deep"]
+TONES = ["pink", "rose", "beige", "nude", "coral", "mauve", "plum", "sand"]
+
+
+def fake_rgb(phrase):
+    digest = zlib.crc32(phrase.encode("utf-8"))
+    return digest & 255, (digest >> 8) & 255, (digest >> 16) & 255
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--phrases", type=int, default=48)
+    parser.add_argument("--latency", type=float, default=0.15, help="seconds per completion")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    phrases = [f"{MODIFIERS[i % 8]} {TONES[(i // 8) % 8]} {i}" for i in range(args.phrases)]
+    os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+
+    rows = []
+    with FakeOpenRouter(responder=batch_rgb_responder(fake_rgb), delay=args.latency) as server:
+        transport = LLMTransport(url=server.url)
+        for batch_size in args.batch_sizes:
+            metrics = LLMCallMetrics()
+            query_llm_for_rgb_batch(phrases, batch_size=batch_size, transport=transport, metrics=metrics)
+            mode = "single" if batch_size == 1 else "batch"
+            rows.append((batch_size, metrics.per_phrase(mode)))
+        transport.close()
+
+    baseline = rows[0][1]
+    print(f"[📊 LLM BATCHING] {len(phrases)} phrases, {args.latency * 1000:.0f} ms per completion")
+    print(f"  {'batch':>5} {'requests':>9} {'tokens/phrase':>14} {'ms/phrase':>10} {'tokens saved':>13} {'ms saved':>9}")
+    for batch_size, stats in rows:
+        print(f"  {batch_size:>5} {stats['requests']:>9} {stats['tokens_per_phrase']:>14.1f} "
+              f"{stats['latency_ms_per_phrase']:>10.1f} "
+              f"{baseline['tokens_per_phrase'] - stats['tokens_per_phrase']:>13.1f} "
+              f"{baseline['latency_ms_per_phrase'] - stats['latency_ms_per_phrase']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
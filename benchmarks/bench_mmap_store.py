@@ -0,0 +1,135 @@
+# benchmarks/bench_mmap_store.py
+
+"""
+bench_mmap_store.py
+===================
+
+Shared-memory comparison for N pre-forked workers holding the palette
+plus a phrase → RGB cache:
+
+- dict: the parent builds Python dicts of tuples, then forks; every
+  worker reads all entries (refcount writes break copy-on-write)
+- mmap: the parent writes an MmapRGBStore file; every worker maps it
+  and reads all entries
+
+Each worker reports Rss and Pss from /proc/self/smaps_rollup (Linux).
+Pss splits shared pages between the processes that map them, so the
+Pss total is the real memory cost of the worker fleet.
+
+Usage:
+------
+    python -m benchmarks.bench_mmap_store --workers 8 --phrases 200000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Dict, Mapping, Tuple
+
+from Chatbot.cache.mmap_store import MmapRGBStore, write_rgb_store
+from Chatbot.extractors.color.utils.palette_index import build_palette_rgb_map
+
+
+def read_memory_kb() -> Dict[str, int]:
+    usage = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss"):
+                usage[key] = int(value.split()[0])
+    return usage
+
+
+def build_entries(phrases: int, seed: int = 29) -> Dict[str, Tuple[int, int, int]]:
+    rng = random.Random(seed)
+    words = ["dusty", "soft", "warm", "cool", "muted", "peachy", "rosy", "deep", "pale", "smoky"]
+    tones = ["pink", "rose", "beige", "nude", "coral", "mauve", "plum", "sand", "olive", "teal"]
+    entries = dict(build_palette_rgb_map())
+    for idx in range(phrases):
+        phrase = f"{rng.choice(words)} {rng.choice(words)} {rng.choice(tones)} {idx}"
+        entries[phrase] = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+    return entries
+
+
+def touch_all(mapping: Mapping[str, Tuple[int, int, int]], keys) -> int:
+    total = 0
+    for key in keys:
+        total += mapping[key][0]
+    return total
+
+
+def run_workers(mapping: Mapping[str, Tuple[int, int, int]], keys, workers: int) -> Dict[str, float]:
+    pipes = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            start = time.perf_counter()
+            touch_all(mapping, keys)
+            elapsed = time.perf_counter() - start
+            usage = read_memory_kb()
+            os.write(write_fd, f"{usage['Rss']} {usage['Pss']} {elapsed}".encode())
+            os._exit(0)
+        os.close(write_fd)
+        pipes.append((pid, read_fd))
+
+    rss = pss = seconds = 0.0
+    for pid, read_fd in pipes:
+        with os.fdopen(read_fd) as f:
+            worker_rss, worker_pss, elapsed = f.read().split()
+        os.waitpid(pid, 0)
+        rss += int(worker_rss)
+        pss += int(worker_pss)
+        seconds += float(elapsed)
+
+    return {"rss_mb": rss / 1024, "pss_mb": pss / 1024, "lookup_s": seconds / workers}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--phrases", type=int, default=200000)
+    parser.add_argument("--mode", choices=["dict", "mmap", "both"], default="both")
+    args = parser.parse_args()
+
+    entries = build_entries(args.phrases)
+    keys = list(entries)
+    results = {}
+
+    # Each mode runs in its own child so the other mode's objects are not inherited
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rgb.store")
+        write_rgb_store(path, entries)
+        store_mb = os.path.getsize(path) / 1024 / 1024
+        del entries
+
+        for mode in (["dict", "mmap"] if args.mode == "both" else [args.mode]):
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_fd)
+                store = MmapRGBStore(path)
+                mapping = dict(store.items()) if mode == "dict" else store
+                result = run_workers(mapping, keys, args.workers)
+                os.write(write_fd, json.dumps(result).encode())
+                os._exit(0)
+            os.close(write_fd)
+            with os.fdopen(read_fd) as f:
+                results[mode] = json.loads(f.read())
+            os.waitpid(pid, 0)
+
+    print(f"[📊 MMAP RGB STORE] {len(keys):,} entries, {args.workers} workers, store file {store_mb:.1f} MB")
+    for mode, result in results.items():
+        print(f"  {mode:<5} Σ Rss {result['rss_mb']:>8.1f} MB   Σ Pss {result['pss_mb']:>8.1f} MB   "
+              f"full scan {result['lookup_s'] * 1000:>7.1f} ms/worker")
+    if len(results) == 2:
+        saved = results["dict"]["pss_mb"] - results["mmap"]["pss_mb"]
+        print(f"  shared-memory savings: {saved:.1f} MB Pss across {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
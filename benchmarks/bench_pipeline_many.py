@@ -0,0 +1,98 @@
+# benchmarks/bench_pipeline_many.py
+
+"""
+bench_pipeline_many.py
+======================
+
+Throughput of the full color pipeline on a synthetic corpus: the
+single-text loop (`extract_color_pipeline` per message) vs. batch mode
+(`extract_color_pipeline_many`, nlp.pipe parsing, batched sentiment and
+cross-message phrase dedup). RGB lookups the palette cannot answer go
+to the local OpenRouter stand-in; the LLM cache (a throwaway file) is
+emptied before each mode so both pay for their own lookups.
+
+Needs the spaCy / transformers models used by the pipeline.
+
+Usage:
+------
+    python -m benchmarks.bench_pipeline_many --texts 200 --batch-size 32 --latency 0.05
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from Chatbot.cache.llm_cache import CACHE_PATH_ENV, ColorLLMCache
+from Chatbot.extractors.color.extractor import extract_color_pipeline, extract_color_pipeline_many
+from Chatbot.extractors.color.llm.llm_transport import LLMTransport, set_default_transport
+from Chatbot.extractors.color.shared.vocab import known_tones
+from Chatbot.extractors.color.utils.config_loader import load_known_modifiers
+from Chatbot.tests.support.fake_openrouter import FakeOpenRouter
+
+TEMPLATES = [
+    "I love {m} {t} but not {t2}",
+    "something {m} {t}, nothing too {t2}",
+    "looking for a {m} {t} lipstick",
+    "{t} or {m} {t2} blush, I hate {t3}",
+]
+TONES = ["pink", "rose", "beige", "nude", "coral", "mauve", "plum", "red", "peach", "berry"]
+MODIFIERS = ["dusty", "soft", "warm", "cool", "muted", "deep", "light", "glowy"]
+
+
+def corpus(count: int, seed: int = 7):
+    """
+    Yields `count` synthetic messages (a generator, as a large corpus would be).
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        t, t2, t3 = rng.sample(TONES, 3)
+        yield rng.choice(TEMPLATES).format(m=rng.choice(MODIFIERS), t=t, t2=t2, t3=t3)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per completion")
+    args = parser.parse_args()
+    os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+    os.environ[CACHE_PATH_ENV] = os.path.join(tempfile.mkdtemp(), "bench_cache.sqlite3")
+
+    cache = ColorLLMCache.get_instance()
+    known_modifiers = load_known_modifiers()
+
+    with FakeOpenRouter(delay=args.latency) as server:
+        transport = LLMTransport(url=server.url)
+        set_default_transport(transport)
+        try:
+            cache.clear(persistent=True)
+            start = time.perf_counter()
+            single = [
+                extract_color_pipeline(text, known_tones, known_modifiers, budget=None)
+                for text in corpus(args.texts)
+            ]
+            single_seconds = time.perf_counter() - start
+
+            cache.clear(persistent=True)
+            start = time.perf_counter()
+            many = list(extract_color_pipeline_many(
+                corpus(args.texts), known_tones, known_modifiers, batch_size=args.batch_size
+            ))
+            many_seconds = time.perf_counter() - start
+        finally:
+            set_default_transport(None)
+            transport.close()
+
+    same = sum(a == b for a, b in zip(single, many))
+    print(f"[📊 PIPELINE MANY] {args.texts} texts, batch size {args.batch_size}, "
+          f"{args.latency * 1000:.0f} ms per completion")
+    print(f"  {'mode':<8} {'seconds':>9} {'texts/s':>9}")
+    print(f"  {'single':<8} {single_seconds:>9.2f} {args.texts / single_seconds:>9.1f}")
+    print(f"  {'many':<8} {many_seconds:>9.2f} {args.texts / many_seconds:>9.1f}")
+    print(f"  speedup x{single_seconds / many_seconds:.1f}, identical outputs {same}/{args.texts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_prefetch.py
+
+"""
+bench_prefetch.py
+=================
+
+Per-message latency of the LLM RGB stage, sequential vs. speculative
+prefetch overlapped with sentiment classification. Classification is
+simulated by a fixed sleep (model inference); RGB lookups go through
+`query_llm_for_rgb` against the local OpenRouter stand-in.
+
+Usage:
+------
+    python -m benchmarks.bench_prefetch --messages 20 --latency 0.15 --classify 0.1
+"""
+
+import argparse
+import os
+import time
+
+from Chatbot.extractors.color.llm.llm_api_client import query_llm_for_rgb
+from Chatbot.extractors.color.llm.llm_transport import LLMTransport
+from Chatbot.extractors.color.logic.prefetch import (
+    ColorPrefetcher,
+    guess_color_phrases,
+    prefetch_stats,
+    reset_prefetch_stats,
+)
+from Chatbot.tests.support.fake_openrouter import FakeOpenRouter
+
+TONES = {"pink", "rose", "beige", "nude", "coral", "mauve", "plum", "red"}
+MODIFIERS = {"dusty", "soft", "warm", "cool", "muted", "deep"}
+MESSAGES = [
+    "I love dusty rose and soft pink but not red",
+    "warm beige or muted coral, nothing plum",
+    "deep mauve lipstick, maybe nude",
+    "cool pink blush with a glowy finish",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.15, help="seconds per completion")
+    parser.add_argument("--classify", type=float, default=0.1, help="simulated classification seconds")
+    args = parser.parse_args()
+    os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+
+    with FakeOpenRouter(delay=args.latency) as server:
+        transport = LLMTransport(url=server.url)
+
+        def resolve(phrase):
+            return query_llm_for_rgb(phrase, transport=transport)
+
+        def run(pipelined: bool) -> float:
+            start = time.perf_counter()
+            for i in range(args.messages):
+                text = MESSAGES[i % len(MESSAGES)]
+                phrases = guess_color_phrases(text, TONES, MODIFIERS)  # stands in for phrase extraction
+                prefetcher = ColorPrefetcher(resolve).start(phrases) if pipelined else None
+                time.sleep(args.classify)
+                for phrase in phrases:
+                    prefetcher.resolve(phrase) if pipelined else resolve(phrase)
+                if pipelined:
+                    prefetcher.finish()
+            return (time.perf_counter() - start) * 1000 / args.messages
+
+        reset_prefetch_stats()
+        sequential = run(pipelined=False)
+        pipelined = run(pipelined=True)
+        transport.close()
+
+    stats = prefetch_stats()
+    print(f"[📊 PREFETCH] {args.messages} messages, {args.latency * 1000:.0f} ms per completion, "
+          f"{args.classify * 1000:.0f} ms classification")
+    print(f"  {'mode':<11} {'ms/message':>11}")
+    print(f"  {'sequential':<11} {sequential:>11.1f}")
+    print(f"  {'pipelined':<11} {pipelined:>11.1f}")
+    print(f"  prefetched={stats['prefetched']} used={stats['used']} wasted={stats['wasted']} "
+          f"cancelled={stats['cancelled']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/bench_process_pool.py
+
+"""
+bench_process_pool.py
+=====================
+
+Scaling of `ColorProcessPool` with the number of worker processes on a
+synthetic corpus (throughput and speedup vs. one in-process worker).
+
+Workloads:
+- fuzzy     CPU-bound offline resolution only (token normalization,
+            palette lookup, fuzzy name match); no models needed
+- pipeline  full `extract_color_pipeline_many` (needs the spaCy /
+            transformers models; unresolved phrases go to the local
+            OpenRouter stand-in)
+
+Usage:
+------
+    python -m benchmarks.bench_process_pool --texts 2000 --workers 1 2 4 8
+    python -m benchmarks.bench_process_pool --workload pipeline --texts 400
+"""
+
+import argparse
+import os
+import random
+import time
+
+from Chatbot.extractors.color.logic.process_pool import ColorProcessPool, extract_colors, preload_models
+from Chatbot.extractors.color.utils.palette_index import get_palette_index, lookup_palette_rgb
+from Chatbot.extractors.color.utils.rgb_distance import fuzzy_match_rgb_from_known_colors
+from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
+
+TONES = ["pink", "rose", "beige", "nude", "coral", "mauve", "plum", "red", "peach", "berry"]
+MODIFIERS = ["dusty", "soft", "warm", "cool", "muted", "deep", "light", "glowy"]
+TYPOS = ["pinkk", "rosey", "beigy", "corall", "muave", "berri", "peachy", "nudish"]
+
+
+def corpus(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        words = [rng.choice(MODIFIERS), rng.choice(TONES + TYPOS), "or", rng.choice(TYPOS)]
+        yield f"I want something {' '.join(words)} please"
+
+
+def fuzzy_workload(texts):
+    outputs = []
+    for text in texts:
+        resolved = {}
+        for word in text.split():
+            token = normalize_token(word)
+            rgb = lookup_palette_rgb(token)
+            if rgb is None:
+                name = fuzzy_match_rgb_from_known_colors(token)
+                rgb = lookup_palette_rgb(name) if name else None
+            resolved[token] = rgb
+        outputs.append(resolved)
+    return outputs
+
+
+def run(workers: int, texts: int, chunk_size: int, extract, preload) -> dict:
+    with ColorProcessPool(workers=workers, chunk_size=chunk_size, extract=extract, preload=preload) as pool:
+        start = time.perf_counter()
+        count = sum(1 for _ in pool.map(corpus(texts)))
+        seconds = time.perf_counter() - start
+        stats = pool.stats()
+    rss = max((worker["peak_rss_kb"] for worker in stats["workers"].values()), default=0)
+    return {"texts": count, "seconds": seconds, "peak_rss_mb": rss / 1024, "frozen": stats["frozen_objects"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--workload", choices=("fuzzy", "pipeline"), default="fuzzy")
+    args = parser.parse_args()
+
+    if args.workload == "pipeline":
+        from Chatbot.extractors.color.llm.llm_transport import LLMTransport, set_default_transport
+        from Chatbot.tests.support.fake_openrouter import FakeOpenRouter
+
+        os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+        server = FakeOpenRouter(delay=0.02).start()
+        set_default_transport(LLMTransport(url=server.url))  # workers fork it away and rebuild their own
+        extract, preload = extract_colors, preload_models
+    else:
+        server = None
+        extract, preload = fuzzy_workload, get_palette_index
+
+    print(f"[📊 PROCESS POOL] {args.texts} texts, {args.workload} workload, chunk size {args.chunk_size}, "
+          f"{os.cpu_count()} CPUs")
+    print(f"  {'workers':>7} {'seconds':>9} {'texts/s':>9} {'speedup':>8} {'RSS MB':>8} {'frozen':>9}")
+    baseline = None
+    try:
+        for workers in sorted(set(args.workers)):
+            result = run(workers, args.texts, args.chunk_size, extract, preload)
+            baseline = baseline or result["seconds"]
+            print(f"  {workers:>7} {result['seconds']:>9.2f} {result['texts'] / result['seconds']:>9.1f} "
+                  f"{baseline / result['seconds']:>7.2f}x {result['peak_rss_mb']:>8.1f} {result['frozen']:>9}")
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_rgb_grid.py
+
+"""
+bench_rgb_grid.py
+=================
+
+Queries-per-second comparison of "palette names within distance" lookups
+over the CSS4 + XKCD palette:
+
+- Brute-force scan (`find_similar_color_names` without a grid)
+- RGBNeighborGrid built in memory
+- RGBNeighborGrid loaded from its mmap-able file
+
+Usage:
+------
+    python -m benchmarks.bench_rgb_grid --queries 5000 --threshold 60
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from Chatbot.extractors.color.utils.palette_index import get_palette_rgb_map
+from Chatbot.extractors.color.utils.rgb_distance import find_similar_color_names
+from Chatbot.extractors.color.utils.rgb_grid import RGBNeighborGrid
+
+
+def build_queries(count: int, seed: int = 28) -> List[Tuple[int, int, int]]:
+    rng = random.Random(seed)
+    return [tuple(rng.randint(0, 255) for _ in range(3)) for _ in range(count)]
+
+
+def measure_qps(fn: Callable[[Tuple[int, int, int]], object], queries: List[Tuple[int, int, int]]) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--threshold", type=float, default=60.0)
+    parser.add_argument("--bits", type=int, default=5)
+    args = parser.parse_args()
+
+    rgb_map = get_palette_rgb_map()
+    queries = build_queries(args.queries)
+
+    start = time.perf_counter()
+    grid = RGBNeighborGrid.build(rgb_map, threshold=args.threshold, bits=args.bits)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "palette.grid")
+        grid.save(path)
+        size_kb = os.path.getsize(path) / 1024
+        start = time.perf_counter()
+        mapped = RGBNeighborGrid.load(path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        candidates = sum(len(grid.cell_candidates(q)) for q in queries) / len(queries)
+        results = {
+            "brute force": measure_qps(lambda q: find_similar_color_names(q, rgb_map, args.threshold), queries),
+            "grid (memory)": measure_qps(lambda q: grid.query(q, args.threshold), queries),
+            "grid (mmap)": measure_qps(lambda q: mapped.query(q, args.threshold), queries),
+        }
+        del mapped
+
+    print(f"[📊 RGB GRID] {len(rgb_map)} colors, {1 << args.bits}³ cells, threshold {args.threshold}")
+    print(f"  build {build_ms:.1f} ms, load {load_ms:.2f} ms, file {size_kb:.0f} KiB, "
+          f"{candidates:.1f} candidates/query")
+    for label, qps in results.items():
+        print(f"  {label:<16} {qps:>12,.0f} q/s")
+
+
+if __name__ == "__main__":
+    main()
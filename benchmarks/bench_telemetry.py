@@ -0,0 +1,73 @@
+# benchmarks/bench_telemetry.py
+
+"""
+bench_telemetry.py
+==================
+
+Cost of the pipeline's stage spans (utils/telemetry.py): an empty stage
+and a real one (palette match through the RGB grid), run bare, inside a
+disabled span and inside an enabled span.
+
+Usage:
+------
+    python -m benchmarks.bench_telemetry --calls 200000
+"""
+
+import argparse
+import random
+import time
+
+from Chatbot.extractors.color.utils.rgb_grid import get_default_rgb_grid
+from Chatbot.extractors.color.utils.telemetry import (
+    disable_telemetry,
+    enable_telemetry,
+    reset_telemetry,
+    span,
+)
+
+
+def ns_per_call(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    grid = get_default_rgb_grid()
+    rng = random.Random(48)
+    queries = [tuple(rng.randint(0, 255) for _ in range(3)) for _ in range(256)]
+    cursor = iter(range(1 << 62))
+
+    def empty():
+        pass
+
+    def palette_match():
+        grid.query(queries[next(cursor) & 255])
+
+    def in_span(stage_fn):
+        def run():
+            with span("palette_match"):
+                stage_fn()
+        return run
+
+    stages = [("empty", empty, args.calls), ("palette match", palette_match, max(1, args.calls // 50))]
+    print(f"[📊 TELEMETRY] ns per call")
+    print(f"  {'stage':<14} {'bare':>10} {'disabled':>10} {'enabled':>10}")
+    for name, fn, calls in stages:
+        bare = ns_per_call(fn, calls)
+        disable_telemetry()
+        disabled = ns_per_call(in_span(fn), calls)
+        enable_telemetry()
+        enabled = ns_per_call(in_span(fn), calls)
+        disable_telemetry()
+        reset_telemetry()
+        print(f"  {name:<14} {bare:>10.0f} {disabled:>10.0f} {enabled:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_tone_conflicts.py
+
+"""
+bench_tone_conflicts.py
+=======================
+
+Positive/negative conflict detection at realistic RGB-expansion sizes:
+each side is a random sample of XKCD names, as produced when
+find_similar_color_names expands a few phrases to every palette color
+within 60 RGB units.
+
+- nested loop: original pairwise `extract_tones` implementation
+- bitsets: find_tone_conflicts (memoized tone signatures)
+
+Usage:
+------
+    python -m benchmarks.bench_tone_conflicts --rounds 20
+"""
+
+import argparse
+import random
+import time
+
+from matplotlib.colors import XKCD_COLORS
+
+from Chatbot.extractors.color.logic.tone_signatures import find_tone_conflicts
+from Chatbot.extractors.color.shared.vocab import known_tones
+from Chatbot.extractors.general.utils.fuzzy_match import normalize_token
+
+SIZES = [(50, 20), (200, 100), (500, 300), (900, 600)]
+
+
+def nested_loop_conflicts(positive, negative, tones):
+    def extract_tones(color_name):
+        return {normalize_token(t) for t in color_name.split()} & tones
+
+    positive_set = set(positive)
+    negative_set = set(negative)
+    conflict_colors = positive_set.intersection(negative_set)
+    for neg_color in negative_set:
+        neg_tones = extract_tones(neg_color)
+        for pos_color in positive_set:
+            if neg_tones & extract_tones(pos_color):
+                conflict_colors.add(pos_color)
+    return conflict_colors
+
+
+def time_ms(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(30)
+    names = sorted(name.replace("xkcd:", "") for name in XKCD_COLORS)
+
+    print(f"[📊 TONE CONFLICTS] {len(known_tones)} known tones, mean of {args.rounds} rounds")
+    for pos_size, neg_size in SIZES:
+        positive = rng.sample(names, pos_size)
+        negative = rng.sample(names, neg_size)
+        assert nested_loop_conflicts(positive, negative, known_tones) == \
+            find_tone_conflicts(positive, negative, known_tones)
+
+        rounds = max(1, args.rounds // 10) if pos_size * neg_size > 100_000 else args.rounds
+        loop_ms = time_ms(lambda: nested_loop_conflicts(positive, negative, known_tones), rounds)
+        bits_ms = time_ms(lambda: find_tone_conflicts(positive, negative, known_tones), args.rounds)
+        print(f"  P={pos_size:<4} N={neg_size:<4} nested loop {loop_ms:>9.2f} ms   "
+              f"bitsets {bits_ms:>7.3f} ms   x{loop_ms / bits_ms:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/corpus.py
+
+"""
+corpus.py
+=========
+
+Benchmark inputs: the hand-labeled cosmetic color queries in
+data/color_queries.json plus a seeded synthetic corpus, and the
+deterministic RGB answers of the mocked LLM.
+
+- `labeled()`: {'queries', 'glued', 'misspelled', 'palette'} with expected
+  tones / splits / names / RGB for accuracy checks
+- `synthetic_queries(count, seed)`: template messages (same seed → same corpus)
+- `fake_rgb(phrase)`: stable RGB per phrase, used as the stand-in LLM's reply
+
+Used By:
+--------
+- benchmarks/suite.py
+"""
+
+import json
+import os
+import random
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "color_queries.json")
+
+TEMPLATES = [
+    "I love {m} {t} but not {t2}",
+    "something {m} {t}, nothing too {t2}",
+    "looking for a {m} {t} lipstick",
+    "{t} or {m} {t2} blush, I hate {t3}",
+    "no {t3} please, I want {m} {t}",
+    "a {m}{t} gloss for the evening",
+]
+TONES = ["pink", "rose", "beige", "nude", "coral", "mauve", "plum", "red", "peach", "berry", "taupe", "wine"]
+MODIFIERS = ["dusty", "soft", "warm", "cool", "muted", "deep", "light", "glowy", "sheer", "rosy", "matte"]
+
+
+@lru_cache(maxsize=1)
+def labeled() -> Dict[str, List[dict]]:
+    with open(DATA_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def synthetic_queries(count: int, seed: int = 50) -> Iterator[str]:
+    """
+    Yields `count` synthetic messages, including glued modifier+tone tokens.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        t, t2, t3 = rng.sample(TONES, 3)
+        yield rng.choice(TEMPLATES).format(m=rng.choice(MODIFIERS), t=t, t2=t2, t3=t3)
+
+
+def color_phrases(count: int, seed: int = 50) -> List[str]:
+    """
+    `count` distinct 'modifier tone' phrases (numbered past the vocabulary
+    size so cache and LLM cases never see the same phrase twice).
+    """
+    rng = random.Random(seed)
+    pairs = [f"{m} {t}" for m in MODIFIERS for t in TONES]
+    rng.shuffle(pairs)
+    return [pairs[i] if i < len(pairs) else f"{pairs[i % len(pairs)]} {i}" for i in range(count)]
+
+
+def fake_rgb(phrase: str) -> Tuple[int, int, int]:
+    digest = zlib.crc32(phrase.encode("utf-8"))
+    return digest & 255, (digest >> 8) & 255, (digest >> 16) & 255
@@ -0,0 +1,155 @@
+# benchmarks/load_test_service.py
+
+"""
+load_test_service.py
+====================
+
+Closed-loop load test for the color extraction service: `--concurrency`
+clients, each on its own keep-alive connection, send POST /extract
+requests back to back. Reports throughput, p50 / p95 / p99 latency and
+the server-side micro-batch sizes (from /metrics).
+
+Targets a running service (`--url`), or with `--simulate-ms` starts one
+in-process whose model stage is a fixed per-batch sleep plus a small
+per-text cost — enough to see the effect of the batch window without
+loading the models.
+
+Usage:
+------
+    python -m Chatbot.service.server --port 8080 &
+    python -m benchmarks.load_test_service --url http://127.0.0.1:8080 --requests 2000 --concurrency 32
+    python -m benchmarks.load_test_service --simulate-ms 40 --wait-ms 5 --concurrency 32
+"""
+
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+from Chatbot.service.server import ColorService, percentiles
+
+TEXTS = [
+    "I love dusty rose and soft pink but not red",
+    "warm beige or muted coral, nothing plum",
+    "deep mauve lipstick, maybe nude",
+    "cool pink blush with a glowy finish",
+    "something peachy but not orange",
+]
+
+
+def simulated_pipeline(batch_ms: float, text_ms: float):
+    def process(texts):
+        time.sleep((batch_ms + text_ms * len(texts)) / 1000)
+        return [{"positive": {"matched_color_names": [], "base_rgb": None, "threshold": 60.0}} for _ in texts]
+    return process
+
+
+def client(host: str, port: int, count: int, latencies: list, errors: list, seed: int) -> None:
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    for _ in range(count):
+        body = json.dumps({"text": rng.choice(TEXTS)})
+        start = time.perf_counter()
+        try:
+            conn.request("POST", "/extract", body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=60)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def get_json(host: str, port: int, path: str):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    conn.request("GET", path)
+    response = conn.getresponse()
+    body = json.loads(response.read())
+    conn.close()
+    return response.status, body
+
+
+def wait_ready(host: str, port: int, timeout: float = 300.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if get_json(host, port, "/readyz")[0] == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise SystemExit(f"service at {host}:{port} not ready after {timeout:.0f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="running service (default: in-process simulation)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--simulate-ms", type=float, default=40.0, help="simulated per-batch model cost")
+    parser.add_argument("--simulate-text-ms", type=float, default=1.0, help="simulated per-text model cost")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--wait-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    service = server = None
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+        mode = args.url
+    else:
+        service = ColorService(
+            simulated_pipeline(args.simulate_ms, args.simulate_text_ms),
+            warm_up=None,
+            max_batch_size=args.batch_size,
+            max_wait=args.wait_ms / 1000
+        )
+        server = service.make_server(port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        service.start_warm_up()
+        host, port = "127.0.0.1", server.server_address[1]
+        mode = (f"simulated {args.simulate_ms:g} ms/batch + {args.simulate_text_ms:g} ms/text, "
+                f"batch ≤{args.batch_size}, window {args.wait_ms:g} ms")
+
+    try:
+        wait_ready(host, port)
+        latencies, errors = [], []
+        per_client = [args.requests // args.concurrency + (i < args.requests % args.concurrency)
+                      for i in range(args.concurrency)]
+        threads = [threading.Thread(target=client, args=(host, port, count, latencies, errors, i))
+                   for i, count in enumerate(per_client)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - start
+        batches = get_json(host, port, "/metrics")[1].get("batches", {})
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            service.close()
+
+    latency = percentiles(latencies)
+    print(f"[📊 LOAD TEST] {args.requests} requests, {args.concurrency} clients — {mode}")
+    print(f"  {'throughput':<16}{len(latencies) / seconds:>10.1f} req/s")
+    for key, value in latency.items():
+        print(f"  {key + ' latency':<16}{value * 1000:>10.1f} ms")
+    print(f"  {'errors':<16}{len(errors):>10}")
+    if batches:
+        print(f"  {'mean batch':<16}{batches.get('mean_batch_size', 0):>10.1f}")
+        print(f"  {'largest batch':<16}{batches.get('largest_batch', 0):>10}")
+
+
+if __name__ == "__main__":
+    main()
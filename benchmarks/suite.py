@@ -0,0 +1,538 @@
+# benchmarks/suite.py
+
+"""
+suite.py
+========
+
+End-to-end benchmark suite with regression gates.
+
+Runs every case on the hand-labeled corpus (data/color_queries.json)
+plus a seeded synthetic one, with the LLM replaced by the local
+OpenRouter stand-in (deterministic RGB per phrase) and the LLM cache on
+a throwaway file. Per case it reports:
+
+- latency percentiles (p50 / p95 / p99, µs per item) and throughput
+- peak traced allocations and net retained memory (tracemalloc, one
+  separate pass so the timings are not skewed), peak RSS of the process
+- accuracy against the labels, where the case has labels
+
+The suite runs --runs times and keeps the best value of each metric.
+
+Cases: pipeline (full `extract_color_pipeline`, with the per-stage means
+from utils/telemetry.py), stage.sentiment, stage.phrases, glued.split,
+fuzzy.palette_names, fuzzy.expressions, palette.lookup, palette.nearest,
+cache.rgb, llm.rgb. Cases whose models are not installed (spaCy
+en_core_web_sm, transformers / torch, the zero-shot sentiment model) are
+reported as "models missing" and are not gated (a warning, not a
+failure; --require-models makes them fail); any other import error is a
+bug and is raised.
+
+Gates: results are compared with a stored baseline (baselines/default.json);
+a case regresses when its p50 or allocation peak grows beyond the
+tolerance, its p95 beyond twice the tolerance (tails are noisier), or its
+accuracy drops at all. A measured case without a baseline and a baseline
+case that no longer exists fail the gate too. llm.rgb times socket round
+trips to the local stand-in, which swing by 2x between runs on an idle
+machine: its latency is report-only, its allocations and accuracy are
+gated. Any regression exits with status 1. Baselines are machine-specific:
+refresh them with --update-baseline after an intended change; the model
+cases (pipeline, stage.*) need a machine with the models installed.
+
+Usage:
+------
+    python -m benchmarks.suite
+    python -m benchmarks.suite --cases glued fuzzy --repeat 5
+    python -m benchmarks.suite --update-baseline
+    python -m benchmarks.suite --require-models      # CI with the models installed
+    python -m benchmarks.suite --json results.json --latency-tolerance 0.3
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.corpus import color_phrases, fake_rgb, labeled, synthetic_queries
+from Chatbot.service.server import percentiles
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "default.json")
+
+LATENCY_TOLERANCE = 0.5
+ALLOC_TOLERANCE = 0.25
+LATENCY_SLACK_US = 5.0    # absolute noise floor for very fast cases
+ALLOC_SLACK_KB = 64.0
+
+# Cases whose timings are reported but not gated (network round trips)
+LATENCY_REPORT_ONLY = ("llm.rgb",)
+
+
+class Workload(NamedTuple):
+    items: Sequence[Any]
+    run: Callable[[Any], Any]
+    check: Optional[Callable[[Any, Any], bool]] = None   # (item, result) → correct?
+    close: Optional[Callable[[], None]] = None
+    extra: Optional[Callable[[], Dict[str, Any]]] = None  # case-specific report fields
+
+
+class Skip(Exception):
+    pass
+
+
+# The only import failures a case may be skipped for (and left ungated): models not installed
+MODEL_PACKAGES = ("en_core_web_sm", "transformers", "torch")
+MODEL_NAMES = ("en_core_web_sm", "bart-large-mnli")
+
+
+def _peak_rss_kb() -> int:
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+# ------------------ CASES ------------------ #
+
+def _vocab():
+    from Chatbot.extractors.color.shared.vocab import known_tones
+    from Chatbot.extractors.color.utils.config_loader import load_known_modifiers
+    return known_tones, load_known_modifiers()
+
+
+def _heavy(import_fn: Callable[[], Any]) -> Any:
+    """
+    Imports a model-backed module, turning missing models into a Skip.
+    Other import errors come from the repo's own code and propagate.
+    """
+    try:
+        return import_fn()
+    except ModuleNotFoundError as e:
+        if (e.name or "").split(".")[0] not in MODEL_PACKAGES:
+            raise
+        raise Skip(f"{type(e).__name__}: {e}") from e
+    except OSError as e:
+        if not any(model in str(e) for model in MODEL_NAMES):
+            raise
+        raise Skip(f"{type(e).__name__}: {e}") from e
+
+
+def _tones_found(expected: Iterable[str], names: Iterable[str]) -> bool:
+    names = [name.lower() for name in names]
+    return all(any(tone in name for name in names) for tone in expected)
+
+
+def case_pipeline(args, env) -> Workload:
+    extractor = _heavy(lambda: __import__("Chatbot.extractors.color.extractor", fromlist=["extract_color_pipeline"]))
+    from Chatbot.extractors.color.utils import telemetry
+
+    known_tones, known_modifiers = _vocab()
+    env.use_llm_stand_in()
+    queries = labeled()["queries"]
+    items = [(query["text"], query) for query in queries]
+    items += [(text, None) for text in synthetic_queries(args.synthetic)]
+    telemetry.reset_telemetry()
+    telemetry.enable_telemetry()
+
+    def run(item):
+        return extractor.extract_color_pipeline(item[0], known_tones, known_modifiers, budget=None)
+
+    def check(item, result):
+        query = item[1]
+        if query is None:
+            return None
+        return (_tones_found(query["positive"], result["positive"]["matched_color_names"])
+                and _tones_found(query["negative"], result["negative"]["matched_color_names"]))
+
+    def stages():
+        series = telemetry.telemetry_snapshot()["histograms"].get(telemetry.STAGE_SECONDS, [])
+        return {
+            "stage_mean_us": {
+                item["labels"]["stage"]: round(item["mean"] * 1e6, 1) for item in series
+            }
+        }
+
+    def close():
+        telemetry.disable_telemetry()
+        telemetry.reset_telemetry()
+
+    return Workload(items, run, check, close, stages)
+
+
+def case_stage_sentiment(args, env) -> Workload:
+    extractor = _heavy(lambda: __import__("Chatbot.extractors.color.extractor", fromlist=["segment_and_classify_text"]))
+    queries = labeled()["queries"]
+
+    def check(query, result):
+        return (not query["negative"]) or bool(result["negative"])
+
+    return Workload(queries, lambda query: extractor.segment_and_classify_text(query["text"]), check)
+
+
+def case_stage_phrases(args, env) -> Workload:
+    extractor = _heavy(lambda: __import__("Chatbot.extractors.color.extractor", fromlist=["extract_segment_phrases"]))
+    known_tones, known_modifiers = _vocab()
+    texts = [query["text"] for query in labeled()["queries"]] + list(synthetic_queries(args.synthetic))
+    return Workload(texts, lambda text: extractor.extract_segment_phrases([text], known_tones, known_modifiers))
+
+
+def case_glued_split(args, env) -> Workload:
+    from Chatbot.extractors.color.utils.token_utils import split_glued_tokens
+
+    known_tones, known_modifiers = _vocab()
+    known_tokens = known_tones | known_modifiers
+    return Workload(
+        labeled()["glued"],
+        lambda item: split_glued_tokens(item["token"], known_tokens, known_modifiers),
+        lambda item, result: result == item["split"],
+    )
+
+
+def case_fuzzy_palette_names(args, env) -> Workload:
+    from Chatbot.extractors.color.utils.fuzzy_name_index import get_xkcd_name_index
+
+    index = get_xkcd_name_index()
+    return Workload(
+        labeled()["misspelled"],
+        lambda item: index.best_match(item["query"]),
+        lambda item, result: result is not None and result[0] == item["name"],
+    )
+
+
+def case_fuzzy_expressions(args, env) -> Workload:
+    from Chatbot.extractors.color.utils.config_loader import load_json_from_data_dir
+    from Chatbot.extractors.general.utils.fuzzy_match import match_expression_aliases
+
+    expression_map = load_json_from_data_dir("expression_definition.json")
+    texts = [query["text"] for query in labeled()["queries"]]
+    return Workload(texts, lambda text: match_expression_aliases(text, expression_map))
+
+
+def case_palette_lookup(args, env) -> Workload:
+    from Chatbot.extractors.color.utils.palette_index import lookup_palette_rgb
+
+    return Workload(
+        labeled()["palette"],
+        lambda item: lookup_palette_rgb(item["name"]),
+        lambda item, result: (list(result) if result else None) == item["rgb"],
+    )
+
+
+def case_palette_nearest(args, env) -> Workload:
+    from Chatbot.extractors.color.utils.rgb_grid import get_default_rgb_grid
+
+    grid = get_default_rgb_grid()
+    rgbs = [fake_rgb(phrase) for phrase in color_phrases(args.synthetic)]
+    return Workload(rgbs, grid.query)
+
+
+def case_cache_rgb(args, env) -> Workload:
+    from Chatbot.cache.llm_cache import ColorLLMCache
+
+    cache = ColorLLMCache.get_instance()
+    cache.clear(persistent=True)
+    phrases = color_phrases(args.synthetic)
+
+    def run(phrase):
+        cache.store_rgb(phrase, fake_rgb(phrase))
+        return cache.get_rgb(phrase)
+
+    return Workload(phrases, run, lambda phrase, rgb: tuple(rgb) == fake_rgb(phrase),
+                    lambda: cache.clear(persistent=True))
+
+
+def case_llm_rgb(args, env) -> Workload:
+    from Chatbot.extractors.color.llm.llm_api_client import query_llm_for_rgb
+
+    transport = env.use_llm_stand_in()
+    phrases = color_phrases(args.synthetic, seed=51)
+    return Workload(
+        phrases,
+        lambda phrase: query_llm_for_rgb(phrase, transport=transport, retries=0),
+        lambda phrase, rgb: rgb == fake_rgb(phrase),
+    )
+
+
+CASES = {
+    "pipeline": case_pipeline,
+    "stage.sentiment": case_stage_sentiment,
+    "stage.phrases": case_stage_phrases,
+    "glued.split": case_glued_split,
+    "fuzzy.palette_names": case_fuzzy_palette_names,
+    "fuzzy.expressions": case_fuzzy_expressions,
+    "palette.lookup": case_palette_lookup,
+    "palette.nearest": case_palette_nearest,
+    "cache.rgb": case_cache_rgb,
+    "llm.rgb": case_llm_rgb,
+}
+
+
+# ------------------ ENVIRONMENT ------------------ #
+
+class Environment:
+    """
+    Throwaway LLM cache file and a lazily started OpenRouter stand-in.
+    """
+
+    def __init__(self, llm_latency: float):
+        from Chatbot.cache.llm_cache import CACHE_PATH_ENV
+
+        self.llm_latency = llm_latency
+        self.tmp = tempfile.TemporaryDirectory()
+        os.environ[CACHE_PATH_ENV] = os.path.join(self.tmp.name, "bench_cache.sqlite3")
+        os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+        self._server = None
+        self._transport = None
+
+    def use_llm_stand_in(self):
+        if self._transport is None:
+            from Chatbot.extractors.color.llm.llm_transport import LLMTransport, set_default_transport
+            from Chatbot.tests.support.fake_openrouter import FakeOpenRouter, batch_rgb_responder
+
+            self._server = FakeOpenRouter(responder=batch_rgb_responder(fake_rgb), delay=self.llm_latency).start()
+            self._transport = LLMTransport(url=self._server.url)
+            set_default_transport(self._transport)
+        return self._transport
+
+    def close(self) -> None:
+        if self._transport is not None:
+            from Chatbot.extractors.color.llm.llm_transport import set_default_transport
+
+            set_default_transport(None)
+            self._transport.close()
+            self._server.stop()
+        self.tmp.cleanup()
+
+
+# ------------------ RUNNER ------------------ #
+
+def measure(workload: Workload, repeat: int) -> Dict[str, Any]:
+    """
+    Times every item `repeat` times (after one warm-up pass), then runs a
+    separate tracemalloc pass.
+    """
+    results = [workload.run(item) for item in workload.items]  # warm-up, also used for accuracy
+
+    timings = []
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in workload.items:
+            t0 = time.perf_counter_ns()
+            workload.run(item)
+            timings.append((time.perf_counter_ns() - t0) / 1000)
+    wall = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for item in workload.items:
+        workload.run(item)
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    gc.collect()  # cyclic garbage is not retained memory
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    report = {
+        "items": len(workload.items),
+        **{f"{key}_us": round(value, 1) for key, value in percentiles(timings).items()},
+        "ops_per_s": round(len(timings) / wall, 1) if wall else 0.0,
+        "alloc_peak_kb": round(alloc_peak / 1024, 1),
+        "alloc_net_kb": round(retained / 1024, 1),
+        "rss_peak_kb": _peak_rss_kb(),
+    }
+    if workload.check is not None:
+        checks = [workload.check(item, result) for item, result in zip(workload.items, results)]
+        checks = [ok for ok in checks if ok is not None]
+        if checks:
+            report["accuracy"] = round(sum(checks) / len(checks), 4)
+    if workload.extra is not None:
+        report.update(workload.extra())
+    return report
+
+
+def run_cases(names: Iterable[str], args) -> Dict[str, Dict[str, Any]]:
+    env = Environment(args.llm_latency)
+    reports = {}
+    try:
+        for name in names:
+            try:
+                workload = CASES[name](args, env)
+            except Skip as e:
+                reports[name] = {"skipped": str(e)}
+                continue
+            try:
+                reports[name] = measure(workload, args.repeat)
+            finally:
+                if workload.close is not None:
+                    workload.close()
+    finally:
+        env.close()
+    return reports
+
+
+def best_of(runs: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Merges repeated runs, keeping each metric's best value (as timeit does:
+    noise only ever makes a run slower).
+    """
+    merged = {}
+    for name, report in runs[0].items():
+        if "skipped" in report:
+            merged[name] = report
+            continue
+        reports = [run[name] for run in runs]
+        merged[name] = dict(report)
+        for key in report:
+            if key.endswith("_us") or key.startswith("alloc_"):
+                merged[name][key] = min(r[key] for r in reports)
+        merged[name]["ops_per_s"] = max(r["ops_per_s"] for r in reports)
+        merged[name]["rss_peak_kb"] = max(r["rss_peak_kb"] for r in reports)
+    return merged
+
+
+# ------------------ GATES ------------------ #
+
+def compare(
+    reports: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    latency_tolerance: float = LATENCY_TOLERANCE,
+    alloc_tolerance: float = ALLOC_TOLERANCE,
+    require_models: bool = False
+) -> List[str]:
+    """
+    Returns one message per regression against `baseline`. Measured cases
+    without a baseline and baseline cases that no longer exist are
+    regressions as well; cases skipped for missing models are not, unless
+    `require_models`.
+    """
+    regressions = [f"{name}: in the baseline but no longer a case" for name in baseline if name not in CASES]
+    for name, report in reports.items():
+        base = baseline.get(name)
+        if "skipped" in report:
+            if require_models:
+                regressions.append(f"{name}: skipped ({report['skipped']})")
+            continue
+        if not base:
+            regressions.append(f"{name}: no baseline (record it with --update-baseline)")
+            continue
+        latency_gates = () if name in LATENCY_REPORT_ONLY else (
+            ("p50_us", latency_tolerance), ("p95_us", 2 * latency_tolerance)
+        )
+        for key, tolerance in latency_gates:
+            if report[key] > base[key] * (1 + tolerance) + LATENCY_SLACK_US:
+                regressions.append(f"{name}: {key[:3]} {report[key]:.1f} µs vs baseline {base[key]:.1f} µs")
+        if report["alloc_peak_kb"] > base["alloc_peak_kb"] * (1 + alloc_tolerance) + ALLOC_SLACK_KB:
+            regressions.append(f"{name}: alloc peak {report['alloc_peak_kb']:.0f} KB "
+                               f"vs baseline {base['alloc_peak_kb']:.0f} KB")
+        if report.get("accuracy", 1.0) < base.get("accuracy", 0.0):
+            regressions.append(f"{name}: accuracy {report['accuracy']:.3f} vs baseline {base['accuracy']:.3f}")
+    return regressions
+
+
+def machine() -> Dict[str, Any]:
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()}
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, reports: Dict[str, Dict[str, Any]], args) -> None:
+    """
+    Writes the measured cases over the stored ones (skipped cases keep
+    their previous baseline).
+    """
+    stored = (load_baseline(path) or {}).get("cases", {})
+    stored.update({name: report for name, report in reports.items() if "skipped" not in report})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "machine": machine(),
+            "settings": {"runs": args.runs, "repeat": args.repeat, "synthetic": args.synthetic, "llm_latency": args.llm_latency},
+            "cases": stored,
+        }, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def print_report(reports: Dict[str, Dict[str, Any]]) -> None:
+    print(f"  {'case':<20} {'items':>5} {'p50 µs':>9} {'p95 µs':>9} {'p99 µs':>9} {'ops/s':>9} "
+          f"{'alloc KB':>9} {'net KB':>8} {'RSS MB':>7} {'accuracy':>8}")
+    for name, report in reports.items():
+        if "skipped" in report:
+            print(f"  {name:<20} not gated ({report['skipped'][:70]})")
+            continue
+        accuracy = f"{report['accuracy']:.3f}" if "accuracy" in report else "—"
+        print(f"  {name:<20} {report['items']:>5} {report['p50_us']:>9.1f} {report['p95_us']:>9.1f} "
+              f"{report['p99_us']:>9.1f} {report['ops_per_s']:>9.0f} {report['alloc_peak_kb']:>9.1f} "
+              f"{report['alloc_net_kb']:>8.1f} {report['rss_peak_kb'] / 1024:>7.1f} {accuracy:>8}")
+        for stage, mean_us in report.get("stage_mean_us", {}).items():
+            print(f"    └ {stage:<24} mean {mean_us:>10.1f} µs")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="+", default=[], help="case name prefixes (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed passes over each case's items")
+    parser.add_argument("--runs", type=int, default=3, help="whole-suite runs; the best value of each metric is kept")
+    parser.add_argument("--synthetic", type=int, default=64, help="synthetic items per case")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds per stand-in completion")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--latency-tolerance", type=float, default=LATENCY_TOLERANCE)
+    parser.add_argument("--alloc-tolerance", type=float, default=ALLOC_TOLERANCE)
+    parser.add_argument("--require-models", action="store_true",
+                        help="fail cases skipped for missing models instead of leaving them ungated")
+    parser.add_argument("--json", help="also write the reports to this file")
+    args = parser.parse_args(argv)
+
+    names = [name for name in CASES if not args.cases or name.startswith(tuple(args.cases))]
+    if not names:
+        parser.error(f"no case matches {args.cases}; cases: {', '.join(CASES)}")
+
+    reports = best_of([run_cases(names, args) for _ in range(max(1, args.runs))])
+    print(f"[📊 BENCHMARK SUITE] {len(names)} cases, best of {args.runs} runs × {args.repeat} passes, "
+          f"{args.synthetic} synthetic items, stand-in LLM {args.llm_latency * 1000:.0f} ms")
+    print_report(reports)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine(), "cases": reports}, f, indent=2, ensure_ascii=False)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, reports, args)
+        print(f"[💾 BASELINE] updated {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"[⚠️ NO BASELINE] {args.baseline} (run with --update-baseline)")
+        return 0
+    if baseline.get("machine") != machine():
+        print(f"[⚠️ BASELINE MACHINE] recorded on {baseline.get('machine')}, timings may not compare")
+    regressions = compare(
+        reports, baseline.get("cases", {}), args.latency_tolerance, args.alloc_tolerance, args.require_models
+    )
+    ungated = [name for name, report in reports.items() if "skipped" in report]
+    if ungated and not args.require_models:
+        print(f"[⚠️ NOT GATED] models missing for {', '.join(ungated)}")
+    for message in regressions:
+        print(f"[❌ REGRESSION] {message}")
+    if not regressions:
+        print("[✅ NO REGRESSIONS]")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())